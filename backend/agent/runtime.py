@@ -13,6 +13,7 @@ from urllib.parse import quote_plus, urlparse
 
 from backend.telemetry import event as telemetry_event
 from backend.app.search.embedding import embed_query as _runtime_embed_query
+from backend.app.search.hybrid import HybridResult, HybridRetriever, HybridTimeoutError
 
 from .document_store import DocumentStore, StoredDocument
 from .frontier_store import FrontierStore
@@ -145,53 +146,85 @@ class AgentRuntime:
         elif self.vector_store is None:
             self.vector_store = getattr(self.vector_index, "vector_store", None)
 
-    def search_index(self, query: str, *, k: int = 20, use_embeddings: bool = True) -> list[dict[str, object]]:
+    def search_index(
+        self,
+        query: str,
+        *,
+        k: int = 20,
+        use_embeddings: bool = True,
+        deadline_ms: float | None = None,
+    ) -> list[dict[str, object]]:
+        """Return fused hits, or no hits when every retriever missed its deadline."""
+
+        try:
+            result = self.hybrid_search(
+                query, k=k, use_embeddings=use_embeddings, deadline_ms=deadline_ms
+            )
+        except HybridTimeoutError as exc:
+            LOGGER.warning(
+                "hybrid search timed out (%s); treating as no results",
+                ", ".join(f"{name}={timing.status}" for name, timing in exc.timings.items()),
+            )
+            return []
+        return result.hits
+
+    def hybrid_search(
+        self,
+        query: str,
+        *,
+        k: int = 20,
+        use_embeddings: bool = True,
+        deadline_ms: float | None = None,
+    ) -> HybridResult:
+        """Run vector and BM25 retrieval concurrently and fuse them by rank.
+
+        ``deadline_ms`` overrides the default per-retriever deadline.
+        """
+
         clean_query = (query or "").strip()
         if not clean_query:
-            return []
-        combined: dict[str, dict[str, object]] = {}
-        if use_embeddings:
-            try:
-                vector_hits = self.vector_index.search(clean_query, k=k)
-            except EmbedderUnavailableError:
-                LOGGER.debug("Embedding unavailable; falling back to BM25 only", exc_info=True)
-                vector_hits = []
-            for rank, hit in enumerate(vector_hits, start=1):
-                url = str(hit.get("url", ""))
-                if not url:
-                    continue
-                combined.setdefault(
-                    url,
-                    {
-                        "url": url,
-                        "title": hit.get("title"),
-                        "snippet": hit.get("chunk"),
-                        "score": float(hit.get("score", 0.0)),
-                        "source": "vector",
-                        "rank": rank,
-                    },
-                )
+            return HybridResult(hits=[])
+        retrievers: dict[str, Callable[[str, int], Sequence[Mapping[str, object]]]] = {}
+        if use_embeddings and self.vector_index is not None:
+            retrievers["vector"] = self._vector_hits
         if self.search_service:
-            results, _job, _context = self.search_service.run_query(
-                clean_query, limit=max(5, k), use_llm=False, model=None
-            )
-            for rank, item in enumerate(results, start=1):
-                url = str(item.get("url", ""))
-                if not url:
-                    continue
-                entry = combined.setdefault(url, {
-                    "url": url,
-                    "title": item.get("title"),
-                    "snippet": item.get("snippet"),
-                    "score": float(item.get("score", 0.0)),
-                    "source": "bm25",
-                    "rank": rank,
-                })
-                if entry["source"] == "vector":
-                    entry.setdefault("bm25_rank", rank)
-                    entry.setdefault("snippet", item.get("snippet"))
-        ordered = sorted(combined.values(), key=lambda hit: hit.get("rank", 9999))
-        return ordered[:k]
+            retrievers["bm25"] = self._bm25_hits
+        if not retrievers:
+            return HybridResult(hits=[])
+        options: dict[str, float] = {}
+        if deadline_ms is not None:
+            options["default_deadline_ms"] = float(deadline_ms)
+        return HybridRetriever(retrievers, **options).search(clean_query, k=k)
+
+    def _vector_hits(self, query: str, limit: int) -> list[dict[str, object]]:
+        try:
+            hits = self.vector_index.search(query, k=limit)
+        except EmbedderUnavailableError:
+            LOGGER.debug("Embedding unavailable; falling back to BM25 only", exc_info=True)
+            return []
+        return [
+            {
+                "url": str(hit.get("url", "")),
+                "title": hit.get("title"),
+                "snippet": hit.get("chunk"),
+                "score": float(hit.get("score", 0.0)),
+            }
+            for hit in hits
+        ]
+
+    def _bm25_hits(self, query: str, limit: int) -> list[dict[str, object]]:
+        results, _job, _context = self.search_service.run_query(
+            query, limit=max(5, limit), use_llm=False, model=None
+        )
+        return [
+            {
+                "url": str(item.get("url", "")),
+                "title": item.get("title"),
+                "snippet": item.get("snippet"),
+                "score": float(item.get("score", 0.0)),
+            }
+            for item in results
+        ]
 
     def enqueue_crawl(
         self,
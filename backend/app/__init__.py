@@ -86,6 +86,7 @@ def create_app() -> Flask:
     from .api import index_health as index_health_api
     from .api import jobs as jobs_api
     from .api import metrics as metrics_api
+    from .metrics import metrics
     from .api import bundle as bundle_api
     from .api import admin as admin_api
     from .api import meta as meta_api
@@ -324,7 +325,7 @@ def create_app() -> Flask:
 
     # App state database
     # --------------------------------------------------------------------------
-    state_db = AppStateDB(config.app_state_db_path)
+    state_db = AppStateDB(config.app_state_db_path, on_call=metrics.record_db_call)
     repo_root = Path(__file__).resolve().parents[2]
     try:
         state_db.register_repo("workspace", root_path=repo_root, allowed_ops=["read", "write"])
@@ -9,6 +9,7 @@ from flask import Blueprint, current_app, jsonify, request
 from observability import start_span
 
 from .utils import coerce_chat_identifier
+from ..search.hybrid import HybridTimeoutError
 from ..services.agent_tracing import publish_agent_step
 
 bp = Blueprint("agent_tools", __name__, url_prefix="/api/tools")
@@ -104,7 +105,28 @@ def search_index() -> tuple[str, int]:
 
     use_embeddings = _parse_bool(payload.get("use_embeddings", True), default=True)
 
-    results = _runtime().search_index(query, k=k, use_embeddings=use_embeddings)
+    runtime = _runtime()
+    timings = None
+    hybrid_search = getattr(runtime, "hybrid_search", None)
+    if callable(hybrid_search):
+        try:
+            hybrid = hybrid_search(query, k=k, use_embeddings=use_embeddings)
+        except HybridTimeoutError as exc:
+            publish_agent_step(
+                tool="agent.search_index",
+                chat_id=chat_id,
+                message_id=message_id,
+                args={"query": query, "k": k, "use_embeddings": use_embeddings},
+                status="error",
+                started_at=started_at,
+                ended_at=time.time(),
+                excerpt="search timed out",
+            )
+            timings = {name: timing.as_dict() for name, timing in exc.timings.items()}
+            return jsonify({"error": "search timed out", "timings": timings}), 504
+        results, timings = hybrid.hits, hybrid.timings_payload()
+    else:
+        results = runtime.search_index(query, k=k, use_embeddings=use_embeddings)
     publish_agent_step(
         tool="agent.search_index",
         chat_id=chat_id,
@@ -115,7 +137,10 @@ def search_index() -> tuple[str, int]:
         ended_at=time.time(),
         excerpt=f"{len(results)} results",
     )
-    return jsonify({"results": results}), 200
+    payload = {"results": results}
+    if timings is not None:
+        payload["timings"] = timings
+    return jsonify(payload), 200
 
 
 @bp.post("/enqueue_crawl")
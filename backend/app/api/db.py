@@ -98,8 +98,8 @@ def run_query():
     rows: list[list[Any]] = []
     columns: list[str] = []
     truncated = False
-    with state_db._lock, state_db._conn:  # type: ignore[attr-defined]
-        cursor = state_db._conn.execute(sql)  # type: ignore[attr-defined]
+    with state_db._read("db_query") as conn:  # type: ignore[attr-defined]
+        cursor = conn.execute(sql)
         if cursor.description:
             columns = [col[0] for col in cursor.description]
         for index, row in enumerate(cursor):
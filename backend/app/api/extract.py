@@ -4,21 +4,24 @@ from __future__ import annotations
 
 import base64
 import json
+import os
 from contextlib import suppress
 from typing import Any
 
 from flask import Blueprint, g, jsonify, request
 from playwright.sync_api import Error as PlaywrightError
 from playwright.sync_api import TimeoutError as PlaywrightTimeout
-from playwright.sync_api import sync_playwright
 from bs4 import BeautifulSoup
 import trafilatura
 
+from backend.app.services.browser_pool import PRIORITY_INTERACTIVE, get_browser_pool
 from server.json_logger import log_event
 
 bp = Blueprint("extract_api", __name__, url_prefix="/api")
 
 _DEFAULT_TIMEOUT_MS = 30_000
+# Upper bound on pool wait plus render for one extract request.
+_EXTRACT_TIMEOUT_S = float(os.getenv("EXTRACT_TIMEOUT", "60"))
 
 
 def _should_capture_vision() -> bool:
@@ -100,41 +103,40 @@ def _dom_extract(
 
 
 def _playwright_extract(url: str, capture_vision: bool) -> dict[str, Any]:
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(headless=True)
-        context = browser.new_context(ignore_https_errors=True)
-        page = context.new_page()
-        page.set_default_navigation_timeout(_DEFAULT_TIMEOUT_MS)
-        page.set_default_timeout(_DEFAULT_TIMEOUT_MS)
-
-        page_title: str | None = None
-        lang: str | None = None
-        text: str = ""
-        meta: dict[str, Any] = {}
-        screenshot_b64: str | None = None
-
-        try:
-            page.goto(url, wait_until="domcontentloaded")
-            html = page.content()
-            page_title = page.title()
-            lang = page.evaluate("document.documentElement?.lang || null")
-            text, meta = _extract_text(html, source_url=url)
-            if not text.strip():
-                fallback_text = page.evaluate(
-                    "document.body ? document.body.innerText : ''"
-                )
-                if isinstance(fallback_text, str):
-                    text = fallback_text
-            if capture_vision:
-                with suppress(Exception):
-                    image = page.screenshot(full_page=True, type="png")
-                    if isinstance(image, (bytes, bytearray)):
-                        screenshot_b64 = base64.b64encode(image).decode("ascii")
-        finally:
-            with suppress(Exception):
-                context.close()
-            with suppress(Exception):
-                browser.close()
+    try:
+        return get_browser_pool().run(
+            lambda page: _render_extract(page, url, capture_vision),
+            consumer="extract",
+            context_options={"ignore_https_errors": True},
+            origin=url,
+            priority=PRIORITY_INTERACTIVE,
+            timeout=_EXTRACT_TIMEOUT_S,
+        )
+    except TimeoutError as exc:
+        raise PlaywrightTimeout(
+            f"extract of {url} did not finish within {_EXTRACT_TIMEOUT_S:.0f}s"
+        ) from exc
+
+
+def _render_extract(page: Any, url: str, capture_vision: bool) -> dict[str, Any]:
+    page.set_default_navigation_timeout(_DEFAULT_TIMEOUT_MS)
+    page.set_default_timeout(_DEFAULT_TIMEOUT_MS)
+
+    screenshot_b64: str | None = None
+    page.goto(url, wait_until="domcontentloaded")
+    html = page.content()
+    page_title = page.title()
+    lang = page.evaluate("document.documentElement?.lang || null")
+    text, meta = _extract_text(html, source_url=url)
+    if not text.strip():
+        fallback_text = page.evaluate("document.body ? document.body.innerText : ''")
+        if isinstance(fallback_text, str):
+            text = fallback_text
+    if capture_vision:
+        with suppress(Exception):
+            image = page.screenshot(full_page=True, type="png")
+            if isinstance(image, (bytes, bytearray)):
+                screenshot_b64 = base64.b64encode(image).decode("ascii")
 
     payload: dict[str, Any] = {
         "url": url,
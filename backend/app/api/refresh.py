@@ -8,6 +8,7 @@ from urllib.parse import urlunparse
 from flask import Blueprint, current_app, jsonify, request
 
 from backend.app.api import seeds as seeds_api
+from server.refresh_worker import PRIORITY_BACKGROUND, PRIORITY_USER
 
 bp = Blueprint("refresh_api", __name__, url_prefix="/api/refresh")
 
@@ -182,6 +183,9 @@ def trigger_refresh():
     force = bool(force_raw) if force_raw is not None else False
 
     seeds = manual_seed_urls if manual_seed_urls else None
+    priority = payload.get("priority") or PRIORITY_USER
+    if not isinstance(priority, str) or priority not in (PRIORITY_USER, PRIORITY_BACKGROUND):
+        return jsonify({"error": "invalid_priority"}), 400
 
     try:
         job_id, status, created = worker.enqueue(
@@ -192,6 +196,7 @@ def trigger_refresh():
             depth=depth,
             force=force,
             seeds=seeds,
+            priority=priority,
         )
     except ValueError as exc:
         return jsonify({"error": "invalid_query", "detail": str(exc)}), 400
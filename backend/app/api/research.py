@@ -118,6 +118,27 @@ def research_page():
         except Exception:  # pragma: no cover - defensive
             logger.debug("failed to record research progress", exc_info=True)
 
+    def _index_vectors(docs: list[dict]) -> None:
+        if vector_index is None:
+            return
+        for doc in docs:
+            text = str(doc.get("body") or "").strip()
+            if not text:
+                continue
+            try:
+                vector_index.upsert_document(
+                    text=text,
+                    url=str(doc.get("url") or ""),
+                    title=str(doc.get("title") or ""),
+                    metadata={
+                        "source": source,
+                        "domain": doc.get("site"),
+                        "temp": False,
+                    },
+                )
+            except Exception:  # pragma: no cover - defensive
+                logger.debug("vector index upsert failed", exc_info=True)
+
     def _job():
         job_id = job_ref.get("id")
         if state_db and job_id:
@@ -134,26 +155,8 @@ def research_page():
             progress_callback=_progress,
             state_db=state_db,
             job_id=job_id,
+            documents_callback=_index_vectors,
         )
-        docs = result.get("normalized_docs") or []
-        if vector_index is not None:
-            for doc in docs:
-                text = str(doc.get("body") or "").strip()
-                if not text:
-                    continue
-                try:
-                    vector_index.upsert_document(
-                        text=text,
-                        url=str(doc.get("url") or ""),
-                        title=str(doc.get("title") or ""),
-                        metadata={
-                            "source": source,
-                            "domain": doc.get("site"),
-                            "temp": False,
-                        },
-                    )
-                except Exception:  # pragma: no cover - defensive
-                    logger.debug("vector index upsert failed", exc_info=True)
         stats_payload = {
             "pages_fetched": int(result.get("pages_fetched", 0) or 0),
             "docs_indexed": int(result.get("docs_indexed", 0) or 0),
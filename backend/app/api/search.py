@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import hashlib
+import os
 import textwrap
 import time
 from collections.abc import Mapping, Sequence
@@ -23,6 +24,7 @@ from engine.indexing.coldstart import ColdStartIndexer
 from engine.llm.ollama_client import OllamaClientError
 from backend.app.embedding_manager import EmbeddingManager
 from backend.app.api.seeds import parse_http_url
+from backend.app.search.hybrid import HybridRetriever
 from backend.logging_utils import event_base, redact, write_event
 from server.llm import LLMError
 from server.runlog import add_run_log_line, current_run_log
@@ -71,6 +73,7 @@ bp = Blueprint("search_api", __name__, url_prefix="/api")
 
 
 _EMBEDDING_ERROR_CODE = "embedding_unavailable"
+RAG_HYBRID_SEARCH = os.getenv("RAG_HYBRID_SEARCH", "0").strip().lower() in {"1", "true", "yes", "on"}
 
 
 def _format_snippet(text: str, width: int = 320) -> str:
@@ -91,6 +94,71 @@ def _serialize_chunk(chunk: RetrievedChunk) -> dict:
     }
 
 
+def _retrieve_chunks(
+    query: str,
+    store: VectorStore,
+    embedder: OllamaEmbedder,
+    engine_config: EngineConfig,
+) -> tuple[list[RetrievedChunk], dict[str, Any] | None]:
+    """Return RAG chunks, fusing vector and BM25 retrieval when enabled.
+
+    With ``RAG_HYBRID_SEARCH`` both retrievers run concurrently and documents
+    are ordered by rank fusion; each document contributes its vector chunks,
+    or its BM25 snippet when the vector store did not return it.
+    """
+
+    retrieval = engine_config.retrieval
+    search_service = current_app.config.get("SEARCH_SERVICE")
+    hybrid = current_app.config.get("RAG_HYBRID_SEARCH", RAG_HYBRID_SEARCH)
+    if not hybrid or search_service is None:
+        chunks = store.query(
+            vector=embedder.embed_query(query),
+            k=retrieval.k,
+            similarity_threshold=retrieval.similarity_threshold,
+        )
+        return chunks, None
+
+    def _vector(text: str, limit: int) -> list[dict[str, Any]]:
+        found = store.query(
+            vector=embedder.embed_query(text),
+            k=limit,
+            similarity_threshold=retrieval.similarity_threshold,
+        )
+        return [
+            {"url": chunk.url or "", "title": chunk.title, "score": chunk.similarity, "chunk": chunk}
+            for chunk in found
+        ]
+
+    def _keyword(text: str, limit: int) -> list[dict[str, Any]]:
+        results, _job_id, _context = search_service.run_query(
+            text, limit=limit, use_llm=False, model=None
+        )
+        return list(results)
+
+    result = HybridRetriever({"vector": _vector, "bm25": _keyword}).search(query, k=retrieval.k)
+    by_url: dict[str, list[RetrievedChunk]] = {}
+    for hit in result.raw.get("vector", []):
+        by_url.setdefault(str(hit["url"]), []).append(hit["chunk"])
+    chunks: list[RetrievedChunk] = []
+    for hit in result.hits:
+        matches = by_url.get(str(hit["url"]))
+        if matches:
+            chunks.extend(matches)
+        else:
+            chunks.append(
+                RetrievedChunk(
+                    text=str(hit.get("snippet") or ""),
+                    title=hit.get("title"),
+                    url=str(hit["url"]),
+                    similarity=_float_or_zero(hit["sources"]["bm25"]["score"]),
+                    metadata={"source": "bm25"},
+                )
+            )
+        if len(chunks) >= retrieval.k:
+            break
+    return chunks[: retrieval.k], result.timings_payload()
+
+
 def _embedding_unavailable_payload(
     message: str, *, status: Mapping[str, Any] | None = None
 ) -> dict[str, Any]:
@@ -710,12 +778,7 @@ def search_endpoint():
                 ):
                     coldstart.build_index(query, use_llm=llm_enabled, llm_model=llm_model)
 
-                query_vector = embedder.embed_query(query)
-                results = store.query(
-                    vector=query_vector,
-                    k=engine_config.retrieval.k,
-                    similarity_threshold=engine_config.retrieval.similarity_threshold,
-                )
+                results, retrieval_timings = _retrieve_chunks(query, store, embedder, engine_config)
             except EmbeddingError as exc:
                 message = (
                     "Unable to generate embeddings from Ollama. "
@@ -757,11 +820,8 @@ def search_endpoint():
                         payload["llm_model"] = llm_model
                     return jsonify(payload)
                 try:
-                    query_vector = embedder.embed_query(query)
-                    results = store.query(
-                        vector=query_vector,
-                        k=engine_config.retrieval.k,
-                        similarity_threshold=engine_config.retrieval.similarity_threshold,
+                    results, retrieval_timings = _retrieve_chunks(
+                        query, store, embedder, engine_config
                     )
                 except Exception as exc:  # pragma: no cover - defensive logging
                     current_app.logger.debug("vector store query failed after coldstart", exc_info=True)
@@ -788,6 +848,8 @@ def search_endpoint():
                     "llm_used": llm_enabled,
                 }
                 payload["hits"] = serialized_results
+                if retrieval_timings:
+                    payload["retrieval_timings"] = retrieval_timings
                 if llm_model:
                     payload["llm_model"] = llm_model
                 return jsonify(payload)
@@ -802,6 +864,8 @@ def search_endpoint():
                     "llm_used": False,
                 }
                 payload["hits"] = serialized_results
+                if retrieval_timings:
+                    payload["retrieval_timings"] = retrieval_timings
                 if llm_model:
                     payload["llm_model"] = llm_model
                 return jsonify(payload)
@@ -820,6 +884,8 @@ def search_endpoint():
                     "llm_used": llm_enabled,
                 }
                 payload["hits"] = serialized_results
+                if retrieval_timings:
+                    payload["retrieval_timings"] = retrieval_timings
                 if llm_model:
                     payload["llm_model"] = llm_model
                 return jsonify(payload)
@@ -837,6 +903,8 @@ def search_endpoint():
                     "llm_used": llm_enabled,
                 }
                 payload["hits"] = serialized_results
+                if retrieval_timings:
+                    payload["retrieval_timings"] = retrieval_timings
                 if llm_model:
                     payload["llm_model"] = llm_model
                 return jsonify(payload)
@@ -850,6 +918,8 @@ def search_endpoint():
                 "llm_used": llm_enabled,
             }
             payload["hits"] = serialized_results
+            if retrieval_timings:
+                payload["retrieval_timings"] = retrieval_timings
             if llm_model:
                 payload["llm_model"] = llm_model
             return jsonify(payload)
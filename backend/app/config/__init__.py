@@ -71,6 +71,11 @@ class AppConfig:
     search_default_limit: int
     search_max_limit: int
     max_query_length: int
+    search_cache_entries: int
+    search_cache_max_bytes: int
+    search_cache_ttl: float
+    search_searcher_pool_size: int
+    search_index_poll_seconds: float
     ollama_url: str
     crawl_use_playwright: str
     use_llm_rerank: bool
@@ -96,11 +101,11 @@ class AppConfig:
         index_dir = _resolve_path(os.getenv("INDEX_DIR"), index_dir_default)
         index_dir = _guard_directory(index_dir, label="INDEX_DIR")
         ledger_path = _resolve_path(
-            os.getenv("INDEX_LEDGER"), data_dir / "index_ledger.json"
+            os.getenv("INDEX_LEDGER"), data_dir / "index_ledger.sqlite3"
         )
         _guard_directory(ledger_path.parent, label="INDEX_LEDGER parent")
         simhash_path = _resolve_path(
-            os.getenv("SIMHASH_PATH"), data_dir / "simhash_index.json"
+            os.getenv("SIMHASH_PATH"), data_dir / "simhash_index.bin"
         )
         _guard_directory(simhash_path.parent, label="SIMHASH_PATH parent")
         last_index_time_path = _resolve_path(
@@ -169,6 +174,15 @@ class AppConfig:
             search_default_limit, int(os.getenv("SEARCH_MAX_LIMIT", "50"))
         )
         max_query_length = max(32, int(os.getenv("SEARCH_MAX_QUERY_LENGTH", "256")))
+        search_cache_entries = max(0, int(os.getenv("SEARCH_CACHE_ENTRIES", "256")))
+        search_cache_max_bytes = max(
+            0, int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+        )
+        search_cache_ttl = max(0.0, float(os.getenv("SEARCH_CACHE_TTL", "60")))
+        search_searcher_pool_size = max(1, int(os.getenv("SEARCH_SEARCHER_POOL_SIZE", "4")))
+        search_index_poll_seconds = max(
+            0.0, float(os.getenv("SEARCH_INDEX_POLL_SECONDS", "2"))
+        )
         ollama_url = os.getenv(
             "OLLAMA_URL", os.getenv("OLLAMA_HOST", "http://127.0.0.1:11434")
         ).rstrip("/")
@@ -217,6 +231,11 @@ class AppConfig:
             search_default_limit=search_default_limit,
             search_max_limit=search_max_limit,
             max_query_length=max_query_length,
+            search_cache_entries=search_cache_entries,
+            search_cache_max_bytes=search_cache_max_bytes,
+            search_cache_ttl=search_cache_ttl,
+            search_searcher_pool_size=search_searcher_pool_size,
+            search_index_poll_seconds=search_index_poll_seconds,
             ollama_url=ollama_url,
             crawl_use_playwright=crawl_use_playwright,
             use_llm_rerank=use_llm_rerank,
@@ -260,6 +279,10 @@ class AppConfig:
             "search_default_limit": self.search_default_limit,
             "search_max_limit": self.search_max_limit,
             "max_query_length": self.max_query_length,
+            "search_cache_entries": self.search_cache_entries,
+            "search_cache_ttl": self.search_cache_ttl,
+            "search_searcher_pool_size": self.search_searcher_pool_size,
+            "search_index_poll_seconds": self.search_index_poll_seconds,
             "ollama_url": self.ollama_url,
             "crawl_use_playwright": self.crawl_use_playwright,
             "use_llm_rerank": self.use_llm_rerank,
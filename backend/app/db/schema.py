@@ -20,6 +20,10 @@ _APP_CONFIG_DESKTOP_DEFAULTS = _MIGRATIONS_DIR / "20251115_desktop_defaults.sql"
 MigrationFn = Callable[[sqlite3.Connection], None]
 
 
+class _MigrationDeferred(Exception):
+    """Raised by a migration that cannot run here; it is retried on the next open."""
+
+
 def connect(db_path: Path | str) -> sqlite3.Connection:
     """Return a SQLite connection with conservative defaults."""
 
@@ -46,6 +50,9 @@ def migrate(connection: sqlite3.Connection) -> None:
             with connection:
                 migration_fn(connection)
                 _mark_applied(connection, migration_id)
+        except _MigrationDeferred as exc:
+            LOGGER.warning("Deferred migration %s: %s", migration_id, exc)
+            continue
         except Exception:  # noqa: BLE001 - surface precise failure context to logs
             LOGGER.exception(
                 "Migration %s failed. Inspect the _migrations ledger for partial state.",
@@ -53,6 +60,7 @@ def migrate(connection: sqlite3.Connection) -> None:
             )
             raise
         LOGGER.info("Applied migration %s", migration_id)
+    _resync_fts_rowids(connection)
 
 
 def _ensure_ledger(connection: sqlite3.Connection) -> None:
@@ -808,6 +816,85 @@ def _migration_014_repo_changes(connection: sqlite3.Connection) -> None:
         )
 
 
+# Full-text indexes mirror their source tables through triggers (external
+# content tables, so the text is stored once). History and memories use the
+# trigram tokenizer, which keeps the substring semantics of the LIKE filters
+# they replace; chat messages use word tokens.
+_FTS_TABLES: dict[str, tuple[str, str, tuple[str, ...], str]] = {
+    "history_fts": ("history", "id", ("url", "title"), "trigram"),
+    "memories_fts": ("memories", "rowid", ("key", "value"), "trigram"),
+    "llm_messages_fts": ("llm_messages", "rowid", ("content",), "unicode61 remove_diacritics 2"),
+}
+
+
+def fts5_available() -> bool:
+    """Return ``True`` when SQLite ships FTS5 with the trigram tokenizer."""
+
+    probe = sqlite3.connect(":memory:")
+    try:
+        probe.execute("CREATE VIRTUAL TABLE probe USING fts5(body, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+def _migration_015_fts_search(connection: sqlite3.Connection) -> None:
+    if not fts5_available():
+        raise _MigrationDeferred("SQLite lacks FTS5 trigram support; text search keeps LIKE scans")
+    statements: list[str] = []
+    for fts, (table, key, columns, tokenizer) in _FTS_TABLES.items():
+        if not _table_exists(connection, table):
+            continue
+        cols = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+        statements.append(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                {cols}, content='{table}', content_rowid='{key}', tokenize='{tokenizer}'
+            );
+            CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts}(rowid, {cols}) VALUES (new.{key}, {new_values});
+            END;
+            CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{key}, {old_values});
+            END;
+            CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+                INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{key}, {old_values});
+                INSERT INTO {fts}(rowid, {cols}) VALUES (new.{key}, {new_values});
+            END;
+            INSERT INTO {fts}({fts}) VALUES ('rebuild');
+            """
+        )
+    if statements:
+        with connection:
+            connection.executescript("\n".join(statements))
+
+
+def _resync_fts_rowids(connection: sqlite3.Connection) -> None:
+    """Rebuild FTS tables keyed on an implicit rowid whose rowids drifted.
+
+    ``memories`` and ``llm_messages`` have TEXT primary keys, so a VACUUM may
+    renumber the rowids their full-text indexes point at. Comparing rowid
+    aggregates with the index's docsize table is a cheap integer scan; only
+    a mismatch pays for the rebuild.
+    """
+
+    for fts, (table, key, _columns, _tokenizer) in _FTS_TABLES.items():
+        if key != "rowid" or not _table_exists(connection, f"{fts}_docsize"):
+            continue
+        aggregate = "SELECT COUNT(*), MIN(rowid), MAX(rowid), TOTAL(rowid) FROM {}"
+        source = tuple(connection.execute(aggregate.format(table)).fetchone())
+        indexed = tuple(connection.execute(aggregate.format(f"{fts}_docsize")).fetchone())
+        if source == indexed:
+            continue
+        LOGGER.warning("Rebuilding %s: rowids no longer match %s", fts, table)
+        with connection:
+            connection.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
 _MIGRATIONS: list[tuple[str, MigrationFn]] = [
     ("001_init", _migration_001_init),
     ("002_pending_vectors", _migration_002_pending_vectors),
@@ -823,6 +910,7 @@ _MIGRATIONS: list[tuple[str, MigrationFn]] = [
     ("012_repo_registry", _migration_012_repo_registry),
     ("013_jobs_table", _migration_013_jobs_table),
     ("014_repo_changes", _migration_014_repo_changes),
+    ("015_fts_search", _migration_015_fts_search),
     ("20251102_app_config", _migration_20251102_app_config),
     ("20251115_desktop_defaults", _migration_20251115_desktop_defaults),
 ]
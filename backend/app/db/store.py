@@ -5,12 +5,16 @@ from __future__ import annotations
 import json
 import logging
 import math
+import os
+import queue
+import re
 import sqlite3
 import threading
 import time
 import uuid
-from collections.abc import Iterable, Sequence
-from dataclasses import dataclass
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Mapping
@@ -30,6 +34,11 @@ LOGGER = logging.getLogger(__name__)
 
 SOURCES_CONFIG_KEY = "sources.config"
 JOB_STATUSES = {"queued", "running", "succeeded", "failed", "cancelled"}
+READ_POOL_SIZE = int(os.getenv("APP_STATE_READ_POOL", "4"))
+WRITE_BATCH_SIZE = int(os.getenv("APP_STATE_WRITE_BATCH", "64"))
+DOCUMENT_BATCH_SIZE = int(os.getenv("APP_STATE_DOCUMENT_BATCH", "200"))
+
+DbCallback = Callable[[str, str, float, float], None]
 
 
 def _serialize(data: Any) -> str:
@@ -135,6 +144,25 @@ def _normalize_links(outlinks: Iterable[str] | None) -> list[str]:
     return normalized
 
 
+def _fts_substring(text: str | None) -> str | None:
+    """Return an FTS5 trigram phrase matching ``text`` anywhere in a column."""
+
+    value = (text or "").strip()
+    if len(value) < 3:
+        # Trigram indexes cannot answer queries shorter than one trigram.
+        return None
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _fts_terms(text: str | None) -> str | None:
+    """Return an FTS5 query requiring every word of ``text`` as a prefix."""
+
+    tokens = re.findall(r"\w+", text or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
 @dataclass(slots=True)
 class DocumentRecord:
     id: str
@@ -160,10 +188,36 @@ class SchemaValidation:
     errors: list[str]
 
 
-class AppStateDB:
-    """Thin wrapper around SQLite providing typed helpers."""
+@dataclass(slots=True)
+class _WriteBatch:
+    """Writes sharing one transaction on the writer connection."""
 
-    def __init__(self, path: Path) -> None:
+    writes: int = 0
+    error: BaseException | None = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class AppStateDB:
+    """Thin wrapper around SQLite providing typed helpers.
+
+    Query helpers borrow one of ``read_pool_size`` read-only connections, so
+    readers never queue behind writers (the database runs in WAL mode). All
+    writes go through the single writer connection ``_conn`` guarded by
+    ``_lock``; each write runs in its own savepoint and writes that arrive
+    while another is in flight share one ``COMMIT`` (up to
+    ``write_batch_size`` writes). A write returns only once its batch has
+    committed. ``on_call(method, kind, wait_ms, duration_ms)`` receives the
+    connection wait and total latency of every call.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        read_pool_size: int = READ_POOL_SIZE,
+        write_batch_size: int = WRITE_BATCH_SIZE,
+        on_call: DbCallback | None = None,
+    ) -> None:
         self.path = path
         self.path.parent.mkdir(parents=True, exist_ok=True)
         self._conn = connect(path)
@@ -171,14 +225,154 @@ class AppStateDB:
         migrate(self._conn)
         LOGGER.info("State DB migrations finished", extra={"db_path": str(self.path)})
         self._lock = threading.RLock()
+        self._local = threading.local()
+        self._on_call = on_call
+        self._read_pool_size = max(0, int(read_pool_size))
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._write_batch_size = max(1, int(write_batch_size))
+        self._batch: _WriteBatch | None = None
+        self._batch_lock = threading.Lock()
+        self._writers_waiting = 0
+        self.write_batches = 0
+        self.batched_writes = 0
+        self._fts_tables = {
+            str(row[0])
+            for row in self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name IN ('history_fts', 'memories_fts', 'llm_messages_fts')"
+            )
+        }
         self._schema_validation: SchemaValidation = self._validate_schema()
 
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+    @contextmanager
+    def _read(self, method: str) -> Iterator[sqlite3.Connection]:
+        """Yield a read-only connection for the duration of a query."""
+
+        if getattr(self._local, "writing", False):
+            # Reads issued from inside a write must see its uncommitted rows.
+            yield self._conn
+            return
+        started = time.perf_counter()
+        if not self._read_pool_size:
+            with self._lock:
+                acquired = time.perf_counter()
+                try:
+                    yield self._conn
+                finally:
+                    self._report(method, "read", started, acquired)
+            return
+        conn = self._acquire_reader()
+        acquired = time.perf_counter()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+            self._report(method, "read", started, acquired)
+
+    @contextmanager
+    def _write(self, method: str) -> Iterator[sqlite3.Connection]:
+        """Run a write on the writer connection inside a grouped transaction."""
+
+        if getattr(self._local, "writing", False):
+            yield self._conn
+            return
+        started = time.perf_counter()
+        with self._batch_lock:
+            self._writers_waiting += 1
+        self._lock.acquire()
+        acquired = time.perf_counter()
+        self._local.writing = True
+        conn = self._conn
+        failed = False
+        try:
+            with self._batch_lock:
+                self._writers_waiting -= 1
+                batch = self._batch
+                if batch is None:
+                    batch = self._batch = _WriteBatch()
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            conn.execute("SAVEPOINT app_state_write")
+            try:
+                yield conn
+            except BaseException:
+                failed = True
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK TO app_state_write")
+                    conn.execute("RELEASE app_state_write")
+                raise
+            else:
+                conn.execute("RELEASE app_state_write")
+            finally:
+                batch.writes += 1
+                self._finish_write(batch)
+        finally:
+            self._local.writing = False
+            self._lock.release()
+        batch.done.wait()
+        self._report(method, "write", started, acquired)
+        if batch.error is not None and not failed:
+            raise batch.error
+
+    def _finish_write(self, batch: _WriteBatch) -> None:
+        # Leave the transaction open while more writers are queued on the
+        # lock; the last writer of the batch (or a full batch) commits it.
+        with self._batch_lock:
+            if self._writers_waiting and batch.writes < self._write_batch_size:
+                return
+            self._batch = None
+        try:
+            self._conn.commit()
+        except sqlite3.Error as exc:
+            LOGGER.exception("state DB batch commit failed")
+            self._conn.rollback()
+            batch.error = exc
+        self.write_batches += 1
+        self.batched_writes += batch.writes
+        batch.done.set()
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._readers_lock:
+            if len(self._reader_conns) < self._read_pool_size:
+                conn = sqlite3.connect(
+                    f"{self.path.resolve().as_uri()}?mode=ro",
+                    uri=True,
+                    check_same_thread=False,
+                )
+                conn.row_factory = sqlite3.Row
+                self._reader_conns.append(conn)
+                return conn
+        return self._readers.get()
+
+    def _report(self, method: str, kind: str, started: float, acquired: float) -> None:
+        if self._on_call is None:
+            return
+        finished = time.perf_counter()
+        try:
+            self._on_call(
+                method,
+                kind,
+                (acquired - started) * 1000.0,
+                (finished - started) * 1000.0,
+            )
+        except Exception:  # pragma: no cover - metrics must not break queries
+            LOGGER.debug("state DB call callback failed", exc_info=True)
+
     # ------------------------------------------------------------------
     # Config
     # ------------------------------------------------------------------
     def config_snapshot(self) -> dict[str, Any]:
-        with self._lock, self._conn:
-            rows = list(self._conn.execute("SELECT k, v FROM app_config"))
+        with self._read("config_snapshot") as conn:
+            rows = list(conn.execute("SELECT k, v FROM app_config"))
         snapshot: dict[str, Any] = {}
         for row in rows:
             key = str(row["k"]) if row["k"] is not None else ""
@@ -190,8 +384,8 @@ class AppStateDB:
     def get_config(self, key: str, default: Any = None) -> Any:
         if not key:
             return default
-        with self._lock, self._conn:
-            row = self._conn.execute(
+        with self._read("get_config") as conn:
+            row = conn.execute(
                 "SELECT v FROM app_config WHERE k=?",
                 (key,),
             ).fetchone()
@@ -202,8 +396,8 @@ class AppStateDB:
         if not key:
             raise ValueError("config key required")
         serialized = _serialize(value)
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("set_config") as conn:
+            conn.execute(
                 "INSERT INTO app_config(k, v) VALUES(?, ?) ON CONFLICT(k) DO UPDATE SET v=excluded.v",
                 (key, serialized),
             )
@@ -211,13 +405,13 @@ class AppStateDB:
     def update_config(self, values: Mapping[str, Any]) -> dict[str, Any]:
         if not isinstance(values, Mapping):
             raise TypeError("values must be a mapping")
-        with self._lock, self._conn:
+        with self._write("update_config") as conn:
             for key, value in values.items():
                 normalized_key = str(key or "").strip()
                 if not normalized_key:
                     continue
                 serialized = _serialize(value)
-                self._conn.execute(
+                conn.execute(
                     "INSERT INTO app_config(k, v) VALUES(?, ?) ON CONFLICT(k) DO UPDATE SET v=excluded.v",
                     (normalized_key, serialized),
                 )
@@ -241,8 +435,8 @@ class AppStateDB:
         normalized_command = _normalize_command(check_command)
         command_payload = _serialize(normalized_command) if normalized_command else None
         resolved_root = str(Path(root_path).resolve())
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("register_repo") as conn:
+            conn.execute(
                 """
                 INSERT INTO repos(id, root_path, allowed_ops, check_command, created_at, updated_at)
                 VALUES(?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
@@ -262,8 +456,8 @@ class AppStateDB:
     def get_repo(self, repo_id: str) -> dict[str, Any] | None:
         if not repo_id:
             return None
-        with self._lock, self._conn:
-            row = self._conn.execute(
+        with self._read("get_repo") as conn:
+            row = conn.execute(
                 "SELECT id, root_path, allowed_ops, check_command, created_at, updated_at FROM repos WHERE id = ?",
                 (repo_id,),
             ).fetchone()
@@ -272,8 +466,8 @@ class AppStateDB:
         return self._format_repo_row(row)
 
     def list_repos(self) -> list[dict[str, Any]]:
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._read("list_repos") as conn:
+            rows = conn.execute(
                 "SELECT id, root_path, allowed_ops, check_command, created_at, updated_at FROM repos ORDER BY id ASC"
             ).fetchall()
         return [self._format_repo_row(row) for row in rows]
@@ -303,8 +497,8 @@ class AppStateDB:
         identifier = uuid.uuid4().hex
         stats_json = _serialize(change_stats) if change_stats is not None else None
         normalized_result = (result or "").strip() or None
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("record_repo_change") as conn:
+            conn.execute(
                 """
                 INSERT INTO repo_changes(id, repo_id, job_id, summary, change_stats, result, error_message)
                 VALUES(?, ?, ?, ?, ?, ?, ?)
@@ -325,8 +519,8 @@ class AppStateDB:
         if not repo_id:
             return []
         capped = max(1, min(int(limit), 200))
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._read("list_repo_changes") as conn:
+            rows = conn.execute(
                 """
                 SELECT id, repo_id, job_id, applied_at, summary, change_stats, result, error_message
                   FROM repo_changes
@@ -349,21 +543,21 @@ class AppStateDB:
     def ensure_tab(self, tab_id: str, *, shadow_mode: str | None = None) -> None:
         if not tab_id:
             return
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("ensure_tab") as conn:
+            conn.execute(
                 "INSERT OR IGNORE INTO tabs(id) VALUES(?)",
                 (tab_id,),
             )
             if shadow_mode:
-                self._conn.execute(
+                conn.execute(
                     "UPDATE tabs SET shadow_mode=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
                     (shadow_mode, tab_id),
                 )
 
     def update_tab_shadow_mode(self, tab_id: str, mode: str | None) -> None:
         self.ensure_tab(tab_id)
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("update_tab_shadow_mode") as conn:
+            conn.execute(
                 "UPDATE tabs SET shadow_mode=?, updated_at=CURRENT_TIMESTAMP WHERE id=?",
                 (mode, tab_id),
             )
@@ -371,8 +565,8 @@ class AppStateDB:
     def tab_shadow_mode(self, tab_id: str) -> str | None:
         if not tab_id:
             return None
-        with self._lock, self._conn:
-            row = self._conn.execute(
+        with self._read("tab_shadow_mode") as conn:
+            row = conn.execute(
                 "SELECT shadow_mode FROM tabs WHERE id=?",
                 (tab_id,),
             ).fetchone()
@@ -406,8 +600,8 @@ class AppStateDB:
 
     def list_tabs(self, *, limit: int = 50) -> list[dict[str, Any]]:
         capped = max(1, min(int(limit), 200))
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._read("list_tabs") as conn:
+            rows = conn.execute(
                 """
                 SELECT t.id,
                        t.shadow_mode,
@@ -433,8 +627,8 @@ class AppStateDB:
     def get_tab(self, tab_id: str) -> dict[str, Any] | None:
         if not tab_id:
             return None
-        with self._lock, self._conn:
-            row = self._conn.execute(
+        with self._read("get_tab") as conn:
+            row = conn.execute(
                 """
                 SELECT t.id,
                        t.shadow_mode,
@@ -462,8 +656,8 @@ class AppStateDB:
         if not tab_id:
             return
         self.ensure_tab(tab_id)
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("bind_tab_thread") as conn:
+            conn.execute(
                 "UPDATE tabs SET thread_id = ?, updated_at=CURRENT_TIMESTAMP WHERE id = ?",
                 (thread_id, tab_id),
             )
@@ -471,8 +665,8 @@ class AppStateDB:
     def tab_thread_id(self, tab_id: str) -> str | None:
         if not tab_id:
             return None
-        with self._lock, self._conn:
-            row = self._conn.execute(
+        with self._read("tab_thread_id") as conn:
+            row = conn.execute(
                 "SELECT thread_id FROM tabs WHERE id = ?",
                 (tab_id,),
             ).fetchone()
@@ -507,8 +701,8 @@ class AppStateDB:
             return
         self.ensure_tab(tab_id)
         params.append(tab_id)
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("update_tab_navigation") as conn:
+            conn.execute(
                 f"UPDATE tabs SET {', '.join(updates)} WHERE id = ?",
                 params,
             )
@@ -525,8 +719,8 @@ class AppStateDB:
         shadow_enqueued: bool = False,
     ) -> int:
         self.ensure_tab(tab_id or "")
-        with self._lock, self._conn:
-            cursor = self._conn.execute(
+        with self._write("add_history_entry") as conn:
+            cursor = conn.execute(
                 """
                 INSERT INTO history(tab_id, url, title, referrer, status_code, content_type, shadow_enqueued)
                 VALUES(?,?,?,?,?,?,?)
@@ -547,15 +741,15 @@ class AppStateDB:
         return int(history_id)
 
     def mark_history_shadow_enqueued(self, history_id: int) -> None:
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("mark_history_shadow_enqueued") as conn:
+            conn.execute(
                 "UPDATE history SET shadow_enqueued=1 WHERE id=?",
                 (history_id,),
             )
 
     def delete_history_entry(self, history_id: int) -> None:
-        with self._lock, self._conn:
-            self._conn.execute("DELETE FROM history WHERE id=?", (history_id,))
+        with self._write("delete_history_entry") as conn:
+            conn.execute("DELETE FROM history WHERE id=?", (history_id,))
 
     def purge_history(
         self,
@@ -581,14 +775,14 @@ class AppStateDB:
             return 0
         condition = " AND ".join(clauses) if clauses else "1=1"
         params_tuple = tuple(params)
-        with self._lock, self._conn:
-            row = self._conn.execute(
+        with self._write("purge_history") as conn:
+            row = conn.execute(
                 f"SELECT COUNT(*) FROM history WHERE {condition}", params_tuple
             ).fetchone()
             total = int(row[0] or 0)
             if total == 0:
                 return 0
-            self._conn.execute(
+            conn.execute(
                 f"""
                 UPDATE tabs
                    SET current_history_id = NULL
@@ -598,7 +792,7 @@ class AppStateDB:
                 """,
                 params_tuple,
             )
-            self._conn.execute(
+            conn.execute(
                 f"DELETE FROM history WHERE {condition}", params_tuple
             )
         return total
@@ -618,9 +812,14 @@ class AppStateDB:
         clauses: list[str] = []
         params: list[Any] = []
         if query:
-            pattern = f"%{query.lower()}%"
-            clauses.append("(lower(url) LIKE ? OR lower(COALESCE(title,'')) LIKE ?)")
-            params.extend([pattern, pattern])
+            phrase = _fts_substring(query) if "history_fts" in self._fts_tables else None
+            if phrase:
+                clauses.append("id IN (SELECT rowid FROM history_fts WHERE history_fts MATCH ?)")
+                params.append(phrase)
+            else:
+                pattern = f"%{query.lower()}%"
+                clauses.append("(lower(url) LIKE ? OR lower(COALESCE(title,'')) LIKE ?)")
+                params.extend([pattern, pattern])
         if start:
             clauses.append("visited_at >= ?")
             params.append(start.isoformat())
@@ -633,13 +832,34 @@ class AppStateDB:
         sql.append("LIMIT ?")
         params.append(max(1, min(int(limit), 1000)))
         query_sql = " ".join(sql)
-        with self._lock, self._conn:
-            rows = self._conn.execute(query_sql, params).fetchall()
+        with self._read("query_history") as conn:
+            rows = conn.execute(query_sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def search_history(self, query: str, *, limit: int = 20) -> list[dict[str, Any]]:
+        """Return history entries matching ``query`` ranked by BM25 relevance."""
+
+        phrase = _fts_substring(query) if "history_fts" in self._fts_tables else None
+        if not phrase:
+            return self.query_history(limit=limit, query=query)
+        with self._read("search_history") as conn:
+            rows = conn.execute(
+                """
+                SELECT h.id, h.tab_id, h.url, h.title, h.visited_at, h.referrer, h.status_code,
+                       h.content_type, h.shadow_enqueued
+                  FROM history_fts
+                  JOIN history h ON h.id = history_fts.rowid
+                 WHERE history_fts MATCH ?
+              ORDER BY bm25(history_fts), h.visited_at DESC
+                 LIMIT ?
+                """,
+                (phrase, max(1, min(int(limit), 1000))),
+            ).fetchall()
         return [dict(row) for row in rows]
 
     def export_browser_history(self) -> list[dict[str, Any]]:
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._read("export_browser_history") as conn:
+            rows = conn.execute(
                 """
                 SELECT id, tab_id, url, title, visited_at, referrer, status_code, content_type, shadow_enqueued
                   FROM history
@@ -668,14 +888,14 @@ class AppStateDB:
         shadow_enqueued = int(bool(record.get("shadow_enqueued")))
         if tab_id:
             self.ensure_tab(tab_id)
-        with self._lock, self._conn:
-            existing = self._conn.execute(
+        with self._write("import_browser_history_record") as conn:
+            existing = conn.execute(
                 "SELECT id FROM history WHERE url = ? AND visited_at = ? LIMIT 1",
                 (url, visited_at),
             ).fetchone()
             if existing:
                 return int(existing["id"])
-            cursor = self._conn.execute(
+            cursor = conn.execute(
                 """
                 INSERT INTO history(tab_id, url, title, visited_at, referrer, status_code, content_type, shadow_enqueued)
                 VALUES(?, ?, ?, ?, ?, ?, ?, ?)
@@ -712,8 +932,8 @@ class AppStateDB:
         return []
 
     def create_bookmark_folder(self, name: str, parent_id: int | None = None) -> int:
-        with self._lock, self._conn:
-            cursor = self._conn.execute(
+        with self._write("create_bookmark_folder") as conn:
+            cursor = conn.execute(
                 "INSERT INTO bookmark_folders(name, parent_id) VALUES(?, ?)",
                 (name, parent_id),
             )
@@ -721,8 +941,8 @@ class AppStateDB:
         return int(folder_id)
 
     def list_bookmark_folders(self) -> list[dict[str, Any]]:
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._read("list_bookmark_folders") as conn:
+            rows = conn.execute(
                 "SELECT id, name, parent_id, created_at FROM bookmark_folders ORDER BY name ASC"
             ).fetchall()
         return [dict(row) for row in rows]
@@ -736,8 +956,8 @@ class AppStateDB:
         tags: Iterable[str] | None = None,
     ) -> int:
         payload_tags = self._encode_tags(tags)
-        with self._lock, self._conn:
-            cursor = self._conn.execute(
+        with self._write("add_bookmark") as conn:
+            cursor = conn.execute(
                 "INSERT INTO bookmarks(folder_id, url, title, tags) VALUES(?,?,?,?)",
                 (folder_id, url, title, payload_tags),
             )
@@ -751,8 +971,8 @@ class AppStateDB:
             sql += " WHERE folder_id = ?"
             params.append(folder_id)
         sql += " ORDER BY created_at DESC"
-        with self._lock, self._conn:
-            rows = self._conn.execute(sql, params).fetchall()
+        with self._read("list_bookmarks") as conn:
+            rows = conn.execute(sql, params).fetchall()
         results = []
         for row in rows:
             record = dict(row)
@@ -764,15 +984,15 @@ class AppStateDB:
     # Seed sources
     # ------------------------------------------------------------------
     def list_source_categories(self) -> list[dict[str, Any]]:
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._read("list_source_categories") as conn:
+            rows = conn.execute(
                 "SELECT key, label FROM source_categories ORDER BY label ASC"
             ).fetchall()
         return [dict(row) for row in rows]
 
     def list_seed_sources(self) -> list[dict[str, Any]]:
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._read("list_seed_sources") as conn:
+            rows = conn.execute(
                 """
                 SELECT id, category_key, url, title, added_by, enabled, created_at
                   FROM seed_sources
@@ -784,7 +1004,7 @@ class AppStateDB:
     def bulk_upsert_seed_sources(self, seeds: Sequence[Mapping[str, Any]]) -> int:
         if not seeds:
             return 0
-        with self._lock, self._conn:
+        with self._write("bulk_upsert_seed_sources") as conn:
             for seed in seeds:
                 params = {
                     "category_key": seed.get("category_key"),
@@ -793,7 +1013,7 @@ class AppStateDB:
                     "added_by": seed.get("added_by", "user"),
                     "enabled": 1 if seed.get("enabled", True) else 0,
                 }
-                self._conn.execute(
+                conn.execute(
                     """
                     INSERT INTO seed_sources(category_key, url, title, added_by, enabled)
                     VALUES(:category_key, :url, :title, :added_by, :enabled)
@@ -816,16 +1036,16 @@ class AppStateDB:
             sql += f" AND category_key IN ({placeholders})"
             params.extend(category_keys)
         sql += " ORDER BY created_at DESC"
-        with self._lock, self._conn:
-            rows = self._conn.execute(sql, params).fetchall()
+        with self._read("enabled_seed_urls") as conn:
+            rows = conn.execute(sql, params).fetchall()
         return [row["url"] for row in rows]
 
     # ------------------------------------------------------------------
     # Shadow settings & crawl queue
     # ------------------------------------------------------------------
     def get_shadow_settings(self) -> dict[str, Any]:
-        with self._lock, self._conn:
-            row = self._conn.execute(
+        with self._read("get_shadow_settings") as conn:
+            row = conn.execute(
                 "SELECT enabled, mode FROM shadow_settings WHERE id=1"
             ).fetchone()
         if not row:
@@ -833,8 +1053,8 @@ class AppStateDB:
         return {"enabled": bool(row["enabled"]), "mode": row["mode"] or "off"}
 
     def set_shadow_settings(self, *, enabled: bool, mode: str) -> dict[str, Any]:
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("set_shadow_settings") as conn:
+            conn.execute(
                 """
                 INSERT INTO shadow_settings(id, enabled, mode)
                 VALUES(1, ?, ?)
@@ -856,7 +1076,7 @@ class AppStateDB:
     def overview_counters(self) -> dict[str, Any]:
         def _count(query: str, params: Sequence[Any] | None = None) -> int:
             try:
-                row = self._conn.execute(query, params or ()).fetchone()
+                row = conn.execute(query, params or ()).fetchone()
             except sqlite3.OperationalError:
                 return 0
             value = row[0] if row else 0
@@ -865,12 +1085,12 @@ class AppStateDB:
             except (TypeError, ValueError):
                 return 0
 
-        with self._lock, self._conn:
+        with self._read("overview_counters") as conn:
             tabs_total = _count("SELECT COUNT(*) FROM tabs")
             tabs_linked = _count(
                 "SELECT COUNT(*) FROM tabs WHERE thread_id IS NOT NULL AND thread_id <> ''"
             )
-            history_row = self._conn.execute(
+            history_row = conn.execute(
                 "SELECT COUNT(*), MAX(visited_at) FROM history"
             ).fetchone()
             history_total = int(history_row[0] or 0)
@@ -884,7 +1104,7 @@ class AppStateDB:
             llm_messages = _count("SELECT COUNT(*) FROM llm_messages")
             memories_total = _count("SELECT COUNT(*) FROM memories")
             tasks_total = _count("SELECT COUNT(*) FROM tasks")
-            rows = self._conn.execute(
+            rows = conn.execute(
                 "SELECT status, COUNT(*) AS total FROM tasks GROUP BY status"
             ).fetchall()
             tasks_by_status = {
@@ -922,8 +1142,8 @@ class AppStateDB:
         is_source: bool = False,
     ) -> str:
         job_id = uuid.uuid4().hex
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("enqueue_crawl_job") as conn:
+            conn.execute(
                 """
                 INSERT INTO crawl_jobs(
                     id,
@@ -941,7 +1161,7 @@ class AppStateDB:
                 """,
                 (job_id, priority, reason, parent_url, int(bool(is_source))),
             )
-            self._conn.execute(
+            conn.execute(
                 "INSERT INTO crawl_events(job_id, stage, payload) VALUES(?, ?, ?)",
                 (
                     job_id,
@@ -960,8 +1180,8 @@ class AppStateDB:
         return job_id
 
     def crawl_overview(self) -> dict[str, int]:
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._read("crawl_overview") as conn:
+            rows = conn.execute(
                 "SELECT status, COUNT(*) as total FROM crawl_jobs GROUP BY status"
             ).fetchall()
         summary = {"queued": 0, "running": 0, "done": 0, "error": 0}
@@ -974,8 +1194,8 @@ class AppStateDB:
         return summary
 
     def crawl_job_status(self, job_id: str) -> dict[str, Any] | None:
-        with self._lock, self._conn:
-            row = self._conn.execute(
+        with self._read("crawl_job_status") as conn:
+            row = conn.execute(
                 """
                 SELECT
                     id,
@@ -1015,19 +1235,19 @@ class AppStateDB:
     # ------------------------------------------------------------------
     def graph_summary(self) -> dict[str, Any]:
         seven_days_ago = datetime.utcnow() - timedelta(days=7)
-        with self._lock, self._conn:
-            page_total = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
-            site_total = self._conn.execute(
+        with self._read("graph_summary") as conn:
+            page_total = conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            site_total = conn.execute(
                 "SELECT COUNT(DISTINCT site) FROM pages WHERE site IS NOT NULL"
             ).fetchone()[0]
-            edge_total = self._conn.execute(
+            edge_total = conn.execute(
                 "SELECT COUNT(*) FROM link_edges"
             ).fetchone()[0]
-            fresh = self._conn.execute(
+            fresh = conn.execute(
                 "SELECT COUNT(*) FROM pages WHERE last_seen IS NOT NULL AND last_seen >= ?",
                 (seven_days_ago.isoformat(),),
             ).fetchone()[0]
-            top_sites = self._conn.execute(
+            top_sites = conn.execute(
                 """
                 SELECT site, COUNT(*) as degree
                   FROM link_edges
@@ -1038,7 +1258,7 @@ class AppStateDB:
               LIMIT 5
                 """
             ).fetchall()
-            sample_pages = self._conn.execute(
+            sample_pages = conn.execute(
                 """
                 SELECT url, title, site, last_seen
                   FROM pages
@@ -1106,8 +1326,8 @@ class AppStateDB:
         sql.append("LIMIT ?")
         params.append(max(1, min(limit, 1000)))
         query_sql = " ".join(sql)
-        with self._lock, self._conn:
-            rows = self._conn.execute(query_sql, params).fetchall()
+        with self._read("graph_nodes") as conn:
+            rows = conn.execute(query_sql, params).fetchall()
         results: list[dict[str, Any]] = []
         for row in rows:
             record = dict(row)
@@ -1127,8 +1347,8 @@ class AppStateDB:
         return results
 
     def _page_degree(self, url: str) -> int:
-        with self._lock, self._conn:
-            row = self._conn.execute(
+        with self._read("_page_degree") as conn:
+            row = conn.execute(
                 "SELECT COUNT(*) FROM link_edges WHERE src_url = ? OR dst_url = ?",
                 (url, url),
             ).fetchone()
@@ -1169,8 +1389,8 @@ class AppStateDB:
         sql.append("LIMIT ?")
         params.append(max(1, min(limit, 2000)))
         query_sql = " ".join(sql)
-        with self._lock, self._conn:
-            rows = self._conn.execute(query_sql, params).fetchall()
+        with self._read("graph_edges") as conn:
+            rows = conn.execute(query_sql, params).fetchall()
         return [
             {"src_url": row["src_url"], "dst_url": row["dst_url"], "relation": row["relation"]}
             for row in rows
@@ -1210,9 +1430,9 @@ class AppStateDB:
             "WHERE p.site IS NOT NULL GROUP BY p.site"
         )
 
-        with self._lock, self._conn:
-            page_rows = self._conn.execute(page_query, params).fetchall()
-            degree_rows = self._conn.execute(degree_query).fetchall()
+        with self._read("graph_site_nodes") as conn:
+            page_rows = conn.execute(page_query, params).fetchall()
+            degree_rows = conn.execute(degree_query).fetchall()
 
         degree_map: dict[str, int] = {str(r["site"]): int(r["degree"]) for r in degree_rows}
         results: list[dict[str, Any]] = []
@@ -1258,8 +1478,8 @@ class AppStateDB:
         sql.append("GROUP BY ps.site, pd.site HAVING COUNT(*) >= ? ORDER BY weight DESC LIMIT ?")
         params.extend([max(1, min_weight), max(1, min(limit, 5000))])
         query_sql = " ".join(sql)
-        with self._lock, self._conn:
-            rows = self._conn.execute(query_sql, params).fetchall()
+        with self._read("graph_site_edges") as conn:
+            rows = conn.execute(query_sql, params).fetchall()
         return [
             {"src_site": row["src_site"], "dst_site": row["dst_site"], "weight": int(row["weight"] or 0)}
             for row in rows
@@ -1272,8 +1492,8 @@ class AppStateDB:
         """Return a simplified node/link snapshot for the force graph."""
 
         capped_limit = max(1, min(int(limit or 1), 5000))
-        with self._lock, self._conn:
-            edge_rows = self._conn.execute(
+        with self._read("graph_network_snapshot") as conn:
+            edge_rows = conn.execute(
                 "SELECT src_url, dst_url FROM link_edges LIMIT ?",
                 (capped_limit,),
             ).fetchall()
@@ -1289,8 +1509,8 @@ class AppStateDB:
         if urls:
             placeholders = ",".join("?" for _ in urls)
             query = f"SELECT url, title, site FROM pages WHERE url IN ({placeholders})"
-            with self._lock, self._conn:
-                for row in self._conn.execute(query, tuple(urls)):
+            with self._read("graph_network_snapshot") as conn:
+                for row in conn.execute(query, tuple(urls)):
                     metadata[str(row["url"])] = {
                         "title": row["title"],
                         "site": row["site"],
@@ -1329,8 +1549,8 @@ class AppStateDB:
     def graph_hierarchy_snapshot(self, *, max_sites: int = 200) -> dict[str, Any]:
         """Return hierarchical data grouped by site for treemap/radial views."""
 
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._read("graph_hierarchy_snapshot") as conn:
+            rows = conn.execute(
                 """
                 SELECT site, url, title, COALESCE(text_len, tokens, 1) AS value
                   FROM documents
@@ -1377,8 +1597,8 @@ class AppStateDB:
         is_source: bool = False,
         reason: str | None = None,
     ) -> None:
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("record_crawl_job") as conn:
+            conn.execute(
                 """
                 INSERT INTO crawl_jobs(id, status, seed, query, normalized_path, parent_url, is_source, reason)
                 VALUES(?, 'queued', ?, ?, ?, ?, ?, ?)
@@ -1401,8 +1621,8 @@ class AppStateDB:
             )
 
     def pending_crawl_jobs(self) -> list[dict[str, Any]]:
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._read("pending_crawl_jobs") as conn:
+            rows = conn.execute(
                 "SELECT id, query, seed, status FROM crawl_jobs WHERE status IN ('queued','running')"
             ).fetchall()
         return [dict(row) for row in rows]
@@ -1419,8 +1639,8 @@ class AppStateDB:
     ) -> None:
         preview_payload = _serialize(list(preview)) if preview is not None else None
         stats_payload = _serialize(dict(stats)) if stats is not None else None
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("update_crawl_status") as conn:
+            conn.execute(
                 """
                 UPDATE crawl_jobs
                    SET status = ?,
@@ -1444,12 +1664,12 @@ class AppStateDB:
         self, job_id: str, stage: str, payload: Mapping[str, Any] | None = None
     ) -> dict[str, Any]:
         event_payload = _serialize(payload or {})
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("record_crawl_event") as conn:
+            conn.execute(
                 "INSERT INTO crawl_events(job_id, stage, payload) VALUES(?, ?, ?)",
                 (job_id, stage, event_payload),
             )
-            stats = self._conn.execute(
+            stats = conn.execute(
                 "SELECT stats FROM crawl_jobs WHERE id = ?",
                 (job_id,),
             ).fetchone()
@@ -1463,10 +1683,13 @@ class AppStateDB:
                 if added == 0:
                     added = int((payload or {}).get("docs_indexed", 0))
                 current["indexed"] = int(current.get("indexed", 0)) + added
+                normalized = int((payload or {}).get("normalized", 0))
+                if normalized:
+                    current["normalized"] = int(current.get("normalized", 0)) + normalized
             elif stage in {"normalize", "normalize_complete"}:
                 docs_count = int((payload or {}).get("docs", 0))
                 current["normalized"] = int(current.get("normalized", 0)) + docs_count
-            self._conn.execute(
+            conn.execute(
                 "UPDATE crawl_jobs SET stats = ? WHERE id = ?",
                 (_serialize(current), job_id),
             )
@@ -1497,25 +1720,108 @@ class AppStateDB:
         verification: Mapping[str, Any] | None = None,
         outlinks: Iterable[str] | None = None,
     ) -> None:
-        categories_json = _serialize(_ensure_list(categories or []))
-        labels_json = _serialize(_ensure_list(labels or []))
-        verification_json = (
-            _serialize(verification) if verification is not None else None
+        self.upsert_documents(
+            [
+                {
+                    "job_id": job_id,
+                    "document_id": document_id,
+                    "url": url,
+                    "canonical_url": canonical_url,
+                    "site": site,
+                    "title": title,
+                    "description": description,
+                    "language": language,
+                    "fetched_at": fetched_at,
+                    "normalized_path": normalized_path,
+                    "text_len": text_len,
+                    "tokens": tokens,
+                    "content_hash": content_hash,
+                    "categories": categories,
+                    "labels": labels,
+                    "source": source,
+                    "verification": verification,
+                    "outlinks": outlinks,
+                }
+            ]
         )
-        site_value = _normalize_site(site) or _normalize_site(url)
-        try:
-            last_seen = (
-                datetime.fromtimestamp(float(fetched_at), tz=timezone.utc).isoformat(
-                    timespec="seconds"
+
+    def upsert_documents(
+        self,
+        documents: Iterable[Mapping[str, Any]],
+        *,
+        batch_size: int = DOCUMENT_BATCH_SIZE,
+    ) -> int:
+        """Upsert many documents with their page rows and outgoing link edges.
+
+        ``documents`` holds mappings with the keyword arguments of
+        :meth:`upsert_document`. Each batch of ``batch_size`` documents is
+        written in one transaction with one ``executemany`` per table.
+        Returns the number of documents written.
+        """
+
+        written = 0
+        batch: list[Mapping[str, Any]] = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) >= max(1, int(batch_size)):
+                written += self._upsert_document_batch(batch)
+                batch = []
+        if batch:
+            written += self._upsert_document_batch(batch)
+        return written
+
+    def _upsert_document_batch(self, documents: Sequence[Mapping[str, Any]]) -> int:
+        document_rows: list[tuple[Any, ...]] = []
+        page_rows: list[tuple[Any, ...]] = []
+        edge_rows: list[tuple[str, str]] = []
+        for document in documents:
+            url = document["url"]
+            title = document.get("title")
+            fetched_at = document.get("fetched_at")
+            verification = document.get("verification")
+            categories_json = _serialize(_ensure_list(document.get("categories") or []))
+            site_value = _normalize_site(document.get("site")) or _normalize_site(url)
+            try:
+                last_seen = (
+                    datetime.fromtimestamp(float(fetched_at), tz=timezone.utc).isoformat(
+                        timespec="seconds"
+                    )
+                    if fetched_at is not None
+                    else _utc_now()
                 )
-                if fetched_at is not None
-                else _utc_now()
+            except (TypeError, ValueError):
+                last_seen = _utc_now()
+            document_rows.append(
+                (
+                    document["document_id"],
+                    url,
+                    document.get("canonical_url"),
+                    site_value,
+                    title,
+                    document.get("description"),
+                    document.get("language"),
+                    fetched_at,
+                    document.get("normalized_path"),
+                    document.get("text_len"),
+                    document.get("tokens"),
+                    document.get("content_hash"),
+                    categories_json,
+                    _serialize(_ensure_list(document.get("labels") or [])),
+                    document.get("source"),
+                    document.get("job_id"),
+                    _serialize(verification) if verification is not None else None,
+                )
+            )
+            page_rows.append(
+                (url, site_value, title or url, last_seen, last_seen, categories_json)
+            )
+            edge_rows.extend(
+                (url, link) for link in _normalize_links(document.get("outlinks"))
             )
-        except (TypeError, ValueError):
-            last_seen = _utc_now()
-        outlinks_normalized = _normalize_links(outlinks)
-        with self._lock, self._conn:
-            self._conn.execute(
+        if not document_rows:
+            return 0
+        with self._write("upsert_documents") as conn:
+            conn.executemany(
                 """
                 INSERT INTO documents(
                     id, url, canonical_url, site, title, description, language, fetched_at,
@@ -1541,28 +1847,10 @@ class AppStateDB:
                     job_id = excluded.job_id,
                     verification = excluded.verification
                 """,
-                (
-                    document_id,
-                    url,
-                    canonical_url,
-                    site_value,
-                    title,
-                    description,
-                    language,
-                    fetched_at,
-                    normalized_path,
-                    text_len,
-                    tokens,
-                    content_hash,
-                    categories_json,
-                    labels_json,
-                    source,
-                    job_id,
-                    verification_json,
-                ),
+                document_rows,
             )
             try:
-                self._conn.execute(
+                conn.executemany(
                     """
                     INSERT INTO pages(url, site, title, first_seen, last_seen, topics, embedding)
                     VALUES(?, ?, ?, ?, ?, ?, NULL)
@@ -1575,26 +1863,23 @@ class AppStateDB:
                             ELSE pages.topics
                         END
                     """,
-                    (
-                        url,
-                        site_value,
-                        title or url,
-                        last_seen,
-                        last_seen,
-                        categories_json,
-                    ),
+                    page_rows,
                 )
-                if outlinks_normalized:
-                    for link in outlinks_normalized:
-                        self._conn.execute(
-                            """
-                            INSERT OR IGNORE INTO link_edges(src_url, dst_url, relation)
-                            VALUES (?, ?, 'link')
-                            """,
-                            (url, link),
-                        )
+                if edge_rows:
+                    conn.executemany(
+                        """
+                        INSERT OR IGNORE INTO link_edges(src_url, dst_url, relation)
+                        VALUES (?, ?, 'link')
+                        """,
+                        edge_rows,
+                    )
             except Exception:  # pragma: no cover - defensive logging only
-                LOGGER.debug("failed to persist page/link graph for %s", url, exc_info=True)
+                LOGGER.debug(
+                    "failed to persist page/link graph for %d documents",
+                    len(page_rows),
+                    exc_info=True,
+                )
+        return len(document_rows)
 
     # ------------------------------------------------------------------
     # Domain profiles
@@ -1606,8 +1891,8 @@ class AppStateDB:
         if not normalized:
             return 0
 
-        with self._lock, self._conn:
-            row = self._conn.execute(
+        with self._read("count_documents_for_site") as conn:
+            row = conn.execute(
                 "SELECT COUNT(*) AS total FROM documents WHERE site = ?",
                 (normalized,),
             ).fetchone()
@@ -1615,7 +1900,7 @@ class AppStateDB:
             if total > 0:
                 return total
             fallback_pattern = f"%://{normalized}/%"
-            fallback_row = self._conn.execute(
+            fallback_row = conn.execute(
                 "SELECT COUNT(*) AS total FROM documents WHERE url LIKE ?",
                 (fallback_pattern,),
             ).fetchone()
@@ -1629,8 +1914,8 @@ class AppStateDB:
             return []
         limit_value = max(1, min(int(limit or 1), 50))
         pattern = f"%.{normalized}"
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._read("list_known_subdomains") as conn:
+            rows = conn.execute(
                 """
                 SELECT DISTINCT site
                 FROM documents
@@ -1687,8 +1972,8 @@ class AppStateDB:
         serialized_sitemaps = _serialize(_clean_list(sitemaps))
         serialized_subdomains = _serialize(_clean_list(subdomains))
         robots_text = (robots_txt or "").strip() or None
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("upsert_domain_profile") as conn:
+            conn.execute(
                 """
                 INSERT INTO domain_profiles(
                     host, pages_cached, robots_txt, robots_allows, robots_disallows,
@@ -1723,8 +2008,8 @@ class AppStateDB:
         normalized = (host or "").strip().lower()
         if not normalized:
             return None
-        with self._lock, self._conn:
-            row = self._conn.execute(
+        with self._read("get_domain_profile") as conn:
+            row = conn.execute(
                 "SELECT * FROM domain_profiles WHERE host = ?",
                 (normalized,),
             ).fetchone()
@@ -1881,8 +2166,8 @@ class AppStateDB:
     # Settings
     # ------------------------------------------------------------------
     def get_setting(self, key: str, default: str | None = None) -> str | None:
-        with self._lock, self._conn:
-            cursor = self._conn.execute(
+        with self._read("get_setting") as conn:
+            cursor = conn.execute(
                 "SELECT value FROM app_settings WHERE key = ?",
                 (key,),
             )
@@ -1893,8 +2178,8 @@ class AppStateDB:
         return str(value)
 
     def set_setting(self, key: str, value: str) -> None:
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("set_setting") as conn:
+            conn.execute(
                 """
                 INSERT INTO app_settings(key, value, updated_at)
                 VALUES(?, ?, strftime('%s','now'))
@@ -1941,9 +2226,9 @@ class AppStateDB:
         if not parent_url or not links:
             return
         enqueued_flag = 1 if mark_enqueued else 0
-        with self._lock, self._conn:
+        with self._write("record_source_links") as conn:
             for link in links:
-                self._conn.execute(
+                conn.execute(
                     """
                     INSERT INTO source_links(parent_url, source_url, kind, enqueued)
                     VALUES(?, ?, ?, ?)
@@ -1960,9 +2245,9 @@ class AppStateDB:
     def mark_sources_enqueued(self, parent_url: str, urls: Sequence[str]) -> None:
         if not parent_url or not urls:
             return
-        with self._lock, self._conn:
+        with self._write("mark_sources_enqueued") as conn:
             for url in urls:
-                self._conn.execute(
+                conn.execute(
                     "UPDATE source_links SET enqueued = 1 WHERE parent_url = ? AND source_url = ?",
                     (parent_url, url),
                 )
@@ -1980,8 +2265,8 @@ class AppStateDB:
         if not parent_url or not source_url:
             return
         timestamp = int(time.time())
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("record_missing_source") as conn:
+            conn.execute(
                 """
                 INSERT INTO missing_sources(parent_url, source_url, reason, http_status, last_attempt, retries, next_action, notes)
                 VALUES(?, ?, ?, ?, ?, 0, ?, ?)
@@ -2009,13 +2294,13 @@ class AppStateDB:
     ) -> None:
         if not parent_url or not source_url:
             return
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("resolve_missing_source") as conn:
+            conn.execute(
                 "DELETE FROM missing_sources WHERE parent_url = ? AND source_url = ?",
                 (parent_url, source_url),
             )
             if notes:
-                self._conn.execute(
+                conn.execute(
                     """
                     INSERT INTO source_links(parent_url, source_url, kind, enqueued, discovered_at)
                     VALUES(?, ?, 'resolved', 1, CURRENT_TIMESTAMP)
@@ -2031,8 +2316,8 @@ class AppStateDB:
         limit: int = 100,
     ) -> list[dict[str, Any]]:
         capped = max(1, min(int(limit), 500))
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._read("list_missing_sources") as conn:
+            rows = conn.execute(
                 """
                 SELECT id, parent_url, source_url, reason, http_status, last_attempt, retries, next_action, notes
                 FROM missing_sources
@@ -2075,8 +2360,8 @@ class AppStateDB:
             except (TypeError, ValueError):
                 sim_signature_str = str(sim_signature)
         now = int(time.time())
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("enqueue_pending_document") as conn:
+            conn.execute(
                 """
                 INSERT INTO pending_documents(
                     doc_id,
@@ -2122,12 +2407,12 @@ class AppStateDB:
                     now,
                 ),
             )
-            self._conn.execute(
+            conn.execute(
                 "DELETE FROM pending_chunks WHERE doc_id = ?",
                 (doc_id,),
             )
             for index, text, chunk_metadata in chunks:
-                self._conn.execute(
+                conn.execute(
                     """
                     INSERT INTO pending_chunks(doc_id, chunk_index, text, metadata, created_at, updated_at)
                     VALUES(?, ?, ?, ?, ?, ?)
@@ -2150,7 +2435,7 @@ class AppStateDB:
                 int(math.ceil(now + max(0.0, float(initial_delay)))),
                 now,
             )
-            self._conn.execute(
+            conn.execute(
                 """
                 INSERT INTO pending_vectors_queue(doc_id, attempts, next_attempt_at, created_at, updated_at)
                 VALUES(?, 0, ?, ?, ?)
@@ -2164,8 +2449,8 @@ class AppStateDB:
     def pop_pending_documents(self, limit: int = 5) -> list[dict[str, Any]]:
         now = int(time.time())
         rows: list[dict[str, Any]] = []
-        with self._lock, self._conn:
-            cursor = self._conn.execute(
+        with self._write("pop_pending_documents") as conn:
+            cursor = conn.execute(
                 """
                 SELECT q.doc_id, q.attempts, d.job_id, d.url, d.title, d.resolved_title, d.doc_hash,
                        d.sim_signature, d.metadata, d.last_error, d.retry_count
@@ -2180,7 +2465,7 @@ class AppStateDB:
             candidates = list(cursor.fetchall())
             for row in candidates:
                 doc_id = row["doc_id"]
-                chunk_rows = self._conn.execute(
+                chunk_rows = conn.execute(
                     "SELECT chunk_index, text, metadata FROM pending_chunks WHERE doc_id = ? ORDER BY chunk_index ASC",
                     (doc_id,),
                 ).fetchall()
@@ -2208,7 +2493,7 @@ class AppStateDB:
                         "retry_count": _parse_int(row["retry_count"]) or 0,
                     }
                 )
-                self._conn.execute(
+                conn.execute(
                     "DELETE FROM pending_vectors_queue WHERE doc_id = ?",
                     (doc_id,),
                 )
@@ -2224,8 +2509,8 @@ class AppStateDB:
     ) -> None:
         now = int(time.time())
         next_attempt = int(math.ceil(now + max(1.0, float(delay))))
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("reschedule_pending_document") as conn:
+            conn.execute(
                 """
                 INSERT INTO pending_vectors_queue(doc_id, attempts, next_attempt_at, created_at, updated_at)
                 VALUES(?, ?, ?, ?, ?)
@@ -2245,7 +2530,7 @@ class AppStateDB:
                     now,
                 ),
             )
-            self._conn.execute(
+            conn.execute(
                 """
                 UPDATE pending_documents
                    SET retry_count = ?,
@@ -2257,14 +2542,14 @@ class AppStateDB:
             )
 
     def clear_pending_document(self, doc_id: str) -> None:
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("clear_pending_document") as conn:
+            conn.execute(
                 "DELETE FROM pending_documents WHERE doc_id = ?", (doc_id,)
             )
 
     def list_pending_documents(self, limit: int = 200) -> list[dict[str, Any]]:
-        with self._lock, self._conn:
-            cursor = self._conn.execute(
+        with self._read("list_pending_documents") as conn:
+            cursor = conn.execute(
                 """
                 SELECT doc_id, url, title, retry_count, last_error, updated_at
                   FROM pending_documents
@@ -2317,8 +2602,8 @@ class AppStateDB:
         normalized_status = status if status in JOB_STATUSES else "queued"
         identifier = job_id or uuid.uuid4().hex
         payload_json = _serialize(payload) if payload is not None else None
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("create_job") as conn:
+            conn.execute(
                 """
                 INSERT INTO jobs(id, type, status, payload, task_id, thread_id)
                 VALUES(?, ?, ?, ?, ?, ?)
@@ -2377,16 +2662,16 @@ class AppStateDB:
         sets.append("updated_at = ?")
         params.append(_utc_now())
         params.append(job_id)
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("update_job") as conn:
+            conn.execute(
                 f"UPDATE jobs SET {', '.join(sets)} WHERE id = ?",
                 params,
             )
         return self.get_job(job_id)
 
     def get_job(self, job_id: str) -> dict[str, Any] | None:
-        with self._lock, self._conn:
-            row = self._conn.execute(
+        with self._read("get_job") as conn:
+            row = conn.execute(
                 """
                 SELECT id, type, status, created_at, updated_at, started_at, completed_at,
                        payload, result, error, task_id, thread_id
@@ -2426,8 +2711,8 @@ class AppStateDB:
             + " ORDER BY datetime(updated_at) DESC LIMIT ?"
         )
         params.append(capped)
-        with self._lock, self._conn:
-            rows = self._conn.execute(query, params).fetchall()
+        with self._read("list_jobs") as conn:
+            rows = conn.execute(query, params).fetchall()
         items: list[dict[str, Any]] = []
         for row in rows:
             record = dict(row)
@@ -2451,8 +2736,8 @@ class AppStateDB:
         cutoff_iso = cutoff.isoformat(timespec="seconds")
         placeholders = ",".join("?" for _ in allowed)
         params = tuple(list(allowed) + [cutoff_iso])
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("prune_jobs") as conn:
+            conn.execute(
                 f"""
                 DELETE FROM job_status
                  WHERE job_id IN (
@@ -2463,7 +2748,7 @@ class AppStateDB:
                 """,
                 params,
             )
-            cursor = self._conn.execute(
+            cursor = conn.execute(
                 f"""
                 DELETE FROM jobs
                  WHERE status IN ({placeholders})
@@ -2489,8 +2774,8 @@ class AppStateDB:
         message: str | None,
         started_at: float | None = None,
     ) -> None:
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("upsert_job_status") as conn:
+            conn.execute(
                 """
                 INSERT INTO job_status(
                     job_id, url, phase, steps_total, steps_completed, retries, eta_seconds, message, started_at, updated_at
@@ -2520,8 +2805,8 @@ class AppStateDB:
             )
 
     def get_job_status(self, job_id: str) -> dict[str, Any] | None:
-        with self._lock, self._conn:
-            cursor = self._conn.execute(
+        with self._read("get_job_status") as conn:
+            cursor = conn.execute(
                 """
                 SELECT job_id, url, phase, steps_total, steps_completed, retries, eta_seconds, message, started_at, updated_at
                   FROM job_status
@@ -2569,7 +2854,8 @@ class AppStateDB:
             sql += " WHERE " + " AND ".join(conditions)
         sql += " ORDER BY last_seen DESC LIMIT ?"
         params.append(limit)
-        rows = self._conn.execute(sql, params).fetchall()
+        with self._read("list_documents") as conn:
+            rows = conn.execute(sql, params).fetchall()
         results: list[DocumentRecord] = []
         for row in rows:
             results.append(
@@ -2591,9 +2877,10 @@ class AppStateDB:
         return results
 
     def get_document(self, document_id: str) -> dict[str, Any] | None:
-        row = self._conn.execute(
-            "SELECT * FROM documents WHERE id = ?", (document_id,)
-        ).fetchone()
+        with self._read("get_document") as conn:
+            row = conn.execute(
+                "SELECT * FROM documents WHERE id = ?", (document_id,)
+            ).fetchone()
         if not row:
             return None
         payload = dict(row)
@@ -2605,21 +2892,22 @@ class AppStateDB:
         return payload
 
     def fetch_documents_for_labeling(self, *, limit: int = 5) -> list[dict[str, Any]]:
-        rows = self._conn.execute(
-            """
-            SELECT id, url, title, description, language
-              FROM documents
-             WHERE (labels IS NULL OR labels = '[]')
-          ORDER BY last_seen DESC
-             LIMIT ?
-            """,
-            (limit,),
-        ).fetchall()
+        with self._read("fetch_documents_for_labeling") as conn:
+            rows = conn.execute(
+                """
+                SELECT id, url, title, description, language
+                  FROM documents
+                 WHERE (labels IS NULL OR labels = '[]')
+              ORDER BY last_seen DESC
+                 LIMIT ?
+                """,
+                (limit,),
+            ).fetchall()
         return [dict(row) for row in rows]
 
     def update_document_labels(self, document_id: str, labels: Iterable[str]) -> None:
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("update_document_labels") as conn:
+            conn.execute(
                 "UPDATE documents SET labels = ?, last_seen = CURRENT_TIMESTAMP WHERE id = ?",
                 (_serialize(_ensure_list(labels)), document_id),
             )
@@ -2630,8 +2918,8 @@ class AppStateDB:
     def record_visit(
         self, url: str, *, referer: str | None, dur_ms: int | None, source: str
     ) -> None:
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("record_visit") as conn:
+            conn.execute(
                 "INSERT INTO page_visits(url, referer, dur_ms, source) VALUES(?, ?, ?, ?)",
                 (url, referer, dur_ms, source),
             )
@@ -2640,8 +2928,8 @@ class AppStateDB:
     # Chat history
     # ------------------------------------------------------------------
     def upsert_thread(self, thread_id: str, *, title: str | None = None) -> None:
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("upsert_thread") as conn:
+            conn.execute(
                 """
                 INSERT INTO chat_threads(id, title, last_activity)
                 VALUES(?, ?, CURRENT_TIMESTAMP)
@@ -2661,15 +2949,15 @@ class AppStateDB:
         tokens: int | None = None,
     ) -> str:
         msg_id = message_id or uuid.uuid4().hex
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("add_chat_message") as conn:
+            conn.execute(
                 """
                 INSERT OR REPLACE INTO chat_messages(id, thread_id, role, content, tokens)
                 VALUES(?, ?, ?, ?, ?)
                 """,
                 (msg_id, thread_id, role, content, tokens),
             )
-            self._conn.execute(
+            conn.execute(
                 "UPDATE chat_threads SET last_activity = CURRENT_TIMESTAMP WHERE id = ?",
                 (thread_id,),
             )
@@ -2678,30 +2966,32 @@ class AppStateDB:
     def recent_messages(
         self, thread_id: str, *, limit: int = 20
     ) -> list[dict[str, Any]]:
-        rows = self._conn.execute(
-            """
-            SELECT role, content, created_at, tokens
-              FROM chat_messages
-             WHERE thread_id = ?
-          ORDER BY created_at DESC
-             LIMIT ?
-            """,
-            (thread_id, limit),
-        ).fetchall()
+        with self._read("recent_messages") as conn:
+            rows = conn.execute(
+                """
+                SELECT role, content, created_at, tokens
+                  FROM chat_messages
+                 WHERE thread_id = ?
+              ORDER BY created_at DESC
+                 LIMIT ?
+                """,
+                (thread_id, limit),
+            ).fetchall()
         return [dict(row) for row in rows][::-1]
 
     def get_summary(self, thread_id: str) -> dict[str, Any] | None:
-        row = self._conn.execute(
-            "SELECT summary, updated_at, embedding_ref FROM chat_summaries WHERE thread_id = ?",
-            (thread_id,),
-        ).fetchone()
+        with self._read("get_summary") as conn:
+            row = conn.execute(
+                "SELECT summary, updated_at, embedding_ref FROM chat_summaries WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchone()
         return dict(row) if row else None
 
     def upsert_summary(
         self, thread_id: str, *, summary: str, embedding_ref: str | None = None
     ) -> None:
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("upsert_summary") as conn:
+            conn.execute(
                 """
                 INSERT INTO chat_summaries(thread_id, summary, embedding_ref)
                 VALUES(?, ?, ?)
@@ -2730,8 +3020,8 @@ class AppStateDB:
         source_message_id: str | None = None,
         embedding_ref: str | None = None,
     ) -> None:
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("upsert_memory") as conn:
+            conn.execute(
                 """
                 INSERT INTO memories(id, scope, scope_ref, key, value, metadata, strength, thread_id, task_id, source_message_id, embedding_ref)
                 VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -2762,7 +3052,7 @@ class AppStateDB:
                     embedding_ref,
                 ),
             )
-            self._conn.execute(
+            conn.execute(
                 "INSERT INTO memory_audit(memory_id, action, detail) VALUES(?, 'upsert', ?)",
                 (memory_id, value[:2000]),
             )
@@ -2770,17 +3060,18 @@ class AppStateDB:
     def list_memories(
         self, *, scope: str, scope_ref: str | None = None, limit: int = 20
     ) -> list[dict[str, Any]]:
-        rows = self._conn.execute(
-            """
-            SELECT id, scope, scope_ref, key, value, metadata, strength, last_accessed, created_at,
-                   thread_id, task_id, source_message_id, embedding_ref
-              FROM memories
-             WHERE scope = ? AND (scope_ref = ? OR ? IS NULL)
-          ORDER BY last_accessed DESC
-             LIMIT ?
-            """,
-            (scope, scope_ref, scope_ref, limit),
-        ).fetchall()
+        with self._read("list_memories") as conn:
+            rows = conn.execute(
+                """
+                SELECT id, scope, scope_ref, key, value, metadata, strength, last_accessed, created_at,
+                       thread_id, task_id, source_message_id, embedding_ref
+                  FROM memories
+                 WHERE scope = ? AND (scope_ref = ? OR ? IS NULL)
+              ORDER BY last_accessed DESC
+                 LIMIT ?
+                """,
+                (scope, scope_ref, scope_ref, limit),
+            ).fetchall()
         items: list[dict[str, Any]] = []
         for row in rows:
             payload = dict(row)
@@ -2796,27 +3087,38 @@ class AppStateDB:
         scope_ref: str | None = None,
         limit: int = 20,
     ) -> list[dict[str, Any]]:
+        """Return memories filtered by scope, ranked by BM25 when ``query`` is set."""
+
         clauses: list[str] = []
         params: list[Any] = []
+        phrase = _fts_substring(query) if query and "memories_fts" in self._fts_tables else None
+        if phrase:
+            clauses.append("memories_fts MATCH ?")
+            params.append(phrase)
+        elif query:
+            pattern = f"%{query.lower()}%"
+            clauses.append("(lower(m.value) LIKE ? OR lower(COALESCE(m.key,'')) LIKE ?)")
+            params.extend([pattern, pattern])
         if scope:
-            clauses.append("scope = ?")
+            clauses.append("m.scope = ?")
             params.append(scope)
         if scope_ref:
-            clauses.append("scope_ref = ?")
+            clauses.append("m.scope_ref = ?")
             params.append(scope_ref)
-        if query:
-            pattern = f"%{query.lower()}%"
-            clauses.append("(lower(value) LIKE ? OR lower(COALESCE(key,'')) LIKE ?)")
-            params.extend([pattern, pattern])
         where_clause = " WHERE " + " AND ".join(clauses) if clauses else ""
         sql = (
-            "SELECT id, scope, scope_ref, key, value, metadata, strength, last_accessed, created_at, "
-            "thread_id, task_id, source_message_id, embedding_ref FROM memories"
+            "SELECT m.id, m.scope, m.scope_ref, m.key, m.value, m.metadata, m.strength, "
+            "m.last_accessed, m.created_at, m.thread_id, m.task_id, m.source_message_id, "
+            "m.embedding_ref FROM "
+            + ("memories_fts JOIN memories m ON m.rowid = memories_fts.rowid" if phrase else "memories m")
             + where_clause
-            + " ORDER BY last_accessed DESC LIMIT ?"
+            + " ORDER BY "
+            + ("bm25(memories_fts), " if phrase else "")
+            + "m.last_accessed DESC LIMIT ?"
         )
         params.append(max(1, min(int(limit), 200)))
-        rows = self._conn.execute(sql, params).fetchall()
+        with self._read("search_memories") as conn:
+            rows = conn.execute(sql, params).fetchall()
         items: list[dict[str, Any]] = []
         for row in rows:
             payload = dict(row)
@@ -2840,8 +3142,8 @@ class AppStateDB:
             raise ValueError("thread_id is required")
         created_at = _utc_now()
         metadata_json = _serialize(metadata) if metadata is not None else None
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("ensure_llm_thread") as conn:
+            conn.execute(
                 """
                 INSERT INTO llm_threads(id, title, description, origin, created_at, updated_at, metadata)
                 VALUES(?, ?, ?, ?, ?, ?, ?)
@@ -2874,15 +3176,16 @@ class AppStateDB:
         )
 
     def get_llm_thread(self, thread_id: str) -> dict[str, Any] | None:
-        row = self._conn.execute(
-            """
-            SELECT id, title, description, origin, created_at, updated_at,
-                   last_user_message_at, last_assistant_message_at, metadata
-              FROM llm_threads
-             WHERE id = ?
-            """,
-            (thread_id,),
-        ).fetchone()
+        with self._read("get_llm_thread") as conn:
+            row = conn.execute(
+                """
+                SELECT id, title, description, origin, created_at, updated_at,
+                       last_user_message_at, last_assistant_message_at, metadata
+                  FROM llm_threads
+                 WHERE id = ?
+                """,
+                (thread_id,),
+            ).fetchone()
         if not row:
             return None
         payload = dict(row)
@@ -2894,16 +3197,17 @@ class AppStateDB:
     ) -> list[dict[str, Any]]:
         capped = max(1, min(int(limit), 200))
         start = max(0, int(offset))
-        rows = self._conn.execute(
-            """
-            SELECT id, title, description, origin, created_at, updated_at,
-                   last_user_message_at, last_assistant_message_at, metadata
-              FROM llm_threads
-          ORDER BY COALESCE(updated_at, created_at) DESC
-             LIMIT ? OFFSET ?
-            """,
-            (capped, start),
-        ).fetchall()
+        with self._read("list_llm_threads") as conn:
+            rows = conn.execute(
+                """
+                SELECT id, title, description, origin, created_at, updated_at,
+                       last_user_message_at, last_assistant_message_at, metadata
+                  FROM llm_threads
+              ORDER BY COALESCE(updated_at, created_at) DESC
+                 LIMIT ? OFFSET ?
+                """,
+                (capped, start),
+            ).fetchall()
         items: list[dict[str, Any]] = []
         for row in rows:
             payload = dict(row)
@@ -2912,14 +3216,15 @@ class AppStateDB:
         return items
 
     def export_llm_threads(self) -> list[dict[str, Any]]:
-        rows = self._conn.execute(
-            """
-            SELECT id, title, description, origin, created_at, updated_at,
-                   last_user_message_at, last_assistant_message_at, metadata
-              FROM llm_threads
-          ORDER BY datetime(created_at) ASC
-            """
-        ).fetchall()
+        with self._read("export_llm_threads") as conn:
+            rows = conn.execute(
+                """
+                SELECT id, title, description, origin, created_at, updated_at,
+                       last_user_message_at, last_assistant_message_at, metadata
+                  FROM llm_threads
+              ORDER BY datetime(created_at) ASC
+                """
+            ).fetchall()
         items: list[dict[str, Any]] = []
         for row in rows:
             payload = dict(row)
@@ -2943,8 +3248,8 @@ class AppStateDB:
         metadata_json = _serialize(metadata) if metadata is not None else None
         msg_id = message_id or uuid.uuid4().hex
         self.ensure_llm_thread(thread_id)
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("append_llm_message") as conn:
+            conn.execute(
                 """
                 INSERT INTO llm_messages(id, thread_id, parent_id, role, content, created_at, tokens, metadata)
                 VALUES(?, ?, ?, ?, ?, ?, ?, ?)
@@ -2968,7 +3273,7 @@ class AppStateDB:
                 set_fragments.append("last_assistant_message_at = ?")
                 updates.append(created_at)
             updates.append(thread_id)
-            self._conn.execute(
+            conn.execute(
                 f"UPDATE llm_threads SET {', '.join(set_fragments)} WHERE id = ?",
                 updates,
             )
@@ -2978,40 +3283,40 @@ class AppStateDB:
         stats = {"threads": 0, "messages": 0, "tasks": 0, "memories": 0, "tabs": 0}
         if not thread_id:
             return stats
-        with self._lock, self._conn:
-            exists = self._conn.execute(
+        with self._write("delete_llm_thread") as conn:
+            exists = conn.execute(
                 "SELECT 1 FROM llm_threads WHERE id=?", (thread_id,)
             ).fetchone()
             if not exists:
                 return stats
             stats["messages"] = int(
-                self._conn.execute(
+                conn.execute(
                     "SELECT COUNT(*) FROM llm_messages WHERE thread_id=?",
                     (thread_id,),
                 ).fetchone()[0]
                 or 0
             )
             stats["tasks"] = int(
-                self._conn.execute(
+                conn.execute(
                     "SELECT COUNT(*) FROM tasks WHERE thread_id=?",
                     (thread_id,),
                 ).fetchone()[0]
                 or 0
             )
             stats["memories"] = int(
-                self._conn.execute(
+                conn.execute(
                     "SELECT COUNT(*) FROM memories WHERE thread_id=?",
                     (thread_id,),
                 ).fetchone()[0]
                 or 0
             )
-            stats["tabs"] = self._conn.execute(
+            stats["tabs"] = conn.execute(
                 "UPDATE tabs SET thread_id=NULL WHERE thread_id=?",
                 (thread_id,),
             ).rowcount
-            self._conn.execute("DELETE FROM tasks WHERE thread_id=?", (thread_id,))
-            self._conn.execute("DELETE FROM memories WHERE thread_id=?", (thread_id,))
-            stats["threads"] = self._conn.execute(
+            conn.execute("DELETE FROM tasks WHERE thread_id=?", (thread_id,))
+            conn.execute("DELETE FROM memories WHERE thread_id=?", (thread_id,))
+            stats["threads"] = conn.execute(
                 "DELETE FROM llm_threads WHERE id=?", (thread_id,)
             ).rowcount
         return stats
@@ -3023,16 +3328,17 @@ class AppStateDB:
             return []
         capped = max(1, min(int(limit), 200))
         order = "ASC" if ascending else "DESC"
-        rows = self._conn.execute(
-            f"""
-            SELECT id, thread_id, parent_id, role, content, created_at, tokens, metadata
-              FROM llm_messages
-             WHERE thread_id = ?
-          ORDER BY datetime(created_at) {order}
-             LIMIT ?
-            """,
-            (thread_id, capped),
-        ).fetchall()
+        with self._read("list_llm_messages") as conn:
+            rows = conn.execute(
+                f"""
+                SELECT id, thread_id, parent_id, role, content, created_at, tokens, metadata
+                  FROM llm_messages
+                 WHERE thread_id = ?
+              ORDER BY datetime(created_at) {order}
+                 LIMIT ?
+                """,
+                (thread_id, capped),
+            ).fetchall()
         items: list[dict[str, Any]] = [dict(row) for row in rows]
         for item in items:
             item["metadata"] = _deserialize(item.get("metadata"), {})
@@ -3041,13 +3347,14 @@ class AppStateDB:
         return items
 
     def export_llm_messages(self) -> list[dict[str, Any]]:
-        rows = self._conn.execute(
-            """
-            SELECT id, thread_id, parent_id, role, content, created_at, tokens, metadata
-              FROM llm_messages
-          ORDER BY datetime(created_at) ASC
-            """
-        ).fetchall()
+        with self._read("export_llm_messages") as conn:
+            rows = conn.execute(
+                """
+                SELECT id, thread_id, parent_id, role, content, created_at, tokens, metadata
+                  FROM llm_messages
+              ORDER BY datetime(created_at) ASC
+                """
+            ).fetchall()
         items: list[dict[str, Any]] = []
         for row in rows:
             payload = dict(row)
@@ -3058,14 +3365,15 @@ class AppStateDB:
     def get_llm_message(self, message_id: str) -> dict[str, Any] | None:
         if not message_id:
             return None
-        row = self._conn.execute(
-            """
-            SELECT id, thread_id, parent_id, role, content, created_at, tokens, metadata
-              FROM llm_messages
-             WHERE id = ?
-            """,
-            (message_id,),
-        ).fetchone()
+        with self._read("get_llm_message") as conn:
+            row = conn.execute(
+                """
+                SELECT id, thread_id, parent_id, role, content, created_at, tokens, metadata
+                  FROM llm_messages
+                 WHERE id = ?
+                """,
+                (message_id,),
+            ).fetchone()
         if not row:
             return None
         payload = dict(row)
@@ -3079,8 +3387,8 @@ class AppStateDB:
         created_at = record.get("created_at") or _utc_now()
         updated_at = record.get("updated_at") or created_at
         metadata_json = _serialize(record.get("metadata")) if record.get("metadata") is not None else None
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("import_llm_thread_record") as conn:
+            conn.execute(
                 """
                 INSERT INTO llm_threads(
                     id, title, description, origin, created_at, updated_at,
@@ -3114,10 +3422,11 @@ class AppStateDB:
     ) -> str | None:
         if not thread_id or not created_at:
             return None
-        row = self._conn.execute(
-            "SELECT id FROM llm_messages WHERE thread_id = ? AND created_at = ? LIMIT 1",
-            (thread_id, created_at),
-        ).fetchone()
+        with self._read("_find_message_by_timestamp") as conn:
+            row = conn.execute(
+                "SELECT id FROM llm_messages WHERE thread_id = ? AND created_at = ? LIMIT 1",
+                (thread_id, created_at),
+            ).fetchone()
         if not row:
             return None
         return str(row["id"])
@@ -3140,12 +3449,20 @@ class AppStateDB:
         metadata_json = _serialize(record.get("metadata")) if record.get("metadata") is not None else None
         msg_id = message_id or uuid.uuid4().hex
         role = (record.get("role") or "user").strip().lower() or "user"
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("import_llm_message_record") as conn:
+            conn.execute(
                 """
-                INSERT OR REPLACE INTO llm_messages(
+                INSERT INTO llm_messages(
                     id, thread_id, parent_id, role, content, created_at, tokens, metadata
                 ) VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    thread_id = excluded.thread_id,
+                    parent_id = excluded.parent_id,
+                    role = excluded.role,
+                    content = excluded.content,
+                    created_at = excluded.created_at,
+                    tokens = excluded.tokens,
+                    metadata = excluded.metadata
                 """,
                 (
                     msg_id,
@@ -3158,7 +3475,7 @@ class AppStateDB:
                     metadata_json,
                 ),
             )
-            self._conn.execute(
+            conn.execute(
                 "UPDATE llm_threads SET updated_at = ?, last_user_message_at = CASE WHEN ? = 'user' THEN ? ELSE last_user_message_at END, last_assistant_message_at = CASE WHEN ? = 'assistant' THEN ? ELSE last_assistant_message_at END WHERE id = ?",
                 (created_at, role, created_at, role, created_at, thread_id),
             )
@@ -3169,6 +3486,41 @@ class AppStateDB:
     ) -> list[dict[str, Any]]:
         return self.list_llm_messages(thread_id, limit=limit, ascending=True)
 
+    def search_llm_messages(
+        self, query: str, *, thread_id: str | None = None, limit: int = 20
+    ) -> list[dict[str, Any]]:
+        """Return chat messages containing every word of ``query``, best match first."""
+
+        capped = max(1, min(int(limit), 200))
+        terms = _fts_terms(query) if "llm_messages_fts" in self._fts_tables else None
+        if terms:
+            sql = (
+                "SELECT m.id, m.thread_id, m.parent_id, m.role, m.content, m.created_at, "
+                "m.tokens, m.metadata FROM llm_messages_fts "
+                "JOIN llm_messages m ON m.rowid = llm_messages_fts.rowid "
+                "WHERE llm_messages_fts MATCH ?"
+            )
+            params: list[Any] = [terms]
+        elif (query or "").strip():
+            sql = (
+                "SELECT m.id, m.thread_id, m.parent_id, m.role, m.content, m.created_at, "
+                "m.tokens, m.metadata FROM llm_messages m WHERE lower(m.content) LIKE ?"
+            )
+            params = [f"%{query.strip().lower()}%"]
+        else:
+            return []
+        if thread_id:
+            sql += " AND m.thread_id = ?"
+            params.append(thread_id)
+        sql += " ORDER BY " + ("bm25(llm_messages_fts), " if terms else "") + "datetime(m.created_at) DESC LIMIT ?"
+        params.append(capped)
+        with self._read("search_llm_messages") as conn:
+            rows = conn.execute(sql, params).fetchall()
+        items: list[dict[str, Any]] = [dict(row) for row in rows]
+        for item in items:
+            item["metadata"] = _deserialize(item.get("metadata"), {})
+        return items
+
     # ------------------------------------------------------------------
     # HydraFlow tasks & events
     # ------------------------------------------------------------------
@@ -3191,8 +3543,8 @@ class AppStateDB:
             self.ensure_llm_thread(thread_id)
         metadata_json = _serialize(metadata or {})
         result_json = _serialize(result) if result is not None else None
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("create_task") as conn:
+            conn.execute(
                 """
                 INSERT INTO tasks(id, thread_id, title, description, status, priority, due_at, created_at, updated_at, owner, metadata, result)
                 VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -3215,15 +3567,16 @@ class AppStateDB:
         return task_id
 
     def get_task(self, task_id: str) -> dict[str, Any] | None:
-        row = self._conn.execute(
-            """
-            SELECT id, thread_id, title, description, status, priority, due_at,
-                   created_at, updated_at, closed_at, owner, metadata, result
-              FROM tasks
-             WHERE id = ?
-            """,
-            (task_id,),
-        ).fetchone()
+        with self._read("get_task") as conn:
+            row = conn.execute(
+                """
+                SELECT id, thread_id, title, description, status, priority, due_at,
+                       created_at, updated_at, closed_at, owner, metadata, result
+                  FROM tasks
+                 WHERE id = ?
+                """,
+                (task_id,),
+            ).fetchone()
         if not row:
             return None
         payload = dict(row)
@@ -3254,7 +3607,8 @@ class AppStateDB:
             + " ORDER BY updated_at DESC LIMIT ?"
         )
         params.append(max(1, min(int(limit), 200)))
-        rows = self._conn.execute(sql, params).fetchall()
+        with self._read("list_tasks") as conn:
+            rows = conn.execute(sql, params).fetchall()
         items: list[dict[str, Any]] = []
         for row in rows:
             payload = dict(row)
@@ -3264,14 +3618,15 @@ class AppStateDB:
         return items
 
     def export_tasks(self) -> list[dict[str, Any]]:
-        rows = self._conn.execute(
-            """
-            SELECT id, thread_id, title, description, status, priority, due_at,
-                   created_at, updated_at, closed_at, owner, metadata, result
-              FROM tasks
-          ORDER BY datetime(created_at) ASC
-            """
-        ).fetchall()
+        with self._read("export_tasks") as conn:
+            rows = conn.execute(
+                """
+                SELECT id, thread_id, title, description, status, priority, due_at,
+                       created_at, updated_at, closed_at, owner, metadata, result
+                  FROM tasks
+              ORDER BY datetime(created_at) ASC
+                """
+            ).fetchall()
         items: list[dict[str, Any]] = []
         for row in rows:
             payload = dict(row)
@@ -3325,8 +3680,8 @@ class AppStateDB:
         sets.append("updated_at = ?")
         params.append(_utc_now())
         params.append(task_id)
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("update_task") as conn:
+            conn.execute(
                 f"UPDATE tasks SET {', '.join(sets)} WHERE id = ?",
                 params,
             )
@@ -3343,8 +3698,8 @@ class AppStateDB:
         event_identifier = event_id or uuid.uuid4().hex
         serialized = _serialize(payload or {})
         created_at = _utc_now()
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("record_task_event") as conn:
+            conn.execute(
                 """
                 INSERT INTO task_events(id, task_id, event_type, payload, created_at)
                 VALUES(?, ?, ?, ?, ?)
@@ -3356,16 +3711,17 @@ class AppStateDB:
     def list_task_events(
         self, task_id: str, *, limit: int = 100
     ) -> list[dict[str, Any]]:
-        rows = self._conn.execute(
-            """
-            SELECT id, task_id, event_type, payload, created_at
-              FROM task_events
-             WHERE task_id = ?
-          ORDER BY created_at ASC
-             LIMIT ?
-            """,
-            (task_id, max(1, min(int(limit), 500))),
-        ).fetchall()
+        with self._read("list_task_events") as conn:
+            rows = conn.execute(
+                """
+                SELECT id, task_id, event_type, payload, created_at
+                  FROM task_events
+                 WHERE task_id = ?
+              ORDER BY created_at ASC
+                 LIMIT ?
+                """,
+                (task_id, max(1, min(int(limit), 500))),
+            ).fetchall()
         events: list[dict[str, Any]] = []
         for row in rows:
             payload = dict(row)
@@ -3379,8 +3735,8 @@ class AppStateDB:
         result_json = _serialize(record.get("result")) if record.get("result") is not None else None
         created_at = record.get("created_at") or _utc_now()
         updated_at = record.get("updated_at") or created_at
-        with self._lock, self._conn:
-            self._conn.execute(
+        with self._write("import_task_record") as conn:
+            conn.execute(
                 """
                 INSERT INTO tasks(
                     id, thread_id, title, description, status, priority, due_at,
@@ -3418,18 +3774,18 @@ class AppStateDB:
         return identifier
 
     def age_memories(self, *, decay: float = 0.9, floor: float = 0.05) -> None:
-        with self._lock, self._conn:
-            rows = self._conn.execute(
+        with self._write("age_memories") as conn:
+            rows = conn.execute(
                 "SELECT id, strength FROM memories",
             ).fetchall()
             for row in rows:
                 current = float(row["strength"] or 0.0)
                 aged = max(floor, current * decay)
-                self._conn.execute(
+                conn.execute(
                     "UPDATE memories SET strength = ?, last_accessed = CURRENT_TIMESTAMP WHERE id = ?",
                     (aged, row["id"]),
                 )
-                self._conn.execute(
+                conn.execute(
                     "INSERT INTO memory_audit(memory_id, action, detail) VALUES(?, 'age', ?)",
                     (row["id"], f"{current:.3f}->{aged:.3f}"),
                 )
@@ -3438,5 +3794,9 @@ class AppStateDB:
     # Utilities
     # ------------------------------------------------------------------
     def close(self) -> None:
+        with self._readers_lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
         with self._lock:
             self._conn.close()
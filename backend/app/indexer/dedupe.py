@@ -3,13 +3,22 @@
 from __future__ import annotations
 
 import hashlib
+import itertools
 import json
+import os
 import re
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+import numpy as np
 
 _WORD_RE = re.compile(r"[\w]+", re.UNICODE)
+_BIT_SHIFTS = np.arange(64, dtype=np.uint64)
+_BIT_WEIGHTS = np.left_shift(np.uint64(1), _BIT_SHIFTS)
+_BINARY_MAGIC = b"SIMHASH1"
 
 
 def tokenize(text: str) -> Iterable[str]:
@@ -19,40 +28,150 @@ def tokenize(text: str) -> Iterable[str]:
             yield token
 
 
+@lru_cache(maxsize=131072)
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+
+
+def _token_signs(tokens: Sequence[str]) -> np.ndarray:
+    """Return a ``(len(tokens), 64)`` matrix of +1/-1 per hash bit."""
+
+    digests = b"".join(_token_digest(token) for token in tokens)
+    values = np.frombuffer(digests, dtype=">u8").astype(np.uint64)
+    bits = (values[:, None] >> _BIT_SHIFTS) & np.uint64(1)
+    return bits.astype(np.int64) * 2 - 1
+
+
+def _fold(weights: np.ndarray) -> int:
+    return int(np.bitwise_or.reduce(_BIT_WEIGHTS[weights >= 0], initial=np.uint64(0)))
+
+
 def simhash64(text: str) -> int:
-    tokens = list(tokenize(text))
-    if not tokens:
+    counts = Counter(tokenize(text))
+    if not counts:
         return 0
-    vector = [0] * 64
-    for token in tokens:
-        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
-        value = int.from_bytes(digest, "big", signed=False)
-        for bit in range(64):
-            if value & (1 << bit):
-                vector[bit] += 1
-            else:
-                vector[bit] -= 1
-    result = 0
-    for bit, weight in enumerate(vector):
-        if weight >= 0:
-            result |= 1 << bit
-    return result
+    tokens = list(counts)
+    frequencies = np.fromiter(counts.values(), dtype=np.int64, count=len(tokens))
+    return _fold(frequencies @ _token_signs(tokens))
+
+
+def simhash_many(texts: Iterable[str]) -> List[int]:
+    """Return ``simhash64`` for every text, hashing shared tokens only once."""
+
+    documents = [Counter(tokenize(text)) for text in texts]
+    vocabulary: Dict[str, int] = {}
+    for counts in documents:
+        for token in counts:
+            vocabulary.setdefault(token, len(vocabulary))
+    if not vocabulary:
+        return [0 for _ in documents]
+    signs = _token_signs(list(vocabulary))
+    results: List[int] = []
+    for counts in documents:
+        if not counts:
+            results.append(0)
+            continue
+        rows = np.fromiter((vocabulary[token] for token in counts), dtype=np.int64)
+        frequencies = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        results.append(_fold(frequencies @ signs[rows]))
+    return results
 
 
 def hamming_distance(a: int, b: int) -> int:
     return (a ^ b).bit_count()
 
 
+def _band_masks(threshold: int) -> List[Tuple[int, int]]:
+    """Split 64 bits into ``threshold + 1`` contiguous ``(shift, mask)`` bands.
+
+    By the pigeonhole principle two signatures within ``threshold`` bits of each
+    other agree exactly on at least one band.
+    """
+
+    count = threshold + 1
+    bands: List[Tuple[int, int]] = []
+    shift = 0
+    for index in range(count):
+        width = 64 // count + (1 if index < 64 % count else 0)
+        bands.append((shift, (1 << width) - 1))
+        shift += width
+    return bands
+
+
+class _BandTable:
+    """Multi-index hashing table answering Hamming queries up to ``threshold``."""
+
+    def __init__(self, threshold: int) -> None:
+        self.bands = _band_masks(threshold)
+        self.tables: List[Dict[int, Set[str]]] = [{} for _ in self.bands]
+
+    def add(self, url: str, value: int) -> None:
+        for (shift, mask), table in zip(self.bands, self.tables):
+            table.setdefault((value >> shift) & mask, set()).add(url)
+
+    def discard(self, url: str, value: int) -> None:
+        for (shift, mask), table in zip(self.bands, self.tables):
+            key = (value >> shift) & mask
+            bucket = table.get(key)
+            if bucket is None:
+                continue
+            bucket.discard(url)
+            if not bucket:
+                del table[key]
+
+    def candidates(self, value: int) -> Set[str]:
+        found: Set[str] = set()
+        for (shift, mask), table in zip(self.bands, self.tables):
+            bucket = table.get((value >> shift) & mask)
+            if bucket:
+                found.update(bucket)
+        return found
+
+
 @dataclass
 class SimHashIndex:
+    """URL -> SimHash map with band-indexed near-duplicate lookups.
+
+    ``nearest`` consults per-threshold band tables (built lazily on first use
+    and kept current by ``update``) instead of scanning every signature, and
+    still returns the earliest-inserted match like the linear scan did.
+    """
+
+    _MAX_BANDED_THRESHOLD = 15
+
     entries: Dict[str, int]
+    _order: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    # Monotonic so a URL re-added after ``remove`` never shares a position.
+    _positions: Iterator[int] = field(default_factory=itertools.count, init=False, repr=False)
+    _tables: Dict[int, _BandTable] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._order = {url: next(self._positions) for url in self.entries}
 
     @classmethod
     def load(cls, path: Path) -> "SimHashIndex":
+        """Load ``path`` in the binary format, falling back to legacy JSON.
+
+        When ``path`` is missing, a ``.json`` sibling written by older releases
+        is read instead; the next :meth:`save` then writes the binary file.
+        """
+
         if not path.exists():
+            legacy = path.with_suffix(".json")
+            if legacy == path or not legacy.exists():
+                return cls(entries={})
+            path = legacy
+        try:
+            raw = path.read_bytes()
+        except OSError:
             return cls(entries={})
+        if raw.startswith(_BINARY_MAGIC):
+            try:
+                return cls(entries=cls._decode_binary(raw))
+            except ValueError:
+                return cls(entries={})
         try:
-            data = json.loads(path.read_text("utf-8"))
+            data = json.loads(raw.decode("utf-8"))
         except Exception:
             return cls(entries={})
         if not isinstance(data, dict):
@@ -65,14 +184,92 @@ class SimHashIndex:
                 continue
         return cls(entries=casted)
 
+    @staticmethod
+    def _decode_binary(raw: bytes) -> Dict[str, int]:
+        header = len(_BINARY_MAGIC) + 8
+        if len(raw) < header:
+            raise ValueError("truncated simhash index")
+        count = int.from_bytes(raw[len(_BINARY_MAGIC) : header], "little")
+        values_end = header + 8 * count
+        lengths_end = values_end + 4 * count
+        if len(raw) < lengths_end:
+            raise ValueError("truncated simhash index")
+        values = np.frombuffer(raw, dtype="<u8", count=count, offset=header)
+        lengths = np.frombuffer(raw, dtype="<u4", count=count, offset=values_end)
+        blob = raw[lengths_end:]
+        if len(blob) != int(lengths.sum()):
+            raise ValueError("corrupt simhash url table")
+        urls = blob.decode("utf-8")
+        # Lengths are byte counts. URLs are almost always ASCII, in which case
+        # byte and character offsets agree and the decoded text can be sliced.
+        entries: Dict[str, int] = {}
+        cursor = 0
+        if len(urls) == len(blob):
+            for url_length, value in zip(lengths.tolist(), values.tolist()):
+                entries[urls[cursor : cursor + url_length]] = value
+                cursor += url_length
+        else:
+            for url_length, value in zip(lengths.tolist(), values.tolist()):
+                entries[blob[cursor : cursor + url_length].decode("utf-8")] = value
+                cursor += url_length
+        return entries
+
     def save(self, path: Path) -> None:
-        path.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+        """Write a compact binary file: header, uint64 signatures, URL table."""
+
+        encoded = [url.encode("utf-8") for url in self.entries]
+        values = np.fromiter(self.entries.values(), dtype="<u8", count=len(encoded))
+        lengths = np.fromiter((len(url) for url in encoded), dtype="<u4", count=len(encoded))
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("wb") as handle:
+            handle.write(_BINARY_MAGIC)
+            handle.write(len(encoded).to_bytes(8, "little"))
+            handle.write(values.tobytes())
+            handle.write(lengths.tobytes())
+            handle.write(b"".join(encoded))
+        os.replace(tmp_path, path)
+
+    def _table(self, threshold: int) -> _BandTable:
+        table = self._tables.get(threshold)
+        if table is None:
+            table = _BandTable(threshold)
+            for url, value in self.entries.items():
+                table.add(url, value)
+            self._tables[threshold] = table
+        return table
 
     def nearest(self, target: int, threshold: int = 3) -> str | None:
-        for url, value in self.entries.items():
-            if hamming_distance(target, value) <= threshold:
-                return url
-        return None
+        if threshold < 0:
+            return None
+        if threshold > self._MAX_BANDED_THRESHOLD:
+            for url, value in self.entries.items():
+                if hamming_distance(target, value) <= threshold:
+                    return url
+            return None
+        matches = [
+            url
+            for url in self._table(threshold).candidates(target)
+            if hamming_distance(target, self.entries[url]) <= threshold
+        ]
+        if not matches:
+            return None
+        return min(matches, key=lambda url: self._order.get(url, len(self._order)))
 
     def update(self, url: str, value: int) -> None:
+        previous = self.entries.get(url)
+        if previous is not None:
+            for table in self._tables.values():
+                table.discard(url, previous)
+        else:
+            self._order[url] = next(self._positions)
         self.entries[url] = value
+        for table in self._tables.values():
+            table.add(url, value)
+
+    def remove(self, url: str) -> None:
+        value = self.entries.pop(url, None)
+        if value is None:
+            return
+        self._order.pop(url, None)
+        for table in self._tables.values():
+            table.discard(url, value)
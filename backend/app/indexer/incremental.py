@@ -2,24 +2,38 @@
 
 from __future__ import annotations
 
+import glob
 import hashlib
-import json
 import logging
+import os
 import shutil
+import tempfile
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, Mapping, Tuple
+from typing import Iterable, Iterator, Mapping, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
 
 from whoosh import index
 
 from rank.authority import AuthorityIndex
 
-from .dedupe import SimHashIndex, simhash64
+from .dedupe import simhash64
+from .ledger import IndexLedger
 from .schema import build_schema
 from ..metrics import metrics
 
 LOGGER = logging.getLogger(__name__)
 
+_GENERATION_LOCK = threading.Lock()
+_UPGRADE_LOCK = threading.Lock()
+_generation = 0
+
 REQUIRED_FIELDS = {"url", "lang", "title", "h1h2", "body"}
 
 
@@ -28,20 +42,6 @@ def _content_hash(doc: Mapping[str, str]) -> str:
     return hashlib.sha256(payload.encode("utf-8", errors="ignore")).hexdigest()
 
 
-def _load_json(path: Path) -> dict[str, str]:
-    if not path.exists():
-        return {}
-    try:
-        return json.loads(path.read_text("utf-8"))
-    except Exception:
-        LOGGER.warning("unable to parse ledger at %s", path)
-        return {}
-
-
-def _write_json(path: Path, payload: dict[str, str]) -> None:
-    path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
-
-
 _FIELD_BOOL_OPTIONS = ("stored", "unique", "sortable", "spelling", "scorable")
 
 
@@ -82,7 +82,98 @@ def _clear_index_dir(index_dir: Path) -> None:
             entry.unlink()
 
 
+def _stored_documents_reusable(current_schema) -> bool:
+    names = set(current_schema.names())
+    return all(
+        name in names and bool(getattr(current_schema[name], "stored", False))
+        for name in REQUIRED_FIELDS
+    )
+
+
+@contextmanager
+def _upgrade_lock(index_dir: Path) -> Iterator[None]:
+    """Serialize opening/upgrading ``index_dir`` across threads and processes."""
+
+    lock_path = index_dir.with_name(index_dir.name + ".lock")
+    with _UPGRADE_LOCK, lock_path.open("a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _rebuild_from_stored(ix, index_dir: Path, schema):
+    """Re-create the index at ``index_dir`` with ``schema`` from ``ix``'s stored fields.
+
+    The new index is built in a private sibling directory and swapped in with
+    two ``os.replace`` calls once every stored document has been written, so
+    ``index_dir`` always holds a complete index. Raises if the rebuild fails,
+    leaving the old index untouched.
+    """
+
+    staging = Path(tempfile.mkdtemp(prefix=index_dir.name + ".rebuild-", dir=index_dir.parent))
+    count = 0
+    try:
+        rebuilt = index.create_in(staging, schema)
+        writer = rebuilt.writer(limitmb=256)
+        try:
+            with ix.searcher() as searcher:
+                for stored in searcher.reader().all_stored_fields():
+                    document = {name: stored.get(name) or "" for name in REQUIRED_FIELDS}
+                    if not document["url"]:
+                        continue
+                    document["lang"] = document["lang"] or "unknown"
+                    writer.add_document(**document)
+                    count += 1
+        except BaseException:
+            writer.cancel()
+            raise
+        writer.commit()
+        rebuilt.close()
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    ix.close()
+    retired = Path(tempfile.mkdtemp(prefix=index_dir.name + ".old-", dir=index_dir.parent))
+    os.rmdir(retired)
+    os.replace(index_dir, retired)
+    try:
+        os.replace(staging, index_dir)
+    except BaseException:
+        os.replace(retired, index_dir)
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    shutil.rmtree(retired, ignore_errors=True)
+    LOGGER.info("re-indexed %d stored documents at %s", count, index_dir)
+    return index.open_dir(index_dir)
+
+
+def _recover_interrupted_swap(index_dir: Path) -> None:
+    """Finish or undo a swap cut short by a crash, and drop stale build dirs."""
+
+    pattern = glob.escape(index_dir.name)
+    retired = sorted(index_dir.parent.glob(pattern + ".old-*"), key=lambda path: path.stat().st_mtime)
+    if retired and not (index_dir.is_dir() and index.exists_in(index_dir)):
+        LOGGER.warning("restoring %s from interrupted re-index at %s", index_dir, retired[-1])
+        if index_dir.is_dir():
+            shutil.rmtree(index_dir)
+        os.replace(retired.pop(), index_dir)
+    for stale in retired + list(index_dir.parent.glob(pattern + ".rebuild-*")):
+        shutil.rmtree(stale, ignore_errors=True)
+
+
 def ensure_index(index_dir: Path):
+    index_dir = Path(index_dir)
+    index_dir.parent.mkdir(parents=True, exist_ok=True)
+    with _upgrade_lock(index_dir):
+        _recover_interrupted_swap(index_dir)
+        return _ensure_index_locked(index_dir)
+
+
+def _ensure_index_locked(index_dir: Path):
     index_dir.mkdir(parents=True, exist_ok=True)
     schema = build_schema()
     if index.exists_in(index_dir):
@@ -111,6 +202,18 @@ def ensure_index(index_dir: Path):
                     )
                     raise
                 return ix
+            if _stored_documents_reusable(ix.schema):
+                LOGGER.warning(
+                    "re-indexing stored documents at %s due to schema change (%s)",
+                    index_dir,
+                    reason,
+                )
+                try:
+                    return _rebuild_from_stored(ix, index_dir, schema)
+                except Exception:
+                    # Keep serving the old index; the upgrade is retried on the next open.
+                    LOGGER.exception("re-indexing %s failed; keeping the existing index", index_dir)
+                    return index.open_dir(index_dir)
             LOGGER.warning(
                 "rebuilding search index at %s due to schema change (%s); legacy documents will be re-indexed on the next crawl",
                 index_dir,
@@ -131,6 +234,156 @@ def ensure_index(index_dir: Path):
     return index.create_in(index_dir, schema)
 
 
+def index_generation() -> int:
+    """Return the newest index generation committed by this process.
+
+    Readers compare it against the generation they last saw to pick up
+    commits without touching the ``last_index_time`` marker on disk.
+    """
+
+    return _generation
+
+
+def publish_index_generation(value: int) -> None:
+    """Advance the in-process index generation to ``value`` if it is newer."""
+
+    global _generation
+    with _GENERATION_LOCK:
+        if value > _generation:
+            _generation = value
+
+
+def _write_index_time(path: Path) -> int:
+    """Record the index generation, moving forward even within one second."""
+
+    now = int(time.time())
+    try:
+        previous = int(path.read_text(encoding="utf-8").strip() or 0)
+    except (OSError, ValueError):
+        previous = 0
+    generation = max(now, previous + 1, _generation + 1)
+    path.write_text(f"{generation}\n", encoding="utf-8")
+    publish_index_generation(generation)
+    return generation
+
+
+class IncrementalIndexer:
+    """Index documents into Whoosh in batches, committing after each one.
+
+    A long-running job keeps one instance open and calls :meth:`add` as
+    documents arrive; every batch is committed (writer, ledger, authority and
+    the ``last_index_time`` generation marker) so it is searchable right away.
+    Whoosh writes go through the shared
+    :class:`~backend.app.indexer.writer.IndexWriterService` for the index, so
+    concurrent jobs share grouped commits instead of contending for the lock.
+    """
+
+    def __init__(
+        self,
+        index_dir: Path,
+        ledger_path: Path,
+        simhash_path: Path,
+        last_index_time_path: Path,
+    ) -> None:
+        from .writer import get_index_writer
+
+        self.writer = get_index_writer(index_dir, last_index_time_path=last_index_time_path)
+        self.ix = self.writer.ix
+        self.ledger = IndexLedger.open(ledger_path, simhash_path=simhash_path)
+        self.sim_index = self.ledger.simhash_index()
+        self.authority = AuthorityIndex.load_default()
+        self.last_index_time_path = last_index_time_path
+        self.added = self.skipped = self.deduped = 0
+
+    def add(self, docs: Iterable[Mapping[str, str]]) -> Tuple[int, int, int]:
+        """Index ``docs`` and commit; returns this batch's ``(added, skipped, deduped)``."""
+
+        added = skipped = deduped = 0
+        ledger = self.ledger
+        pending: list[dict[str, str]] = []
+        indexed_docs: list[Mapping[str, str]] = []
+        # Ledger rows are staged only once Whoosh has the documents; until then
+        # the batch's hashes and SimHash changes live here so a failed write
+        # can be undone instead of leaving the URLs marked as unchanged.
+        records: dict[str, tuple[str, int | None]] = {}
+        replaced: dict[str, int | None] = {}
+        try:
+            for doc in docs:
+                url = (doc.get("url") or "").strip()
+                body = (doc.get("body") or "").strip()
+                if not url or not body:
+                    skipped += 1
+                    continue
+                signature = _content_hash(doc)
+                staged = records.get(url)
+                previous_signature = staged[0] if staged else ledger.content_hash(url)
+                if previous_signature == signature:
+                    skipped += 1
+                    continue
+                sim_signature = simhash64(body)
+                duplicate_url = self.sim_index.nearest(sim_signature, threshold=3)
+                if duplicate_url and duplicate_url != url:
+                    records[url] = (signature, None)
+                    deduped += 1
+                    continue
+                pending.append(
+                    {
+                        "url": url,
+                        "title": doc.get("title", ""),
+                        "h1h2": doc.get("h1h2", ""),
+                        "body": body,
+                        "lang": doc.get("lang", "unknown"),
+                    }
+                )
+                records[url] = (signature, sim_signature)
+                replaced.setdefault(url, self.sim_index.entries.get(url))
+                self.sim_index.update(url, sim_signature)
+                added += 1
+                indexed_docs.append(doc)
+        finally:
+            self._commit_batch(pending, records, replaced)
+
+        if indexed_docs:
+            self.authority.update_from_docs(indexed_docs)
+            self.authority.save()
+        metrics.record_index_results(added, skipped, deduped, self.ix.doc_count())
+        self.added += added
+        self.skipped += skipped
+        self.deduped += deduped
+        return added, skipped, deduped
+
+    def _commit_batch(
+        self,
+        pending: list[dict[str, str]],
+        records: Mapping[str, tuple[str, int | None]],
+        replaced: Mapping[str, int | None],
+    ) -> None:
+        try:
+            if pending:
+                # Wait for the grouped commit so the ledger never runs ahead of the index.
+                self.writer.update_documents(pending).result()
+        except BaseException:
+            for url, previous in replaced.items():
+                if previous is None:
+                    self.sim_index.remove(url)
+                else:
+                    self.sim_index.update(url, previous)
+            self.ledger.discard()
+            raise
+        for url, (signature, sim_signature) in records.items():
+            self.ledger.record(url, signature, sim_signature)
+        self.ledger.commit()
+
+    def close(self) -> None:
+        self.ledger.close()
+
+    def __enter__(self) -> "IncrementalIndexer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
 def incremental_index(
     index_dir: Path,
     ledger_path: Path,
@@ -140,56 +393,16 @@ def incremental_index(
 ) -> Tuple[int, int, int]:
     """Index the provided documents incrementally.
 
+    Content hashes and SimHash signatures live in the SQLite ledger at
+    ``ledger_path``; only rows for changed documents are written. Legacy JSON
+    ledger/SimHash files are imported the first time the ledger is opened.
+
     Returns a tuple ``(added, skipped, deduped)``.
     """
 
-    ix = ensure_index(index_dir)
-    ledger = _load_json(ledger_path)
-    sim_index = SimHashIndex.load(simhash_path)
-
-    added = skipped = deduped = 0
-    authority = AuthorityIndex.load_default()
-    writer = ix.writer(limitmb=256)
-    indexed_docs: list[Mapping[str, str]] = []
-    try:
-        for doc in docs:
-            url = (doc.get("url") or "").strip()
-            body = (doc.get("body") or "").strip()
-            if not url or not body:
-                skipped += 1
-                continue
-            signature = _content_hash(doc)
-            previous_signature = ledger.get(url)
-            if previous_signature == signature:
-                skipped += 1
-                continue
-            sim_signature = simhash64(body)
-            duplicate_url = sim_index.nearest(sim_signature, threshold=3)
-            if duplicate_url and duplicate_url != url:
-                ledger[url] = signature
-                deduped += 1
-                continue
-            writer.update_document(
-                url=url,
-                title=doc.get("title", ""),
-                h1h2=doc.get("h1h2", ""),
-                body=body,
-                lang=doc.get("lang", "unknown"),
-            )
-            ledger[url] = signature
-            sim_index.update(url, sim_signature)
-            added += 1
-            indexed_docs.append(doc)
-    finally:
-        writer.commit()
-
-    _write_json(ledger_path, ledger)
-    sim_index.save(simhash_path)
-    last_index_time_path.write_text(str(int(time.time())) + "\n", encoding="utf-8")
-    authority.update_from_docs(indexed_docs)
-    authority.save()
-    total_docs = ix.doc_count()
-    metrics.record_index_results(added, skipped, deduped, total_docs)
+    with IncrementalIndexer(index_dir, ledger_path, simhash_path, last_index_time_path) as indexer:
+        added, skipped, deduped = indexer.add(docs)
+        total_docs = indexer.ix.doc_count()
     LOGGER.info(
         "incremental index completed: added=%s skipped=%s deduped=%s total=%s",
         added,
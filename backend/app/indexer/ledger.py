@@ -0,0 +1,189 @@
+"""SQLite-backed ledger of indexed documents for :func:`incremental_index`.
+
+One row per URL records the content hash that was last indexed and the
+document's SimHash signature, so a batch only writes rows for the documents
+it actually changed. The database runs in WAL mode so searches and refreshes
+can read while an indexing batch commits.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+from .dedupe import SimHashIndex
+
+LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    simhash INTEGER
+);
+CREATE TABLE IF NOT EXISTS ledger_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_UINT64_MASK = (1 << 64) - 1
+
+
+def _to_sql(signature: int) -> int:
+    """Store unsigned 64-bit signatures in SQLite's signed INTEGER."""
+
+    signature &= _UINT64_MASK
+    return signature - (1 << 64) if signature >= 1 << 63 else signature
+
+
+def _from_sql(value: int) -> int:
+    return value & _UINT64_MASK
+
+
+def ledger_db_path(ledger_path: Path) -> Path:
+    """Return the SQLite file for ``ledger_path`` (legacy ``.json`` paths map to a sibling)."""
+
+    if ledger_path.suffix.lower() == ".json":
+        return ledger_path.with_suffix(".sqlite3")
+    return ledger_path
+
+
+class IndexLedger:
+    """Content hashes and SimHash signatures of every indexed URL."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._pending: dict[str, tuple[str, int | None]] = {}
+
+    @classmethod
+    def open(
+        cls, ledger_path: Path, *, simhash_path: Path | None = None
+    ) -> "IndexLedger":
+        """Open the ledger, importing legacy JSON state on first use."""
+
+        ledger = cls(ledger_db_path(ledger_path))
+        ledger._migrate(ledger_path.with_suffix(".json"), simhash_path)
+        return ledger
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "IndexLedger":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+    def _migrate(self, legacy_ledger: Path, simhash_path: Path | None) -> None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM ledger_meta WHERE key = 'migrated'"
+            ).fetchone()
+        if row is not None:
+            return
+        hashes: dict[str, str] = {}
+        if legacy_ledger.exists():
+            try:
+                payload = json.loads(legacy_ledger.read_text("utf-8"))
+            except Exception:
+                LOGGER.warning("unable to parse legacy ledger at %s", legacy_ledger)
+                payload = {}
+            if isinstance(payload, dict):
+                hashes = {str(url): str(value) for url, value in payload.items()}
+        signatures: dict[str, int] = {}
+        if simhash_path is not None:
+            signatures = SimHashIndex.load(simhash_path).entries
+        rows = [
+            (url, content_hash, _to_sql(signatures[url]) if url in signatures else None)
+            for url, content_hash in hashes.items()
+        ]
+        # Signatures without a ledger entry still take part in de-duplication.
+        rows.extend(
+            (url, "", _to_sql(signature))
+            for url, signature in signatures.items()
+            if url not in hashes
+        )
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO documents (url, content_hash, simhash) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ledger_meta (key, value) VALUES ('migrated', '1')"
+            )
+        if rows:
+            LOGGER.info("migrated %s ledger rows into %s", len(rows), self.path)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def content_hash(self, url: str) -> str | None:
+        pending = self._pending.get(url)
+        if pending is not None:
+            return pending[0]
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM documents WHERE url = ?", (url,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def simhash_index(self) -> SimHashIndex:
+        """Materialise a :class:`SimHashIndex` over every stored signature."""
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, simhash FROM documents WHERE simhash IS NOT NULL ORDER BY rowid"
+            ).fetchall()
+        return SimHashIndex(entries={url: _from_sql(value) for url, value in rows})
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def record(self, url: str, content_hash: str, simhash: int | None = None) -> None:
+        """Stage ``url``'s new hash (and signature); written by :meth:`commit`.
+
+        A ``None`` signature keeps whatever signature is already stored.
+        """
+
+        self._pending[url] = (content_hash, simhash)
+
+    def discard(self) -> None:
+        """Drop staged rows that were never committed."""
+
+        self._pending.clear()
+
+    def commit(self) -> int:
+        """Upsert staged rows and return how many were written."""
+
+        if not self._pending:
+            return 0
+        rows = [
+            (url, content_hash, None if simhash is None else _to_sql(simhash))
+            for url, (content_hash, simhash) in self._pending.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO documents (url, content_hash, simhash) VALUES (?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET content_hash = excluded.content_hash, "
+                "simhash = COALESCE(excluded.simhash, documents.simhash)",
+                rows,
+            )
+        self._pending.clear()
+        return len(rows)
+
+
+__all__ = ["IndexLedger", "ledger_db_path"]
@@ -7,11 +7,17 @@ from whoosh.analysis import StemmingAnalyzer
 
 
 def build_schema() -> Schema:
+    """Return the index schema.
+
+    ``body`` postings carry character offsets so result snippets can be cut
+    around the matched terms without re-analyzing the stored text.
+    """
+
     analyzer = StemmingAnalyzer()
     return Schema(
         url=ID(stored=True, unique=True),
         lang=ID(stored=True),
         title=TEXT(stored=True, field_boost=4.0, analyzer=analyzer, phrase=True),
         h1h2=TEXT(stored=True, field_boost=2.0, analyzer=analyzer, phrase=True),
-        body=TEXT(stored=True, analyzer=analyzer, phrase=True),
+        body=TEXT(stored=True, analyzer=analyzer, phrase=True, chars=True),
     )
@@ -0,0 +1,299 @@
+"""Single in-process Whoosh writer with grouped commits.
+
+Whoosh allows one writer per index. Instead of every job opening its own
+``ix.writer()`` and serializing on the lock, producers hand document updates
+and deletions to the :class:`IndexWriterService` for their index directory;
+its background thread folds everything queued within a short window into one
+commit and resolves each producer's future with the new index generation.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional
+
+from .incremental import (
+    _write_index_time,
+    ensure_index,
+    index_generation,
+    publish_index_generation,
+)
+
+__all__ = ["IndexWriterService", "close_index_writers", "get_index_writer"]
+
+LOGGER = logging.getLogger(__name__)
+
+WRITER_BATCH_DOCS = int(os.getenv("INDEX_WRITER_BATCH_DOCS", "1000"))
+WRITER_COMMIT_MS = float(os.getenv("INDEX_WRITER_COMMIT_MS", "200"))
+WRITER_MERGE = os.getenv("INDEX_WRITER_MERGE", "true").lower() not in {"0", "false", "no", "off"}
+WRITER_OPTIMIZE_EVERY = int(os.getenv("INDEX_WRITER_OPTIMIZE_EVERY", "0"))
+WRITER_LOCK_TIMEOUT = float(os.getenv("INDEX_WRITER_LOCK_TIMEOUT", "30"))
+WRITER_LIMIT_MB = int(os.getenv("INDEX_WRITER_LIMIT_MB", "256"))
+
+
+class _ApplyError(Exception):
+    """An operation failed while being written; the Whoosh writer was cancelled."""
+
+    def __init__(self, error: Exception) -> None:
+        super().__init__(str(error))
+        self.error = error
+
+
+@dataclass(slots=True)
+class _Operation:
+    kind: str
+    payload: list
+    future: Future
+
+
+class IndexWriterService:
+    """Apply queued adds and deletes to one Whoosh index in grouped commits.
+
+    A commit is issued once ``batch_docs`` documents are pending, once
+    ``commit_ms`` has passed since the first pending operation, or as soon as
+    :meth:`flush` is called. ``merge`` is passed to ``writer.commit`` (turn it
+    off to trade more segments for cheaper commits during bulk loads) and
+    every ``optimize_every``-th commit merges the index down to one segment.
+    Each commit advances the index generation, writing
+    ``last_index_time_path`` when one is known.
+    """
+
+    def __init__(
+        self,
+        index_dir: Path,
+        *,
+        last_index_time_path: Path | None = None,
+        batch_docs: int = WRITER_BATCH_DOCS,
+        commit_ms: float = WRITER_COMMIT_MS,
+        merge: bool = WRITER_MERGE,
+        optimize_every: int = WRITER_OPTIMIZE_EVERY,
+        lock_timeout: float = WRITER_LOCK_TIMEOUT,
+        limitmb: int = WRITER_LIMIT_MB,
+    ) -> None:
+        self.index_dir = Path(index_dir)
+        self.ix = ensure_index(self.index_dir)
+        self.last_index_time_path = last_index_time_path
+        self.batch_docs = max(1, int(batch_docs))
+        self.commit_seconds = max(0.0, float(commit_ms)) / 1000.0
+        self.merge = bool(merge)
+        self.optimize_every = max(0, int(optimize_every))
+        self.lock_timeout = float(lock_timeout)
+        self.limitmb = int(limitmb)
+        self._queue: "queue.Queue[_Operation | None]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.commits = 0
+        self.documents = 0
+        self.deletes = 0
+        self.last_commit_ms = 0.0
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+    def update_documents(self, docs: Iterable[Mapping[str, Any]]) -> "Future[int]":
+        """Queue ``writer.update_document`` calls; resolves with the commit's generation."""
+
+        return self._submit("update", [dict(doc) for doc in docs])
+
+    def delete_documents(self, urls: Iterable[str]) -> "Future[int]":
+        """Queue deletions by ``url``; resolves with the commit's generation."""
+
+        return self._submit("delete", [str(url) for url in urls])
+
+    def flush(self, timeout: float | None = None) -> int:
+        """Commit everything queued so far and wait for it to become searchable."""
+
+        return self._submit("flush", []).result(timeout=timeout)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "commits": self.commits,
+            "documents": self.documents,
+            "deletes": self.deletes,
+            "last_commit_ms": round(self.last_commit_ms, 3),
+        }
+
+    def close(self, timeout: float | None = 30.0) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout=timeout)
+
+    def _submit(self, kind: str, payload: list) -> Future:
+        operation = _Operation(kind, payload, Future())
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("index writer is closed")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"index-writer-{self.index_dir.name}", daemon=True
+                )
+                self._thread.start()
+            self._queue.put(operation)
+        return operation.future
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            pending = len(first.payload)
+            flush_now = first.kind == "flush"
+            deadline = time.monotonic() + self.commit_seconds
+            while not flush_now and pending < self.batch_docs:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    operation = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if operation is None:
+                    stopped = True
+                    break
+                batch.append(operation)
+                pending += len(operation.payload)
+                flush_now = operation.kind == "flush"
+            self._commit(batch)
+
+    def _commit(self, batch: list[_Operation]) -> None:
+        # Operations whose producer cancelled the future are dropped unwritten.
+        live = [operation for operation in batch if operation.future.set_running_or_notify_cancel()]
+        if not any(operation.payload for operation in live):
+            for operation in live:
+                operation.future.set_result(index_generation())
+            return
+        try:
+            generation = self._apply(live)
+        except _ApplyError as exc:
+            if sum(1 for operation in live if operation.payload) == 1:
+                self._fail(live, exc.error)
+                return
+            # One bad operation must not fail everyone grouped with it.
+            LOGGER.warning(
+                "grouped index commit failed for %s; retrying %d operations one at a time",
+                self.index_dir,
+                len(live),
+            )
+            for operation in live:
+                if not operation.payload:
+                    operation.future.set_result(index_generation())
+                    continue
+                try:
+                    operation.future.set_result(self._apply([operation]))
+                except _ApplyError as retry_exc:
+                    self._fail([operation], retry_exc.error)
+                except BaseException as retry_exc:  # noqa: BLE001 - handed to the producer
+                    self._fail([operation], retry_exc)
+            return
+        except BaseException as exc:  # noqa: BLE001 - handed to every producer
+            self._fail(live, exc)
+            return
+        for operation in live:
+            operation.future.set_result(generation)
+
+    def _apply(self, operations: list[_Operation]) -> int:
+        """Write ``operations`` in one commit and return the new generation.
+
+        Failures while applying an operation are raised as :class:`_ApplyError`
+        after the writer is cancelled; failures to lock or commit propagate.
+        """
+
+        started = time.perf_counter()
+        writer = self.ix.writer(limitmb=self.limitmb, timeout=self.lock_timeout)
+        documents = deletes = 0
+        try:
+            for operation in operations:
+                if operation.kind == "update":
+                    for doc in operation.payload:
+                        writer.update_document(**doc)
+                    documents += len(operation.payload)
+                elif operation.kind == "delete":
+                    for url in operation.payload:
+                        writer.delete_by_term("url", url)
+                    deletes += len(operation.payload)
+        except Exception as exc:
+            writer.cancel()
+            raise _ApplyError(exc) from exc
+        except BaseException:
+            writer.cancel()
+            raise
+        optimize = bool(self.optimize_every) and (self.commits + 1) % self.optimize_every == 0
+        writer.commit(merge=self.merge, optimize=optimize)
+        if self.last_index_time_path is not None:
+            generation = _write_index_time(self.last_index_time_path)
+        else:
+            generation = index_generation() + 1
+            publish_index_generation(generation)
+        self.commits += 1
+        self.documents += documents
+        self.deletes += deletes
+        self.last_commit_ms = (time.perf_counter() - started) * 1000.0
+        LOGGER.debug(
+            "committed %d documents and %d deletes from %d operations in %.1f ms",
+            documents,
+            deletes,
+            len(operations),
+            self.last_commit_ms,
+        )
+        return generation
+
+    def _fail(self, operations: list[_Operation], exc: BaseException) -> None:
+        LOGGER.error("index commit failed for %s", self.index_dir, exc_info=exc)
+        for operation in operations:
+            operation.future.set_exception(exc)
+
+
+# ----------------------------------------------------------------------
+# Per-index registry
+# ----------------------------------------------------------------------
+_WRITERS: dict[Path, IndexWriterService] = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+def get_index_writer(
+    index_dir: Path, *, last_index_time_path: Path | None = None
+) -> IndexWriterService:
+    """Return the process-wide writer service for ``index_dir``."""
+
+    key = Path(index_dir).resolve()
+    with _WRITERS_LOCK:
+        service = _WRITERS.get(key)
+        if service is None:
+            if not _WRITERS:
+                atexit.register(close_index_writers)
+            service = _WRITERS[key] = IndexWriterService(
+                key, last_index_time_path=last_index_time_path
+            )
+        elif last_index_time_path is not None and service.last_index_time_path is None:
+            service.last_index_time_path = last_index_time_path
+        return service
+
+
+def close_index_writers() -> None:
+    """Commit pending operations and stop every writer service."""
+
+    with _WRITERS_LOCK:
+        services = list(_WRITERS.values())
+        _WRITERS.clear()
+    for service in services:
+        service.close()
@@ -7,7 +7,11 @@ import hashlib
 import inspect
 import json
 import logging
+import os
+import queue
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence
@@ -20,8 +24,13 @@ from backend.app.services.categorizer import deterministic_categories
 from backend.app.services.progress_bus import ProgressBus
 
 from ..config import AppConfig
-from ..indexer.incremental import incremental_index
-from ..pipeline.normalize import normalize
+from ..indexer.incremental import IncrementalIndexer
+from ..pipeline.normalize import (
+    NORMALIZE_WORKERS,
+    ExtractionPool,
+    normalize_records,
+    write_normalized,
+)
 from .runner import JobRunner
 from server.learned_web_db import LearnedWebDB, get_db
 from backend.app.search.embedding import embed_query
@@ -30,6 +39,13 @@ from observability import start_span
 LOGGER = logging.getLogger(__name__)
 
 DEFAULT_DISCOVERY_DEPTH = 4
+# Pages are normalized and indexed while the crawl runs: every STREAM_BATCH_SIZE
+# pages or STREAM_COMMIT_SECONDS (whichever comes first) the batch is
+# committed and becomes searchable. At most STREAM_QUEUE_SIZE fetched pages wait
+# for the indexer before the crawler blocks.
+STREAM_BATCH_SIZE = int(os.getenv("FOCUSED_INDEX_BATCH", "16"))
+STREAM_COMMIT_SECONDS = float(os.getenv("FOCUSED_INDEX_COMMIT_SECONDS", "5"))
+STREAM_QUEUE_SIZE = int(os.getenv("FOCUSED_STREAM_QUEUE", "32"))
 
 if TYPE_CHECKING:  # pragma: no cover - typing only
     from crawler.frontier import Candidate
@@ -56,8 +72,14 @@ def run_focused_crawl(
     db: Optional[LearnedWebDB] = None,
     state_db: Optional[AppStateDB] = None,
     job_id: Optional[str] = None,
+    documents_callback: Optional[Callable[[List[Dict[str, object]]], None]] = None,
 ) -> dict:
-    """Execute the full focused crawl pipeline and return summary statistics."""
+    """Execute the full focused crawl pipeline and return summary statistics.
+
+    Fetched pages are normalized and indexed in batches while the crawl is
+    still running; ``documents_callback`` receives each committed batch (for
+    example to update the vector index alongside Whoosh).
+    """
 
     def _emit(stage: str, **payload: object) -> None:
         if not progress_callback:
@@ -175,57 +197,50 @@ def run_focused_crawl(
         )
 
         _emit("crawl_start", seed_count=len(seeds))
-        with start_span(
-            "focused_crawl.crawl",
-            attributes={"seed.count": len(seeds), "crawl.depth": depth_value},
-            inputs={"budget": budget, "use_llm": use_llm},
-        ) as crawl_span:
-            raw_path, pages = _crawl(
-                query,
-                budget,
-                use_llm,
-                model,
-                config,
-                seeds,
-                state_db=state_db,
-            )
-            if crawl_span is not None:
-                crawl_span.set_attribute("crawl.pages", len(pages))
+        stream = _StreamingIndexer(
+            config,
+            state_db=state_db,
+            job_id=job_id,
+            learned_db=learned_db,
+            emit=_emit,
+            documents_callback=documents_callback,
+        )
+        try:
+            with start_span(
+                "focused_crawl.crawl",
+                attributes={"seed.count": len(seeds), "crawl.depth": depth_value},
+                inputs={"budget": budget, "use_llm": use_llm},
+            ) as crawl_span:
+                raw_path, pages = _crawl(
+                    query,
+                    budget,
+                    use_llm,
+                    model,
+                    config,
+                    seeds,
+                    state_db=state_db,
+                    on_page=stream.submit,
+                )
+                if crawl_span is not None:
+                    crawl_span.set_attribute("crawl.pages", len(pages))
+        except BaseException:
+            # Let the crawl failure surface rather than an indexing error.
+            try:
+                stream.finish()
+            except Exception:
+                LOGGER.debug("focused crawl indexing also failed", exc_info=True)
+            raise
+        normalized_docs = stream.finish()
         _emit("crawl_complete", pages_fetched=len(pages), raw_path=str(raw_path) if raw_path else None)
         print(f"[focused] crawl fetched {len(pages)} page(s)")
         if raw_path:
             print(f"[focused] raw capture written to {raw_path}")
 
-        normalized_docs: List[Dict[str, object]] = []
         preview_samples: List[Dict[str, object]] = []
+        added, skipped, deduped = stream.added, stream.skipped, stream.deduped
         if pages and raw_path:
-            _emit("normalize_start", pages=len(pages))
-            with start_span(
-                "focused_crawl.normalize",
-                attributes={"pages": len(pages)},
-                inputs={"raw_path": str(raw_path)},
-            ) as normalize_span:
-                normalized_docs = normalize(
-                    config.crawl_raw_dir,
-                    config.normalized_path,
-                    append=True,
-                    sources=[raw_path],
-                )
-                if normalize_span is not None:
-                    normalize_span.set_attribute("docs", len(normalized_docs))
-            enriched_docs: List[Dict[str, object]] = []
-            for doc in normalized_docs:
-                url_value = str(doc.get("url") or "")
-                body = str(doc.get("body") or "")
-                categories, site = deterministic_categories(url_value, body)
-                tokens = len(body.split()) if body else 0
-                content_hash = str(doc.get("content_hash") or "")
-                doc["site"] = site
-                doc["categories"] = categories
-                doc["tokens"] = tokens
-                doc["verification"] = {"hash": content_hash, "sample": body[:200]}
-                enriched_docs.append(doc)
-            normalized_docs = enriched_docs
+            # Normalizing and indexing already happened batch by batch during
+            # the crawl (see ``index_progress``); this reports the totals.
             preview_samples = [
                 {
                     "url": doc.get("url"),
@@ -236,73 +251,17 @@ def run_focused_crawl(
                 }
                 for doc in normalized_docs[:5]
             ]
-            _emit("normalize_complete", docs=len(normalized_docs), preview=preview_samples)
             print(f"[focused] normalized {len(normalized_docs)} document(s)")
-            _emit("index_start", docs=len(normalized_docs))
-            with start_span(
-                "focused_crawl.index",
-                attributes={"docs": len(normalized_docs)},
-            ) as index_span:
-                added, skipped, deduped = incremental_index(
-                    config.index_dir,
-                    config.ledger_path,
-                    config.simhash_path,
-                    config.last_index_time_path,
-                    normalized_docs,
-                )
-                if index_span is not None:
-                    index_span.set_attribute("index.added", added)
-                    index_span.set_attribute("index.skipped", skipped)
-                    index_span.set_attribute("index.deduped", deduped)
-            if state_db is not None and job_id:
-                for doc in normalized_docs:
-                    url_value = str(doc.get("url") or "")
-                    content_hash = str(doc.get("content_hash") or "")
-                    if not url_value:
-                        continue
-                    doc_key = _document_key(url_value, content_hash or url_value)
-                    description = str(doc.get("h1h2") or doc.get("body", "")[:160])
-                    fetched_at = doc.get("fetched_at")
-                    try:
-                        fetched_ts = float(fetched_at) if fetched_at is not None else time.time()
-                    except (TypeError, ValueError):
-                        fetched_ts = time.time()
-                    state_db.upsert_document(
-                        job_id=job_id,
-                        document_id=doc_key,
-                        url=url_value,
-                        canonical_url=str(doc.get("canonical_url") or url_value),
-                        site=str(doc.get("site") or "") or None,
-                        title=str(doc.get("title") or "") or None,
-                        description=description or None,
-                        language=str(doc.get("lang") or "") or None,
-                        fetched_at=fetched_ts,
-                        normalized_path=str(config.normalized_path),
-                        text_len=len(str(doc.get("body") or "")),
-                        tokens=int(doc.get("tokens") or 0),
-                        content_hash=content_hash or None,
-                        categories=doc.get("categories") or [],
-                        labels=[],
-                        source="focused_crawl",
-                        verification=doc.get("verification") or {},
-                        outlinks=doc.get("outlinks") or [],
-                    )
-            if learned_db is not None:
-                try:
-                    urls_to_mark = [
-                        doc.get("url") for doc in normalized_docs if isinstance(doc.get("url"), str)
-                    ]
-                    learned_db.mark_pages_indexed(urls_to_mark, indexed_at=time.time())
-                except Exception:  # pragma: no cover - logging only
-                    LOGGER.debug("failed to mark pages indexed", exc_info=True)
             _emit(
                 "index_complete",
                 docs_indexed=added,
                 skipped=skipped,
                 deduped=deduped,
+                normalized=len(normalized_docs),
+                batches=stream.batches,
+                preview=preview_samples,
             )
         else:
-            added = skipped = deduped = 0
             if not seeds:
                 _emit("frontier_empty", mode=discovery_mode)
             else:
@@ -380,6 +339,214 @@ def run_focused_crawl(
     return stats
 
 
+def _enrich_document(doc: Dict[str, object]) -> Dict[str, object]:
+    url_value = str(doc.get("url") or "")
+    body = str(doc.get("body") or "")
+    categories, site = deterministic_categories(url_value, body)
+    content_hash = str(doc.get("content_hash") or "")
+    doc["site"] = site
+    doc["categories"] = categories
+    doc["tokens"] = len(body.split()) if body else 0
+    doc["verification"] = {"hash": content_hash, "sample": body[:200]}
+    return doc
+
+
+def _record_documents(
+    state_db: AppStateDB, job_id: str, config: AppConfig, docs: Sequence[Dict[str, object]]
+) -> None:
+    rows: List[Dict[str, object]] = []
+    for doc in docs:
+        url_value = str(doc.get("url") or "")
+        content_hash = str(doc.get("content_hash") or "")
+        if not url_value:
+            continue
+        doc_key = _document_key(url_value, content_hash or url_value)
+        description = str(doc.get("h1h2") or doc.get("body", "")[:160])
+        fetched_at = doc.get("fetched_at")
+        try:
+            fetched_ts = float(fetched_at) if fetched_at is not None else time.time()
+        except (TypeError, ValueError):
+            fetched_ts = time.time()
+        rows.append(
+            {
+                "job_id": job_id,
+                "document_id": doc_key,
+                "url": url_value,
+                "canonical_url": str(doc.get("canonical_url") or url_value),
+                "site": str(doc.get("site") or "") or None,
+                "title": str(doc.get("title") or "") or None,
+                "description": description or None,
+                "language": str(doc.get("lang") or "") or None,
+                "fetched_at": fetched_ts,
+                "normalized_path": str(config.normalized_path),
+                "text_len": len(str(doc.get("body") or "")),
+                "tokens": int(doc.get("tokens") or 0),
+                "content_hash": content_hash or None,
+                "categories": doc.get("categories") or [],
+                "labels": [],
+                "source": "focused_crawl",
+                "verification": doc.get("verification") or {},
+                "outlinks": doc.get("outlinks") or [],
+            }
+        )
+    if rows:
+        state_db.upsert_documents(rows)
+
+
+_STOP = object()
+
+
+class _StreamingIndexer:
+    """Normalize and index crawled pages on a worker thread during the crawl.
+
+    Raw page records travel through a bounded queue, so a slow indexer stalls
+    the crawler instead of piling up HTML in memory. Batches are extracted in
+    an :class:`ExtractionPool` when ``NORMALIZE_WORKERS`` is set. Each batch is
+    appended to the normalized JSONL, written to the Whoosh index and the
+    state/learned databases, and reported as an ``index_progress`` event.
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        *,
+        state_db: Optional[AppStateDB],
+        job_id: Optional[str],
+        learned_db: Optional[LearnedWebDB],
+        emit: Callable[..., None],
+        documents_callback: Optional[Callable[[List[Dict[str, object]]], None]] = None,
+        batch_size: Optional[int] = None,
+        commit_interval: Optional[float] = None,
+        queue_size: Optional[int] = None,
+    ) -> None:
+        self.config = config
+        self.state_db = state_db
+        self.job_id = job_id
+        self.learned_db = learned_db
+        self._emit = emit
+        self._documents_callback = documents_callback
+        self.batch_size = max(1, batch_size or STREAM_BATCH_SIZE)
+        self.commit_interval = max(0.1, commit_interval or STREAM_COMMIT_SECONDS)
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=max(1, queue_size or STREAM_QUEUE_SIZE))
+        self._docs: "OrderedDict[str, Dict[str, object]]" = OrderedDict()
+        self._indexer: Optional[IncrementalIndexer] = None
+        self._pool = ExtractionPool(NORMALIZE_WORKERS) if NORMALIZE_WORKERS > 0 else None
+        self._error: Optional[BaseException] = None
+        self._finished = False
+        self.pages = 0
+        self.batches = 0
+        self.added = self.skipped = self.deduped = 0
+        self._thread = threading.Thread(target=self._run, name="focused-index", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: Dict[str, object]) -> None:
+        """Queue one raw page record; blocks while the queue is full."""
+
+        self._queue.put(record)
+
+    def finish(self) -> List[Dict[str, object]]:
+        """Flush outstanding pages and return every normalized document."""
+
+        if not self._finished:
+            self._finished = True
+            self._queue.put(_STOP)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return list(self._docs.values())
+
+    def _run(self) -> None:
+        pending: List[Dict[str, object]] = []
+        deadline = time.monotonic() + self.commit_interval
+        stopped = False
+        try:
+            while not stopped:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    stopped = True
+                elif item is not None:
+                    self.pages += 1
+                    pending.append(item)
+                due = time.monotonic() >= deadline
+                if pending and (stopped or due or len(pending) >= self.batch_size):
+                    self._flush(pending)
+                    pending = []
+                if due:
+                    deadline = time.monotonic() + self.commit_interval
+        except BaseException as exc:
+            LOGGER.exception("focused crawl indexing failed", exc_info=True)
+            self._error = exc
+            # Keep consuming so producers blocked on the full queue are released.
+            while not stopped:
+                stopped = self._queue.get() is _STOP
+        finally:
+            if self._indexer is not None:
+                self._indexer.close()
+            if self._pool is not None:
+                self._pool.close()
+
+    def _flush(self, records: List[Dict[str, object]]) -> None:
+        config = self.config
+        with start_span(
+            "focused_crawl.normalize", attributes={"pages": len(records)}
+        ) as normalize_span:
+            docs = [
+                doc
+                for doc in normalize_records(records, workers=0, pool=self._pool)
+                if doc is not None
+            ]
+            if normalize_span is not None:
+                normalize_span.set_attribute("docs", len(docs))
+            if not docs:
+                return
+            write_normalized(config.normalized_path, docs, append=True)
+            for doc in docs:
+                _enrich_document(doc)
+        if self._indexer is None:
+            self._indexer = IncrementalIndexer(
+                config.index_dir,
+                config.ledger_path,
+                config.simhash_path,
+                config.last_index_time_path,
+            )
+        with start_span("focused_crawl.index", attributes={"docs": len(docs)}) as index_span:
+            added, skipped, deduped = self._indexer.add(docs)
+            if index_span is not None:
+                index_span.set_attribute("index.added", added)
+                index_span.set_attribute("index.skipped", skipped)
+                index_span.set_attribute("index.deduped", deduped)
+        self.added += added
+        self.skipped += skipped
+        self.deduped += deduped
+        self.batches += 1
+        for doc in docs:
+            self._docs[str(doc["url"])] = doc
+        if self.state_db is not None and self.job_id:
+            _record_documents(self.state_db, self.job_id, config, docs)
+        if self.learned_db is not None:
+            try:
+                urls_to_mark = [doc.get("url") for doc in docs if isinstance(doc.get("url"), str)]
+                self.learned_db.mark_pages_indexed(urls_to_mark, indexed_at=time.time())
+            except Exception:  # pragma: no cover - logging only
+                LOGGER.debug("failed to mark pages indexed", exc_info=True)
+        if self._documents_callback is not None:
+            try:
+                self._documents_callback(list(docs))
+            except Exception:  # pragma: no cover - logging only
+                LOGGER.exception("focused crawl documents callback failed", exc_info=True)
+        self._emit(
+            "index_progress",
+            pages=self.pages,
+            docs=len(self._docs),
+            docs_indexed=self.added,
+            skipped=self.skipped,
+            deduped=self.deduped,
+        )
+
+
 def _get_seed_candidates(
     query: str,
     budget: int,
@@ -468,10 +635,16 @@ def _crawl(
     seeds: Sequence[Candidate],
     *,
     state_db: AppStateDB | None = None,
+    on_page: Optional[Callable[[dict], None]] = None,
 ) -> tuple[Optional[Path], Sequence[object]]:
     if not seeds:
         return None, []
 
+    async def _on_result(page) -> None:
+        # ``on_page`` blocks while the indexing queue is full; run it off the
+        # event loop so only this worker waits.
+        await asyncio.to_thread(on_page, page.as_record(query))
+
     async def _run() -> FocusedCrawler:
         source_config = state_db.get_sources_config() if state_db is not None else SourceFollowConfig()
 
@@ -509,6 +682,7 @@ def _crawl(
             source_config=source_config,
             record_source_links=_record_links,
             record_missing_source=_record_missing,
+            on_result=_on_result if on_page is not None else None,
         )
         await crawler.run()
         return crawler
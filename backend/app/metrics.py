@@ -70,12 +70,31 @@ class MetricsRegistry:
         self.index_docs_skipped = Counter()
         self.dedupe_hits = Counter()
         self.playwright_uses = Counter()
+        self.robots_fetch_ms = Histogram()
+        self.robots_fetches = Counter()
+        self.robots_negative = Counter()
+        self.search_cache_hits = Counter()
+        self.search_cache_misses = Counter()
+        self.search_cache_evictions = 0
+        self.search_cache_entries = 0
+        self.search_cache_bytes = 0
+        self.embedding_cache_hits = Counter()
+        self.embedding_cache_misses = Counter()
+        self.db_calls: Dict[str, dict] = {}
+        self.db_latency_ms = Histogram()
+        self.db_wait_ms = Histogram()
+        self.browser_wait_ms = Histogram()
+        self.browser_render_ms = Histogram()
+        self.browser_renders: Dict[str, dict] = {}
+        self.browser_launches = Counter()
 
     def snapshot(self) -> Dict[str, object]:
         with self._lock:
             latency = self.search_latency_ms.percentiles()
             llm = self.llm_seed_ms.percentiles()
             snapshot = metrics_state.snapshot()
+            embed_hits = self.embedding_cache_hits.value
+            embed_lookups = embed_hits + self.embedding_cache_misses.value
             snapshot.update(
                 {
                     "search_latency_ms": latency,
@@ -85,6 +104,34 @@ class MetricsRegistry:
                     "index_docs_skipped": self.index_docs_skipped.value,
                     "dedupe_hits": self.dedupe_hits.value,
                     "playwright_uses": self.playwright_uses.value,
+                    "robots_fetch_ms": self.robots_fetch_ms.percentiles(),
+                    "robots_fetches": self.robots_fetches.value,
+                    "robots_negative": self.robots_negative.value,
+                    "search_cache": {
+                        "hits": self.search_cache_hits.value,
+                        "misses": self.search_cache_misses.value,
+                        "evictions": self.search_cache_evictions,
+                        "entries": self.search_cache_entries,
+                        "bytes": self.search_cache_bytes,
+                    },
+                    "embedding_cache": {
+                        "hits": embed_hits,
+                        "misses": self.embedding_cache_misses.value,
+                        "hit_rate": (embed_hits / embed_lookups) if embed_lookups else 0.0,
+                    },
+                    "state_db": {
+                        "latency_ms": self.db_latency_ms.percentiles(),
+                        "wait_ms": self.db_wait_ms.percentiles(),
+                        "methods": {name: dict(stats) for name, stats in self.db_calls.items()},
+                    },
+                    "browser_pool": {
+                        "wait_ms": self.browser_wait_ms.percentiles(),
+                        "render_ms": self.browser_render_ms.percentiles(),
+                        "launches": self.browser_launches.value,
+                        "consumers": {
+                            name: dict(stats) for name, stats in self.browser_renders.items()
+                        },
+                    },
                 }
             )
             return snapshot
@@ -93,10 +140,71 @@ class MetricsRegistry:
         with self._lock:
             self.search_latency_ms.add(ms)
 
+    def record_search_cache(
+        self, hit: bool, *, entries: int, size_bytes: int, evictions: int
+    ) -> None:
+        with self._lock:
+            (self.search_cache_hits if hit else self.search_cache_misses).incr()
+            self.search_cache_entries = int(entries)
+            self.search_cache_bytes = int(size_bytes)
+            self.search_cache_evictions = int(evictions)
+
+    def record_embedding_cache(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self.embedding_cache_hits.incr(hits)
+            self.embedding_cache_misses.incr(misses)
+
+    def record_db_call(
+        self, method: str, kind: str, wait_ms: float, duration_ms: float
+    ) -> None:
+        with self._lock:
+            self.db_latency_ms.add(duration_ms)
+            self.db_wait_ms.add(wait_ms)
+            stats = self.db_calls.get(method)
+            if stats is None:
+                stats = self.db_calls[method] = {
+                    "kind": kind,
+                    "calls": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "wait_ms": 0.0,
+                    "max_wait_ms": 0.0,
+                }
+            stats["calls"] += 1
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+            stats["wait_ms"] += wait_ms
+            stats["max_wait_ms"] = max(stats["max_wait_ms"], wait_ms)
+
+    def record_browser_render(
+        self, consumer: str, wait_ms: float, render_ms: float, ok: bool
+    ) -> None:
+        with self._lock:
+            self.browser_wait_ms.add(wait_ms)
+            self.browser_render_ms.add(render_ms)
+            stats = self.browser_renders.setdefault(
+                consumer, {"renders": 0, "failures": 0, "total_ms": 0.0, "wait_ms": 0.0}
+            )
+            stats["renders"] += 1
+            stats["failures"] += 0 if ok else 1
+            stats["total_ms"] += render_ms
+            stats["wait_ms"] += wait_ms
+
+    def record_browser_launch(self) -> None:
+        with self._lock:
+            self.browser_launches.incr()
+
     def record_crawl_pages(self, count: int) -> None:
         with self._lock:
             self.crawl_pages_fetched.incr(count)
 
+    def record_robots_fetch(self, ms: float, negative: bool = False) -> None:
+        with self._lock:
+            self.robots_fetch_ms.add(ms)
+            self.robots_fetches.incr()
+            if negative:
+                self.robots_negative.incr()
+
     def record_llm_seed_time(self, ms: float) -> None:
         with self._lock:
             self.llm_seed_ms.add(ms)
@@ -5,17 +5,25 @@ from __future__ import annotations
 import json
 import logging
 import hashlib
+import multiprocessing
+import os
 import re
+import threading
 import time
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 try:
     from bs4 import BeautifulSoup  # type: ignore[import-not-found]
 except ImportError:  # pragma: no cover - optional dependency
     BeautifulSoup = None
 
+try:
+    from lxml import html as lxml_html  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    lxml_html = None
+
 try:
     from langdetect import DetectorFactory, LangDetectException, detect  # type: ignore[import-not-found]
 except ImportError:  # pragma: no cover - optional dependency
@@ -36,6 +44,14 @@ LOGGER = logging.getLogger(__name__)
 if DetectorFactory is not None:
     DetectorFactory.seed = 42
 
+# Worker processes used for HTML extraction (0 keeps extraction in the calling
+# thread) and how long one document may take before it is dropped.
+NORMALIZE_WORKERS = int(os.getenv("NORMALIZE_WORKERS", "0"))
+NORMALIZE_DOC_TIMEOUT = float(os.getenv("NORMALIZE_DOC_TIMEOUT", "20"))
+_START_POLL_SECONDS = 0.05
+# Concurrent jobs append to the same normalized JSONL file.
+_WRITE_LOCK = threading.Lock()
+
 
 def _read_raw_documents(raw_dir: Path, sources: Optional[Sequence[Path]] = None) -> Iterator[Dict[str, object]]:
     paths: Sequence[Path]
@@ -98,6 +114,44 @@ def _collect_headings(html: str) -> str:
     return " \n".join(headings)
 
 
+def _element_text(element) -> str:
+    # Like BeautifulSoup's get_text(" "): inline children such as <br> or
+    # adjacent <span>s must not glue their words together.
+    return " ".join(" ".join(element.itertext()).split())
+
+
+def _parse_html(html: str) -> Tuple[str, str, str]:
+    """Return ``(body, headings, title)`` from a single parse of ``html``."""
+
+    if not html:
+        return "", "", ""
+    tree = None
+    if lxml_html is not None:
+        try:
+            tree = lxml_html.fromstring(html)
+        except Exception:
+            tree = None
+    if tree is None:
+        return _extract_text(html), _collect_headings(html), ""
+    title = " ".join((tree.findtext(".//title") or "").split())
+    headings: List[str] = []
+    for element in tree.iter("h1", "h2"):
+        text = _element_text(element)
+        if text:
+            headings.append(text)
+    body = ""
+    if trafilatura_extract:
+        try:
+            body = (trafilatura_extract(tree, include_comments=False, include_links=False) or "").strip()
+        except Exception:
+            body = ""
+    if not body:
+        for element in tree.xpath("//script|//style|//noscript"):
+            element.drop_tree()
+        body = _element_text(tree)
+    return body, " \n".join(headings), title
+
+
 def _detect_language(text: str) -> str:
     sample = text[:1000]
     if not sample.strip():
@@ -108,65 +162,249 @@ def _detect_language(text: str) -> str:
         return "unknown"
 
 
+def normalize_record(record: Dict[str, object]) -> Optional[Dict[str, object]]:
+    """Turn one raw crawl record into a search document, or ``None`` to drop it."""
+
+    url = str(record.get("url") or "").strip()
+    status = int(record.get("status") or 0)
+    if not url or status >= 400:
+        return None
+    html = str(record.get("html") or "")
+    body, headings, parsed_title = _parse_html(html)
+    if not body:
+        return None
+    title = str(record.get("title") or "") or parsed_title
+    lang_hint = str(record.get("lang") or "").strip()
+    lang = lang_hint or _detect_language(body)
+    fetched_at = record.get("fetched_at")
+    try:
+        fetched_ts = float(fetched_at) if fetched_at is not None else time.time()
+    except (TypeError, ValueError):
+        fetched_ts = time.time()
+    canonical = record.get("canonical_url")
+    canonical_url = str(canonical).strip() or url
+    content_hash = record.get("content_hash")
+    if not isinstance(content_hash, str) or not content_hash:
+        content_hash = hashlib.sha256(body.encode("utf-8", errors="ignore")).hexdigest()
+    outlinks_raw = record.get("outlinks") or []
+    if isinstance(outlinks_raw, str):
+        outlinks_list = [item.strip() for item in outlinks_raw.split(",") if item.strip()]
+    elif isinstance(outlinks_raw, list):
+        outlinks_list = [str(link) for link in outlinks_raw[:200]]
+    else:
+        outlinks_list = []
+    return {
+        "url": url,
+        "canonical_url": canonical_url,
+        "title": title,
+        "h1h2": headings,
+        "body": body,
+        "lang": lang,
+        "fetched_at": fetched_ts,
+        "content_hash": content_hash,
+        "outlinks": outlinks_list,
+    }
+
+
+_started_queue = None
+
+
+_WARMUP_RECORD = {
+    "url": "https://warmup.invalid/",
+    "status": 200,
+    "html": "<html><head><title>Warm up</title></head><body><h1>Warm up</h1>"
+    "<p>This paragraph loads the extraction and language models once per worker.</p></body></html>",
+}
+
+
+def _init_extraction_worker(started) -> None:
+    global _started_queue
+    _started_queue = started
+    # Trafilatura and langdetect load lazily on first use; pay that before
+    # the worker takes a document so it does not count against the timeout.
+    _normalize_worker(_WARMUP_RECORD)
+
+
+def _run_extraction(target, token: int, record: Dict[str, object]) -> Optional[Dict[str, object]]:
+    # Tell the parent the document left the queue so its timeout starts now,
+    # not while it waited for a worker to spawn or free up.
+    if _started_queue is not None:
+        _started_queue.put(token)
+    return target(record)
+
+
+def _normalize_worker(record: Dict[str, object]) -> Optional[Dict[str, object]]:
+    try:
+        return normalize_record(record)
+    except Exception:
+        LOGGER.debug("failed to normalize %s", record.get("url"), exc_info=True)
+        return None
+
+
+class ExtractionPool:
+    """Process pool running :func:`normalize_record` off the calling thread.
+
+    :meth:`imap` streams results back in input order with at most
+    ``max_inflight`` documents outstanding. A document that takes longer than
+    ``timeout`` seconds once a worker picks it up yields ``None``; the pool is
+    restarted so the stuck worker cannot hold up the rest of the batch.
+    """
+
+    _target = staticmethod(_normalize_worker)
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        *,
+        timeout: float = NORMALIZE_DOC_TIMEOUT,
+        max_inflight: Optional[int] = None,
+    ) -> None:
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.timeout = timeout
+        self.max_inflight = max(1, max_inflight or self.workers * 4)
+        self.timeouts = 0
+        # Spawned workers do not inherit the caller's threads or locks.
+        self._context = multiprocessing.get_context("spawn")
+        self._pool = None
+        self._started = None
+        self._started_at: Dict[int, float] = {}
+        self._tokens = 0
+        self._taken = 0
+
+    def imap(self, records: Iterable[Dict[str, object]]) -> Iterator[Optional[Dict[str, object]]]:
+        window: Deque[Tuple[int, Dict[str, object], object]] = deque()
+        for record in records:
+            window.append(self._submit(record))
+            if len(window) >= self.max_inflight:
+                yield self._take(window)
+        while window:
+            yield self._take(window)
+
+    def _submit(self, record: Dict[str, object]) -> Tuple[int, Dict[str, object], object]:
+        if self._pool is None:
+            self._started = self._context.SimpleQueue()
+            self._pool = self._context.Pool(
+                self.workers, initializer=_init_extraction_worker, initargs=(self._started,)
+            )
+        self._tokens += 1
+        token = self._tokens
+        return token, record, self._pool.apply_async(_run_extraction, (self._target, token, record))
+
+    def _drain_started(self) -> None:
+        started = self._started
+        while started is not None and not started.empty():
+            token = started.get()
+            # Documents are taken in submission order; older tokens are done.
+            if token >= self._taken:
+                self._started_at.setdefault(token, time.monotonic())
+
+    def _take(self, window: Deque[Tuple[int, Dict[str, object], object]]) -> Optional[Dict[str, object]]:
+        token, record, pending = window.popleft()
+        self._taken = token
+        try:
+            while True:
+                self._drain_started()
+                started_at = self._started_at.get(token)
+                if started_at is None:
+                    # Still queued behind other documents or a spawning worker.
+                    wait = _START_POLL_SECONDS
+                else:
+                    wait = started_at + self.timeout - time.monotonic()
+                    if wait <= 0:
+                        break
+                try:
+                    return pending.get(wait)
+                except multiprocessing.TimeoutError:
+                    continue
+        finally:
+            self._started_at.pop(token, None)
+        self.timeouts += 1
+        LOGGER.warning(
+            "normalization of %s exceeded %.1fs; skipping", record.get("url"), self.timeout
+        )
+        self._restart(window)
+        return None
+
+    def _restart(self, window: Deque[Tuple[int, Dict[str, object], object]]) -> None:
+        self.close()
+        for index, (_, record, _) in enumerate(window):
+            window[index] = self._submit(record)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        if self._started is not None:
+            self._started.close()
+            self._started = None
+        self._started_at.clear()
+
+    def __enter__(self) -> "ExtractionPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def normalize_records(
+    records: Iterable[Dict[str, object]],
+    *,
+    workers: Optional[int] = None,
+    pool: Optional[ExtractionPool] = None,
+) -> Iterator[Optional[Dict[str, object]]]:
+    """Yield :func:`normalize_record` results for ``records`` in order.
+
+    Extraction runs in ``pool`` when given, otherwise in a temporary pool of
+    ``workers`` processes (default :data:`NORMALIZE_WORKERS`); with no
+    workers it runs in the calling thread.
+    """
+
+    if pool is not None:
+        yield from pool.imap(records)
+        return
+    workers = NORMALIZE_WORKERS if workers is None else workers
+    if workers <= 0:
+        for record in records:
+            yield normalize_record(record)
+        return
+    with ExtractionPool(workers) as temporary:
+        yield from temporary.imap(records)
+
+
+def write_normalized(
+    output_path: Path, docs: Iterable[Dict[str, object]], *, append: bool = False
+) -> None:
+    """Write ``docs`` as JSONL to ``output_path`` (appending when requested)."""
+
+    lines = "".join(json.dumps(doc, ensure_ascii=False) + "\n" for doc in docs)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with _WRITE_LOCK:
+        with output_path.open("a" if append else "w", encoding="utf-8") as handle:
+            handle.write(lines)
+
+
 def normalize(
     raw_dir: Path,
     output_path: Path,
     *,
     append: bool = False,
     sources: Optional[Sequence[Path]] = None,
+    workers: Optional[int] = None,
 ) -> List[Dict[str, str]]:
     """Normalize raw crawl documents into JSONL output.
 
-    Returns the list of normalized documents written to ``output_path``.
+    ``workers`` selects the number of extraction processes (see
+    :func:`normalize_records`). Returns the list of normalized documents
+    written to ``output_path``.
     """
 
     docs: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
-    for record in _read_raw_documents(raw_dir, sources=sources):
-        url = str(record.get("url") or "").strip()
-        status = int(record.get("status") or 0)
-        if not url or status >= 400:
-            continue
-        html = str(record.get("html") or "")
-        title = str(record.get("title") or "")
-        body = _extract_text(html)
-        if not body:
-            continue
-        headings = _collect_headings(html)
-        lang_hint = str(record.get("lang") or "").strip()
-        lang = lang_hint or _detect_language(body)
-        fetched_at = record.get("fetched_at")
-        try:
-            fetched_ts = float(fetched_at) if fetched_at is not None else time.time()
-        except (TypeError, ValueError):
-            fetched_ts = time.time()
-        canonical = record.get("canonical_url")
-        canonical_url = str(canonical).strip() or url
-        content_hash = record.get("content_hash")
-        if not isinstance(content_hash, str) or not content_hash:
-            content_hash = hashlib.sha256(body.encode("utf-8", errors="ignore")).hexdigest()
-        outlinks_raw = record.get("outlinks") or []
-        if isinstance(outlinks_raw, str):
-            outlinks_list = [item.strip() for item in outlinks_raw.split(",") if item.strip()]
-        elif isinstance(outlinks_raw, list):
-            outlinks_list = [str(link) for link in outlinks_raw[:200]]
-        else:
-            outlinks_list = []
-        docs[url] = {
-            "url": url,
-            "canonical_url": canonical_url,
-            "title": title,
-            "h1h2": headings,
-            "body": body,
-            "lang": lang,
-            "fetched_at": fetched_ts,
-            "content_hash": content_hash,
-            "outlinks": outlinks_list,
-        }
+    records = _read_raw_documents(raw_dir, sources=sources)
+    for doc in normalize_records(records, workers=workers):
+        if doc is not None:
+            docs[doc["url"]] = doc
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    mode = "a" if append and output_path.exists() else "w"
-    with output_path.open(mode, encoding="utf-8") as handle:
-        for doc in docs.values():
-            handle.write(json.dumps(doc, ensure_ascii=False) + "\n")
+    write_normalized(output_path, docs.values(), append=append)
     LOGGER.info("normalized %s document(s) into %s", len(docs), output_path)
     return list(docs.values())
@@ -0,0 +1,261 @@
+"""Concurrent hybrid retrieval with rank fusion.
+
+:class:`HybridRetriever` runs several retrievers (typically vector and BM25)
+side by side, each under its own deadline, and fuses their ranked lists with
+reciprocal-rank fusion or weighted min-max score normalization. Every
+retriever name gets its own small thread pool that never queues work, so a
+backend that hangs past its deadline cannot starve the others.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+__all__ = [
+    "HybridResult",
+    "HybridRetriever",
+    "HybridTimeoutError",
+    "RetrieverTiming",
+    "fuse_rankings",
+]
+
+LOGGER = logging.getLogger(__name__)
+
+HYBRID_FUSION = os.getenv("HYBRID_FUSION", "rrf").strip().lower() or "rrf"
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+HYBRID_DEADLINE_MS = float(os.getenv("HYBRID_DEADLINE_MS", "2000"))
+HYBRID_WORKERS = int(os.getenv("HYBRID_WORKERS", "4"))
+
+Retriever = Callable[[str, int], Sequence[Mapping[str, Any]]]
+
+
+class HybridTimeoutError(TimeoutError):
+    """Raised when no retriever produced results before its deadline."""
+
+    def __init__(self, message: str, timings: Mapping[str, "RetrieverTiming"]) -> None:
+        super().__init__(message)
+        self.timings = dict(timings)
+
+
+class _Lane:
+    """Thread pool for one retriever that refuses work when every worker is busy.
+
+    Calls abandoned at their deadline keep their worker until they finish, so
+    a hung backend fills its own lane and further calls are rejected at once
+    instead of queueing behind it.
+    """
+
+    def __init__(self, name: str, workers: int) -> None:
+        workers = max(1, workers)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"hybrid-{name}")
+        self._slots = threading.BoundedSemaphore(workers)
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Optional[Future]:
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future
+
+
+_LANES: dict[str, _Lane] = {}
+_LANES_LOCK = threading.Lock()
+
+
+def _lane(name: str) -> _Lane:
+    with _LANES_LOCK:
+        lane = _LANES.get(name)
+        if lane is None:
+            lane = _LANES[name] = _Lane(name, HYBRID_WORKERS)
+        return lane
+
+
+@dataclass(slots=True)
+class RetrieverTiming:
+    status: str
+    elapsed_ms: float
+    hits: int = 0
+    error: Optional[str] = None
+
+    def as_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "status": self.status,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "hits": self.hits,
+        }
+        if self.error:
+            payload["error"] = self.error
+        return payload
+
+
+@dataclass(slots=True)
+class HybridResult:
+    hits: list[dict[str, Any]]
+    timings: dict[str, RetrieverTiming] = field(default_factory=dict)
+    raw: dict[str, list[Mapping[str, Any]]] = field(default_factory=dict)
+
+    def timings_payload(self) -> dict[str, dict[str, Any]]:
+        return {name: timing.as_dict() for name, timing in self.timings.items()}
+
+
+def _score(hit: Mapping[str, Any]) -> float:
+    try:
+        return float(hit.get("score") or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def fuse_rankings(
+    rankings: Mapping[str, Sequence[Mapping[str, Any]]],
+    *,
+    method: str = HYBRID_FUSION,
+    rrf_k: int = HYBRID_RRF_K,
+    weights: Mapping[str, float] | None = None,
+) -> list[dict[str, Any]]:
+    """Fuse ranked hit lists keyed by retriever name into one list by ``url``.
+
+    ``method`` is ``"rrf"`` (sum of ``weight / (rrf_k + rank)``) or
+    ``"weighted"`` (sum of ``weight * min-max normalized score``). Each fused
+    hit keeps the fields of the first retriever that returned it, gains the
+    fused ``score`` and ``rank``, and lists per-retriever ranks and raw scores
+    under ``sources``. ``source`` names the retriever, or ``"hybrid"`` when
+    several agree.
+    """
+
+    if method not in {"rrf", "weighted"}:
+        raise ValueError(f"unknown fusion method: {method}")
+    fused: dict[str, dict[str, Any]] = {}
+    totals: dict[str, float] = {}
+    best_rank: dict[str, int] = {}
+    for name, hits in rankings.items():
+        weight = float((weights or {}).get(name, 1.0))
+        scores = [_score(hit) for hit in hits]
+        low = min(scores, default=0.0)
+        span = max(scores, default=0.0) - low
+        rank = 0
+        for hit, raw_score in zip(hits, scores):
+            url = str(hit.get("url") or "")
+            if not url:
+                continue
+            entry = fused.get(url)
+            if entry is not None and name in entry["sources"]:
+                continue
+            rank += 1
+            if method == "rrf":
+                contribution = weight / (rrf_k + rank)
+            else:
+                contribution = weight * ((raw_score - low) / span if span > 0 else 1.0)
+            if entry is None:
+                entry = fused[url] = dict(hit)
+                entry["sources"] = {}
+            elif not entry.get("snippet") and hit.get("snippet"):
+                entry["snippet"] = hit.get("snippet")
+            entry["sources"][name] = {"rank": rank, "score": raw_score}
+            totals[url] = totals.get(url, 0.0) + contribution
+            best_rank[url] = min(best_rank.get(url, rank), rank)
+    ordered = sorted(fused, key=lambda url: (-totals[url], best_rank[url]))
+    results: list[dict[str, Any]] = []
+    for position, url in enumerate(ordered, start=1):
+        entry = fused[url]
+        sources = entry["sources"]
+        entry["score"] = totals[url]
+        entry["rank"] = position
+        entry["source"] = next(iter(sources)) if len(sources) == 1 else "hybrid"
+        results.append(entry)
+    return results
+
+
+class HybridRetriever:
+    """Run retrievers concurrently under per-retriever deadlines and fuse them.
+
+    ``retrievers`` maps a name to ``fn(query, limit)`` returning hits with
+    ``url``, ``title``, ``snippet`` and ``score``. A retriever that misses its
+    deadline (``deadlines_ms``, else ``default_deadline_ms``) is reported as
+    ``timeout`` and left to finish in the background; one whose lane is full
+    of such calls is reported as ``saturated`` without running; one that
+    raises is reported as ``error``. When no retriever returns, the first
+    error is re-raised, or :class:`HybridTimeoutError` if none raised.
+    """
+
+    def __init__(
+        self,
+        retrievers: Mapping[str, Retriever],
+        *,
+        fusion: str = HYBRID_FUSION,
+        rrf_k: int = HYBRID_RRF_K,
+        weights: Mapping[str, float] | None = None,
+        deadlines_ms: Mapping[str, float] | None = None,
+        default_deadline_ms: float = HYBRID_DEADLINE_MS,
+        candidate_multiplier: int = 2,
+        lanes: Optional[Mapping[str, _Lane]] = None,
+    ) -> None:
+        self.retrievers = dict(retrievers)
+        self.fusion = fusion
+        self.rrf_k = int(rrf_k)
+        self.weights = dict(weights or {})
+        self.deadlines_ms = dict(deadlines_ms or {})
+        self.default_deadline_ms = float(default_deadline_ms)
+        self.candidate_multiplier = max(1, int(candidate_multiplier))
+        self._lanes = dict(lanes or {})
+
+    def search(self, query: str, *, k: int) -> HybridResult:
+        limit = max(1, int(k)) * self.candidate_multiplier
+        started = time.perf_counter()
+        rankings: dict[str, list[Mapping[str, Any]]] = {}
+        timings: dict[str, RetrieverTiming] = {}
+        errors: list[BaseException] = []
+        futures: dict[str, Future] = {}
+        for name, retriever in self.retrievers.items():
+            lane = self._lanes.get(name) or _lane(name)
+            future = lane.submit(self._timed, retriever, query, limit)
+            if future is None:
+                timings[name] = RetrieverTiming("saturated", 0.0)
+                LOGGER.warning("hybrid retriever %s is saturated; skipping it", name)
+                continue
+            futures[name] = future
+        for name, future in futures.items():
+            deadline = self.deadlines_ms.get(name, self.default_deadline_ms) / 1000.0
+            remaining = max(0.0, deadline - (time.perf_counter() - started))
+            try:
+                hits, elapsed_ms = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                future.cancel()
+                timings[name] = RetrieverTiming(
+                    "timeout", (time.perf_counter() - started) * 1000.0
+                )
+                LOGGER.debug("hybrid retriever %s missed its %.0f ms deadline", name, deadline * 1000)
+                continue
+            except Exception as exc:
+                errors.append(exc)
+                timings[name] = RetrieverTiming(
+                    "error", (time.perf_counter() - started) * 1000.0, error=str(exc) or type(exc).__name__
+                )
+                LOGGER.debug("hybrid retriever %s failed", name, exc_info=True)
+                continue
+            rankings[name] = list(hits or [])
+            timings[name] = RetrieverTiming("ok", elapsed_ms, hits=len(rankings[name]))
+        if not rankings:
+            if errors:
+                raise errors[0]
+            raise HybridTimeoutError("no retriever returned before its deadline", timings)
+        fused = fuse_rankings(
+            rankings, method=self.fusion, rrf_k=self.rrf_k, weights=self.weights
+        )
+        return HybridResult(hits=fused[: max(1, int(k))], timings=timings, raw=rankings)
+
+    @staticmethod
+    def _timed(retriever: Retriever, query: str, limit: int) -> tuple[Sequence[Mapping[str, Any]], float]:
+        started = time.perf_counter()
+        hits = retriever(query, limit)
+        return hits, (time.perf_counter() - started) * 1000.0
@@ -0,0 +1,130 @@
+"""Bounded LRU/TTL cache for :meth:`SearchService.run_query` results."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional, Sequence
+
+__all__ = ["CacheStats", "QueryResultCache", "estimate_size", "normalize_query"]
+
+
+def normalize_query(query: str | None, *, max_length: int) -> str:
+    """Collapse whitespace and truncate like :func:`search.query.search` does."""
+
+    collapsed = " ".join((query or "").split())
+    return collapsed[:max_length]
+
+
+def estimate_size(value: object) -> int:
+    """Rough byte size of a JSON-like result payload."""
+
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_size(k) + estimate_size(v) for k, v in value.items()) + 16
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value) + 8
+    return 8
+
+
+@dataclass(frozen=True, slots=True)
+class CacheStats:
+    entries: int
+    bytes: int
+    evictions: int
+
+
+@dataclass(slots=True)
+class _Entry:
+    results: tuple[dict, ...]
+    size: int
+    expires_at: float
+
+
+class QueryResultCache:
+    """LRU cache of ranked results, scoped to one index generation.
+
+    Entries expire after ``ttl_seconds`` and the cache is bounded by both
+    ``max_entries`` and ``max_bytes``. Looking up a different ``generation``
+    than the one the cache holds drops every entry, so an index commit
+    invalidates all cached results at once.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 256,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl_seconds: float = 60.0,
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._generation: Optional[int] = None
+        self._bytes = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_bytes > 0 and self.ttl_seconds > 0
+
+    def get(self, generation: int, key: Hashable) -> Optional[list[dict]]:
+        """Return a copy of the cached results for ``key`` or ``None``."""
+
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._sync_generation(generation)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return [dict(item) for item in entry.results]
+
+    def put(self, generation: int, key: Hashable, results: Sequence[dict]) -> None:
+        if not self.enabled:
+            return
+        stored = tuple(dict(item) for item in results)
+        size = estimate_size(stored)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._sync_generation(generation)
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = _Entry(stored, size, time.monotonic() + self.ttl_seconds)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(len(self._entries), self._bytes, self._evictions)
+
+    def _sync_generation(self, generation: int) -> None:
+        if generation != self._generation:
+            self._entries.clear()
+            self._bytes = 0
+            self._generation = generation
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
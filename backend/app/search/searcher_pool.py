@@ -0,0 +1,79 @@
+"""Reusable Whoosh searchers refreshed only when the index generation moves."""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager, suppress
+from typing import Any, Iterator
+
+__all__ = ["SearcherPool"]
+
+
+class SearcherPool:
+    """Hand out long-lived searchers over one Whoosh index.
+
+    Opening a searcher loads segment readers and term dictionaries, so the
+    pool keeps up to ``size`` idle searchers and reuses them across queries.
+    Each searcher remembers the generation it was opened at; when
+    :meth:`set_generation` has moved past it, the searcher is swapped for
+    ``searcher.refresh()`` on checkout, which reuses unchanged segments.
+    Checkout itself touches neither the index directory nor any marker file.
+
+    The pool mimics the parts of the index that :func:`search.query.search`
+    uses (``schema`` and ``searcher()``), so it can be passed in its place.
+    """
+
+    def __init__(self, ix: Any, *, size: int = 4, generation: int = 0) -> None:
+        self.ix = ix
+        self.schema = ix.schema
+        self.size = max(1, int(size))
+        self.generation = generation
+        self._idle: list[tuple[Any, int]] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.opened = 0
+        self.refreshed = 0
+
+    def set_generation(self, generation: int) -> None:
+        self.generation = generation
+
+    @contextmanager
+    def searcher(self) -> Iterator[Any]:
+        searcher, generation = self._checkout()
+        healthy = False
+        try:
+            yield searcher
+            healthy = True
+        finally:
+            self._checkin(searcher, generation, healthy)
+
+    def _checkout(self) -> tuple[Any, int]:
+        target = self.generation
+        with self._lock:
+            entry = self._idle.pop() if self._idle else None
+        if entry is None:
+            with self._lock:
+                self.opened += 1
+            return self.ix.searcher(), target
+        searcher, generation = entry
+        if generation != target:
+            searcher = searcher.refresh()
+            with self._lock:
+                self.refreshed += 1
+        return searcher, target
+
+    def _checkin(self, searcher: Any, generation: int, healthy: bool) -> None:
+        with self._lock:
+            if healthy and not self._closed and len(self._idle) < self.size:
+                self._idle.append((searcher, generation))
+                return
+        with suppress(Exception):
+            searcher.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for searcher, _ in idle:
+            with suppress(Exception):
+                searcher.close()
@@ -12,10 +12,12 @@ from search import query as query_module
 from rank import blend_results, maybe_rerank
 from observability import start_span
 from ..config import AppConfig
-from ..indexer.incremental import ensure_index
+from ..indexer.incremental import ensure_index, index_generation
 from ..jobs.focused_crawl import FocusedCrawlManager
 from ..metrics import metrics
 from .embedding import embed_query
+from .result_cache import QueryResultCache, normalize_query
+from .searcher_pool import SearcherPool
 
 LOGGER = logging.getLogger(__name__)
 
@@ -27,7 +29,15 @@ class SearchService:
         self._lock = threading.Lock()
         self._index = None
         self._index_dir = None
+        self._searchers: Optional[SearcherPool] = None
         self._index_generation = self._read_index_generation()
+        self._marker_poll_seconds = float(getattr(config, "search_index_poll_seconds", 2.0))
+        self._next_marker_poll = time.monotonic() + self._marker_poll_seconds
+        self._result_cache = QueryResultCache(
+            max_entries=getattr(config, "search_cache_entries", 256),
+            max_bytes=getattr(config, "search_cache_max_bytes", 16 * 1024 * 1024),
+            ttl_seconds=getattr(config, "search_cache_ttl", 60.0),
+        )
 
     def _read_index_generation(self) -> int:
         """Return a monotonic marker for the current on-disk index state."""
@@ -48,27 +58,66 @@ class SearchService:
         except ValueError:
             return 0
 
+    def _current_generation(self) -> int:
+        """Return the newest known index generation.
+
+        Commits made by this process bump :func:`index_generation` in memory;
+        the marker file, which other processes such as ``bin/reindex.py``
+        update, is re-read at most once per ``search_index_poll_seconds``.
+        """
+
+        generation = max(self._index_generation, index_generation())
+        now = time.monotonic()
+        if now >= self._next_marker_poll:
+            self._next_marker_poll = now + self._marker_poll_seconds
+            generation = max(generation, self._read_index_generation())
+        return generation
+
     def _get_index(self):
-        generation = self._read_index_generation()
+        """Return the searcher pool for the current index, refreshing it on new commits."""
+
+        generation = self._current_generation()
         with self._lock:
-            if (
-                self._index
-                and self._index_dir == self.config.index_dir
-                and self._index_generation == generation
-            ):
-                return self._index
-            self._index = ensure_index(self.config.index_dir)
-            self._index_dir = self.config.index_dir
-            self._index_generation = generation
-            return self._index
+            pool = self._searchers
+            if pool is None or self._index_dir != self.config.index_dir:
+                return self._open_index_locked(generation)
+            if generation != self._index_generation:
+                self._index_generation = generation
+                pool.set_generation(generation)
+            return pool
+
+    def _open_index_locked(self, generation: int) -> SearcherPool:
+        if self._searchers is not None:
+            self._searchers.close()
+        self._index = ensure_index(self.config.index_dir)
+        self._index_dir = self.config.index_dir
+        self._index_generation = generation
+        self._searchers = SearcherPool(
+            self._index,
+            size=getattr(self.config, "search_searcher_pool_size", 4),
+            generation=generation,
+        )
+        return self._searchers
 
     def reload_index(self) -> None:
         """Force the Whoosh index handle to be refreshed."""
 
+        generation = max(self._read_index_generation(), index_generation())
         with self._lock:
-            self._index = ensure_index(self.config.index_dir)
-            self._index_dir = self.config.index_dir
-            self._index_generation = self._read_index_generation()
+            self._open_index_locked(generation)
+        self._next_marker_poll = time.monotonic() + self._marker_poll_seconds
+        self._result_cache.clear()
+
+    def _cache_key(
+        self, query: str, limit: int, llm_enabled: bool, model: Optional[str]
+    ) -> tuple:
+        max_limit = self.config.search_max_limit
+        return (
+            normalize_query(query, max_length=self.config.max_query_length),
+            max(1, min(int(limit or 1), max_limit)),
+            llm_enabled,
+            (model or "") if llm_enabled else "",
+        )
 
     def _estimate_confidence(self, results: Sequence[dict]) -> float:
         if not results:
@@ -102,38 +151,29 @@ class SearchService:
             inputs={"query": query, "model": model},
         ) as span:
             ix = self._get_index()
-            with start_span(
-                "search.retrieve.whoosh",
-                attributes={"search.limit": limit},
-                inputs={"query": query},
-            ) as retrieve_span:
-                results = query_module.search(
-                    ix,
-                    query,
-                    limit=limit,
-                    max_limit=self.config.search_max_limit,
-                    max_query_length=self.config.max_query_length,
-                )
-                if retrieve_span is not None:
-                    retrieve_span.set_attribute("search.results", len(results))
-            duration_ms = (time.perf_counter() - start) * 1000
-            metrics.record_search_latency(duration_ms)
-
             q = (query or "").strip()
-            blended = blend_results(results)
             llm_enabled = self.config.use_llm_rerank if use_llm is None else bool(use_llm)
-            if llm_enabled:
-                with start_span(
-                    "search.rerank",
-                    attributes={"llm.model": model or "", "llm.enabled": True},
-                    inputs={"query": q, "candidates": len(blended)},
-                ) as rerank_span:
-                    reranked = maybe_rerank(q, blended, enabled=True, model=model)
-                    if rerank_span is not None:
-                        rerank_span.set_attribute("search.rerank.changed", reranked is not blended)
-                    if reranked is not blended:
-                        metrics.record_llm_usage_event()
-                    blended = reranked
+            generation = self._index_generation
+            cache_key = self._cache_key(q, limit, llm_enabled, model)
+            blended = self._result_cache.get(generation, cache_key)
+            cache_hit = blended is not None
+            if blended is None:
+                results = self._retrieve(ix, q, limit)
+            duration_ms = (time.perf_counter() - start) * 1000
+            metrics.record_search_latency(duration_ms)
+            if blended is None:
+                blended, complete = self._rank(q, results, llm_enabled, model)
+                if complete:
+                    self._result_cache.put(generation, cache_key, blended)
+            stats = self._result_cache.stats()
+            metrics.record_search_cache(
+                cache_hit,
+                entries=stats.entries,
+                size_bytes=stats.bytes,
+                evictions=stats.evictions,
+            )
+            if span is not None:
+                span.set_attribute("search.cache_hit", cache_hit)
 
             job_id: Optional[str] = None
             triggered = False
@@ -187,5 +227,48 @@ class SearchService:
                 span.set_attribute("search.duration_ms", int(duration_ms))
             return blended, job_id, context
 
+    def _retrieve(self, ix, q: str, limit: int) -> list[dict]:
+        with start_span(
+            "search.retrieve.whoosh",
+            attributes={"search.limit": limit},
+            inputs={"query": q},
+        ) as retrieve_span:
+            results = query_module.search(
+                ix,
+                q,
+                limit=limit,
+                max_limit=self.config.search_max_limit,
+                max_query_length=self.config.max_query_length,
+            )
+            if retrieve_span is not None:
+                retrieve_span.set_attribute("search.results", len(results))
+        return results
+
+    def _rank(
+        self, q: str, results: list[dict], llm_enabled: bool, model: Optional[str]
+    ) -> Tuple[list[dict], bool]:
+        """Blend and optionally rerank; the flag is False when the rerank did not apply.
+
+        Unreranked results are not cached so that a rerank finishing in the
+        background can be served on the next identical query.
+        """
+
+        blended = blend_results(results)
+        complete = True
+        if llm_enabled:
+            with start_span(
+                "search.rerank",
+                attributes={"llm.model": model or "", "llm.enabled": True},
+                inputs={"query": q, "candidates": len(blended)},
+            ) as rerank_span:
+                reranked = maybe_rerank(q, blended, enabled=True, model=model)
+                if rerank_span is not None:
+                    rerank_span.set_attribute("search.rerank.changed", reranked is not blended)
+                if reranked is not blended:
+                    metrics.record_llm_usage_event()
+                complete = reranked is not blended or not blended
+                blended = reranked
+        return blended, complete
+
     def last_index_time(self) -> int:
         return self.manager.last_index_time()
@@ -0,0 +1,381 @@
+"""Process-wide pool of warm headless Chromium browsers.
+
+Playwright's sync objects are bound to the thread that created them, so each
+browser lives on its own worker thread and callers submit a render function
+that receives a fresh page. :meth:`BrowserPool.run` blocks for the result,
+:meth:`BrowserPool.arun` awaits it from asyncio code; both share the same
+browsers, so shadow indexing, the crawler fallback and the extract API no
+longer pay for a Chromium launch per page.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping, Optional, Sequence, TypeVar
+from urllib.parse import urlsplit
+
+__all__ = [
+    "PRIORITY_BACKGROUND",
+    "PRIORITY_INTERACTIVE",
+    "BrowserPool",
+    "get_browser_pool",
+    "shutdown_browser_pool",
+]
+
+LOGGER = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.getenv("PLAYWRIGHT_POOL_SIZE", "2"))
+BROWSER_MAX_USES = int(os.getenv("PLAYWRIGHT_POOL_BROWSER_USES", "100"))
+CONTEXT_MAX_USES = int(os.getenv("PLAYWRIGHT_POOL_CONTEXT_USES", "20"))
+
+# Lower values are served first; jobs of equal priority run in FIFO order.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+_STOP_PRIORITY = 1 << 30
+
+T = TypeVar("T")
+Launcher = Callable[[bool], tuple[Any, Any]]
+RenderHook = Callable[[str, float, float, bool], None]
+
+
+def _launch_chromium(headless: bool) -> tuple[Any, Any]:
+    from playwright.sync_api import sync_playwright
+
+    driver = sync_playwright().start()
+    try:
+        browser = driver.chromium.launch(headless=headless)
+    except Exception:
+        with suppress(Exception):
+            driver.stop()
+        raise
+    return driver, browser
+
+
+def _origin(url: str | None) -> Optional[str]:
+    if not url:
+        return None
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+@dataclass(slots=True)
+class _Job:
+    fn: Callable[[Any], Any]
+    consumer: str
+    block: tuple[str, ...]
+    context_options: dict[str, Any]
+    origin: Optional[str]
+    future: Future
+    priority: int = PRIORITY_BACKGROUND
+    queued_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def context_key(self) -> str:
+        return json.dumps([self.block, self.context_options], sort_keys=True, default=str)
+
+
+@dataclass(slots=True)
+class _BrowserSlot:
+    driver: Any
+    browser: Any
+    uses: int = 0
+    context: Any = None
+    context_key: Optional[str] = None
+    context_origin: Optional[str] = None
+    context_uses: int = 0
+
+    def healthy(self) -> bool:
+        try:
+            return bool(self.browser.is_connected())
+        except Exception:
+            return False
+
+    def close_context(self) -> None:
+        if self.context is not None:
+            with suppress(Exception):
+                self.context.close()
+        self.context = None
+        self.context_key = None
+        self.context_origin = None
+        self.context_uses = 0
+
+    def close(self) -> None:
+        self.close_context()
+        with suppress(Exception):
+            self.browser.close()
+        if self.driver is not None:
+            with suppress(Exception):
+                self.driver.stop()
+
+
+def _abort_route(route: Any) -> None:
+    route.abort()
+
+
+class BrowserPool:
+    """Bounded set of long-lived browsers served by dedicated worker threads.
+
+    Each of the ``size`` workers owns one browser and renders one page at a
+    time. A worker keeps its last browser context warm only for jobs on the
+    same ``origin`` with the same blocked URL patterns and context options,
+    so storage and cache never carry over between sites; cookies are cleared
+    between uses and the context is recycled after ``context_max_uses``.
+    Jobs without an origin always get a fresh context. The browser itself is
+    relaunched after ``browser_max_uses`` renders or whenever it is found
+    disconnected. Queued jobs are served by ``priority`` so user-facing
+    renders (:data:`PRIORITY_INTERACTIVE`) overtake background work such as
+    shadow indexing. ``on_render(consumer, wait_ms, render_ms, ok)`` and
+    ``on_launch()`` report pool wait time, render time and browser launches.
+    """
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE,
+        *,
+        headless: bool = True,
+        browser_max_uses: int = BROWSER_MAX_USES,
+        context_max_uses: int = CONTEXT_MAX_USES,
+        launcher: Launcher | None = None,
+        on_render: RenderHook | None = None,
+        on_launch: Callable[[], None] | None = None,
+    ) -> None:
+        self.size = max(1, int(size))
+        self.headless = bool(headless)
+        self.browser_max_uses = max(1, int(browser_max_uses))
+        self.context_max_uses = max(1, int(context_max_uses))
+        self._launcher = launcher or _launch_chromium
+        self._on_render = on_render
+        self._on_launch = on_launch
+        self._jobs: "queue.PriorityQueue[tuple[int, int, _Job | None]]" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._workers: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._busy = 0
+        self.launches = 0
+        self.recycles = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        fn: Callable[[Any], T],
+        *,
+        consumer: str = "default",
+        block: Sequence[str] = (),
+        context_options: Mapping[str, Any] | None = None,
+        origin: str | None = None,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> "Future[T]":
+        """Queue ``fn(page)`` on a pooled browser and return its future.
+
+        ``origin`` is the URL the job will load; only jobs on the same origin
+        share a warm browser context.
+        """
+
+        job = _Job(
+            fn,
+            consumer,
+            tuple(block),
+            dict(context_options or {}),
+            _origin(origin),
+            Future(),
+            int(priority),
+        )
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("browser pool is closed")
+            self._start_workers_locked()
+            self._jobs.put((job.priority, next(self._sequence), job))
+        return job.future
+
+    def run(
+        self,
+        fn: Callable[[Any], T],
+        *,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run ``fn(page)`` on a pooled browser and return its result.
+
+        When ``timeout`` expires the job is cancelled if it has not started
+        and :class:`TimeoutError` is raised.
+        """
+
+        future = self.submit(fn, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    async def arun(
+        self,
+        fn: Callable[[Any], T],
+        *,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> T:
+        """Async variant of :meth:`run`; ``fn`` still uses the sync page API."""
+
+        future = asyncio.wrap_future(self.submit(fn, **kwargs))
+        if timeout is None:
+            return await future
+        return await asyncio.wait_for(future, timeout)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "workers": len(self._workers),
+                "busy": self._busy,
+                "queued": self._jobs.qsize(),
+                "launches": self.launches,
+                "recycles": self.recycles,
+            }
+
+    def close(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+        for _ in workers:
+            self._jobs.put((_STOP_PRIORITY, next(self._sequence), None))
+        for worker in workers:
+            worker.join(timeout=timeout)
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+    def _start_workers_locked(self) -> None:
+        while len(self._workers) < self.size:
+            worker = threading.Thread(
+                target=self._serve,
+                name=f"browser-pool-{len(self._workers)}",
+                daemon=True,
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _serve(self) -> None:
+        slot: _BrowserSlot | None = None
+        try:
+            while True:
+                _, _, job = self._jobs.get()
+                if job is None:
+                    break
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                wait_ms = (time.perf_counter() - job.queued_at) * 1000.0
+                with self._lock:
+                    self._busy += 1
+                started = time.perf_counter()
+                ok = False
+                try:
+                    slot = self._checkout(slot)
+                    result = self._render(slot, job)
+                except BaseException as exc:  # noqa: BLE001 - handed to the caller
+                    if slot is not None:
+                        slot.close_context()
+                    job.future.set_exception(exc)
+                else:
+                    ok = True
+                    job.future.set_result(result)
+                finally:
+                    render_ms = (time.perf_counter() - started) * 1000.0
+                    with self._lock:
+                        self._busy -= 1
+                    if self._on_render is not None:
+                        with suppress(Exception):
+                            self._on_render(job.consumer, wait_ms, render_ms, ok)
+        finally:
+            if slot is not None:
+                slot.close()
+
+    def _checkout(self, slot: _BrowserSlot | None) -> _BrowserSlot:
+        if slot is not None and slot.uses < self.browser_max_uses and slot.healthy():
+            return slot
+        if slot is not None:
+            LOGGER.debug("recycling pooled browser after %d uses", slot.uses)
+            slot.close()
+            with self._lock:
+                self.recycles += 1
+        driver, browser = self._launcher(self.headless)
+        with self._lock:
+            self.launches += 1
+        if self._on_launch is not None:
+            with suppress(Exception):
+                self._on_launch()
+        return _BrowserSlot(driver, browser)
+
+    def _render(self, slot: _BrowserSlot, job: _Job) -> Any:
+        key = job.context_key
+        if (
+            slot.context is None
+            or slot.context_key != key
+            or job.origin is None
+            or slot.context_origin != job.origin
+            or slot.context_uses >= self.context_max_uses
+        ):
+            slot.close_context()
+            slot.context = slot.browser.new_context(**job.context_options)
+            slot.context_key = key
+            slot.context_origin = job.origin
+            for pattern in job.block:
+                slot.context.route(pattern, _abort_route)
+        elif slot.context_uses:
+            slot.context.clear_cookies()
+        slot.uses += 1
+        slot.context_uses += 1
+        page = slot.context.new_page()
+        try:
+            return job.fn(page)
+        finally:
+            with suppress(Exception):
+                page.close()
+
+
+# ----------------------------------------------------------------------
+# Process-wide instance
+# ----------------------------------------------------------------------
+_POOL: BrowserPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the shared pool, creating it (and its metrics hooks) on first use."""
+
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            from backend.app.metrics import metrics
+
+            _POOL = BrowserPool(
+                on_render=metrics.record_browser_render,
+                on_launch=metrics.record_browser_launch,
+            )
+            atexit.register(shutdown_browser_pool)
+        return _POOL
+
+
+def shutdown_browser_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close()
@@ -5,15 +5,19 @@ from __future__ import annotations
 import hashlib
 import math
 import sqlite3
+import threading
 from array import array
 from collections.abc import Sequence
 
-import requests
+from engine.llm.ollama_client import OllamaClient
 
 
 OLLAMA = "http://127.0.0.1:11434"
 EMBED_MODEL = "embeddinggemma"
 
+_CLIENT: OllamaClient | None = None
+_CLIENT_LOCK = threading.Lock()
+
 
 def _hash_key(text: str) -> str:
     """Return a stable content fingerprint for ``text``."""
@@ -36,25 +40,22 @@ def from_blob(blob: bytes) -> list[float]:
     return list(buffer)
 
 
+def _client() -> OllamaClient:
+    """Return the shared client so connections are reused across calls."""
+
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None or _CLIENT.base_url != OLLAMA.rstrip("/"):
+            _CLIENT = OllamaClient(OLLAMA, timeout=120)
+        return _CLIENT
+
+
 def embed_texts(texts: Sequence[str]) -> list[list[float]]:
-    """Call the Ollama embeddings endpoint for ``EMBED_MODEL``."""
+    """Embed ``texts`` with ``EMBED_MODEL`` using batched, pooled requests."""
 
     if not texts:
         return []
-
-    response = requests.post(
-        f"{OLLAMA}/api/embeddings",
-        json={"model": EMBED_MODEL, "input": list(texts)},
-        timeout=120,
-    )
-    response.raise_for_status()
-    data = response.json()
-
-    if "embeddings" in data:
-        return data["embeddings"]
-    if "embedding" in data:  # single input fallback
-        return [data["embedding"]]
-    raise RuntimeError(f"Unexpected embeddings response: {data}")
+    return _client().embed(EMBED_MODEL, list(texts))
 
 
 def ensure_embedding_cache(conn: sqlite3.Connection) -> None:
@@ -133,6 +133,7 @@ def _crawler_health() -> HealthComponent:
     detail = {
         "active": active,
         "recent": recent,
+        "queue": snapshot.get("queue"),
     }
     return HealthComponent("crawler", status, detail)
 
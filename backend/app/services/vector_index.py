@@ -15,11 +15,13 @@ from engine.config import EngineConfig
 from engine.data.store import VectorStore
 from engine.indexing.chunk import TokenChunker
 from engine.indexing.embed import EmbeddingError, OllamaEmbedder
+from engine.indexing.embed_cache import EmbeddingCache
 from engine.llm.ollama_client import OllamaClient, OllamaClientError
 
 from backend.app.config import AppConfig
 from backend.app.db import AppStateDB
 from backend.app.indexer.dedupe import SimHashIndex, simhash64
+from backend.app.metrics import metrics
 from backend.app.search.embedding import embed_query as _fallback_embed
 from backend.app.services import ollama_client as ollama_services
 from observability import start_span
@@ -27,6 +29,9 @@ from observability import start_span
 
 LOGGER = logging.getLogger(__name__)
 
+EMBED_CACHE_MEMORY_ENTRIES = int(os.getenv("EMBED_CACHE_MEMORY_ENTRIES", "4096"))
+EMBED_CACHE_MAX_BYTES = int(os.getenv("EMBED_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
 
 @dataclass(slots=True)
 class IndexResult:
@@ -111,7 +116,7 @@ class VectorIndexService:
         self._autopull_started = False
         self._lock = threading.RLock()
         self._embed_ready_event = threading.Event()
-        self._dedupe_path = app_config.agent_data_dir / "vector_simhash.json"
+        self._dedupe_path = app_config.agent_data_dir / "vector_simhash.bin"
         self._dedupe_path.parent.mkdir(parents=True, exist_ok=True)
         self._simhash_index = SimHashIndex.load(self._dedupe_path)
         self._last_dims = 0
@@ -122,7 +127,16 @@ class VectorIndexService:
         }
         self._embedder: OllamaEmbedder | None = None
         if not self._test_mode:
-            self._embedder = OllamaEmbedder(self._client, self._embed_model)
+            self._embedder = OllamaEmbedder(
+                self._client,
+                self._embed_model,
+                cache=EmbeddingCache(
+                    app_config.agent_data_dir / "embedding_cache.sqlite3",
+                    memory_entries=EMBED_CACHE_MEMORY_ENTRIES,
+                    max_bytes=EMBED_CACHE_MAX_BYTES,
+                    on_lookup=metrics.record_embedding_cache,
+                ),
+            )
         else:
             self._embed_ready_event.set()
         LOGGER.debug(
@@ -417,7 +431,7 @@ class VectorIndexService:
 
             if available:
                 try:
-                    self._embedder.embed_documents(["."])
+                    self._embedder.probe()
                 except EmbeddingError as exc:
                     last_error = str(exc)
                 else:
@@ -470,14 +484,16 @@ class VectorIndexService:
                 _fallback_embed(text, dimensions=self._TEST_EMBED_DIMS)
                 for text in texts
             ]
-        self._ensure_embedder_ready()
         assert self._embedder is not None  # noqa: S101
         with start_span(
             "vector_index.embed_documents",
             attributes={"doc.count": len(texts)},
         ):
             try:
-                vectors = self._embedder.embed_documents(texts)
+                # Cached texts need no model; Ollama is only probed on a miss.
+                vectors = self._embedder.embed_documents(
+                    texts, before_request=self._ensure_embedder_ready
+                )
             except EmbeddingError as exc:
                 raise EmbedderUnavailableError(
                     self._embed_model, detail=str(exc)
@@ -506,7 +522,6 @@ class VectorIndexService:
         last_exc: EmbedderUnavailableError | None = None
         for attempt in range(total_attempts):
             try:
-                self._ensure_embedder_ready()
                 return self._embed_documents(texts)
             except EmbedderUnavailableError as exc:
                 last_exc = exc
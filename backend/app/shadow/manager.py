@@ -13,10 +13,10 @@ import trafilatura
 from flask import Flask
 from playwright.sync_api import Error as PlaywrightError
 from playwright.sync_api import TimeoutError as PlaywrightTimeout
-from playwright.sync_api import sync_playwright
 
 from backend.app.db import AppStateDB
 from backend.app.jobs.runner import JobRunner
+from backend.app.services.browser_pool import get_browser_pool
 from backend.app.services.vector_index import IndexResult, VectorIndexService
 from server.json_logger import log_event
 
@@ -613,62 +613,13 @@ class ShadowIndexer:
     def _fetch_with_playwright(
         self, url: str
     ) -> tuple[str, str, Dict[str, Any], Dict[str, float]]:
-        with sync_playwright() as playwright:
-            browser = playwright.chromium.launch(headless=True)
-            context = browser.new_context(ignore_https_errors=True)
-            page = context.new_page()
-            page.set_default_navigation_timeout(_RETRY_TIMEOUT_MS)
-            page.set_default_timeout(_RETRY_TIMEOUT_MS)
-            for pattern in _BLOCKED_PATTERNS:
-                page.route(pattern, lambda route, _pattern=pattern: route.abort())
-
-            page_title = url
-            text = ""
-            metadata: Dict[str, Any] = {}
-            lang_value: Any = None
-            fetch_start = time.time()
-            fetch_ms = 0.0
-            extract_ms = 0.0
-
-            try:
-                navigation_attempts = [
-                    ("networkidle", _RETRY_TIMEOUT_MS),
-                    ("domcontentloaded", 120_000),
-                ]
-                last_error: Exception | None = None
-                for wait_until, timeout in navigation_attempts:
-                    try:
-                        page.goto(url, wait_until=wait_until, timeout=timeout)
-                        last_error = None
-                        break
-                    except PlaywrightTimeout as exc:
-                        last_error = exc
-                        continue
-                if last_error is not None:
-                    raise last_error
-                for _ in range(_SCROLL_STEPS):
-                    page.wait_for_timeout(_SCROLL_DELAY_MS)
-                    with suppress(Exception):
-                        page.mouse.wheel(0, 800)
-                page.wait_for_timeout(_SCROLL_DELAY_MS)
-                html = page.content()
-                fetch_ms = (time.time() - fetch_start) * 1000.0
-                page_title = page.title() or url
-                lang_value = page.evaluate("document.documentElement?.lang || null")
-                extract_start = time.time()
-                text, metadata = self._extract_text(html)
-                extract_ms = (time.time() - extract_start) * 1000.0
-                if not text.strip():
-                    fallback = page.evaluate(
-                        "document.body ? document.body.innerText : ''"
-                    )
-                    if isinstance(fallback, str):
-                        text = fallback
-            finally:
-                with suppress(Exception):
-                    context.close()
-                with suppress(Exception):
-                    browser.close()
+        page_title, text, metadata, lang_value, metrics = get_browser_pool().run(
+            lambda page: self._render_page(page, url),
+            consumer="shadow",
+            block=_BLOCKED_PATTERNS,
+            context_options={"ignore_https_errors": True},
+            origin=url,
+        )
 
         normalized_metadata: Dict[str, Any] = {}
         if metadata:
@@ -677,9 +628,48 @@ class ShadowIndexer:
             normalized_metadata.setdefault("lang", lang_value.strip())
         if not text.strip():
             raise RuntimeError("shadow_empty_text")
-        metrics = {"fetch_ms": fetch_ms, "extract_ms": extract_ms}
         return page_title, text, normalized_metadata, metrics
 
+    def _render_page(
+        self, page: Any, url: str
+    ) -> tuple[str, str, Dict[str, Any], Any, Dict[str, float]]:
+        page.set_default_navigation_timeout(_RETRY_TIMEOUT_MS)
+        page.set_default_timeout(_RETRY_TIMEOUT_MS)
+        fetch_start = time.time()
+        navigation_attempts = [
+            ("networkidle", _RETRY_TIMEOUT_MS),
+            ("domcontentloaded", 120_000),
+        ]
+        last_error: Exception | None = None
+        for wait_until, timeout in navigation_attempts:
+            try:
+                page.goto(url, wait_until=wait_until, timeout=timeout)
+                last_error = None
+                break
+            except PlaywrightTimeout as exc:
+                last_error = exc
+                continue
+        if last_error is not None:
+            raise last_error
+        for _ in range(_SCROLL_STEPS):
+            page.wait_for_timeout(_SCROLL_DELAY_MS)
+            with suppress(Exception):
+                page.mouse.wheel(0, 800)
+        page.wait_for_timeout(_SCROLL_DELAY_MS)
+        html = page.content()
+        fetch_ms = (time.time() - fetch_start) * 1000.0
+        page_title = page.title() or url
+        lang_value = page.evaluate("document.documentElement?.lang || null")
+        extract_start = time.time()
+        text, metadata = self._extract_text(html)
+        extract_ms = (time.time() - extract_start) * 1000.0
+        if not text.strip():
+            fallback = page.evaluate("document.body ? document.body.innerText : ''")
+            if isinstance(fallback, str):
+                text = fallback
+        metrics = {"fetch_ms": fetch_ms, "extract_ms": extract_ms}
+        return page_title, text, metadata, lang_value, metrics
+
     def _extract_text(self, html: str) -> tuple[str, Dict[str, Any]]:
         metadata: Dict[str, Any] = {}
         with suppress(Exception):
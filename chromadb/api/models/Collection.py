@@ -3,16 +3,36 @@
 from __future__ import annotations
 
 import json
+import logging
 import os
+import threading
 from pathlib import Path
 from threading import RLock
 from typing import Any, Mapping, Sequence
 
-import math
+import numpy as np
+
+from ._metadata_index import MetadataIndex, clause_keys
+from ._segments import SegmentStore, StoredRow
+from ._vector_index import VectorBlock, VectorIndex
+
+LOGGER = logging.getLogger(__name__)
 
 
 class Collection:
-    """Persist collection items on disk and provide cosine similarity queries."""
+    """Persist collection items on disk and provide vector similarity queries.
+
+    Rows are stored by :class:`SegmentStore` (vectors in memory-mapped float32
+    segments, ids/documents/metadata in SQLite) and scored by
+    :class:`VectorIndex`. ``_rows`` mirrors the stored rows in position order;
+    deleted rows stay in place as tombstones until :meth:`compact` runs.
+    ``where`` filters are answered from a :class:`MetadataIndex` over the live
+    rows, so filtered reads, deletes and searches only touch matching rows.
+    """
+
+    _COMPACT_MIN_TOMBSTONES = 4096
+    _COMPACT_TOMBSTONE_RATIO = 0.25
+    _COMPACT_MAX_SEGMENTS = 32
 
     def __init__(
         self,
@@ -24,45 +44,166 @@ class Collection:
         self._root = Path(root)
         self._name = name
         self._metadata = dict(metadata or {})
-        self._path = self._root / f"{name}.json"
+        self._legacy_path = self._root / f"{name}.json"
         self._lock = RLock()
-        self._entries: list[dict[str, Any]] = []
+        self._compaction_lock = threading.Lock()
+        self._compaction_thread: threading.Thread | None = None
+        self._epoch = 0
+        self._rows: list[StoredRow] = []
+        self._positions: dict[str, int] = {}
+        self._index = VectorIndex.from_metadata(self._metadata)
+        self._metadata_index = MetadataIndex()
+        self._store = SegmentStore(self._root / name)
         self._load()
 
     # ------------------------------------------------------------------
     # Persistence helpers
     # ------------------------------------------------------------------
     def _load(self) -> None:
-        if not self._path.exists():
-            self._entries = []
-            return
+        rows, blocks = self._store.load()
+        self._rows = rows
+        self._index.reset(
+            blocks, np.array([not row.deleted for row in rows], dtype=bool)
+        )
+        self._reindex_positions()
+        if not rows and self._legacy_path.exists():
+            self._migrate_legacy()
+
+    def _migrate_legacy(self) -> None:
+        """Import a collection written by the old whole-file JSON format."""
+
         try:
-            with self._path.open("r", encoding="utf-8") as handle:
+            with self._legacy_path.open("r", encoding="utf-8") as handle:
                 payload = json.load(handle)
         except (OSError, ValueError):
             payload = {}
-        entries = payload.get("entries")
-        if isinstance(entries, list):
-            cleaned: list[dict[str, Any]] = []
-            for entry in entries:
-                if not isinstance(entry, dict):
-                    continue
-                identifier = entry.get("id")
-                embedding = entry.get("embedding")
-                if identifier is None or embedding is None:
-                    continue
-                cleaned.append(entry)
-            self._entries = cleaned
-        else:
-            self._entries = []
-
-    def _persist(self) -> None:
-        tmp_path = self._path.with_suffix(".json.tmp")
-        payload = {"entries": self._entries, "metadata": self._metadata}
-        self._root.mkdir(parents=True, exist_ok=True)
-        with tmp_path.open("w", encoding="utf-8") as handle:
-            json.dump(payload, handle, ensure_ascii=False)
-        os.replace(tmp_path, self._path)
+        entries = payload.get("entries") if isinstance(payload, dict) else None
+        ids: list[str] = []
+        documents: list[Any] = []
+        metadatas: list[Mapping[str, Any] | None] = []
+        embeddings: list[Sequence[float]] = []
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            identifier = entry.get("id")
+            embedding = entry.get("embedding")
+            if identifier is None or embedding is None:
+                continue
+            try:
+                self._index.coerce(embedding)
+            except (TypeError, ValueError):
+                continue
+            ids.append(str(identifier))
+            documents.append(entry.get("document"))
+            metadata = entry.get("metadata")
+            metadatas.append(metadata if isinstance(metadata, Mapping) else None)
+            embeddings.append(embedding)
+        if ids:
+            self.add(
+                ids=ids, documents=documents, metadatas=metadatas, embeddings=embeddings
+            )
+        os.replace(self._legacy_path, self._legacy_path.with_suffix(".json.migrated"))
+        LOGGER.info("migrated %s rows from %s", len(ids), self._legacy_path)
+
+    def _live_rows(self) -> list[tuple[int, Mapping[str, Any]]]:
+        return [
+            (position, self._rows[position].metadata)
+            for position in self._positions.values()
+        ]
+
+    def _reindex_positions(self) -> None:
+        self._positions = {
+            row.id: position
+            for position, row in enumerate(self._rows)
+            if not row.deleted
+        }
+        self._metadata_index.rebuild(self._live_rows())
+
+    def _tombstone(self, positions: Sequence[int]) -> None:
+        if not positions:
+            return
+        self._store.tombstone([self._rows[position].row_id for position in positions])
+        self._index.remove(positions)
+        for position in positions:
+            row = self._rows[position]
+            row.deleted = True
+            self._metadata_index.remove(position, row.metadata)
+            if self._positions.get(row.id) == position:
+                del self._positions[row.id]
+
+    def _needs_compaction(self) -> bool:
+        total = len(self._rows)
+        tombstones = total - len(self._positions)
+        if tombstones >= max(
+            self._COMPACT_MIN_TOMBSTONES, total * self._COMPACT_TOMBSTONE_RATIO
+        ):
+            return True
+        return self._store.segment_count > self._COMPACT_MAX_SEGMENTS
+
+    def _schedule_compaction(self) -> None:
+        if not self._needs_compaction():
+            return
+        thread = self._compaction_thread
+        if thread is not None and thread.is_alive():
+            return
+        thread = threading.Thread(
+            target=self._compact_in_background,
+            name=f"chroma-compact-{self._name}",
+            daemon=True,
+        )
+        self._compaction_thread = thread
+        thread.start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception:  # pragma: no cover - background best effort
+            LOGGER.exception("compaction of collection %s failed", self._name)
+
+    def compact(self) -> bool:
+        """Rewrite live vectors into one segment and purge tombstoned rows.
+
+        Returns ``False`` when another compaction is running or there is
+        nothing to compact.
+        """
+
+        if not self._compaction_lock.acquire(blocking=False):
+            return False
+        try:
+            with self._lock:
+                epoch = self._epoch
+                plan = self._store.plan_compaction(
+                    self._index.blocks, self._index.alive, self._rows
+                )
+            if plan is None:
+                return False
+            self._store.write_compaction(plan)
+            with self._lock:
+                if epoch != self._epoch:
+                    return False
+                block = self._store.commit_compaction(plan)
+                kept = plan.positions
+                shift = plan.stop - int(kept.shape[0])
+                alive = self._index.alive
+                blocks = [block] + [
+                    VectorBlock(
+                        start=later.start - shift,
+                        matrix=later.matrix,
+                        norms=later.norms,
+                        dims=later.dims,
+                    )
+                    for later in self._index.blocks[len(plan.segments) :]
+                ]
+                self._rows = [self._rows[position] for position in kept] + self._rows[
+                    plan.stop :
+                ]
+                self._index.reset(
+                    blocks, np.concatenate([alive[kept], alive[plan.stop :]])
+                )
+                self._reindex_positions()
+            return True
+        finally:
+            self._compaction_lock.release()
 
     # ------------------------------------------------------------------
     # Utility helpers
@@ -81,51 +222,70 @@ class Collection:
         return clauses
 
     @staticmethod
-    def _entry_matches(
-        entry: Mapping[str, Any], clauses: Sequence[Mapping[str, Any]]
+    def _metadata_matches(
+        metadata: Mapping[str, Any] | None, clauses: Sequence[Mapping[str, Any]]
     ) -> bool:
         if not clauses:
             return True
-        metadata = entry.get("metadata")
         if not isinstance(metadata, Mapping):
             return False
-        for clause in clauses:
-            match = True
-            for key, value in clause.items():
-                if metadata.get(key) != value:
-                    match = False
-                    break
-            if match:
-                return True
-        return False
-
-    def _filtered_entries(
-        self,
-        where: Mapping[str, Any] | None,
-    ) -> list[dict[str, Any]]:
-        clauses = self._normalise_where(where)
-        return [entry for entry in self._entries if self._entry_matches(entry, clauses)]
+        return all(
+            metadata.get(key) == value
+            for clause in clauses
+            for key, value in clause.items()
+        )
 
-    @staticmethod
-    def _to_vector(embedding: Sequence[float]) -> list[float]:
-        values = list(embedding)
-        if any(isinstance(value, (list, tuple)) for value in values):
-            raise ValueError("embedding must be a 1D sequence")
-        return [float(value) for value in values]
+    def _filtered_rows(self, where: Mapping[str, Any] | None) -> list[int]:
+        """Return the live positions matching ``where`` in insertion order.
 
-    @staticmethod
-    def _dot(a: Sequence[float], b: Sequence[float]) -> float:
-        return sum(x * y for x, y in zip(a, b))
+        Every clause (including each ``$and`` member) must match. Clauses are
+        answered from posting lists; keys not yet indexed are back-filled on
+        first use.
+        """
 
-    @staticmethod
-    def _norm(vec: Sequence[float]) -> float:
-        return math.sqrt(sum(x * x for x in vec))
+        clauses = self._normalise_where(where)
+        if not clauses:
+            return sorted(self._positions.values())
+        for key in clause_keys(clauses).difference(self._metadata_index.keys):
+            self._metadata_index.ensure(key, self._live_rows())
+        matched: set[int] | None = None
+        unindexed: list[Mapping[str, Any]] = []
+        for clause in clauses:
+            members = self._metadata_index.lookup(clause)
+            if members is None:
+                unindexed.append(clause)
+                continue
+            matched = members if matched is None else matched & members
+            if not matched:
+                return []
+        if matched is None:
+            matched = set(self._positions.values())
+        positions = sorted(matched)
+        if unindexed:
+            positions = [
+                position
+                for position in positions
+                if self._metadata_matches(self._rows[position].metadata, unindexed)
+            ]
+        return positions
 
-    def _cosine(self, a: Sequence[float], b: Sequence[float]) -> float:
-        denom = self._norm(a) * self._norm(b)
-        if denom <= 1e-12:
-            return 0.0
-        return self._dot(a, b) / denom
+    def _include_fields(
+        self, positions: Sequence[int], include: Sequence[str]
+    ) -> dict[str, list[Any]]:
+        fields: dict[str, list[Any]] = {}
+        if "documents" in include:
+            row_ids = [self._rows[position].row_id for position in positions]
+            documents = self._store.documents(row_ids)
+            fields["documents"] = [documents.get(row_id) for row_id in row_ids]
+        if "metadatas" in include:
+            fields["metadatas"] = [
+                self._rows[position].metadata for position in positions
+            ]
+        if "embeddings" in include:
+            fields["embeddings"] = [
+                self._index.vector(position) for position in positions
+            ]
+        return fields
 
     # ------------------------------------------------------------------
     # Public API
@@ -133,15 +293,15 @@ class Collection:
     def delete(self, where: Mapping[str, Any] | None = None) -> None:
         with self._lock:
             if where is None:
-                self._entries = []
-            else:
-                clauses = self._normalise_where(where)
-                self._entries = [
-                    entry
-                    for entry in self._entries
-                    if not self._entry_matches(entry, clauses)
-                ]
-            self._persist()
+                self._store.clear()
+                self._rows = []
+                self._positions = {}
+                self._metadata_index.clear()
+                self._index.reset()
+                self._epoch += 1
+                return
+            self._tombstone(self._filtered_rows(where))
+            self._schedule_compaction()
 
     def add(
         self,
@@ -155,31 +315,45 @@ class Collection:
             raise ValueError(
                 "ids, documents, metadatas, and embeddings must be the same length"
             )
-        new_entries: list[dict[str, Any]] = []
+        # Later duplicates of an id win, mirroring sequential upserts.
+        batch: dict[str, tuple[Any, dict[str, Any], np.ndarray]] = {}
         for identifier, document, metadata, embedding in zip(
             ids, documents, metadatas, embeddings
         ):
-            entry = {
-                "id": str(identifier),
-                "document": document,
-                "metadata": dict(metadata or {}),
-                "embedding": list(map(float, embedding)),
-            }
-            new_entries.append(entry)
+            batch[str(identifier)] = (
+                document,
+                dict(metadata or {}),
+                self._index.coerce(embedding),
+            )
+        if not batch:
+            return
+        batch_ids = list(batch)
         with self._lock:
-            existing_ids = {
-                entry["id"]: index for index, entry in enumerate(self._entries)
-            }
-            for entry in new_entries:
-                idx = existing_ids.get(entry["id"])
-                if idx is not None:
-                    self._entries[idx] = entry
-                else:
-                    self._entries.append(entry)
-            self._persist()
+            replaced = [
+                self._positions[identifier]
+                for identifier in batch_ids
+                if identifier in self._positions
+            ]
+            self._tombstone(replaced)
+            row_ids, matrix, norms, dims, extended = self._store.append(
+                batch_ids,
+                [batch[identifier][0] for identifier in batch_ids],
+                [batch[identifier][1] for identifier in batch_ids],
+                [batch[identifier][2] for identifier in batch_ids],
+            )
+            start = len(self._rows)
+            for offset, (identifier, row_id) in enumerate(zip(batch_ids, row_ids)):
+                metadata = batch[identifier][1]
+                self._rows.append(
+                    StoredRow(row_id=row_id, id=identifier, metadata=metadata)
+                )
+                self._positions[identifier] = start + offset
+                self._metadata_index.add(start + offset, metadata)
+            self._index.append(matrix, norms, dims, extend_last=extended)
+            self._schedule_compaction()
 
     def count(self) -> int:
-        return len(self._entries)
+        return len(self._positions)
 
     def get(
         self,
@@ -191,21 +365,21 @@ class Collection:
     ) -> dict[str, Any]:
         include = include or []
         with self._lock:
-            entries = list(self._entries)
-        if where is not None:
-            entries = self._filtered_entries(where)
-        if ids is not None:
-            ids_set = {str(identifier) for identifier in ids}
-            entries = [entry for entry in entries if entry["id"] in ids_set]
-        if limit is not None and limit >= 0:
-            entries = entries[: limit or 0]
-        response: dict[str, Any] = {"ids": [[entry["id"] for entry in entries]]}
-        if "documents" in include:
-            response["documents"] = [[entry.get("document") for entry in entries]]
-        if "metadatas" in include:
-            response["metadatas"] = [[entry.get("metadata") for entry in entries]]
-        if "embeddings" in include:
-            response["embeddings"] = [[entry.get("embedding") for entry in entries]]
+            positions = self._filtered_rows(where)
+            if ids is not None:
+                ids_set = {str(identifier) for identifier in ids}
+                positions = [
+                    position
+                    for position in positions
+                    if self._rows[position].id in ids_set
+                ]
+            if limit is not None and limit >= 0:
+                positions = positions[: limit or 0]
+            response: dict[str, Any] = {
+                "ids": [[self._rows[position].id for position in positions]]
+            }
+            for key, values in self._include_fields(positions, include).items():
+                response[key] = [values]
         return response
 
     def query(
@@ -217,54 +391,29 @@ class Collection:
         where: Mapping[str, Any] | None = None,
     ) -> dict[str, Any]:
         include = include or []
-        queries = [self._to_vector(embedding) for embedding in query_embeddings]
-        entries = self._filtered_entries(where)
-        if not entries:
-            return self._empty_query_response(len(queries), include)
-
-        entry_ids = [entry["id"] for entry in entries]
-        documents = [entry.get("document") for entry in entries]
-        metadatas = [entry.get("metadata") for entry in entries]
-        vectors = [self._to_vector(entry.get("embedding", ())) for entry in entries]
-
-        distances_per_query: list[list[float]] = []
-        indices_per_query: list[list[int]] = []
-
-        for query in queries:
-            scored: list[tuple[float, int]] = []
-            for idx, vector in enumerate(vectors):
-                similarity = self._cosine(query, vector) if vector else 0.0
-                distance = 1.0 - similarity
-                scored.append((distance, idx))
-            scored.sort(key=lambda item: item[0])
-            if n_results >= 0:
-                limit = max(1, n_results)
-                scored = scored[:limit]
-            distances_per_query.append([distance for distance, _ in scored])
-            indices_per_query.append([index for _, index in scored])
-
-        response: dict[str, Any] = {"ids": []}
-        if "documents" in include:
-            response["documents"] = []
-        if "metadatas" in include:
-            response["metadatas"] = []
-        if "distances" in include:
-            response["distances"] = []
-        if "embeddings" in include:
-            response["embeddings"] = []
-
-        for distances, indices in zip(distances_per_query, indices_per_query):
-            response["ids"].append([entry_ids[idx] for idx in indices])
-            if "documents" in include:
-                response["documents"].append([documents[idx] for idx in indices])
-            if "metadatas" in include:
-                response["metadatas"].append([metadatas[idx] for idx in indices])
-            if "distances" in include:
-                response["distances"].append(distances)
-            if "embeddings" in include:
-                response["embeddings"].append(
-                    [entries[idx].get("embedding") for idx in indices]
+        with self._lock:
+            candidates = (
+                np.asarray(self._filtered_rows(where), dtype=np.int64)
+                if where
+                else None
+            )
+            if not self._positions or (candidates is not None and candidates.size == 0):
+                return self._empty_query_response(len(query_embeddings), include)
+            limit = max(1, n_results) if n_results >= 0 else None
+            matches = self._index.search(query_embeddings, limit, candidates=candidates)
+
+            response: dict[str, Any] = {"ids": []}
+            for key in ("documents", "metadatas", "distances", "embeddings"):
+                if key in include:
+                    response[key] = []
+            for distances, positions in matches:
+                response["ids"].append(
+                    [self._rows[position].id for position in positions]
                 )
+                for key, values in self._include_fields(positions, include).items():
+                    response[key].append(values)
+                if "distances" in include:
+                    response["distances"].append(distances)
         return response
 
     @staticmethod
@@ -0,0 +1,111 @@
+"""Inverted metadata index for ``where`` filters on a collection.
+
+Posting lists map ``key -> value -> positions``. A handful of keys that the
+vector store always filters on are indexed eagerly; any other key gets its
+posting list built the first time a filter uses it and is maintained from then
+on, so repeated filters never fall back to a full scan.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping, Sequence
+
+DEFAULT_KEYS = ("url", "doc_id", "content_hash")
+
+
+class MetadataIndex:
+    """Per-key posting lists over row positions."""
+
+    def __init__(self, keys: Iterable[str] = DEFAULT_KEYS) -> None:
+        self._postings: dict[str, dict[Any, set[int]]] = {key: {} for key in keys}
+
+    @staticmethod
+    def _hashable(value: Any) -> bool:
+        try:
+            hash(value)
+        except TypeError:
+            return False
+        return True
+
+    @property
+    def keys(self) -> list[str]:
+        return list(self._postings)
+
+    def add(self, position: int, metadata: Mapping[str, Any]) -> None:
+        for key, postings in self._postings.items():
+            value = metadata.get(key)
+            if value is None or not self._hashable(value):
+                continue
+            postings.setdefault(value, set()).add(position)
+
+    def remove(self, position: int, metadata: Mapping[str, Any]) -> None:
+        for key, postings in self._postings.items():
+            value = metadata.get(key)
+            if value is None or not self._hashable(value):
+                continue
+            members = postings.get(value)
+            if members is None:
+                continue
+            members.discard(position)
+            if not members:
+                del postings[value]
+
+    def rebuild(self, rows: Iterable[tuple[int, Mapping[str, Any]]]) -> None:
+        """Re-create every posting list from ``(position, metadata)`` pairs."""
+
+        self._postings = {key: {} for key in self._postings}
+        for position, metadata in rows:
+            self.add(position, metadata)
+
+    def ensure(self, key: str, rows: Iterable[tuple[int, Mapping[str, Any]]]) -> None:
+        """Start indexing ``key``, back-filling it from ``rows``."""
+
+        if key in self._postings:
+            return
+        postings: dict[Any, set[int]] = {}
+        for position, metadata in rows:
+            value = metadata.get(key)
+            if value is None or not self._hashable(value):
+                continue
+            postings.setdefault(value, set()).add(position)
+        self._postings[key] = postings
+
+    def lookup(self, clause: Mapping[str, Any]) -> set[int] | None:
+        """Return positions matching every ``key == value`` pair of ``clause``.
+
+        ``None`` means the clause cannot be answered from the index (a key is
+        not indexed or a value is unhashable) and callers must scan instead.
+        """
+
+        lists: list[set[int]] = []
+        for key, value in clause.items():
+            postings = self._postings.get(key)
+            if postings is None or not self._hashable(value):
+                return None
+            if value is None:
+                return None
+            members = postings.get(value)
+            if not members:
+                return set()
+            lists.append(members)
+        if not lists:
+            return None
+        lists.sort(key=len)
+        result = set(lists[0])
+        for members in lists[1:]:
+            result.intersection_update(members)
+            if not result:
+                break
+        return result
+
+    def clear(self) -> None:
+        self._postings = {key: {} for key in self._postings}
+
+
+def clause_keys(clauses: Sequence[Mapping[str, Any]]) -> set[str]:
+    """Every metadata key referenced by ``clauses``."""
+
+    return {key for clause in clauses for key in clause}
+
+
+__all__ = ["DEFAULT_KEYS", "MetadataIndex", "clause_keys"]
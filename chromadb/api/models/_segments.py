@@ -0,0 +1,445 @@
+"""Segmented on-disk storage for :class:`chromadb.api.models.Collection`.
+
+Layout of a collection directory::
+
+    <root>/<name>/collection.sqlite3   row table (ids, documents, metadata)
+    <root>/<name>/segments/*.f32       raw row-major float32 vector segments
+
+New vectors are appended to the open tail segment, so the cost of an ``add``
+is proportional to the rows it writes. Deletes only flip a tombstone flag in
+SQLite. Sealed segments are immutable and get memory-mapped on load, which
+makes opening a large collection close to free. Compaction rewrites the live
+rows into a fresh segment and purges tombstones in three steps (plan, write,
+commit) so the vector copy can run without the caller's lock held (see
+``Collection.compact``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Sequence
+
+import numpy as np
+
+from ._vector_index import VectorBlock
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    rows INTEGER NOT NULL DEFAULT 0,
+    sealed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS rows (
+    row_id INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    document TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    segment INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    dims INTEGER NOT NULL,
+    norm REAL NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS rows_position ON rows(segment, slot);
+"""
+
+
+@dataclass(slots=True)
+class StoredRow:
+    """In-memory view of one stored row (documents stay in SQLite)."""
+
+    row_id: int
+    id: str
+    metadata: dict[str, Any]
+    deleted: bool = False
+
+
+@dataclass(slots=True)
+class Segment:
+    id: int
+    file: str
+    width: int
+    rows: int
+    sealed: bool
+
+
+@dataclass(slots=True)
+class CompactionPlan:
+    """Snapshot of the sealed segments that a compaction rewrites."""
+
+    segments: list[Segment]
+    blocks: list[VectorBlock]
+    positions: np.ndarray
+    row_ids: list[int]
+    stop: int
+    width: int
+    target: Segment | None = None
+
+
+class SegmentStore:
+    """Append-only float32 segments plus a SQLite row table."""
+
+    SEGMENT_ROWS = 65536
+
+    def __init__(self, directory: Path) -> None:
+        self._dir = Path(directory)
+        self._segment_dir = self._dir / "segments"
+        self._segment_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self._dir / "collection.sqlite3", check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._segments: list[Segment] = []
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def _map(self, segment: Segment) -> np.ndarray:
+        if segment.rows == 0 or segment.width == 0:
+            return np.zeros((segment.rows, segment.width), dtype=np.float32)
+        return np.memmap(
+            self._segment_dir / segment.file,
+            dtype=np.float32,
+            mode="r",
+            shape=(segment.rows, segment.width),
+        )
+
+    def _repair(self, segment: Segment) -> None:
+        """Reconcile a segment file with the committed row count."""
+
+        path = self._segment_dir / segment.file
+        row_bytes = segment.width * 4
+        size = path.stat().st_size if path.exists() else 0
+        expected = segment.rows * row_bytes
+        if size > expected:
+            # Vectors written before a crash whose rows never committed.
+            with path.open("r+b") as handle:
+                handle.truncate(expected)
+        elif size < expected:
+            segment.rows = size // row_bytes if row_bytes else 0
+            self._conn.execute(
+                "DELETE FROM rows WHERE segment = ? AND slot >= ?",
+                (segment.id, segment.rows),
+            )
+            self._conn.execute(
+                "UPDATE segments SET rows = ? WHERE id = ?", (segment.rows, segment.id)
+            )
+
+    def _remove_orphans(self) -> None:
+        referenced = {segment.file for segment in self._segments}
+        for path in self._segment_dir.iterdir():
+            if path.name in referenced:
+                continue
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:  # pragma: no cover - still mapped on some platforms
+                continue
+
+    def load(self) -> tuple[list[StoredRow], list[VectorBlock]]:
+        """Return every stored row in position order and the mapped blocks."""
+
+        with self._conn:
+            self._segments = [
+                Segment(
+                    id=row[0],
+                    file=row[1],
+                    width=row[2],
+                    rows=row[3],
+                    sealed=bool(row[4]),
+                )
+                for row in self._conn.execute(
+                    "SELECT id, file, width, rows, sealed FROM segments ORDER BY id"
+                )
+            ]
+            for segment in self._segments:
+                self._repair(segment)
+        self._remove_orphans()
+
+        rows: list[StoredRow] = []
+        blocks: list[VectorBlock] = []
+        for segment in self._segments:
+            norms = np.zeros(segment.rows, dtype=np.float32)
+            dims = np.zeros(segment.rows, dtype=np.int32)
+            start = len(rows)
+            cursor = self._conn.execute(
+                "SELECT row_id, id, metadata, slot, dims, norm, deleted FROM rows "
+                "WHERE segment = ? ORDER BY slot",
+                (segment.id,),
+            )
+            for row_id, identifier, metadata, slot, dim, norm, deleted in cursor:
+                norms[slot] = norm
+                dims[slot] = dim
+                rows.append(
+                    StoredRow(
+                        row_id=row_id,
+                        id=identifier,
+                        metadata=_decode(metadata),
+                        deleted=bool(deleted),
+                    )
+                )
+            if len(rows) - start != segment.rows:
+                raise RuntimeError(
+                    f"segment {segment.id} has {len(rows) - start} rows, expected {segment.rows}"
+                )
+            blocks.append(
+                VectorBlock(
+                    start=start, matrix=self._map(segment), norms=norms, dims=dims
+                )
+            )
+        return rows, blocks
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def _open_tail(self, width: int, count: int) -> tuple[Segment, bool]:
+        """Return the segment to append to and whether it already existed."""
+
+        tail = self._segments[-1] if self._segments else None
+        if (
+            tail is not None
+            and not tail.sealed
+            and tail.width >= width
+            and tail.rows + count <= self.SEGMENT_ROWS
+        ):
+            return tail, True
+        if tail is not None and not tail.sealed:
+            tail.sealed = True
+            self._conn.execute(
+                "UPDATE segments SET sealed = 1 WHERE id = ?", (tail.id,)
+            )
+        segment_id = (tail.id if tail is not None else 0) + 1
+        segment = Segment(
+            id=segment_id,
+            file=f"{segment_id:08d}.f32",
+            width=width,
+            rows=0,
+            sealed=False,
+        )
+        self._conn.execute(
+            "INSERT INTO segments (id, file, width, rows, sealed) VALUES (?, ?, ?, 0, 0)",
+            (segment.id, segment.file, segment.width),
+        )
+        self._segments.append(segment)
+        return segment, False
+
+    def append(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[Any],
+        metadatas: Sequence[Mapping[str, Any]],
+        vectors: Sequence[np.ndarray],
+    ) -> tuple[list[int], np.ndarray, np.ndarray, np.ndarray, bool]:
+        """Persist new rows.
+
+        Returns the row ids plus ``(matrix, norms, dims, extended)`` where
+        ``matrix`` is the full mapped segment the rows landed in and
+        ``extended`` tells whether that segment was already loaded.
+        """
+
+        width = max((int(vector.shape[0]) for vector in vectors), default=0)
+        norms = np.array(
+            [np.linalg.norm(vector) for vector in vectors], dtype=np.float32
+        )
+        dims = np.array([vector.shape[0] for vector in vectors], dtype=np.int32)
+        row_ids: list[int] = []
+        with self._conn:
+            segment, extended = self._open_tail(width, len(vectors))
+            matrix = np.zeros((len(vectors), segment.width), dtype=np.float32)
+            for row, vector in enumerate(vectors):
+                matrix[row, : vector.shape[0]] = vector
+            with (self._segment_dir / segment.file).open("ab") as handle:
+                handle.write(matrix.tobytes())
+            for offset, (identifier, document, metadata) in enumerate(
+                zip(ids, documents, metadatas)
+            ):
+                cursor = self._conn.execute(
+                    "INSERT INTO rows (id, document, metadata, segment, slot, dims, norm) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        identifier,
+                        document,
+                        json.dumps(dict(metadata), ensure_ascii=False),
+                        segment.id,
+                        segment.rows + offset,
+                        int(dims[offset]),
+                        float(norms[offset]),
+                    ),
+                )
+                row_ids.append(int(cursor.lastrowid))
+            segment.rows += len(vectors)
+            self._conn.execute(
+                "UPDATE segments SET rows = ? WHERE id = ?", (segment.rows, segment.id)
+            )
+        return row_ids, self._map(segment), norms, dims, extended
+
+    def tombstone(self, row_ids: Sequence[int]) -> None:
+        if not row_ids:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE rows SET deleted = 1 WHERE row_id = ?",
+                [(row_id,) for row_id in row_ids],
+            )
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM rows")
+            self._conn.execute("DELETE FROM segments")
+        self._segments = []
+        self._remove_orphans()
+
+    def documents(self, row_ids: Sequence[int]) -> dict[int, Any]:
+        found: dict[int, Any] = {}
+        for chunk in _chunks(list(row_ids), 500):
+            placeholders = ",".join("?" for _ in chunk)
+            for row_id, document in self._conn.execute(
+                f"SELECT row_id, document FROM rows WHERE row_id IN ({placeholders})",
+                chunk,
+            ):
+                found[row_id] = document
+        return found
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+    @property
+    def segment_count(self) -> int:
+        return len(self._segments)
+
+    def plan_compaction(
+        self,
+        blocks: Sequence[VectorBlock],
+        alive: np.ndarray,
+        rows: Sequence[StoredRow],
+    ) -> CompactionPlan | None:
+        """Seal the tail and snapshot every segment for :meth:`write_compaction`."""
+
+        if not self._segments:
+            return None
+        with self._conn:
+            tail = self._segments[-1]
+            if not tail.sealed:
+                tail.sealed = True
+                self._conn.execute(
+                    "UPDATE segments SET sealed = 1 WHERE id = ?", (tail.id,)
+                )
+        segments = list(self._segments)
+        stop = blocks[len(segments) - 1].stop if blocks else 0
+        positions = np.flatnonzero(alive[:stop])
+        width = 0
+        for block in blocks[: len(segments)]:
+            live = alive[block.start : block.stop]
+            if live.any():
+                width = max(width, int(block.dims[live].max()))
+        return CompactionPlan(
+            segments=segments,
+            blocks=list(blocks[: len(segments)]),
+            positions=positions,
+            row_ids=[rows[position].row_id for position in positions],
+            stop=stop,
+            width=width,
+        )
+
+    def write_compaction(self, plan: CompactionPlan) -> None:
+        """Copy the live vectors of ``plan`` into a new segment file.
+
+        Only reads immutable sealed segments, so callers may run it unlocked.
+        """
+
+        last = plan.segments[-1]
+        target = Segment(
+            id=last.id,
+            file=f"{last.id:08d}-c{len(plan.positions)}.f32",
+            width=plan.width,
+            rows=int(plan.positions.shape[0]),
+            sealed=True,
+        )
+        matrix = np.zeros((target.rows, target.width), dtype=np.float32)
+        for block in plan.blocks:
+            lo, hi = np.searchsorted(plan.positions, [block.start, block.stop])
+            if lo == hi:
+                continue
+            offsets = plan.positions[lo:hi] - block.start
+            columns = min(target.width, block.matrix.shape[1])
+            matrix[lo:hi, :columns] = block.matrix[offsets, :columns]
+        tmp_path = self._segment_dir / f"{target.file}.tmp"
+        with tmp_path.open("wb") as handle:
+            handle.write(matrix.tobytes())
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self._segment_dir / target.file)
+        plan.target = target
+
+    def commit_compaction(self, plan: CompactionPlan) -> VectorBlock:
+        """Swap the compacted segment in and return its block (start ``0``)."""
+
+        target = plan.target
+        assert target is not None
+        merged = [segment.id for segment in plan.segments]
+        placeholders = ",".join("?" for _ in merged)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS compact_rows "
+                "(row_id INTEGER PRIMARY KEY, slot INTEGER NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM compact_rows")
+            self._conn.executemany(
+                "INSERT INTO compact_rows (row_id, slot) VALUES (?, ?)",
+                [(row_id, offset) for offset, row_id in enumerate(plan.row_ids)],
+            )
+            self._conn.execute(
+                f"DELETE FROM rows WHERE segment IN ({placeholders}) "
+                "AND row_id NOT IN (SELECT row_id FROM compact_rows)",
+                merged,
+            )
+            self._conn.execute(
+                "UPDATE rows SET segment = ?, slot = "
+                "(SELECT slot FROM compact_rows WHERE compact_rows.row_id = rows.row_id) "
+                "WHERE row_id IN (SELECT row_id FROM compact_rows)",
+                (target.id,),
+            )
+            self._conn.execute(
+                f"DELETE FROM segments WHERE id IN ({placeholders})", merged
+            )
+            self._conn.execute(
+                "INSERT INTO segments (id, file, width, rows, sealed) VALUES (?, ?, ?, ?, 1)",
+                (target.id, target.file, target.width, target.rows),
+            )
+            self._conn.execute("DELETE FROM compact_rows")
+        self._segments = [target] + self._segments[len(plan.segments) :]
+        self._remove_orphans()
+        norms = np.zeros(target.rows, dtype=np.float32)
+        dims = np.zeros(target.rows, dtype=np.int32)
+        for block in plan.blocks:
+            lo, hi = np.searchsorted(plan.positions, [block.start, block.stop])
+            offsets = plan.positions[lo:hi] - block.start
+            norms[lo:hi] = block.norms[offsets]
+            dims[lo:hi] = block.dims[offsets]
+        return VectorBlock(start=0, matrix=self._map(target), norms=norms, dims=dims)
+
+
+def _decode(payload: str | None) -> dict[str, Any]:
+    try:
+        value = json.loads(payload or "{}")
+    except ValueError:
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+def _chunks(values: list[int], size: int) -> Iterator[list[int]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+__all__ = ["CompactionPlan", "SegmentStore", "StoredRow"]
@@ -0,0 +1,386 @@
+"""NumPy scoring engine backing :class:`chromadb.api.models.Collection`.
+
+Vectors are held in contiguous ``float32`` blocks (typically memory-mapped
+segment files) with precomputed norms, so a query is one matrix-vector product
+per block followed by an ``argpartition`` top-k selection. Rows are addressed
+by their position across all blocks; removed rows are tombstoned in an
+``alive`` mask until the owner compacts the blocks.
+
+Rows may have different dimensionalities (embedding models change over the
+lifetime of an index); shorter rows are zero padded, which keeps the dot
+product equal to the overlap of both vectors while norms are computed over
+the original values.
+
+An optional inverted-file (IVF) mode clusters the rows with a few rounds of
+k-means and only scores the ``nprobe`` closest clusters at query time.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+_EPSILON = 1e-12
+_SPACES = frozenset({"cosine", "l2", "ip"})
+_MODES = frozenset({"exact", "ivf"})
+
+
+@dataclass(slots=True)
+class VectorBlock:
+    """A contiguous run of rows sharing one matrix."""
+
+    start: int
+    matrix: np.ndarray
+    norms: np.ndarray
+    dims: np.ndarray
+
+    @property
+    def stop(self) -> int:
+        return self.start + int(self.norms.shape[0])
+
+
+class VectorIndex:
+    """Position-addressed vector blocks with exact and IVF nearest-neighbour search."""
+
+    _IVF_MIN_ROWS = 2048
+    _KMEANS_ITERATIONS = 8
+
+    def __init__(
+        self,
+        *,
+        space: str = "cosine",
+        mode: str = "exact",
+        nlist: int | None = None,
+        nprobe: int = 8,
+    ) -> None:
+        space = (space or "cosine").strip().lower()
+        mode = (mode or "exact").strip().lower()
+        if space not in _SPACES:
+            raise ValueError(f"unsupported distance space: {space!r}")
+        if mode not in _MODES:
+            raise ValueError(f"unsupported index mode: {mode!r}")
+        self._space = space
+        self._mode = mode
+        self._nlist = int(nlist) if nlist else None
+        self._nprobe = max(1, int(nprobe))
+        self._blocks: list[VectorBlock] = []
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._centroids: np.ndarray | None = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._trained_size = 0
+
+    @classmethod
+    def from_metadata(cls, metadata: Mapping[str, Any] | None) -> "VectorIndex":
+        """Build an index configured from Chroma-style collection metadata.
+
+        ``hnsw:space`` selects the distance function (``cosine``, ``l2`` or
+        ``ip``). ``index:mode`` switches between ``exact`` scoring and the
+        approximate ``ivf`` mode, tuned with ``index:nlist``/``index:nprobe``.
+        """
+
+        metadata = metadata or {}
+        nlist = metadata.get("index:nlist")
+        nprobe = metadata.get("index:nprobe")
+        return cls(
+            space=str(metadata.get("hnsw:space") or "cosine"),
+            mode=str(metadata.get("index:mode") or "exact"),
+            nlist=int(nlist) if nlist else None,
+            nprobe=int(nprobe) if nprobe else 8,
+        )
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    @property
+    def space(self) -> str:
+        return self._space
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @property
+    def blocks(self) -> list[VectorBlock]:
+        return list(self._blocks)
+
+    @property
+    def alive(self) -> np.ndarray:
+        return self._alive[: self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _locate(self, position: int) -> tuple[VectorBlock, int]:
+        for block in self._blocks:
+            if block.start <= position < block.stop:
+                return block, position - block.start
+        raise IndexError(position)
+
+    def vector(self, position: int) -> list[float]:
+        """Return the stored embedding at ``position`` at its original length."""
+
+        block, offset = self._locate(position)
+        dims = int(block.dims[offset])
+        return np.asarray(block.matrix[offset, :dims], dtype=float).tolist()
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+    @staticmethod
+    def coerce(embedding: Sequence[float]) -> np.ndarray:
+        """Return ``embedding`` as a 1D ``float32`` array."""
+
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.ndim != 1:
+            raise ValueError("embedding must be a 1D sequence")
+        return vector
+
+    @staticmethod
+    def pack(vectors: Sequence[np.ndarray], width: int | None = None) -> np.ndarray:
+        """Stack ``vectors`` into a zero-padded ``(n, width)`` matrix."""
+
+        if width is None:
+            width = max((int(vector.shape[0]) for vector in vectors), default=0)
+        matrix = np.zeros((len(vectors), width), dtype=np.float32)
+        for row, vector in enumerate(vectors):
+            matrix[row, : vector.shape[0]] = vector
+        return matrix
+
+    def _grow_positions(self, count: int) -> None:
+        needed = self._size + count
+        if needed <= self._alive.shape[0]:
+            return
+        capacity = max(64, self._alive.shape[0] * 2, needed)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: self._size] = self._alive[: self._size]
+        assignments = np.full(capacity, -1, dtype=np.int32)
+        assignments[: self._size] = self._assignments[: self._size]
+        self._alive, self._assignments = alive, assignments
+
+    def append(
+        self,
+        matrix: np.ndarray,
+        norms: np.ndarray,
+        dims: np.ndarray,
+        *,
+        extend_last: bool = False,
+    ) -> None:
+        """Append ``len(norms)`` rows.
+
+        ``matrix`` holds the rows of a new block, or, with ``extend_last``,
+        the full contents of the last block after the rows were appended to
+        it (the usual case for a re-mapped tail segment).
+        """
+
+        count = int(norms.shape[0])
+        if count == 0:
+            return
+        norms = np.asarray(norms, dtype=np.float32)
+        dims = np.asarray(dims, dtype=np.int32)
+        if extend_last and self._blocks:
+            last = self._blocks[-1]
+            self._blocks[-1] = VectorBlock(
+                start=last.start,
+                matrix=matrix,
+                norms=np.concatenate([last.norms, norms]),
+                dims=np.concatenate([last.dims, dims]),
+            )
+        else:
+            self._blocks.append(
+                VectorBlock(start=self._size, matrix=matrix, norms=norms, dims=dims)
+            )
+        self._grow_positions(count)
+        self._alive[self._size : self._size + count] = True
+        if self._centroids is not None:
+            block = self._blocks[-1]
+            offset = block.norms.shape[0] - count
+            self._assignments[self._size : self._size + count] = self._nearest_centroid(
+                np.asarray(block.matrix[offset:], dtype=np.float32)
+            )
+        self._size += count
+
+    def remove(self, positions: Sequence[int] | np.ndarray) -> None:
+        """Tombstone the rows at ``positions``."""
+
+        self._alive[np.asarray(positions, dtype=np.int64)] = False
+
+    def reset(
+        self, blocks: Sequence[VectorBlock] = (), alive: np.ndarray | None = None
+    ) -> None:
+        """Replace every block, e.g. after a load or a compaction."""
+
+        self._blocks = list(blocks)
+        self._size = self._blocks[-1].stop if self._blocks else 0
+        self._alive = (
+            np.ones(self._size, dtype=bool)
+            if alive is None
+            else np.asarray(alive, dtype=bool).copy()
+        )
+        self._assignments = np.full(self._size, -1, dtype=np.int32)
+        self._centroids = None
+        self._trained_size = 0
+
+    # ------------------------------------------------------------------
+    # IVF clustering
+    # ------------------------------------------------------------------
+    def _width(self) -> int:
+        return max((block.matrix.shape[1] for block in self._blocks), default=0)
+
+    def _gather(
+        self, positions: np.ndarray, width: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        vectors = np.zeros((positions.shape[0], width), dtype=np.float32)
+        norms = np.zeros(positions.shape[0], dtype=np.float32)
+        for block in self._blocks:
+            selected = np.flatnonzero(
+                (positions >= block.start) & (positions < block.stop)
+            )
+            if not selected.size:
+                continue
+            offsets = positions[selected] - block.start
+            columns = min(width, block.matrix.shape[1])
+            vectors[selected, :columns] = block.matrix[offsets, :columns]
+            norms[selected] = block.norms[offsets]
+        return vectors, norms
+
+    def _nearest_centroid(self, vectors: np.ndarray) -> np.ndarray:
+        assert self._centroids is not None
+        width = min(vectors.shape[1], self._centroids.shape[1])
+        scores = vectors[:, :width] @ self._centroids[:, :width].T
+        return np.argmax(scores, axis=1).astype(np.int32)
+
+    def _maybe_train(self) -> None:
+        live = np.flatnonzero(self.alive)
+        if self._mode != "ivf" or live.shape[0] < self._IVF_MIN_ROWS:
+            return
+        if self._centroids is not None and self._size < 2 * self._trained_size:
+            return
+        nlist = self._nlist or int(math.sqrt(live.shape[0]))
+        nlist = max(1, min(nlist, live.shape[0]))
+        rng = np.random.default_rng(0)
+        sample_size = min(live.shape[0], nlist * 64)
+        sample = np.sort(rng.choice(live, size=sample_size, replace=False))
+        width = self._width()
+        points, norms = self._gather(sample, width)
+        points = np.divide(
+            points,
+            norms[:, None],
+            out=np.zeros_like(points),
+            where=norms[:, None] > _EPSILON,
+        )
+        centroids = points[rng.choice(sample_size, size=nlist, replace=False)].copy()
+        for _ in range(self._KMEANS_ITERATIONS):
+            labels = np.argmax(points @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = points[labels == cluster]
+                if members.shape[0]:
+                    centroid = members.mean(axis=0)
+                    norm = float(np.linalg.norm(centroid))
+                    if norm > _EPSILON:
+                        centroids[cluster] = centroid / norm
+        self._centroids = centroids.astype(np.float32)
+        for block in self._blocks:
+            self._assignments[block.start : block.stop] = self._nearest_centroid(
+                np.asarray(block.matrix, dtype=np.float32)
+            )
+        self._trained_size = self._size
+
+    def _probe(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        self._maybe_train()
+        if self._centroids is None:
+            return rows
+        nprobe = min(self._nprobe, self._centroids.shape[0])
+        scores = self._centroids @ query[: self._centroids.shape[1]]
+        lists = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        return rows[np.isin(self._assignments[rows], lists)]
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def _distances(
+        self,
+        block: VectorBlock,
+        offsets: np.ndarray | None,
+        query: np.ndarray,
+        query_norm: float,
+    ) -> np.ndarray:
+        matrix = block.matrix if offsets is None else block.matrix[offsets]
+        norms = block.norms if offsets is None else block.norms[offsets]
+        width = matrix.shape[1]
+        dots = np.asarray(matrix, dtype=np.float32) @ query[:width]
+        if self._space == "ip":
+            return 1.0 - dots
+        if self._space == "l2":
+            return np.maximum(norms * norms - 2.0 * dots + query_norm * query_norm, 0.0)
+        denom = norms * query_norm
+        similarity = np.divide(
+            dots, denom, out=np.zeros_like(dots), where=denom > _EPSILON
+        )
+        return 1.0 - similarity
+
+    def search(
+        self,
+        queries: Sequence[Sequence[float]],
+        limit: int | None,
+        *,
+        candidates: np.ndarray | None = None,
+    ) -> list[tuple[list[float], list[int]]]:
+        """Return ``(distances, positions)`` for the ``limit`` nearest live rows.
+
+        ``candidates`` restricts scoring to the given positions. ``None`` for
+        ``limit`` returns every scored row ordered by distance.
+        """
+
+        alive = self.alive
+        if candidates is None:
+            rows = np.flatnonzero(alive)
+            dense = bool(rows.shape[0] == self._size)
+        else:
+            rows = np.unique(np.asarray(candidates, dtype=np.int64))
+            rows = rows[alive[rows]]
+            dense = False
+        width = self._width()
+        results: list[tuple[list[float], list[int]]] = []
+        for embedding in queries:
+            raw = self.coerce(embedding)
+            query_norm = float(np.linalg.norm(raw))
+            query = np.zeros(width, dtype=np.float32)
+            overlap = min(width, int(raw.shape[0]))
+            query[:overlap] = raw[:overlap]
+            selected = rows
+            scan_all = dense
+            if self._mode == "ivf":
+                selected = self._probe(query, rows)
+                scan_all = dense and selected.shape[0] == self._size
+            if selected.shape[0] == 0:
+                results.append(([], []))
+                continue
+            parts: list[np.ndarray] = []
+            for block in self._blocks:
+                if scan_all:
+                    parts.append(self._distances(block, None, query, query_norm))
+                    continue
+                lo, hi = np.searchsorted(selected, [block.start, block.stop])
+                if lo == hi:
+                    continue
+                offsets = selected[lo:hi] - block.start
+                parts.append(self._distances(block, offsets, query, query_norm))
+            distances = np.concatenate(parts)
+            order = np.arange(distances.shape[0])
+            if limit is not None and limit < distances.shape[0]:
+                order = np.argpartition(distances, limit - 1)[:limit]
+            order = order[np.lexsort((order, distances[order]))]
+            results.append(
+                (
+                    distances[order].astype(float).tolist(),
+                    selected[order].astype(int).tolist(),
+                )
+            )
+        return results
+
+
+__all__ = ["VectorBlock", "VectorIndex"]
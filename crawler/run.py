@@ -11,8 +11,8 @@ import re
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Optional, Sequence
-from urllib.parse import urljoin, urlparse
+from typing import IO, Awaitable, Callable, Iterable, List, Optional, Sequence
+from urllib.parse import urljoin
 
 try:
     import httpx
@@ -25,6 +25,7 @@ except ImportError:  # pragma: no cover - optional dependency
     BeautifulSoup = None
 
 from backend.app.metrics import metrics
+from backend.app.services.browser_pool import get_browser_pool
 from backend.app.services.source_follow import (
     BudgetExceeded,
     SourceBudget,
@@ -34,6 +35,7 @@ from backend.app.services.source_follow import (
 )
 from frontier import ContentFingerprint, RobotsCache, UrlBloom
 
+from .scheduler import HostScheduler, host_key
 from .frontier import (
     Candidate,
     CrawlCooldowns,
@@ -46,6 +48,8 @@ LOGGER = logging.getLogger(__name__)
 USER_AGENT = os.getenv("CRAWL_USER_AGENT", "SelfHostedSearchBot/0.2 (+local)")
 GLOBAL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENT_REQUESTS", "8"))
 PER_DOMAIN_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENT_PER_DOMAIN", "2"))
+CRAWL_DELAY = float(os.getenv("CRAWL_DELAY_SECONDS", "0.5"))
+MAX_CRAWL_DELAY = float(os.getenv("CRAWL_MAX_DELAY_SECONDS", "10"))
 MAX_RETRIES = 3
 RESPECT_ROBOTS = os.getenv("CRAWL_RESPECT_ROBOTS", "true").lower() not in {"0", "false", "no", "off"}
 PLAYWRIGHT_MODE = os.getenv("CRAWL_USE_PLAYWRIGHT", "auto").lower()
@@ -65,6 +69,24 @@ class PageResult:
     is_source: bool
     parent_url: Optional[str]
 
+    def as_record(self, query: str) -> dict:
+        """Return the raw JSONL record persisted for this page."""
+
+        return {
+            "query": query,
+            "url": self.url,
+            "status": self.status,
+            "title": self.title,
+            "html": self.html,
+            "fetched_at": self.fetched_at,
+            "content_hash": self.fingerprint.md5,
+            "simhash": self.fingerprint.simhash,
+            "outlinks": self.outlinks,
+            "sources": [{"url": link.url, "kind": link.kind} for link in self.sources],
+            "is_source": bool(self.is_source),
+            "parent_url": self.parent_url,
+        }
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run the focused crawler")
@@ -92,6 +114,10 @@ async def _maybe_llm_urls(query: str, use_llm: bool, model: Optional[str]) -> Li
     return urls
 
 
+def _record_robots_fetch(origin: str, ms: float, negative: bool) -> None:
+    metrics.record_robots_fetch(ms, negative)
+
+
 def _extract_title(html: str) -> str:
     start = html.lower().find("<title")
     if start == -1:
@@ -118,42 +144,40 @@ def _visible_text_length(html: str) -> int:
         return len(html)
 
 
+def _render_page(page, url: str) -> tuple[int, str, str]:
+    response = page.goto(url, wait_until="networkidle", timeout=PLAYWRIGHT_TIMEOUT)
+    return (response.status if response else 200), page.content(), page.title()
+
+
 async def _fetch_with_playwright(url: str, candidate: Optional[Candidate] = None) -> Optional[PageResult]:
     try:
-        from playwright.async_api import async_playwright
-    except Exception as exc:  # pragma: no cover - optional dependency issues
+        status, html, title = await get_browser_pool().arun(
+            lambda page: _render_page(page, url),
+            consumer="crawler",
+            context_options={"ignore_https_errors": False},
+            origin=url,
+        )
+    except ImportError as exc:  # pragma: no cover - optional dependency issues
         LOGGER.warning("Playwright unavailable: %s", exc)
         return None
-
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            response = await page.goto(url, wait_until="networkidle", timeout=PLAYWRIGHT_TIMEOUT)
-            html = await page.content()
-            title = await page.title()
-            status = response.status if response else 200
-            fingerprint = ContentFingerprint.from_text(html)
-            outlinks = _extract_outlinks(url, html)
-            sources = extract_sources(html, url)
-            await browser.close()
-            metrics.record_playwright_use()
-            return PageResult(
-                url=url,
-                status=status,
-                html=html,
-                title=title,
-                fetched_at=time.time(),
-                fingerprint=fingerprint,
-                outlinks=outlinks,
-                sources=sources,
-                is_source=candidate.is_source if candidate else False,
-                parent_url=candidate.parent_url if candidate else None,
-            )
     except Exception as exc:
         LOGGER.debug("Playwright fetch failed for %s: %s", url, exc)
         return None
 
+    metrics.record_playwright_use()
+    return PageResult(
+        url=url,
+        status=status,
+        html=html,
+        title=title,
+        fetched_at=time.time(),
+        fingerprint=ContentFingerprint.from_text(html),
+        outlinks=_extract_outlinks(url, html),
+        sources=extract_sources(html, url),
+        is_source=candidate.is_source if candidate else False,
+        parent_url=candidate.parent_url if candidate else None,
+    )
+
 
 def _should_use_playwright(html: str) -> bool:
     if PLAYWRIGHT_MODE in {"0", "false", "no", "off"}:
@@ -205,6 +229,7 @@ class FocusedCrawler:
         record_missing_source: Optional[
             Callable[[str, str, str, Optional[int], Optional[str], Optional[str]], None]
         ] = None,
+        on_result: Optional[Callable[[PageResult], Awaitable[None]]] = None,
     ) -> None:
         self.query = query
         self.budget = max(1, budget)
@@ -215,11 +240,13 @@ class FocusedCrawler:
         self.cooldowns = CrawlCooldowns(out_dir.parent / "cooldowns.json")
         self.results: List[PageResult] = []
         self.visited: set[str] = set()
-        self.robots = RobotsCache(respect=RESPECT_ROBOTS, user_agent=USER_AGENT)
+        self.robots = RobotsCache.shared(
+            respect=RESPECT_ROBOTS,
+            user_agent=USER_AGENT,
+            on_fetch=_record_robots_fetch,
+        )
         self._url_filter = UrlBloom(capacity=max(1024, budget * 10))
         self._content_seen: set[str] = set()
-        self._domain_locks: Dict[str, asyncio.Semaphore] = {}
-        self._domain_lock_guard: Optional[asyncio.Lock] = None
         self._results_lock: Optional[asyncio.Lock] = None
         self.last_output_path: Optional[Path] = None
         self._queued_urls: set[str] = set()
@@ -227,6 +254,11 @@ class FocusedCrawler:
         self.source_budget = SourceBudget(self.source_config) if self.source_config.enabled else None
         self._record_source_links = record_source_links
         self._record_missing_source = record_missing_source
+        # When set, each accepted page is written to the raw JSONL and handed
+        # to ``on_result`` immediately; the kept PageResult drops its HTML so a
+        # long crawl does not hold every page body in memory.
+        self._on_result = on_result
+        self._raw_handle: Optional[IO[str]] = None
         self.source_stats = {
             "discovered": 0,
             "enqueued": 0,
@@ -240,7 +272,6 @@ class FocusedCrawler:
         if httpx is None:
             raise RuntimeError("httpx is required to run the focused crawler")
         self.out_dir.mkdir(parents=True, exist_ok=True)
-        self._domain_lock_guard = asyncio.Lock()
         self._results_lock = asyncio.Lock()
         async with httpx.AsyncClient(headers={"User-Agent": USER_AGENT}) as client:
             if self.initial_seeds is not None:
@@ -279,74 +310,81 @@ class FocusedCrawler:
         return enriched
 
     async def _crawl(self, client: httpx.AsyncClient, seeds: List[Candidate]) -> None:
-        queue: asyncio.Queue[Candidate] = asyncio.Queue()
+        scheduler = HostScheduler(crawl_delay=CRAWL_DELAY, per_host=PER_DOMAIN_CONCURRENCY)
         for candidate in seeds:
-            await queue.put(candidate)
+            scheduler.put_nowait(candidate)
             self._queued_urls.add(candidate.url)
         stop_event = asyncio.Event()
-        workers = [asyncio.create_task(self._worker(client, queue, stop_event)) for _ in range(GLOBAL_CONCURRENCY)]
-        await queue.join()
+        workers = [
+            asyncio.create_task(self._worker(client, scheduler, stop_event))
+            for _ in range(GLOBAL_CONCURRENCY)
+        ]
+        await scheduler.join()
         stop_event.set()
-        for _ in workers:
-            await queue.put(Candidate(url="", source="stop", weight=0, score=0.0))
+        scheduler.close()
         await asyncio.gather(*workers, return_exceptions=True)
 
     async def _worker(
         self,
         client: httpx.AsyncClient,
-        queue: asyncio.Queue[Candidate],
+        scheduler: HostScheduler,
         stop_event: asyncio.Event,
     ) -> None:
         while True:
-            candidate = await queue.get()
-            if not candidate.url:
-                queue.task_done()
+            candidate = await scheduler.get()
+            if candidate is None:
                 break
-            if stop_event.is_set():
-                queue.task_done()
-                continue
-            url = candidate.url
-            if url in self._url_filter:
-                queue.task_done()
-                continue
-            self._url_filter.add(url)
-            if url in self.visited:
-                queue.task_done()
-                continue
-            domain = urlparse(url).netloc.lower()
-            lock = await self._get_domain_lock(domain)
-            async with lock:
-                result, failure = await self._fetch_single(client, candidate)
-            queue.task_done()
-            if result:
-                assert self._results_lock is not None
-                follow_sources = bool(self.source_budget)
-                pending_sources = result.sources if self.source_budget else []
-                async with self._results_lock:
-                    if len(self.results) >= self.budget:
-                        stop_event.set()
-                        continue
-                    self.results.append(result)
-                    self.visited.add(url)
-                    self.cooldowns.mark(self.query, domain, time.time())
-                    if pending_sources:
-                        self.source_stats["discovered"] += len(pending_sources)
-                    if len(self.results) >= self.budget:
-                        stop_event.set()
-                if follow_sources:
-                    await self._handle_sources(candidate, result, queue)
-            elif failure and candidate.is_source:
-                self._handle_source_failure(candidate, failure)
-
-    async def _get_domain_lock(self, domain: str) -> asyncio.Semaphore:
-        if self._domain_lock_guard is None:
-            raise RuntimeError("domain lock guard not initialized")
-        async with self._domain_lock_guard:
-            lock = self._domain_locks.get(domain)
-            if lock is None:
-                lock = asyncio.Semaphore(PER_DOMAIN_CONCURRENCY)
-                self._domain_locks[domain] = lock
-            return lock
+            try:
+                await self._process(client, scheduler, candidate, stop_event)
+            finally:
+                scheduler.task_done(candidate)
+
+    async def _process(
+        self,
+        client: httpx.AsyncClient,
+        scheduler: HostScheduler,
+        candidate: Candidate,
+        stop_event: asyncio.Event,
+    ) -> None:
+        if stop_event.is_set():
+            return
+        url = candidate.url
+        if url in self._url_filter:
+            return
+        self._url_filter.add(url)
+        if url in self.visited:
+            return
+        domain = host_key(url)
+        result, failure = await self._fetch_single(client, candidate)
+        robots_delay = self.robots.crawl_delay(url) if RESPECT_ROBOTS else None
+        if robots_delay:
+            scheduler.set_delay(domain, min(robots_delay, MAX_CRAWL_DELAY))
+        if result:
+            assert self._results_lock is not None
+            follow_sources = bool(self.source_budget)
+            pending_sources = result.sources if self.source_budget else []
+            async with self._results_lock:
+                if len(self.results) >= self.budget:
+                    stop_event.set()
+                    scheduler.stop()
+                    return
+                if self._on_result is not None:
+                    self._stream_raw(result)
+                self.results.append(result)
+                self.visited.add(url)
+                self.cooldowns.mark(self.query, domain, time.time())
+                if pending_sources:
+                    self.source_stats["discovered"] += len(pending_sources)
+                if len(self.results) >= self.budget:
+                    stop_event.set()
+                    scheduler.stop()
+            if self._on_result is not None:
+                await self._on_result(result)
+                result.html = ""
+            if follow_sources:
+                await self._handle_sources(candidate, result, scheduler)
+        elif failure and candidate.is_source:
+            self._handle_source_failure(candidate, failure)
 
     async def _fetch_single(
         self, client: httpx.AsyncClient, candidate: Candidate
@@ -420,7 +458,7 @@ class FocusedCrawler:
         self,
         candidate: Candidate,
         result: PageResult,
-        queue: asyncio.Queue[Candidate],
+        queue: "asyncio.Queue[Candidate] | HostScheduler",
     ) -> None:
         if not self.source_budget or not result.sources:
             return
@@ -484,7 +522,20 @@ class FocusedCrawler:
         except Exception:  # pragma: no cover - logging only
             LOGGER.debug("failed to record missing source %s", candidate.url, exc_info=True)
 
+    def _stream_raw(self, result: PageResult) -> None:
+        if self._raw_handle is None:
+            path = self.out_dir / f"focused_{int(time.time())}.jsonl"
+            self._raw_handle = path.open("w", encoding="utf-8")
+            self.last_output_path = path
+        self._raw_handle.write(json.dumps(result.as_record(self.query), ensure_ascii=False) + "\n")
+        self._raw_handle.flush()
+
     def _persist_results(self) -> None:
+        if self._raw_handle is not None:
+            self._raw_handle.close()
+            self._raw_handle = None
+            LOGGER.info("Streamed %s page(s) to %s", len(self.results), self.last_output_path)
+            return
         if not self.results:
             LOGGER.info("No pages fetched for query '%s'", self.query)
             self.last_output_path = None
@@ -493,29 +544,7 @@ class FocusedCrawler:
         path = self.out_dir / f"focused_{timestamp}.jsonl"
         with path.open("w", encoding="utf-8") as handle:
             for result in self.results:
-                    handle.write(
-                        json.dumps(
-                            {
-                                "query": self.query,
-                                "url": result.url,
-                                "status": result.status,
-                                "title": result.title,
-                                "html": result.html,
-                                "fetched_at": result.fetched_at,
-                                "content_hash": result.fingerprint.md5,
-                                "simhash": result.fingerprint.simhash,
-                                "outlinks": result.outlinks,
-                                "sources": [
-                                    {"url": link.url, "kind": link.kind}
-                                    for link in result.sources
-                                ],
-                                "is_source": bool(result.is_source),
-                                "parent_url": result.parent_url,
-                            },
-                            ensure_ascii=False,
-                        )
-                        + "\n"
-                )
+                handle.write(json.dumps(result.as_record(self.query), ensure_ascii=False) + "\n")
         LOGGER.info("Persisted %s page(s) to %s", len(self.results), path)
         self.last_output_path = path
 
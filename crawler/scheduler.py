@@ -0,0 +1,253 @@
+"""Host-aware crawl scheduling for :class:`crawler.run.FocusedCrawler`.
+
+Candidates are kept in one priority heap per host. A host becomes eligible
+again ``crawl_delay`` seconds after its previous request started (and only
+while it has fewer than ``per_host`` requests in flight). Among the eligible
+hosts, :meth:`HostScheduler.get` always hands out the highest-priority
+candidate, so workers never park on a busy host while other hosts have work.
+
+Every scheduler also consults a process-wide :class:`HostGate`, so crawls
+running side by side (one scheduler per crawl) share each host's delay and
+in-flight limit instead of each applying its own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .frontier import Candidate
+
+__all__ = ["HOST_GATE", "HostGate", "HostScheduler", "host_key"]
+
+
+def host_key(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+class HostGate:
+    """Thread-safe per-host politeness shared across schedulers and event loops.
+
+    :meth:`reserve` claims a request slot for ``host`` when fewer than
+    ``limit`` requests are in flight and ``delay`` seconds have passed since
+    the previous request started; otherwise it returns the time to retry.
+    Schedulers on other event loops are not notified when a slot frees up,
+    so a host that is busy elsewhere is polled every ``busy_retry`` seconds.
+    """
+
+    def __init__(self, *, busy_retry: float = 0.05, max_idle_hosts: int = 4096) -> None:
+        self.busy_retry = max(0.001, float(busy_retry))
+        self.max_idle_hosts = max(1, int(max_idle_hosts))
+        self._lock = threading.Lock()
+        self._last_start: Dict[str, float] = {}
+        self._active: Dict[str, int] = {}
+
+    def reserve(self, host: str, *, delay: float, limit: int, now: float) -> Optional[float]:
+        with self._lock:
+            active = self._active.get(host, 0)
+            if active >= limit:
+                return now + self.busy_retry
+            last = self._last_start.get(host)
+            if last is not None and last + delay > now:
+                return last + delay
+            self._active[host] = active + 1
+            self._last_start[host] = now
+            if len(self._last_start) > self.max_idle_hosts:
+                self._prune()
+            return None
+
+    def release(self, host: str) -> None:
+        with self._lock:
+            active = self._active.get(host, 0) - 1
+            if active > 0:
+                self._active[host] = active
+            else:
+                self._active.pop(host, None)
+
+    def _prune(self) -> None:
+        idle = [host for host in self._last_start if host not in self._active]
+        idle.sort(key=self._last_start.__getitem__)
+        for host in idle[: len(self._last_start) - self.max_idle_hosts]:
+            del self._last_start[host]
+
+
+HOST_GATE = HostGate()
+
+
+@dataclass
+class _HostState:
+    heap: List[Tuple[float, int, Candidate]] = field(default_factory=list)
+    delay: float = 0.0
+    next_ready: float = 0.0
+    active: int = 0
+    # Bumped whenever the host is (re)scheduled; older heap entries are stale.
+    token: int = 0
+
+
+class HostScheduler:
+    """Priority frontier with per-host politeness.
+
+    The interface mirrors the parts of :class:`asyncio.Queue` the crawler
+    uses: ``put``/``put_nowait`` to enqueue, ``get`` to take the next
+    candidate (``None`` once the scheduler is closed), ``task_done`` when a
+    fetch finishes and ``join`` to wait until all work is done.
+    """
+
+    def __init__(
+        self,
+        *,
+        crawl_delay: float = 0.0,
+        per_host: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+        gate: Optional[HostGate] = None,
+    ) -> None:
+        self.crawl_delay = max(0.0, float(crawl_delay))
+        self.per_host = max(1, int(per_host))
+        self._clock = clock
+        self._gate = gate if gate is not None else HOST_GATE
+        self._hosts: Dict[str, _HostState] = {}
+        self._available: List[Tuple[float, int, int, str]] = []
+        self._waiting: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._pending = 0
+        self._active = 0
+        self._closed = False
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+    def put_nowait(self, candidate: Candidate) -> None:
+        if self._closed:
+            return
+        host = host_key(candidate.url)
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(delay=self.crawl_delay)
+            self._hosts[host] = state
+        heapq.heappush(state.heap, (-candidate.priority(), next(self._sequence), candidate))
+        self._pending += 1
+        self._idle.clear()
+        self._schedule(host, state)
+        self._wakeup.set()
+
+    async def put(self, candidate: Candidate) -> None:
+        self.put_nowait(candidate)
+
+    def set_delay(self, host: str, delay: float) -> None:
+        """Raise ``host``'s crawl delay (e.g. from a robots.txt Crawl-delay)."""
+
+        state = self._hosts.get(host)
+        if state is None or delay <= state.delay:
+            return
+        if state.next_ready:
+            state.next_ready += delay - state.delay
+        state.delay = float(delay)
+        self._schedule(host, state)
+
+    # ------------------------------------------------------------------
+    # Consumers
+    # ------------------------------------------------------------------
+    async def get(self) -> Optional[Candidate]:
+        while True:
+            if self._closed:
+                return None
+            now = self._clock()
+            candidate = self._pop_ready(now)
+            if candidate is not None:
+                return candidate
+            timeout = None
+            if self._waiting:
+                timeout = max(0.0, self._waiting[0][0] - now)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def task_done(self, candidate: Candidate) -> None:
+        host = host_key(candidate.url)
+        state = self._hosts.get(host)
+        if state is None or state.active <= 0:
+            raise ValueError(f"task_done() called for idle host {host!r}")
+        state.active -= 1
+        self._active -= 1
+        self._gate.release(host)
+        self._schedule(host, state)
+        if self._active == 0 and self._pending == 0:
+            self._idle.set()
+        self._wakeup.set()
+
+    async def join(self) -> None:
+        await self._idle.wait()
+
+    def stop(self) -> None:
+        """Drop every queued candidate; in-flight fetches still finish."""
+
+        for state in self._hosts.values():
+            state.heap.clear()
+            state.token += 1
+        self._pending = 0
+        self._available.clear()
+        self._waiting.clear()
+        if self._active == 0:
+            self._idle.set()
+
+    def close(self) -> None:
+        """Release every worker blocked in :meth:`get`."""
+
+        self._closed = True
+        self._wakeup.set()
+
+    def qsize(self) -> int:
+        return self._pending
+
+    def empty(self) -> bool:
+        return self._pending == 0
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _schedule(self, host: str, state: _HostState) -> None:
+        state.token += 1
+        if not state.heap or state.active >= self.per_host:
+            return
+        if state.next_ready <= self._clock():
+            priority, sequence, _ = state.heap[0]
+            heapq.heappush(self._available, (priority, sequence, state.token, host))
+        else:
+            heapq.heappush(self._waiting, (state.next_ready, state.token, host))
+
+    def _pop_ready(self, now: float) -> Optional[Candidate]:
+        while self._waiting and self._waiting[0][0] <= now:
+            _, token, host = heapq.heappop(self._waiting)
+            state = self._hosts[host]
+            if token == state.token:
+                priority, sequence, _ = state.heap[0]
+                heapq.heappush(self._available, (priority, sequence, token, host))
+        while self._available:
+            _, _, token, host = heapq.heappop(self._available)
+            state = self._hosts[host]
+            if token != state.token:
+                continue
+            retry_at = self._gate.reserve(host, delay=state.delay, limit=self.per_host, now=now)
+            if retry_at is not None:
+                state.token += 1
+                heapq.heappush(self._waiting, (retry_at, state.token, host))
+                continue
+            _, _, candidate = heapq.heappop(state.heap)
+            self._pending -= 1
+            self._active += 1
+            state.active += 1
+            state.next_ready = now + state.delay
+            self._schedule(host, state)
+            return candidate
+        return None
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Callable, Optional, Sequence
 
 from ..llm.ollama_client import OllamaClient, OllamaClientError
+from .embed_cache import EmbeddingCache
 
 
 class EmbeddingError(RuntimeError):
@@ -12,11 +13,18 @@ class EmbeddingError(RuntimeError):
 
 
 class OllamaEmbedder:
-    """Turns text into vectors using Ollama's embedding endpoint."""
+    """Turns text into vectors using Ollama's embedding endpoint.
 
-    def __init__(self, client: OllamaClient, model: str) -> None:
+    With a :class:`EmbeddingCache`, only texts the cache has not seen for the
+    active model are sent to Ollama.
+    """
+
+    def __init__(
+        self, client: OllamaClient, model: str, *, cache: Optional[EmbeddingCache] = None
+    ) -> None:
         self._client = client
         self._model = model
+        self._cache = cache
 
     @property
     def model(self) -> str:
@@ -29,9 +37,51 @@ class OllamaEmbedder:
 
         self._model = model
 
-    def embed_documents(self, texts: Sequence[str]) -> list[list[float]]:
+    @property
+    def cache(self) -> Optional[EmbeddingCache]:
+        return self._cache
+
+    def embed_documents(
+        self,
+        texts: Sequence[str],
+        *,
+        before_request: Optional[Callable[[], None]] = None,
+    ) -> list[list[float]]:
+        """Embed ``texts``; ``before_request`` runs only if Ollama is needed."""
+
         if not texts:
             return []
+        if self._cache is None:
+            if before_request is not None:
+                before_request()
+            return self._embed(texts)
+        model = self._model
+        vectors = self._cache.get_many(model, texts)
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        if missing:
+            if before_request is not None:
+                before_request()
+            unique = list(dict.fromkeys(texts[index] for index in missing))
+            fresh = self._embed(unique)
+            if len(fresh) != len(unique):
+                raise EmbeddingError("embedding count mismatch")
+            self._cache.put_many(model, unique, fresh)
+            by_text = dict(zip(unique, fresh))
+            for index in missing:
+                vectors[index] = list(by_text[texts[index]])
+        return vectors
+
+    def probe(self) -> list[float]:
+        """Embed a one-character text through Ollama, bypassing the cache.
+
+        Readiness checks use this so a cached vector cannot report a model as
+        loaded when Ollama has never been asked for it.
+        """
+
+        vectors = self._embed(["."])
+        return vectors[0] if vectors else []
+
+    def _embed(self, texts: Sequence[str]) -> list[list[float]]:
         try:
             return self._client.embed(self._model, texts)
         except OllamaClientError as exc:  # pragma: no cover - network failures
@@ -0,0 +1,233 @@
+"""Content-addressed embedding cache shared by the embedding helpers."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    dims INTEGER NOT NULL,
+    vec BLOB NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (model, digest)
+)
+"""
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def _to_blob(vector: Sequence[float]) -> bytes:
+    return array("f", (float(value) for value in vector)).tobytes()
+
+
+def _from_blob(blob: bytes) -> list[float]:
+    buffer = array("f")
+    buffer.frombytes(blob)
+    return buffer.tolist()
+
+
+class EmbeddingCache:
+    """Two-tier cache of embeddings keyed by ``(model, sha256(text))``.
+
+    Lookups go to an in-memory LRU of ``memory_entries`` vectors first, then
+    to an optional SQLite file holding float32 blobs. The file is trimmed to
+    ``max_bytes`` of vector data by evicting the least recently used rows.
+    ``on_lookup(hits, misses)`` is called after every :meth:`get_many`.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        *,
+        memory_entries: int = 4096,
+        max_bytes: int = 256 * 1024 * 1024,
+        on_lookup: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        self.path = Path(path) if path is not None else None
+        self.memory_entries = max(0, int(memory_entries))
+        self.max_bytes = max(0, int(max_bytes))
+        self._on_lookup = on_lookup
+        self._memory: "OrderedDict[tuple[str, str], list[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get_many(self, model: str, texts: Sequence[str]) -> list[Optional[list[float]]]:
+        """Return cached vectors for ``texts`` (``None`` where missing)."""
+
+        keys = [(model, text_digest(text)) for text in texts]
+        found: list[Optional[list[float]]] = [None] * len(keys)
+        missing: dict[str, list[int]] = {}
+        with self._lock:
+            for index, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[index] = list(vector)
+                else:
+                    missing.setdefault(key[1], []).append(index)
+            if missing:
+                for digest, vector in self._disk_lookup(model, list(missing)).items():
+                    self._remember((model, digest), vector)
+                    for index in missing[digest]:
+                        found[index] = list(vector)
+            hits = sum(1 for vector in found if vector is not None)
+            self.hits += hits
+            self.misses += len(found) - hits
+        if self._on_lookup is not None:
+            self._on_lookup(hits, len(found) - hits)
+        return found
+
+    def put_many(
+        self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]
+    ) -> None:
+        rows = []
+        now = time.time()
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                values = [float(value) for value in vector]
+                digest = text_digest(text)
+                self._remember((model, digest), values)
+                rows.append((model, digest, len(values), _to_blob(values), now))
+            if rows:
+                self._disk_store(rows)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+                "evictions": self.evictions,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Internals (callers hold ``self._lock``)
+    # ------------------------------------------------------------------
+    def _remember(self, key: tuple[str, str], vector: list[float]) -> None:
+        if not self.memory_entries:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self.path is None:
+            return None
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)")
+            (self._disk_bytes,) = conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings"
+            ).fetchone()
+            self._conn = conn
+        return self._conn
+
+    def _disk_lookup(self, model: str, digests: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        try:
+            conn = self._connection()
+            if conn is None:
+                return found
+            for start in range(0, len(digests), 500):
+                chunk = digests[start : start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"SELECT digest, vec FROM embeddings WHERE model = ? AND digest IN ({placeholders})",
+                    (model, *chunk),
+                ).fetchall()
+                for digest, blob in rows:
+                    found[digest] = _from_blob(blob)
+            if found:
+                with conn:
+                    conn.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE model = ? AND digest = ?",
+                        [(time.time(), model, digest) for digest in found],
+                    )
+        except sqlite3.Error:
+            LOGGER.debug("embedding cache read failed", exc_info=True)
+        return found
+
+    def _disk_store(self, rows: list[tuple]) -> None:
+        try:
+            conn = self._connection()
+            if conn is None:
+                return
+            with conn:
+                replaced = 0
+                for model, digest, *_ in rows:
+                    row = conn.execute(
+                        "SELECT LENGTH(vec) FROM embeddings WHERE model = ? AND digest = ?",
+                        (model, digest),
+                    ).fetchone()
+                    replaced += row[0] if row else 0
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, digest, dims, vec, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            self._disk_bytes += sum(len(row[3]) for row in rows) - replaced
+            if self.max_bytes and self._disk_bytes > self.max_bytes:
+                self._evict(conn)
+        except sqlite3.Error:
+            LOGGER.debug("embedding cache write failed", exc_info=True)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Trim to 90% of the budget so a steady stream of inserts does not
+        # evict on every write.
+        target = int(self.max_bytes * 0.9)
+        with conn:
+            while self._disk_bytes > target:
+                rows = conn.execute(
+                    "SELECT rowid, LENGTH(vec) FROM embeddings ORDER BY last_used, rowid LIMIT 256"
+                ).fetchall()
+                if not rows:
+                    self._disk_bytes = 0
+                    break
+                freed = 0
+                doomed = []
+                for rowid, size in rows:
+                    doomed.append((rowid,))
+                    freed += size
+                    if self._disk_bytes - freed <= target:
+                        break
+                conn.executemany("DELETE FROM embeddings WHERE rowid = ?", doomed)
+                self._disk_bytes -= freed
+                self.evictions += len(doomed)
+
+
+__all__ = ["EmbeddingCache", "text_digest"]
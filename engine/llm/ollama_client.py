@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass, is_dataclass
 from typing import Any, Iterable, Mapping, Sequence
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from observability import start_span
 
+LOGGER = logging.getLogger(__name__)
+
+# Texts per ``/api/embed`` request and how many of those requests may be in
+# flight at once for a single :meth:`OllamaClient.embed` call.
+EMBED_BATCH_SIZE = int(os.getenv("OLLAMA_EMBED_BATCH_SIZE", "32"))
+EMBED_CONCURRENCY = int(os.getenv("OLLAMA_EMBED_CONCURRENCY", "2"))
+
 
 class OllamaClientError(RuntimeError):
     """Raised when the Ollama API returns an unexpected response."""
@@ -50,10 +62,27 @@ def _message_to_dict(message: Any) -> dict[str, str]:
 class OllamaClient:
     """Minimal HTTP wrapper that exposes chat and embedding helpers."""
 
-    def __init__(self, base_url: str, timeout: float = 60.0) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 60.0,
+        *,
+        embed_batch_size: int = EMBED_BATCH_SIZE,
+        embed_concurrency: int = EMBED_CONCURRENCY,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.embed_batch_size = max(1, int(embed_batch_size))
+        self.embed_concurrency = max(1, int(embed_concurrency))
         self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max(10, self.embed_concurrency))
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # ``None`` until the first batch request tells us whether the server
+        # understands ``/api/embed``; older servers only take one prompt.
+        self._batch_supported: bool | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # Chat completions
@@ -99,34 +128,88 @@ class OllamaClient:
     # Embeddings
     # ------------------------------------------------------------------
     def embed(self, model: str, texts: Sequence[str]) -> list[list[float]]:
-        embeddings: list[list[float]] = []
+        """Embed ``texts`` in order.
+
+        Texts are sent in batches of ``embed_batch_size`` to ``/api/embed``
+        with up to ``embed_concurrency`` batches in flight. Servers without
+        the batch endpoint get one ``/api/embeddings`` request per text.
+        """
+
+        texts = list(texts)
+        batches = [
+            texts[start : start + self.embed_batch_size]
+            for start in range(0, len(texts), self.embed_batch_size)
+        ]
         with start_span(
             "ollama.embed",
-            attributes={"llm.model": model, "text.count": len(texts)},
+            attributes={
+                "llm.model": model,
+                "text.count": len(texts),
+                "embedding.batches": len(batches),
+            },
         ) as span:
-            for text in texts:
-                payload = {"model": model, "prompt": text}
-                response = self._session.post(
-                    f"{self.base_url}/api/embeddings",
-                    json=payload,
-                    timeout=self.timeout,
-                )
-                try:
-                    response.raise_for_status()
-                except requests.RequestException as exc:  # pragma: no cover - network failure
-                    raise OllamaClientError(str(exc)) from exc
-                try:
-                    data = response.json()
-                except ValueError as exc:  # pragma: no cover - unexpected response
-                    raise OllamaClientError("Invalid JSON response from Ollama") from exc
-                vector = data.get("embedding")
-                if not isinstance(vector, Iterable):
-                    raise OllamaClientError("Unexpected embedding response payload")
-                embeddings.append([float(value) for value in vector])
+            if len(batches) <= 1 or self.embed_concurrency == 1:
+                results = [self._embed_batch(model, batch) for batch in batches]
+            else:
+                executor = self._embed_executor()
+                results = list(executor.map(lambda batch: self._embed_batch(model, batch), batches))
+            embeddings = [vector for batch in results for vector in batch]
             if span is not None and embeddings:
                 span.set_attribute("embedding.dims", len(embeddings[0]))
             return embeddings
 
+    def _embed_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.embed_concurrency, thread_name_prefix="ollama-embed"
+                )
+            return self._executor
+
+    def _embed_batch(self, model: str, texts: Sequence[str]) -> list[list[float]]:
+        if self._batch_supported is not False:
+            response = self._session.post(
+                f"{self.base_url}/api/embed",
+                json={"model": model, "input": list(texts)},
+                timeout=self.timeout,
+            )
+            if response.status_code in (404, 405, 501) and not _missing_model(response):
+                LOGGER.info(
+                    "Ollama at %s has no batch embedding endpoint; using per-text requests",
+                    self.base_url,
+                )
+                self._batch_supported = False
+            else:
+                data = self._json(response)
+                vectors = data.get("embeddings")
+                if not isinstance(vectors, list) or len(vectors) != len(texts):
+                    raise OllamaClientError("Unexpected embedding response payload")
+                self._batch_supported = True
+                return [_vector(vector) for vector in vectors]
+        return [self._embed_single(model, text) for text in texts]
+
+    def _embed_single(self, model: str, text: str) -> list[float]:
+        response = self._session.post(
+            f"{self.base_url}/api/embeddings",
+            json={"model": model, "prompt": text},
+            timeout=self.timeout,
+        )
+        return _vector(self._json(response).get("embedding"))
+
+    @staticmethod
+    def _json(response: requests.Response) -> dict:
+        try:
+            response.raise_for_status()
+        except requests.RequestException as exc:  # pragma: no cover - network failure
+            raise OllamaClientError(str(exc)) from exc
+        try:
+            data = response.json()
+        except ValueError as exc:  # pragma: no cover - unexpected response
+            raise OllamaClientError("Invalid JSON response from Ollama") from exc
+        if not isinstance(data, dict):
+            raise OllamaClientError("Unexpected embedding response payload")
+        return data
+
     def embed_one(self, model: str, text: str) -> list[float]:
         [vector] = self.embed(model, [text])
         return vector
@@ -192,6 +275,24 @@ class OllamaClient:
         return match or candidate
 
 
+def _vector(value: Any) -> list[float]:
+    if not isinstance(value, Iterable) or isinstance(value, (str, bytes)):
+        raise OllamaClientError("Unexpected embedding response payload")
+    return [float(item) for item in value]
+
+
+def _missing_model(response: requests.Response) -> bool:
+    """Whether a 404 is Ollama reporting an unpulled model, not a missing route."""
+
+    if response.status_code != 404:
+        return False
+    try:
+        error = response.json().get("error")
+    except (ValueError, AttributeError):
+        return False
+    return isinstance(error, str) and "model" in error.lower() and "not found" in error.lower()
+
+
 def _model_available(target: str, candidates: Iterable[str]) -> bool:
     target_name, target_tag = _split_model_tag(target)
     if not target_name:
@@ -27,6 +27,7 @@ export function ProgressPanel({ jobId }: ProgressPanelProps) {
         case "index":
         case "index_complete":
           stats.indexed += Number(event.added ?? event.docs_indexed ?? 0);
+          stats.normalized += Number(event.normalized ?? 0);
           break;
         case "normalize_complete":
           stats.normalized += Number(event.docs ?? 0);
@@ -1,12 +1,26 @@
-"""Robots.txt helper with caching."""
+"""Robots.txt helper with caching.
+
+Parsed robots.txt files are kept in memory and, when a :class:`RobotsStore` is
+attached, persisted to SQLite keyed by origin so later crawl jobs (and
+restarts) reuse them until they expire. Expiry honours ``Cache-Control:
+max-age``; expired entries are revalidated with ``If-None-Match`` /
+``If-Modified-Since``. Concurrent misses for the same origin share a single
+fetch, including across event loops running in different threads.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import re
+import sqlite3
+import threading
 import time
-from dataclasses import dataclass
-from typing import Dict
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, TypeVar
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 
@@ -17,73 +31,409 @@ except ImportError:  # pragma: no cover - optional dependency
 
 LOGGER = logging.getLogger(__name__)
 
+DATA_DIR = Path(os.getenv("DATA_DIR", "data"))
+DEFAULT_ROBOTS_CACHE_PATH = Path(
+    os.getenv("ROBOTS_CACHE_PATH", DATA_DIR / "crawl" / "robots.sqlite3")
+)
+MAX_ROBOTS_TTL = 86400
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+_T = TypeVar("_T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS robots (
+    origin TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetch_ms REAL NOT NULL DEFAULT 0
+)
+"""
+
+FetchCallback = Callable[[str, float, bool], None]
+
+
+@dataclass(frozen=True)
+class RobotsRecord:
+    """One fetched robots.txt; ``status`` 0 means the fetch failed outright."""
+
+    body: str
+    status: int
+    fetched_at: float
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetch_ms: float = 0.0
+
+    @property
+    def negative(self) -> bool:
+        """True when the origin could not be reached or answered with an error."""
+
+        return self.status == 0 or self.status == 429 or self.status >= 500
+
 
 @dataclass
 class _CacheEntry:
     parser: RobotFileParser
-    fetched_at: float
+    record: RobotsRecord
+
+    def fresh(self, now: float) -> bool:
+        return now < self.record.expires_at
+
+
+class RobotsStore:
+    """SQLite persistence for :class:`RobotsRecord` rows keyed by origin."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(self, origin: str) -> Optional[RobotsRecord]:
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT body, status, fetched_at, expires_at, etag, last_modified, fetch_ms "
+                    "FROM robots WHERE origin = ?",
+                    (origin,),
+                ).fetchone()
+        except sqlite3.Error:
+            LOGGER.debug("robots cache read failed for %s", origin, exc_info=True)
+            return None
+        return RobotsRecord(*row) if row else None
+
+    def put(self, origin: str, record: RobotsRecord) -> None:
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO robots "
+                        "(origin, body, status, fetched_at, expires_at, etag, last_modified, fetch_ms) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            origin,
+                            record.body,
+                            record.status,
+                            record.fetched_at,
+                            record.expires_at,
+                            record.etag,
+                            record.last_modified,
+                            record.fetch_ms,
+                        ),
+                    )
+        except sqlite3.Error:
+            LOGGER.debug("robots cache write failed for %s", origin, exc_info=True)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _header(headers: Mapping[str, str] | None, name: str) -> Optional[str]:
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    return value or None
 
 
 class RobotsCache:
     """Cache robots.txt lookups across crawling sessions."""
 
+    _shared: Dict[tuple, "RobotsCache"] = {}
+    _shared_lock = threading.Lock()
+
     def __init__(
         self,
         *,
         respect: bool = True,
         ttl: int = 3600,
+        negative_ttl: int = 300,
         user_agent: str = "SelfHostedSearchBot/1.0",
+        store: Optional[RobotsStore] = None,
+        on_fetch: Optional[FetchCallback] = None,
     ) -> None:
         self.respect = respect
         self.ttl = max(60, ttl)
+        self.negative_ttl = max(30, negative_ttl)
         self.user_agent = user_agent
+        self.store = store
+        self._fetch_hooks: List[FetchCallback] = [on_fetch] if on_fetch is not None else []
         self._cache: Dict[str, _CacheEntry] = {}
-        self._lock = asyncio.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "negative": 0}
+
+    @classmethod
+    def shared(
+        cls,
+        *,
+        respect: bool = True,
+        user_agent: str = "SelfHostedSearchBot/1.0",
+        path: Optional[Path] = None,
+        on_fetch: Optional[FetchCallback] = None,
+    ) -> "RobotsCache":
+        """Return the process-wide cache backed by the on-disk robots store.
+
+        Every distinct ``on_fetch`` passed by any caller is attached to the
+        shared cache, not only the first caller's.
+        """
+
+        store_path = Path(path) if path is not None else DEFAULT_ROBOTS_CACHE_PATH
+        key = (respect, user_agent, store_path)
+        with cls._shared_lock:
+            cache = cls._shared.get(key)
+            if cache is None:
+                cache = cls(
+                    respect=respect,
+                    user_agent=user_agent,
+                    store=RobotsStore(store_path),
+                )
+                cls._shared[key] = cache
+            if on_fetch is not None:
+                cache.add_fetch_hook(on_fetch)
+            return cache
+
+    def add_fetch_hook(self, hook: FetchCallback) -> None:
+        """Call ``hook(origin, fetch_ms, negative)`` after every robots.txt fetch."""
+
+        with self._lock:
+            if hook not in self._fetch_hooks:
+                self._fetch_hooks.append(hook)
 
     def _key(self, url: str) -> str:
         parsed = urlparse(url)
         return f"{parsed.scheme}://{parsed.netloc}".rstrip("/")
 
+    # ------------------------------------------------------------------
+    # Cache bookkeeping
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _parse(key: str, record: RobotsRecord) -> RobotFileParser:
+        parser = RobotFileParser()
+        parser.set_url(f"{key}/robots.txt")
+        parser.parse(record.body.splitlines())
+        return parser
+
+    def _fresh_entry(self, key: str) -> Optional[_CacheEntry]:
+        return self._memory_entry(key) or self._stored_entry(key)
+
+    def _memory_entry(self, key: str) -> Optional[_CacheEntry]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry.fresh(time.time()):
+                self.stats["hits"] += 1
+                return entry
+        return None
+
+    def _stored_entry(self, key: str) -> Optional[_CacheEntry]:
+        record = self.store.get(key) if self.store is not None else None
+        if record is None or record.expires_at <= time.time():
+            return None
+        entry = _CacheEntry(parser=self._parse(key, record), record=record)
+        with self._lock:
+            self._cache[key] = entry
+            self.stats["hits"] += 1
+        return entry
+
+    def _stale_record(self, key: str) -> Optional[RobotsRecord]:
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is not None:
+            return entry.record
+        return self.store.get(key) if self.store is not None else None
+
+    def _claim(self, key: str) -> tuple[Future, bool]:
+        """Return the in-flight fetch for ``key`` and whether the caller owns it."""
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            self.stats["misses"] += 1
+            return future, True
+
+    def _ttl_for(self, headers: Mapping[str, str] | None) -> float:
+        cache_control = _header(headers, "Cache-Control") or ""
+        if "no-store" in cache_control.lower() or "no-cache" in cache_control.lower():
+            return 60.0
+        match = _MAX_AGE_RE.search(cache_control)
+        if match:
+            return float(min(MAX_ROBOTS_TTL, max(60, int(match.group(1)))))
+        return float(self.ttl)
+
+    def _record(
+        self,
+        key: str,
+        status: int,
+        text: str,
+        headers: Mapping[str, str] | None,
+        elapsed_ms: float,
+        stale: Optional[RobotsRecord],
+    ) -> RobotsRecord:
+        now = time.time()
+        if status == 304 and stale is not None:
+            return replace(
+                stale,
+                fetched_at=now,
+                expires_at=now + self._ttl_for(headers),
+                fetch_ms=elapsed_ms,
+            )
+        record = RobotsRecord(
+            body=text if 0 < status < 400 else "",
+            status=status,
+            fetched_at=now,
+            expires_at=now,
+            etag=_header(headers, "ETag"),
+            last_modified=_header(headers, "Last-Modified"),
+            fetch_ms=elapsed_ms,
+        )
+        ttl = self.negative_ttl if record.negative else self._ttl_for(headers)
+        return replace(record, expires_at=now + ttl)
+
+    def _finish(self, key: str, future: Future, record: RobotsRecord) -> _CacheEntry:
+        entry = _CacheEntry(parser=self._parse(key, record), record=record)
+        if self.store is not None:
+            self.store.put(key, record)
+        with self._lock:
+            self._cache[key] = entry
+            self._inflight.pop(key, None)
+            if record.negative:
+                self.stats["negative"] += 1
+        with self._lock:
+            hooks = list(self._fetch_hooks)
+        for hook in hooks:
+            try:
+                hook(key, record.fetch_ms, record.negative)
+            except Exception:  # pragma: no cover - metrics must not break crawling
+                LOGGER.debug("robots fetch callback failed", exc_info=True)
+        future.set_result(entry)
+        return entry
+
+    def _abandon(self, key: str, future: Future) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        if not future.done():
+            future.set_result(None)
+
+    @staticmethod
+    def _conditional_headers(stale: Optional[RobotsRecord]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if stale is None or stale.negative:
+            return headers
+        if stale.etag:
+            headers["If-None-Match"] = stale.etag
+        if stale.last_modified:
+            headers["If-Modified-Since"] = stale.last_modified
+        return headers
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
     async def allowed_async(self, client: httpx.AsyncClient, url: str) -> bool:
         if not self.respect:
             return True
         key = self._key(url)
-        async with self._lock:
-            entry = self._cache.get(key)
-            if entry and (time.time() - entry.fetched_at) < self.ttl:
-                return entry.parser.can_fetch(self.user_agent, url)
-        robots_url = f"{key}/robots.txt"
+        # RobotsStore is SQLite; its reads and writes stay off the event loop.
+        entry = self._memory_entry(key)
+        if entry is None and self.store is not None:
+            entry = await asyncio.to_thread(self._stored_entry, key)
+        if entry is not None:
+            return entry.parser.can_fetch(self.user_agent, url)
+        future, owner = self._claim(key)
+        if not owner:
+            entry = await asyncio.wrap_future(future)
+            if entry is None:
+                return await self.allowed_async(client, url)
+            return entry.parser.can_fetch(self.user_agent, url)
         try:
-            response = await client.get(robots_url, timeout=5.0)
-            text = response.text if response.status_code < 400 else ""
-        except Exception:
-            text = ""
-        parser = RobotFileParser()
-        parser.set_url(robots_url)
-        parser.parse(text.splitlines())
-        async with self._lock:
-            self._cache[key] = _CacheEntry(parser=parser, fetched_at=time.time())
-        return parser.can_fetch(self.user_agent, url)
+            stale = await self._off_loop(self._stale_record, key)
+            robots_url = f"{key}/robots.txt"
+            start = time.perf_counter()
+            try:
+                response = await client.get(
+                    robots_url, timeout=5.0, headers=self._conditional_headers(stale)
+                )
+                status = int(response.status_code)
+                text = response.text if status < 400 else ""
+                headers = response.headers
+            except Exception:
+                status, text, headers = 0, "", None
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            record = self._record(key, status, text, headers, elapsed_ms, stale)
+            entry = await self._off_loop(self._finish, key, future, record)
+        except BaseException:
+            self._abandon(key, future)
+            raise
+        return entry.parser.can_fetch(self.user_agent, url)
+
+    async def _off_loop(self, fn: Callable[..., _T], *args: Any) -> _T:
+        """Run ``fn`` in a worker thread when it may touch the robots store."""
+
+        if self.store is None:
+            return fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """Return the cached ``Crawl-delay`` for ``url``'s origin, if any."""
+
+        with self._lock:
+            entry = self._cache.get(self._key(url))
+        if entry is None:
+            return None
+        delay = entry.parser.crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
 
     def allowed(self, url: str, fetcher=None) -> bool:
         if not self.respect:
             return True
         key = self._key(url)
-        entry = self._cache.get(key)
-        if entry and (time.time() - entry.fetched_at) < self.ttl:
+        entry = self._fresh_entry(key)
+        if entry is not None:
             return entry.parser.can_fetch(self.user_agent, url)
-        robots_url = f"{key}/robots.txt"
-        text = ""
-        if fetcher:
-            try:
-                text = fetcher(robots_url)
-            except Exception:
-                text = ""
-        parser = RobotFileParser()
-        parser.set_url(robots_url)
-        parser.parse((text or "").splitlines())
-        self._cache[key] = _CacheEntry(parser=parser, fetched_at=time.time())
-        return parser.can_fetch(self.user_agent, url)
+        future, owner = self._claim(key)
+        if not owner:
+            entry = future.result()
+            if entry is None:
+                return self.allowed(url, fetcher)
+            return entry.parser.can_fetch(self.user_agent, url)
+        try:
+            robots_url = f"{key}/robots.txt"
+            status, text = 0, ""
+            start = time.perf_counter()
+            if fetcher:
+                try:
+                    text = fetcher(robots_url)
+                    status = 200
+                except Exception:
+                    status, text = 0, ""
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            record = self._record(key, status, text or "", None, elapsed_ms, None)
+            entry = self._finish(key, future, record)
+        except BaseException:
+            self._abandon(key, future)
+            raise
+        return entry.parser.can_fetch(self.user_agent, url)
 
 
-__all__ = ["RobotsCache"]
+__all__ = ["RobotsCache", "RobotsRecord", "RobotsStore"]
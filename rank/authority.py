@@ -5,14 +5,68 @@ from __future__ import annotations
 import json
 import math
 import os
+import sqlite3
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
 from collections.abc import Iterable
+from contextlib import closing
 from typing import Mapping
 from urllib.parse import urlparse
 
 DATA_DIR = Path(os.getenv("DATA_DIR", "data"))
-DEFAULT_AUTHORITY_PATH = Path(os.getenv("AUTHORITY_PATH", DATA_DIR / "index" / "authority.json"))
+DEFAULT_AUTHORITY_PATH = Path(
+    os.getenv("AUTHORITY_PATH", DATA_DIR / "index" / "authority.sqlite3")
+)
+
+_CACHE_LOCK = threading.Lock()
+_CACHE: dict[Path, tuple[tuple, "AuthorityIndex"]] = {}
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS authority (host TEXT PRIMARY KEY, count INTEGER NOT NULL)"
+
+
+def _is_json(path: Path) -> bool:
+    return path.suffix.lower() == ".json"
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def _read_json(path: Path) -> dict[str, int]:
+    try:
+        payload = json.loads(path.read_text("utf-8"))
+    except FileNotFoundError:
+        payload = {}
+    except json.JSONDecodeError:
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
+    return {str(host): int(value) for host, value in payload.items() if isinstance(host, str)}
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _signature(path: Path, generation: int | None) -> tuple:
+    """Cheap fingerprint of every file :meth:`AuthorityIndex.load` may read."""
+
+    if _is_json(path):
+        return (generation, _stat(path))
+    return (
+        generation,
+        _stat(path),
+        _stat(path.with_name(path.name + "-wal")),
+        _stat(path.with_suffix(".json")),
+    )
 
 
 def _normalize_host(value: str) -> str | None:
@@ -28,40 +82,99 @@ def _normalize_host(value: str) -> str | None:
 
 @dataclass(slots=True)
 class AuthorityIndex:
+    """Inbound-link counts per host.
+
+    ``path`` is a SQLite file (the default) or a legacy ``.json`` file. With
+    SQLite, :meth:`save` adds the increments counted since the last save to
+    the stored rows, so several writers loaded from the same snapshot do not
+    overwrite each other's counts. ``_dirty`` hosts (imported from legacy
+    JSON) are inserted with their loaded count only if no row exists yet.
+    """
+
     scores: dict[str, int] = field(default_factory=dict)
     path: Path = field(default=DEFAULT_AUTHORITY_PATH)
+    _dirty: set[str] = field(default_factory=set, repr=False)
+    _deltas: dict[str, int] = field(default_factory=dict, repr=False)
+    _log_scores: dict[str, float] | None = field(default=None, repr=False)
 
     @classmethod
     def load(cls, path: Path) -> "AuthorityIndex":
+        if _is_json(path):
+            return cls(scores=_read_json(path), path=path)
+        if not path.exists():
+            legacy = path.with_suffix(".json")
+            data = _read_json(legacy) if legacy.exists() else {}
+            # First open after the JSON era: persist everything once.
+            return cls(scores=data, path=path, _dirty=set(data))
         try:
-            payload = json.loads(path.read_text("utf-8"))
-        except FileNotFoundError:
-            payload = {}
-        except json.JSONDecodeError:
-            payload = {}
-        if not isinstance(payload, dict):
-            payload = {}
-        data = {str(host): int(value) for host, value in payload.items() if isinstance(host, str)}
-        return cls(scores=data, path=path)
+            with closing(_connect(path)) as conn:
+                rows = conn.execute("SELECT host, count FROM authority").fetchall()
+        except sqlite3.DatabaseError:
+            rows = []
+        return cls(scores={str(host): int(count) for host, count in rows}, path=path)
 
     @classmethod
     def load_default(cls) -> "AuthorityIndex":
         return cls.load(DEFAULT_AUTHORITY_PATH)
 
+    @classmethod
+    def cached(
+        cls, path: Path | None = None, *, generation: int | None = None
+    ) -> "AuthorityIndex":
+        """Return a process-wide shared index for ``path`` (default store).
+
+        The table is reloaded only when the backing files change (mtime/size of
+        the database, its WAL and any legacy JSON sibling) or when
+        ``generation`` differs from the value it was loaded with. Scores are
+        precomputed, so lookups are a single dict access. The returned
+        instance is shared between threads and must be treated as read-only.
+        """
+
+        path = Path(path) if path is not None else DEFAULT_AUTHORITY_PATH
+        signature = _signature(path, generation)
+        with _CACHE_LOCK:
+            entry = _CACHE.get(path)
+            if entry is not None and entry[0] == signature:
+                return entry[1]
+            index = cls.load(path)
+            index._precompute()
+            _CACHE[path] = (signature, index)
+            return index
+
+    @staticmethod
+    def invalidate_cache(path: Path | None = None) -> None:
+        """Drop cached tables for ``path`` (or every path when ``None``)."""
+
+        with _CACHE_LOCK:
+            if path is None:
+                _CACHE.clear()
+            else:
+                _CACHE.pop(Path(path), None)
+
+    def _precompute(self) -> None:
+        self._log_scores = {
+            host: round(math.log1p(max(0, count)), 3) for host, count in self.scores.items()
+        }
+
     def score_for(self, url_or_host: str) -> float:
         host = _normalize_host(url_or_host)
         if not host:
             return 0.0
+        if self._log_scores is not None:
+            return self._log_scores.get(host, 0.0)
         count = max(0, self.scores.get(host, 0))
         return round(math.log1p(count), 3)
 
     def update_from_docs(self, docs: Iterable[Mapping[str, object]]) -> None:
+        self._log_scores = None
         for doc in docs:
             url = doc.get("url")
             host = _normalize_host(str(url))
             if not host:
                 continue
-            self.scores.setdefault(host, 0)
+            if host not in self.scores:
+                self.scores[host] = 0
+                self._deltas.setdefault(host, 0)
             outlinks = doc.get("outlinks") or []
             if isinstance(outlinks, str):  # defensive: allow comma separated
                 outlinks = [item.strip() for item in outlinks.split(",") if item.strip()]
@@ -75,12 +188,40 @@ class AuthorityIndex:
                 if normalized in seen:
                     continue
                 self.scores[normalized] = self.scores.get(normalized, 0) + 1
+                self._deltas[normalized] = self._deltas.get(normalized, 0) + 1
                 seen.add(normalized)
 
     def save(self) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        serializable = {host: count for host, count in sorted(self.scores.items())}
-        self.path.write_text(json.dumps(serializable, indent=2, sort_keys=True), encoding="utf-8")
+        try:
+            self._write()
+        finally:
+            AuthorityIndex.invalidate_cache(self.path)
+
+    def _write(self) -> None:
+        if _is_json(self.path):
+            serializable = {host: count for host, count in sorted(self.scores.items())}
+            self.path.write_text(json.dumps(serializable, indent=2, sort_keys=True), encoding="utf-8")
+            self._dirty.clear()
+            self._deltas.clear()
+            return
+        if not self._dirty and not self._deltas and self.path.exists():
+            return
+        with closing(_connect(self.path)) as conn, conn:
+            conn.executemany(
+                "INSERT INTO authority (host, count) VALUES (?, ?) ON CONFLICT(host) DO NOTHING",
+                [
+                    (host, self.scores.get(host, 0) - self._deltas.get(host, 0))
+                    for host in sorted(self._dirty)
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO authority (host, count) VALUES (?, ?) "
+                "ON CONFLICT(host) DO UPDATE SET count = count + excluded.count",
+                sorted(self._deltas.items()),
+            )
+        self._dirty.clear()
+        self._deltas.clear()
 
 
 __all__ = ["AuthorityIndex"]
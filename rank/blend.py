@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from typing import Iterable, List
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .authority import AuthorityIndex
 from observability import start_span
@@ -19,12 +24,29 @@ DEFAULT_ALPHA = float(os.getenv("RANK_AUTH_ALPHA", "0.15"))
 OLLAMA_HOST = os.getenv("OLLAMA_URL", os.getenv("OLLAMA_HOST", "http://127.0.0.1:11434")).rstrip("/")
 OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "12"))
 RERANK_TOP_N = int(os.getenv("RERANK_TOP_N", "5"))
+RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "1500"))
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "512"))
+RERANK_CACHE_TTL = float(os.getenv("RERANK_CACHE_TTL", "900"))
+RERANK_WORKERS = max(1, int(os.getenv("RERANK_WORKERS", "2")))
+# Queued plus running LLM calls; beyond this new queries skip reranking
+# instead of piling up behind a slow Ollama.
+RERANK_MAX_PENDING = max(1, int(os.getenv("RERANK_MAX_PENDING", str(RERANK_WORKERS * 2))))
+
+_STATE_LOCK = threading.Lock()
+_SESSION: requests.Session | None = None
+_EXECUTOR: ThreadPoolExecutor | None = None
+_RERANK_CACHE: "OrderedDict[tuple[str, str, str], tuple[float, tuple[str, ...]]]" = OrderedDict()
+_INFLIGHT: dict[tuple[str, str, str], Future] = {}
 
 
 def blend_results(results: Iterable[dict], authority: AuthorityIndex | None = None, *, alpha: float = DEFAULT_ALPHA) -> List[dict]:
-    """Return a copy of ``results`` with blended scores."""
+    """Return a copy of ``results`` with blended scores.
+
+    Without an explicit ``authority`` the process-wide cached table is used,
+    so a query does not re-read the authority store.
+    """
 
-    authority = authority or AuthorityIndex.load_default()
+    authority = authority or AuthorityIndex.cached()
     blended: List[dict] = []
     for result in results:
         url = result.get("url", "")
@@ -51,61 +73,122 @@ def _rerank_prompt(query: str, docs: List[dict]) -> str:
     return "\n".join(lines)
 
 
-def maybe_rerank(
-    query: str,
-    results: List[dict],
-    *,
-    enabled: bool,
-    model: str | None = None,
-    top_n: int = RERANK_TOP_N,
-    timeout: float = OLLAMA_TIMEOUT,
-) -> List[dict]:
-    """Rerank ``results`` using a local LLM when available."""
+def _session() -> requests.Session:
+    """Return the pooled HTTP session shared by rerank calls."""
 
-    if not enabled or not results or not OLLAMA_HOST:
-        return results
-    docs = results[: max(1, top_n)]
-    prompt = _rerank_prompt(query, docs)
-    payload = {"model": model or os.getenv("OLLAMA_MODEL", "llama3.1:8b-instruct"), "prompt": prompt, "stream": False}
+    global _SESSION
+    with _STATE_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=RERANK_WORKERS * 2)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _STATE_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=RERANK_WORKERS, thread_name_prefix="rerank"
+            )
+        return _EXECUTOR
+
+
+def _rerank_key(query: str, model: str, docs: List[dict]) -> tuple[str, str, str]:
+    """Key on the query and an order-insensitive fingerprint of the candidate URLs."""
+
+    urls = sorted(str(doc.get("url") or "") for doc in docs)
+    fingerprint = hashlib.sha1("\n".join(urls).encode("utf-8")).hexdigest()
+    return (model, " ".join(query.split()).lower(), fingerprint)
+
+
+def _cached_order(key: tuple[str, str, str]) -> List[str] | None:
+    with _STATE_LOCK:
+        entry = _RERANK_CACHE.get(key)
+        if entry is None:
+            return None
+        expires_at, order = entry
+        if expires_at <= time.monotonic():
+            del _RERANK_CACHE[key]
+            return None
+        _RERANK_CACHE.move_to_end(key)
+        return list(order)
+
+
+def _store_order(key: tuple[str, str, str], order: List[str]) -> None:
+    if RERANK_CACHE_SIZE <= 0:
+        return
+    with _STATE_LOCK:
+        _RERANK_CACHE[key] = (time.monotonic() + RERANK_CACHE_TTL, tuple(order))
+        _RERANK_CACHE.move_to_end(key)
+        while len(_RERANK_CACHE) > RERANK_CACHE_SIZE:
+            _RERANK_CACHE.popitem(last=False)
+
+
+def clear_rerank_cache() -> None:
+    with _STATE_LOCK:
+        _RERANK_CACHE.clear()
+
+
+def _request_order(query: str, docs: List[dict], model: str, timeout: float) -> List[str] | None:
+    """Ask the LLM for an ordering of ``docs``; ``None`` when it is unavailable."""
+
+    payload = {"model": model, "prompt": _rerank_prompt(query, docs), "stream": False}
     start = time.perf_counter()
     try:
         with start_span(
             "rerank.llm",
-            attributes={"llm.model": payload["model"], "rerank.top_n": len(docs)},
+            attributes={"llm.model": model, "rerank.top_n": len(docs)},
             inputs={"query": query},
         ) as span:
-            response = requests.post(f"{OLLAMA_HOST}/api/generate", json=payload, timeout=timeout)
+            response = _session().post(f"{OLLAMA_HOST}/api/generate", json=payload, timeout=timeout)
             response.raise_for_status()
             if span is not None:
                 span.set_attribute("http.status_code", response.status_code)
     except requests.RequestException as exc:
         LOGGER.debug("LLM rerank skipped: %s", exc)
-        return results
+        return None
     finally:
         duration = (time.perf_counter() - start) * 1000
         LOGGER.debug("LLM rerank attempt took %.1fms", duration)
     try:
         body = response.json()
     except ValueError:
-        return results
+        return None
     order_text = (body or {}).get("response", "").strip()
     if not order_text:
-        return results
+        return None
     try:
         ordered_urls = json.loads(order_text)
     except json.JSONDecodeError:
         LOGGER.debug("LLM rerank response not JSON: %s", order_text[:120])
-        return results
+        return None
     if not isinstance(ordered_urls, list):
-        return results
+        return None
+    return [url for url in ordered_urls if isinstance(url, str) and url]
+
+
+def _fetch_and_cache(
+    key: tuple[str, str, str], query: str, docs: List[dict], model: str, timeout: float
+) -> List[str] | None:
+    try:
+        order = _request_order(query, docs, model, timeout)
+        if order is not None:
+            _store_order(key, order)
+        return order
+    finally:
+        with _STATE_LOCK:
+            _INFLIGHT.pop(key, None)
 
+
+def _apply_order(results: List[dict], docs: List[dict], ordered_urls: List[str]) -> List[dict]:
     lookup = {doc.get("url"): doc for doc in docs}
     reordered: List[dict] = []
     used: set[str] = set()
-    for candidate in ordered_urls:
-        url = candidate if isinstance(candidate, str) else None
-        if not url:
-            continue
+    for url in ordered_urls:
         doc = lookup.get(url)
         if doc and url not in used:
             reordered.append(doc)
@@ -119,4 +202,57 @@ def maybe_rerank(
     return reordered
 
 
-__all__ = ["blend_results", "maybe_rerank"]
+def maybe_rerank(
+    query: str,
+    results: List[dict],
+    *,
+    enabled: bool,
+    model: str | None = None,
+    top_n: int = RERANK_TOP_N,
+    timeout: float = OLLAMA_TIMEOUT,
+    budget_ms: float | None = RERANK_BUDGET_MS,
+) -> List[dict]:
+    """Rerank ``results`` using a local LLM when available.
+
+    Orderings are cached per query and candidate URL set. When the LLM does
+    not answer within ``budget_ms`` the blended order is returned unchanged
+    and the request keeps running in the background to warm the cache for
+    the next identical query. ``budget_ms=None`` waits for the full
+    ``timeout``. While ``RERANK_MAX_PENDING`` distinct calls are already
+    queued or running, other queries are returned in blended order without
+    starting a new one.
+    """
+
+    if not enabled or not results or not OLLAMA_HOST:
+        return results
+    docs = results[: max(1, top_n)]
+    model_name = model or os.getenv("OLLAMA_MODEL", "llama3.1:8b-instruct")
+    key = _rerank_key(query, model_name, docs)
+    cached = _cached_order(key)
+    if cached is not None:
+        return _apply_order(results, docs, cached)
+
+    executor = _executor()
+    with _STATE_LOCK:
+        # Identical concurrent requests share one in-flight LLM call. The worker
+        # drops the key under the same lock, so it cannot finish before the
+        # future is registered here.
+        future = _INFLIGHT.get(key)
+        if future is None:
+            if len(_INFLIGHT) >= RERANK_MAX_PENDING:
+                LOGGER.debug("%d LLM reranks pending; skipping rerank", len(_INFLIGHT))
+                return results
+            future = executor.submit(_fetch_and_cache, key, query, docs, model_name, timeout)
+            _INFLIGHT[key] = future
+    wait = None if budget_ms is None else max(0.0, budget_ms / 1000.0)
+    try:
+        ordered = future.result(timeout=wait)
+    except FuturesTimeoutError:
+        LOGGER.debug("LLM rerank exceeded %.0fms budget; finishing in background", budget_ms)
+        return results
+    if ordered is None:
+        return results
+    return _apply_order(results, docs, ordered)
+
+
+__all__ = ["blend_results", "clear_rerank_cache", "maybe_rerank"]
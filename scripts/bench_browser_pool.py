@@ -0,0 +1,86 @@
+"""Benchmark headless renders with a fresh Chromium per page versus the shared pool.
+
+Usage::
+
+    python scripts/bench_browser_pool.py [--pages 20] [--size 2] [--url data:text/html,<p>hi</p>]
+
+``launch`` starts and closes a browser for every page, like the shadow
+indexer, crawler fallback and extract API did before; ``pool`` renders the
+same pages through :class:`BrowserPool` and also reports pool wait time.
+Requires Playwright with Chromium installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.app.services.browser_pool import BrowserPool  # noqa: E402
+
+
+def _render(page, url: str) -> int:
+    page.goto(url, wait_until="domcontentloaded")
+    return len(page.content())
+
+
+def _launch_per_page(url: str) -> int:
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=True)
+        try:
+            context = browser.new_context(ignore_https_errors=True)
+            return _render(context.new_page(), url)
+        finally:
+            browser.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--size", type=int, default=2)
+    parser.add_argument("--url", default="data:text/html,<title>bench</title><p>hello</p>")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.size) as executor:
+        list(executor.map(_launch_per_page, [args.url] * args.pages))
+    elapsed = time.perf_counter() - start
+    print(f"{'launch':>6}: pages={args.pages} elapsed={elapsed:6.2f}s throughput={args.pages / elapsed:7.2f} pages/s")
+
+    waits: list[float] = []
+    pool = BrowserPool(
+        size=args.size,
+        on_render=lambda consumer, wait_ms, render_ms, ok: waits.append(wait_ms),
+    )
+    try:
+        start = time.perf_counter()
+        futures = [
+            pool.submit(
+                lambda page: _render(page, args.url),
+                context_options={"ignore_https_errors": True},
+                origin=args.url,
+            )
+            for _ in range(args.pages)
+        ]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+    print(
+        f"{'pool':>6}: pages={args.pages} elapsed={elapsed:6.2f}s throughput={args.pages / elapsed:7.2f} pages/s "
+        f"mean_wait={sum(waits) / max(1, len(waits)):.1f}ms launches={pool.launches}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
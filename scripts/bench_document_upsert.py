@@ -0,0 +1,93 @@
+"""Benchmark document/page/link-edge ingestion into the app state database.
+
+Usage::
+
+    python scripts/bench_document_upsert.py [--docs 500] [--outlinks 100] [--batch-size 200]
+
+``per-doc`` calls ``AppStateDB.upsert_document`` once per document, like the
+focused crawl did before; ``bulk`` hands the same documents to
+``upsert_documents``. Rows counts documents, pages and link edges.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.app.db import AppStateDB  # noqa: E402
+
+
+def _documents(count: int, outlinks: int) -> list[dict[str, object]]:
+    return [
+        {
+            "job_id": None,
+            "document_id": f"doc-{n}",
+            "url": f"https://example.com/page/{n}",
+            "canonical_url": None,
+            "site": "example.com",
+            "title": f"Page {n}",
+            "description": "benchmark page",
+            "language": "en",
+            "fetched_at": time.time(),
+            "normalized_path": None,
+            "text_len": 2000,
+            "tokens": 300,
+            "content_hash": f"hash-{n}",
+            "categories": ["docs"],
+            "labels": [],
+            "source": "focused_crawl",
+            "verification": {"hash": f"hash-{n}"},
+            "outlinks": [f"https://example.com/page/{n}/{m}" for m in range(outlinks)],
+        }
+        for n in range(count)
+    ]
+
+
+def _run(label: str, db: AppStateDB, ingest) -> None:
+    start = time.perf_counter()
+    ingest(db)
+    elapsed = time.perf_counter() - start
+    rows = sum(
+        db._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ("documents", "pages", "link_edges")
+    )
+    print(
+        f"{label:>8}: rows={rows:>7} elapsed={elapsed:6.2f}s "
+        f"throughput={rows / elapsed:9.1f} rows/s"
+    )
+    db.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--outlinks", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    docs = _documents(args.docs, args.outlinks)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+
+        def per_doc(db: AppStateDB) -> None:
+            for doc in docs:
+                db.upsert_document(**doc)
+
+        _run("per-doc", AppStateDB(root / "per_doc.sqlite3"), per_doc)
+        _run(
+            "bulk",
+            AppStateDB(root / "bulk.sqlite3"),
+            lambda db: db.upsert_documents(docs, batch_size=args.batch_size),
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
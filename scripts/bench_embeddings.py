@@ -0,0 +1,109 @@
+"""Benchmark embedding throughput against a local fake Ollama server.
+
+Usage::
+
+    python scripts/bench_embeddings.py [--chunks 400] [--request-ms 15] [--item-ms 1] [--batch-size 32] [--concurrency 2]
+
+The fake server charges a fixed per-request latency (HTTP + model dispatch)
+plus a per-text cost that is serialized across requests, like a single GPU.
+``per-text`` reproduces the previous client (one ``/api/embeddings`` POST
+per chunk); the other rows use ``/api/embed`` batches.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from engine.llm.ollama_client import OllamaClient  # noqa: E402
+
+
+class _FakeOllama(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, request_s: float, item_s: float) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.request_s = request_s
+        self.item_s = item_s
+        self.model_lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: _FakeOllama
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        texts = payload["input"] if self.path == "/api/embed" else [payload["prompt"]]
+        time.sleep(self.server.request_s)
+        with self.server.model_lock:
+            time.sleep(self.server.item_s * len(texts))
+        vectors = [[float(len(text))] * 8 for text in texts]
+        body = {"embeddings": vectors} if self.path == "/api/embed" else {"embedding": vectors[0]}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _run(label: str, client: OllamaClient, chunks: list[str]) -> None:
+    start = time.perf_counter()
+    vectors = client.embed("bench", chunks)
+    elapsed = time.perf_counter() - start
+    assert len(vectors) == len(chunks)
+    print(
+        f"{label:>22}: chunks={len(chunks):>5} elapsed={elapsed:6.2f}s "
+        f"throughput={len(chunks) / elapsed:8.1f} chunks/s"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=400)
+    parser.add_argument("--request-ms", type=float, default=15.0)
+    parser.add_argument("--item-ms", type=float, default=1.0)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    server = _FakeOllama(args.request_ms / 1000.0, args.item_ms / 1000.0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    chunks = [f"chunk {index} " * 20 for index in range(args.chunks)]
+    try:
+        legacy = OllamaClient(url, embed_concurrency=1)
+        legacy._batch_supported = False
+        _run("per-text", legacy, chunks)
+        _run(
+            f"batch={args.batch_size}",
+            OllamaClient(url, embed_batch_size=args.batch_size, embed_concurrency=1),
+            chunks,
+        )
+        _run(
+            f"batch={args.batch_size} x{args.concurrency}",
+            OllamaClient(url, embed_batch_size=args.batch_size, embed_concurrency=args.concurrency),
+            chunks,
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+"""Benchmark LearnedWebDB.similar_discovery_seeds against many stored queries.
+
+Usage::
+
+    python scripts/bench_learned_seeds.py [--queries 100000] [--dims 64] [--probes 50]
+
+``legacy`` replays the previous algorithm (JSON embeddings, per-row cosine in
+Python, one discovery query per similar query) on a copy of the same data;
+``cold`` includes loading the in-memory matrix, ``warm`` is the steady state
+of a low-confidence search.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.app.search.embedding import cosine_similarity  # noqa: E402
+from server.learned_web_db import LearnedWebDB  # noqa: E402
+
+
+def _populate(db: LearnedWebDB, vectors: np.ndarray) -> None:
+    now = time.time()
+    conn = db._conn
+    conn.execute("BEGIN")
+    conn.execute(
+        "INSERT INTO domains (host, first_seen, last_seen) VALUES ('bench.example', ?, ?)",
+        (now, now),
+    )
+    conn.executemany(
+        "INSERT INTO query_embeddings (query, embedding, updated_at, vector) VALUES (?, '', ?, ?)",
+        ((f"query {n}", now, vector.tobytes()) for n, vector in enumerate(vectors)),
+    )
+    conn.execute("CREATE TABLE legacy_embeddings (query TEXT PRIMARY KEY, embedding TEXT NOT NULL)")
+    conn.executemany(
+        "INSERT INTO legacy_embeddings VALUES (?, ?)",
+        ((f"query {n}", json.dumps([round(float(v), 6) for v in vector])) for n, vector in enumerate(vectors)),
+    )
+    conn.executemany(
+        "INSERT INTO discoveries (query, domain_id, url, reason, score, discovered_at) "
+        "VALUES (?, 1, ?, 'frontier', ?, ?)",
+        (
+            (f"query {n}", f"https://bench.example/{n}/{k}", 1.0 - k / 10, now)
+            for n in range(len(vectors))
+            for k in range(2)
+        ),
+    )
+    conn.execute("COMMIT")
+
+
+def _legacy(db: LearnedWebDB, target: list[float], limit: int, min_similarity: float) -> list[str]:
+    rows = db._conn.execute("SELECT query, embedding FROM legacy_embeddings").fetchall()
+    candidates = []
+    for row in rows:
+        stored = [float(value) for value in json.loads(row["embedding"])]
+        similarity = cosine_similarity(target, stored)
+        if similarity >= min_similarity:
+            candidates.append((similarity, row["query"]))
+    candidates.sort(reverse=True)
+    seeds: list[str] = []
+    for _, query in candidates:
+        for row in db._conn.execute(
+            "SELECT url, MAX(score) AS best FROM discoveries WHERE query = ? GROUP BY url ORDER BY best DESC LIMIT 5",
+            (query,),
+        ):
+            if row["url"] not in seeds:
+                seeds.append(row["url"])
+                if len(seeds) >= limit:
+                    return seeds
+    return seeds
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--dims", type=int, default=64)
+    parser.add_argument("--probes", type=int, default=50)
+    parser.add_argument("--min-similarity", type=float, default=0.35)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((args.queries, args.dims)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    probes = [vectors[n] + 0.3 * rng.standard_normal(args.dims).astype(np.float32) for n in range(args.probes)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = LearnedWebDB(Path(tmp) / "learned.sqlite3")
+        _populate(db, vectors)
+
+        start = time.perf_counter()
+        _legacy(db, probes[0].tolist(), 8, args.min_similarity)
+        print(f"{'legacy':>6}: {(time.perf_counter() - start) * 1000:9.2f} ms/search")
+
+        start = time.perf_counter()
+        db.similar_discovery_seeds(probes[0].tolist(), limit=8, min_similarity=args.min_similarity)
+        print(f"{'cold':>6}: {(time.perf_counter() - start) * 1000:9.2f} ms/search")
+
+        start = time.perf_counter()
+        for probe in probes:
+            seeds = db.similar_discovery_seeds(probe.tolist(), limit=8, min_similarity=args.min_similarity)
+        elapsed = (time.perf_counter() - start) / len(probes)
+        print(f"{'warm':>6}: {elapsed * 1000:9.2f} ms/search (queries={args.queries}, seeds={len(seeds)})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,86 @@
+"""Benchmark HTML normalization throughput over a synthetic corpus.
+
+Usage::
+
+    python scripts/bench_normalize.py [--docs 400] [--paragraphs 40] [--workers 4]
+
+Three paths are compared on the same records: the previous extraction (one
+trafilatura pass plus a second BeautifulSoup parse for headings), the
+single-parse :func:`normalize_record` in the calling thread, and the same
+function in an :class:`ExtractionPool`. Pool start-up is included.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.app.pipeline import normalize as pipeline  # noqa: E402
+
+WORDS = (
+    "search index crawler ranking query vector document page link host robots "
+    "snippet token language parser extract heading title body section archive"
+).split()
+
+
+def _corpus(count: int, paragraphs: int) -> list[dict]:
+    rng = random.Random(count)
+    records = []
+    for index in range(count):
+        sections = []
+        for section in range(paragraphs):
+            text = " ".join(rng.choice(WORDS) for _ in range(60))
+            heading = "h1" if section == 0 else "h2"
+            sections.append(f"<{heading}>Section {section}</{heading}><p>{text}.</p>")
+        html = (
+            f"<html><head><title>Doc {index}</title><script>var x = {index};</script></head>"
+            f"<body><nav><a href='/'>home</a></nav><article>{''.join(sections)}</article>"
+            "<footer>footer text</footer></body></html>"
+        )
+        records.append({"url": f"https://bench.test/{index}", "status": 200, "html": html})
+    return records
+
+
+def _previous(record: dict) -> dict | None:
+    html = record["html"]
+    body = pipeline._extract_text(html)
+    if not body:
+        return None
+    headings = pipeline._collect_headings(html)
+    return {"url": record["url"], "body": body, "h1h2": headings, "lang": pipeline._detect_language(body)}
+
+
+def _run(label: str, records: list[dict], func) -> None:
+    start = time.perf_counter()
+    produced = sum(1 for doc in func(records) if doc is not None)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>12}: docs={produced:>5} elapsed={elapsed:6.2f}s throughput={produced / elapsed:7.1f} docs/s")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=400)
+    parser.add_argument("--paragraphs", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+    records = _corpus(args.docs, args.paragraphs)
+    _run("previous", records, lambda items: map(_previous, items))
+    _run("single-parse", records, lambda items: pipeline.normalize_records(items, workers=0))
+    _run(
+        f"pool[{args.workers}]",
+        records,
+        lambda items: pipeline.normalize_records(items, workers=args.workers),
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
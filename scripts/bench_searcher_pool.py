@@ -0,0 +1,68 @@
+"""Benchmark Whoosh queries with a searcher per query versus the pooled searcher.
+
+Usage::
+
+    python scripts/bench_searcher_pool.py [--docs 5000] [--queries 500]
+
+``per-query`` opens ``ix.searcher()`` for every query, as ``search.query.search``
+did when handed the index directly; ``pooled`` goes through
+:class:`SearcherPool`, which reuses searchers until the generation moves.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.app.indexer.incremental import ensure_index  # noqa: E402
+from backend.app.search.searcher_pool import SearcherPool  # noqa: E402
+from search import query as query_module  # noqa: E402
+
+WORDS = "alpha beta gamma delta search index python crawler vector ranking snippet browser".split()
+
+
+def _populate(ix, docs: int, rng: random.Random) -> None:
+    for start in range(0, docs, 1000):
+        writer = ix.writer(limitmb=256)
+        for n in range(start, min(docs, start + 1000)):
+            body = " ".join(rng.choice(WORDS) for _ in range(200))
+            writer.add_document(url=f"https://example.com/{n}", title=f"Doc {n}", h1h2="", body=body, lang="en")
+        writer.commit()
+
+
+def _run(label: str, target, queries: list[str]) -> None:
+    start = time.perf_counter()
+    for q in queries:
+        query_module.search(target, q, limit=10)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>9}: {elapsed / len(queries) * 1000:7.2f} ms/query ({len(queries) / elapsed:8.1f} q/s)")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(3)
+    queries = [" ".join(rng.sample(WORDS, 2)) for _ in range(args.queries)]
+    with tempfile.TemporaryDirectory() as tmp:
+        ix = ensure_index(Path(tmp) / "index")
+        _populate(ix, args.docs, rng)
+        _run("per-query", ix, queries)
+        pool = SearcherPool(ix, size=1)
+        _run("pooled", pool, queries)
+        pool.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""Benchmark ``SimHashIndex.nearest`` lookup latency at increasing index sizes.
+
+Usage::
+
+    python scripts/bench_simhash.py [--sizes 10000 100000 1000000] [--queries 2000]
+
+Half of the queries are near-duplicates (1-3 flipped bits) of stored
+signatures and half are random misses, which is the worst case for the old
+linear scan.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.app.indexer.dedupe import SimHashIndex, hamming_distance  # noqa: E402
+
+
+def _linear_nearest(entries: dict[str, int], target: int, threshold: int) -> str | None:
+    for url, value in entries.items():
+        if hamming_distance(target, value) <= threshold:
+            return url
+    return None
+
+
+def _queries(rng: random.Random, signatures: list[int], count: int) -> list[int]:
+    queries: list[int] = []
+    for index in range(count):
+        if index % 2:
+            queries.append(rng.getrandbits(64))
+            continue
+        value = rng.choice(signatures)
+        for bit in rng.sample(range(64), rng.randint(1, 3)):
+            value ^= 1 << bit
+        queries.append(value)
+    return queries
+
+
+def bench(size: int, query_count: int, *, linear: bool) -> None:
+    rng = random.Random(size)
+    signatures = [rng.getrandbits(64) for _ in range(size)]
+    index = SimHashIndex(entries={})
+    start = time.perf_counter()
+    for position, value in enumerate(signatures):
+        index.update(f"https://example.com/{position}", value)
+    index.nearest(0)  # build the threshold=3 band table
+    build_s = time.perf_counter() - start
+
+    queries = _queries(rng, signatures, query_count)
+    start = time.perf_counter()
+    for query in queries:
+        index.nearest(query)
+    banded_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+    line = f"size={size:>9,} build={build_s:6.2f}s banded={banded_us:8.1f}us/lookup"
+    if linear:
+        sample = queries[: max(1, min(len(queries), 200_000 // max(size // 1000, 1)))]
+        start = time.perf_counter()
+        for query in sample:
+            _linear_nearest(index.entries, query, 3)
+        linear_us = (time.perf_counter() - start) / len(sample) * 1e6
+        line += f" linear={linear_us:10.1f}us/lookup"
+    print(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument(
+        "--no-linear", action="store_true", help="skip the linear-scan baseline"
+    )
+    args = parser.parse_args(argv)
+    for size in args.sizes:
+        bench(size, args.queries, linear=not args.no_linear)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+"""Benchmark top-20 search latency, including snippets, on long pages.
+
+Usage::
+
+    python scripts/bench_snippets.py [--docs 300] [--words 5000] [--queries 50]
+
+``retokenize`` replays the previous highlighting (no stored character
+offsets, ``ContextFragmenter`` re-analyzing every hit's body); ``offsets``
+runs :func:`search.query.search` against the current schema, whose ``body``
+postings carry character offsets.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from whoosh import index
+from whoosh.fields import TEXT
+from whoosh.highlight import ContextFragmenter, HtmlFormatter
+from whoosh.qparser import MultifieldParser, PhrasePlugin
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.app.indexer.schema import build_schema  # noqa: E402
+from search import query as query_module  # noqa: E402
+
+WORDS = (
+    "alpha beta gamma delta epsilon search index python crawler vector ranking snippet "
+    "browser document page network latency cache thread worker queue token analyzer"
+).split()
+
+
+def _legacy_schema():
+    schema = build_schema()
+    schema.remove("body")
+    schema.add("body", TEXT(stored=True, analyzer=build_schema()["body"].analyzer, phrase=True))
+    return schema
+
+
+def _legacy_search(ix, q: str, limit: int) -> list[str]:
+    with ix.searcher() as searcher:
+        parser = MultifieldParser(["title", "h1h2", "body", "url"], schema=ix.schema)
+        parser.add_plugin(PhrasePlugin())
+        hits = searcher.search(parser.parse(q), limit=limit)
+        hits.fragmenter = ContextFragmenter(maxchars=240, surround=60)
+        hits.formatter = HtmlFormatter(tagname="mark")
+        return [hit.highlights("body") or (hit.get("body") or "")[:240] for hit in hits]
+
+
+def _populate(ix, bodies: list[str]) -> None:
+    writer = ix.writer(limitmb=256)
+    for n, body in enumerate(bodies):
+        writer.add_document(url=f"https://example.com/{n}", title=f"Page {n}", h1h2="", body=body, lang="en")
+    writer.commit()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=300)
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(11)
+    bodies = [" ".join(rng.choice(WORDS) for _ in range(args.words)) for _ in range(args.docs)]
+    queries = [" ".join(rng.sample(WORDS, 2)) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("legacy", "current"):
+            (Path(tmp) / name).mkdir()
+        legacy = index.create_in(Path(tmp) / "legacy", _legacy_schema())
+        current = index.create_in(Path(tmp) / "current", build_schema())
+        _populate(legacy, bodies)
+        _populate(current, bodies)
+
+        runs = (
+            ("retokenize", lambda q: _legacy_search(legacy, q, 20)),
+            ("offsets", lambda q: [hit["snippet"] for hit in query_module.search(current, q, limit=20)]),
+        )
+        for label, run in runs:
+            run(queries[0])
+            start = time.perf_counter()
+            for q in queries:
+                snippets = run(q)
+            elapsed = (time.perf_counter() - start) / len(queries)
+            print(f"{label:>10}: {elapsed * 1000:8.2f} ms/query (top-{len(snippets)}, {args.words} words/page)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+"""Benchmark AppStateDB throughput under concurrent readers and writers.
+
+Usage::
+
+    python scripts/bench_state_db.py [--threads 8] [--ops 300] [--write-ratio 0.2]
+
+``single`` routes every call through the writer connection and commits each
+write on its own, like the previous single-connection store; ``pooled``
+uses the read-only connection pool and grouped write commits.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from backend.app.db import AppStateDB  # noqa: E402
+
+
+def _run(label: str, db: AppStateDB, threads: int, ops: int, write_ratio: float) -> None:
+    waits: list[float] = []
+    db._on_call = lambda method, kind, wait_ms, duration_ms: waits.append(wait_ms)
+    for n in range(200):
+        db.add_history_entry(tab_id=None, url=f"https://example.com/{n}", title=f"page {n}")
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        for n in range(ops):
+            if rng.random() < write_ratio:
+                db.set_setting(f"bench-{seed}-{n % 20}", str(n))
+            else:
+                db.query_history(limit=50)
+
+    workers = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    total = threads * ops
+    waits.sort()
+    p95 = waits[int(0.95 * (len(waits) - 1))] if waits else 0.0
+    print(
+        f"{label:>8}: ops={total:>6} elapsed={elapsed:6.2f}s "
+        f"throughput={total / elapsed:8.1f} ops/s wait_p95={p95:6.2f}ms "
+        f"commits={db.write_batches}"
+    )
+    db.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=300)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _run(
+            "single",
+            AppStateDB(root / "single.sqlite3", read_pool_size=0, write_batch_size=1),
+            args.threads,
+            args.ops,
+            args.write_ratio,
+        )
+        _run(
+            "pooled",
+            AppStateDB(root / "pooled.sqlite3"),
+            args.threads,
+            args.ops,
+            args.write_ratio,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 from typing import List
 
-from whoosh.highlight import ContextFragmenter, HtmlFormatter
+from whoosh.highlight import HtmlFormatter, PinpointFragmenter
 from whoosh.qparser import MultifieldParser, PhrasePlugin, QueryParserError
 
 from observability import start_span
@@ -53,8 +53,11 @@ def search(
                 LOGGER.error("unexpected parse error for %s: %s", q, exc)
                 return []
 
-            hits = searcher.search(parsed, limit=limit)
-            hits.fragmenter = ContextFragmenter(maxchars=240, surround=60)
+            # ``terms=True`` records the matched terms so that, for fields
+            # indexed with character offsets, snippets are cut straight from
+            # the postings instead of re-analyzing every stored body.
+            hits = searcher.search(parsed, limit=limit, terms=True)
+            hits.fragmenter = PinpointFragmenter(maxchars=240, surround=60, autotrim=True)
             hits.formatter = HtmlFormatter(tagname="mark")
 
             results = []
@@ -18,7 +18,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, Optional, Sequence
 
-from backend.app.search.embedding import cosine_similarity
+import numpy as np
 from urllib.parse import urlparse, urlunparse
 
 __all__ = [
@@ -77,17 +77,12 @@ def _ts(value: Optional[float]) -> float:
     return float(value if value is not None else time.time())
 
 
-def _normalize_embedding(embedding: Sequence[float]) -> list[float]:
-    vector = [float(value) for value in embedding]
-    norm = math.sqrt(sum(value * value for value in vector))
-    if norm == 0.0:
-        return [0.0 for value in vector]
-    return [value / norm for value in vector]
-
-
-def _serialize_embedding(embedding: Sequence[float]) -> str:
-    normalized = _normalize_embedding(embedding)
-    return json.dumps([round(value, 6) for value in normalized])
+def _normalize_embedding(embedding: Sequence[float]) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+    norm = float(np.linalg.norm(vector))
+    if norm == 0.0 or not math.isfinite(norm):
+        return np.zeros_like(vector)
+    return vector / norm
 
 
 def _deserialize_embedding(payload: str) -> list[float]:
@@ -100,6 +95,37 @@ def _deserialize_embedding(payload: str) -> list[float]:
     return [float(value) for value in data]
 
 
+class _QueryMatrix:
+    """Unit-length float32 query embeddings of one dimensionality, by row."""
+
+    def __init__(self, dims: int) -> None:
+        self.dims = dims
+        self.queries: list[Optional[str]] = []
+        self.rows: dict[str, int] = {}
+        self.data = np.zeros((0, dims), dtype=np.float32)
+
+    def set(self, query: str, vector: np.ndarray) -> None:
+        row = self.rows.get(query)
+        if row is None:
+            row = len(self.queries)
+            if row >= self.data.shape[0]:
+                grown = np.zeros((max(64, row * 2), self.dims), dtype=np.float32)
+                grown[:row] = self.data[:row]
+                self.data = grown
+            self.queries.append(query)
+            self.rows[query] = row
+        self.data[row] = vector
+
+    def discard(self, query: str) -> None:
+        row = self.rows.pop(query, None)
+        if row is not None:
+            self.queries[row] = None
+            self.data[row] = 0.0
+
+    def scores(self, target: np.ndarray) -> np.ndarray:
+        return self.data[: len(self.queries)] @ target
+
+
 @dataclass
 class LearnedWebDB:
     """Small helper around a SQLite database storing learned web state."""
@@ -119,6 +145,9 @@ class LearnedWebDB:
         self._conn.execute("PRAGMA synchronous=NORMAL;")
         self._conn.row_factory = sqlite3.Row
         self._lock = threading.RLock()
+        self._matrices: dict[int, _QueryMatrix] = {}
+        self._matrix_dims: dict[str, int] = {}
+        self._matrix_synced_at = float("-inf")
         self._initialize_schema()
 
     # -- schema -----------------------------------------------------------------
@@ -203,11 +232,20 @@ class LearnedWebDB:
         CREATE TABLE IF NOT EXISTS query_embeddings (
             query TEXT PRIMARY KEY,
             embedding TEXT NOT NULL,
-            updated_at REAL NOT NULL
+            updated_at REAL NOT NULL,
+            vector BLOB
         );
         """
         with self._lock:
             self._conn.executescript(ddl)
+            columns = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(query_embeddings)")
+            }
+            if "vector" not in columns:
+                self._conn.execute("ALTER TABLE query_embeddings ADD COLUMN vector BLOB")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_query_embeddings_updated ON query_embeddings(updated_at)"
+            )
 
     # -- domain helpers ----------------------------------------------------------
 
@@ -446,19 +484,22 @@ class LearnedWebDB:
         normalized_query = (query or "").strip()
         if not normalized_query:
             return
-        serialized = _serialize_embedding(embedding)
+        vector = _normalize_embedding(embedding)
         ts = _ts(updated_at)
         with self._lock:
             self._conn.execute(
                 """
-                INSERT INTO query_embeddings (query, embedding, updated_at)
-                VALUES (?, ?, ?)
+                INSERT INTO query_embeddings (query, embedding, updated_at, vector)
+                VALUES (?, '', ?, ?)
                 ON CONFLICT(query) DO UPDATE SET
                     embedding = excluded.embedding,
-                    updated_at = excluded.updated_at
+                    updated_at = excluded.updated_at,
+                    vector = excluded.vector
                 """,
-                (normalized_query, serialized, ts),
+                (normalized_query, ts, vector.tobytes()),
             )
+            if self._matrix_synced_at != float("-inf"):
+                self._set_matrix_row_locked(normalized_query, vector)
 
     def similar_discovery_seeds(
         self,
@@ -468,47 +509,124 @@ class LearnedWebDB:
         min_similarity: float = 0.35,
         per_query: int = 5,
     ) -> list[str]:
-        if not embedding:
+        """Return discovery URLs recorded for stored queries similar to ``embedding``.
+
+        Stored query embeddings are kept in memory as one unit-length float32
+        matrix per dimensionality, loaded on first use and refreshed from rows
+        updated since the previous call. Similar queries are scored with a
+        single matrix product and their discoveries fetched in one statement.
+        """
+
+        if not embedding or limit <= 0:
             return []
         target = _normalize_embedding(embedding)
         with self._lock:
-            rows = self._conn.execute(
-                "SELECT query, embedding FROM query_embeddings"
-            ).fetchall()
-        candidates: list[tuple[float, str]] = []
-        for row in rows:
-            stored = _deserialize_embedding(row["embedding"])
-            if not stored or len(stored) != len(target):
-                continue
-            similarity = cosine_similarity(target, stored)
-            if similarity >= min_similarity:
-                candidates.append((similarity, row["query"]))
-        candidates.sort(reverse=True)
-        seeds: list[str] = []
-        seen: set[str] = set()
-        for similarity, query in candidates:
-            with self._lock:
-                urls = self._conn.execute(
-                    """
-                    SELECT url, MAX(score) AS best_score
-                    FROM discoveries
-                    WHERE query = ?
-                    GROUP BY url
-                    ORDER BY best_score DESC
-                    LIMIT ?
-                    """,
-                    (query, int(per_query)),
-                ).fetchall()
-            for row in urls:
-                url = row["url"]
-                if url in seen:
-                    continue
-                seen.add(url)
-                seeds.append(url)
-                if len(seeds) >= limit:
-                    return seeds
+            self._sync_query_matrix_locked()
+            matrix = self._matrices.get(int(target.shape[0]))
+            if matrix is None or not matrix.rows:
+                return []
+            scores = matrix.scores(target)
+            hits = np.flatnonzero(scores >= min_similarity)
+            queries = matrix.queries
+            if not hits.size:
+                return []
+            # Rank only the best few queries up front; each contributes up to
+            # ``per_query`` URLs, so this nearly always fills ``limit``.
+            head = min(hits.size, max(4 * limit, 16))
+            if head < hits.size:
+                top = np.argpartition(-scores[hits], head - 1)[:head]
+                hits = np.concatenate([hits[top], np.setdiff1d(hits, hits[top])])
+            head_order = np.argsort(-scores[hits[:head]], kind="stable")
+            ranked = [queries[int(index)] for index in hits[:head][head_order]]
+
+            seeds: list[str] = []
+            seen: set[str] = set()
+            batch = [query for query in ranked if query is not None]
+            remaining = hits[head:]
+            while batch:
+                urls = self._discoveries_for_queries_locked(batch, per_query)
+                for query in batch:
+                    for url in urls.get(query, ()):
+                        if url in seen:
+                            continue
+                        seen.add(url)
+                        seeds.append(url)
+                        if len(seeds) >= limit:
+                            return seeds
+                if not remaining.size:
+                    break
+                order = remaining[np.argsort(-scores[remaining], kind="stable")]
+                batch = [queries[int(index)] for index in order[:500] if queries[int(index)] is not None]
+                remaining = order[500:]
         return seeds
 
+    def _discoveries_for_queries_locked(
+        self, queries: Sequence[str], per_query: int
+    ) -> dict[str, list[str]]:
+        placeholders = ",".join("?" for _ in queries)
+        rows = self._conn.execute(
+            f"""
+            SELECT query, url FROM (
+                SELECT query, url, ROW_NUMBER() OVER (
+                    PARTITION BY query ORDER BY MAX(score) DESC
+                ) AS rank
+                FROM discoveries
+                WHERE query IN ({placeholders})
+                GROUP BY query, url
+            )
+            WHERE rank <= ?
+            ORDER BY query, rank
+            """,
+            (*queries, int(per_query)),
+        ).fetchall()
+        urls: dict[str, list[str]] = {}
+        for row in rows:
+            urls.setdefault(row["query"], []).append(row["url"])
+        return urls
+
+    def _sync_query_matrix_locked(self) -> None:
+        # Pick up rows written by other connections since the last call;
+        # upserts through this instance update the matrix directly.
+        rows = self._conn.execute(
+            """
+            SELECT query, embedding, vector, updated_at FROM query_embeddings
+            WHERE updated_at > ?
+            ORDER BY updated_at
+            """,
+            (self._matrix_synced_at,),
+        ).fetchall()
+        legacy: list[tuple[bytes, str]] = []
+        for row in rows:
+            blob = row["vector"]
+            if blob is None:
+                vector = _normalize_embedding(_deserialize_embedding(row["embedding"]))
+                legacy.append((vector.tobytes(), row["query"]))
+            else:
+                vector = np.frombuffer(blob, dtype=np.float32)
+            self._set_matrix_row_locked(row["query"], vector)
+            self._matrix_synced_at = max(self._matrix_synced_at, float(row["updated_at"]))
+        if self._matrix_synced_at == float("-inf"):
+            self._matrix_synced_at = 0.0
+        if legacy:
+            # One-time conversion of JSON embeddings written by older releases.
+            self._conn.executemany(
+                "UPDATE query_embeddings SET vector = ?, embedding = '' WHERE query = ?",
+                legacy,
+            )
+
+    def _set_matrix_row_locked(self, query: str, vector: np.ndarray) -> None:
+        dims = int(vector.shape[0])
+        if not dims:
+            return
+        previous = self._matrix_dims.get(query)
+        if previous is not None and previous != dims:
+            self._matrices[previous].discard(query)
+        matrix = self._matrices.get(dims)
+        if matrix is None:
+            matrix = self._matrices[dims] = _QueryMatrix(dims)
+        matrix.set(query, vector)
+        self._matrix_dims[query] = dims
+
     # -- pages & links -----------------------------------------------------------
 
     def record_page(
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import logging
-import queue
+import os
 import threading
 import time
 import uuid
 from collections import deque
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Deque, Dict, Optional, Sequence
+from typing import TYPE_CHECKING, Deque, Dict, FrozenSet, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
 
 from backend.app.config import AppConfig
 from backend.app.db import AppStateDB
@@ -24,13 +25,27 @@ if TYPE_CHECKING:  # pragma: no cover - imported for typing only
 
 LOGGER = logging.getLogger(__name__)
 
+REFRESH_WORKERS = max(1, int(os.getenv("REFRESH_WORKERS", "2")))
+REFRESH_USER_BURST = max(1, int(os.getenv("REFRESH_USER_BURST", "4")))
+
+PRIORITY_USER = "user"
+PRIORITY_BACKGROUND = "background"
+_LANES = (PRIORITY_USER, PRIORITY_BACKGROUND)
+
 
 def _now_iso() -> str:
     return datetime.now(tz=timezone.utc).isoformat(timespec="seconds")
 
 
 class RefreshWorker:
-    """Track and execute manual refresh jobs serially."""
+    """Track and execute manual refresh jobs on a small pool of threads.
+
+    Jobs wait in two lanes: ``user`` (explicit refresh or index requests) is
+    served before ``background`` (resumed jobs), except that a waiting
+    background job is picked after ``user_burst`` consecutive user jobs.
+    A job only starts once no running job shares its normalized query or any
+    of its seed hosts, so concurrent refreshes never hammer the same site.
+    """
 
     DEFAULT_FRONTIER_DEPTH = 4
 
@@ -43,6 +58,8 @@ class RefreshWorker:
         db: Optional["LearnedWebDB"] = None,
         state_db: Optional[AppStateDB] = None,
         progress_bus: Optional[ProgressBus] = None,
+        workers: int = REFRESH_WORKERS,
+        user_burst: int = REFRESH_USER_BURST,
     ) -> None:
         self.config = config
         self.max_history = max_history
@@ -50,13 +67,24 @@ class RefreshWorker:
         self._db = db
         self._state_db = state_db
         self._progress_bus = progress_bus
-        self._queue: "queue.Queue[str]" = queue.Queue()
         self._jobs: Dict[str, dict] = {}
         self._query_to_job: Dict[str, str] = {}
         self._history: Deque[str] = deque(maxlen=max_history)
         self._lock = threading.RLock()
-        self._worker = threading.Thread(target=self._worker_loop, name="refresh-worker", daemon=True)
-        self._worker.start()
+        self._ready = threading.Condition(self._lock)
+        self._lanes: Dict[str, Deque[str]] = {lane: deque() for lane in _LANES}
+        self._active_keys: set[Tuple[str, str]] = set()
+        self._running = 0
+        self._user_burst = max(1, int(user_burst))
+        self._user_streak = 0
+        self._wait_ms: Dict[str, Deque[float]] = {lane: deque(maxlen=200) for lane in _LANES}
+        self._started: Dict[str, int] = {lane: 0 for lane in _LANES}
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"refresh-worker-{n}", daemon=True)
+            for n in range(max(1, int(workers)))
+        ]
+        for worker in self._workers:
+            worker.start()
         self._resume_pending_jobs()
 
     # ------------------------------------------------------------------
@@ -73,12 +101,15 @@ class RefreshWorker:
         force: bool = False,
         seeds: Optional[Sequence[str]] = None,
         resume_job_id: str | None = None,
+        priority: str = PRIORITY_USER,
     ) -> tuple[str, dict, bool]:
         """Queue a refresh for *query*; return (job_id, status, created)."""
 
         normalized = self._normalize_query(query)
         if not normalized:
             raise ValueError("Query must be a non-empty string")
+        if priority not in _LANES:
+            raise ValueError(f"Priority must be one of: {', '.join(_LANES)}")
 
         effective_budget = self._resolve_budget(budget)
         frontier_depth = self._resolve_depth(depth)
@@ -107,6 +138,8 @@ class RefreshWorker:
                 "depth": frontier_depth,
                 "force": bool(force),
                 "seeds": seed_list,
+                "priority": priority,
+                "queue_wait_ms": None,
                 "created_at": now,
                 "started_at": None,
                 "updated_at": now,
@@ -129,7 +162,8 @@ class RefreshWorker:
             }
             self._jobs[job_id] = record
             self._query_to_job[normalized] = job_id
-            self._queue.put(job_id)
+            self._lanes[priority].append(job_id)
+            self._ready.notify()
             if self._state_db is not None:
                 if resume_job_id:
                     self._state_db.update_crawl_status(job_id, "queued")
@@ -187,7 +221,27 @@ class RefreshWorker:
 
             active_jobs = [self._snapshot(self._jobs[jid]) for jid in self._query_to_job.values() if self._jobs.get(jid)]
             recent_jobs = [self._snapshot(self._jobs[jid]) for jid in list(self._history)[-self.max_history :]]
-            return {"active": active_jobs, "recent": recent_jobs}
+            return {"active": active_jobs, "recent": recent_jobs, "queue": self._queue_stats_locked()}
+
+    def _queue_stats_locked(self) -> dict:
+        lanes = {}
+        for lane in _LANES:
+            waits = sorted(self._wait_ms[lane])
+            lanes[lane] = {
+                "depth": len(self._lanes[lane]),
+                "started": self._started[lane],
+                "wait_ms": {
+                    "p50": waits[len(waits) // 2] if waits else 0.0,
+                    "p95": waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+                    "max": waits[-1] if waits else 0.0,
+                },
+            }
+        return {
+            "workers": len(self._workers),
+            "running": self._running,
+            "depth": sum(len(lane) for lane in self._lanes.values()),
+            "lanes": lanes,
+        }
     def _resume_pending_jobs(self) -> None:
         if self._state_db is None:
             return
@@ -209,6 +263,7 @@ class RefreshWorker:
                     force=True,
                     seeds=seeds,
                     resume_job_id=job_id,
+                    priority=PRIORITY_BACKGROUND,
                 )
             except Exception:  # pragma: no cover - defensive logging
                 LOGGER.exception("failed to resume refresh job %s", job_id)
@@ -220,11 +275,62 @@ class RefreshWorker:
     # ------------------------------------------------------------------
     def _worker_loop(self) -> None:
         while True:
-            job_id = self._queue.get()
+            job_id, keys = self._next_job()
             try:
                 self._run_job(job_id)
+            except Exception:  # pragma: no cover - defensive logging
+                LOGGER.exception("refresh job %s crashed", job_id)
             finally:
-                self._queue.task_done()
+                with self._ready:
+                    self._active_keys.difference_update(keys)
+                    self._running -= 1
+                    self._ready.notify_all()
+
+    def _next_job(self) -> Tuple[str, FrozenSet[Tuple[str, str]]]:
+        """Block until a queued job whose query and hosts are all free can start."""
+
+        with self._ready:
+            while True:
+                picked = self._pick_locked()
+                if picked is not None:
+                    return picked
+                self._ready.wait()
+
+    def _pick_locked(self) -> Optional[Tuple[str, FrozenSet[Tuple[str, str]]]]:
+        lanes = list(_LANES)
+        if self._user_streak >= self._user_burst and self._lanes[PRIORITY_BACKGROUND]:
+            lanes.reverse()
+        for lane in lanes:
+            queued = self._lanes[lane]
+            for job_id in list(queued):
+                job = self._jobs.get(job_id)
+                if job is None:
+                    queued.remove(job_id)
+                    continue
+                keys = self._exclusion_keys(job)
+                if keys & self._active_keys:
+                    continue
+                queued.remove(job_id)
+                self._active_keys.update(keys)
+                self._running += 1
+                self._user_streak = self._user_streak + 1 if lane == PRIORITY_USER else 0
+                wait_ms = max(0.0, (time.time() - float(job.get("created_at") or time.time())) * 1000.0)
+                job["queue_wait_ms"] = round(wait_ms, 3)
+                self._wait_ms[lane].append(wait_ms)
+                self._started[lane] += 1
+                return job_id, keys
+        return None
+
+    @staticmethod
+    def _exclusion_keys(job: dict) -> FrozenSet[Tuple[str, str]]:
+        keys = {("query", str(job.get("normalized_query") or ""))}
+        for seed in job.get("seeds") or []:
+            host = (urlsplit(seed).hostname or "").lower()
+            if host.startswith("www."):
+                host = host[4:]
+            if host:
+                keys.add(("host", host))
+        return frozenset(keys)
 
     def _run_job(self, job_id: str) -> None:
         with self._lock:
@@ -419,6 +525,9 @@ class RefreshWorker:
             elif stage == "crawl_complete":
                 stats["pages_fetched"] = int(payload.get("pages_fetched", 0) or 0)
                 stats["fetched"] = stats["pages_fetched"]
+            elif stage == "index_progress":
+                stats["docs_indexed"] = int(payload.get("docs_indexed", 0) or 0)
+                stats["updated"] = stats["docs_indexed"]
             elif stage == "normalize_complete":
                 stats["normalized_docs"] = int(payload.get("docs", 0) or 0)
             elif stage == "index_complete":
@@ -426,6 +535,8 @@ class RefreshWorker:
                 stats["skipped"] = int(payload.get("skipped", 0) or 0)
                 stats["deduped"] = int(payload.get("deduped", 0) or 0)
                 stats["updated"] = stats["docs_indexed"]
+                if "normalized" in payload:
+                    stats["normalized_docs"] = int(payload.get("normalized", 0) or 0)
             elif stage == "index_skipped":
                 stats["updated"] = 0
             job["stats"] = stats
@@ -485,6 +596,8 @@ class RefreshWorker:
             "depth": job.get("depth"),
             "force": bool(job.get("force", False)),
             "seeds": list(job.get("seeds", []) or []),
+            "priority": job.get("priority", PRIORITY_USER),
+            "queue_wait_ms": job.get("queue_wait_ms"),
             "created_at": job.get("created_at"),
             "started_at": job.get("started_at"),
             "updated_at": job.get("updated_at"),
@@ -510,6 +623,7 @@ class RefreshWorker:
             "frontier_start": 10,
             "frontier_complete": 20,
             "crawl_start": 30,
+            "index_progress": 40,
             "crawl_complete": 55,
             "normalize_start": 65,
             "normalize_complete": 75,
@@ -532,6 +646,9 @@ class RefreshWorker:
         if stage == "crawl_complete":
             pages = int(payload.get("pages_fetched", 0) or 0)
             return f"Fetched {pages} page{'s' if pages != 1 else ''}."
+        if stage == "index_progress":
+            docs = int(payload.get("docs_indexed", 0) or 0)
+            return f"Indexed {docs} document{'s' if docs != 1 else ''} so far…"
         if stage == "normalize_start":
             return "Normalizing new documents…"
         if stage == "normalize_complete":
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import base64
+import threading
 from typing import Any
 
 import pytest
@@ -8,6 +9,7 @@ from flask import Flask
 
 from backend.app.api import extract as extract_mod
 from backend.app.api.extract import bp as extract_bp
+from backend.app.services.browser_pool import BrowserPool
 
 
 class _DummyPage:
@@ -50,7 +52,7 @@ class _DummyPage:
         assert type == "png"
         return self._screenshot_bytes
 
-    def close(self) -> None:  # pragma: no cover - defensive
+    def close(self) -> None:
         self.closed = True
 
 
@@ -78,25 +80,8 @@ class _DummyBrowser:
     def close(self) -> None:
         self.closed = True
 
-
-class _DummyChromium:
-    def __init__(self, browser: _DummyBrowser) -> None:
-        self._browser = browser
-
-    def launch(self, *, headless: bool) -> _DummyBrowser:
-        assert headless is True
-        return self._browser
-
-
-class _DummyPlaywrightManager:
-    def __init__(self, playwright: Any) -> None:
-        self._playwright = playwright
-
-    def __enter__(self) -> Any:
-        return self._playwright
-
-    def __exit__(self, *_exc: object) -> None:
-        return None
+    def is_connected(self) -> bool:
+        return not self.closed
 
 
 def test_playwright_extract_returns_payload(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -104,16 +89,9 @@ def test_playwright_extract_returns_payload(monkeypatch: pytest.MonkeyPatch) ->
     dummy_page = _DummyPage(screenshot_bytes=screenshot, fallback_text="fallback text")
     dummy_context = _DummyContext(page=dummy_page)
     dummy_browser = _DummyBrowser(context=dummy_context)
-    dummy_chromium = _DummyChromium(browser=dummy_browser)
-
-    class _DummyPlaywright:
-        chromium = dummy_chromium
+    pool = BrowserPool(size=1, launcher=lambda headless: (None, dummy_browser))
 
-    monkeypatch.setattr(
-        extract_mod,
-        "sync_playwright",
-        lambda: _DummyPlaywrightManager(_DummyPlaywright()),
-    )
+    monkeypatch.setattr(extract_mod, "get_browser_pool", lambda: pool)
     monkeypatch.setattr(
         extract_mod,
         "_extract_text",
@@ -130,6 +108,10 @@ def test_playwright_extract_returns_payload(monkeypatch: pytest.MonkeyPatch) ->
     assert payload["lang"] == "en"
     expected_b64 = base64.b64encode(screenshot).decode("ascii")
     assert payload["screenshot_b64"] == expected_b64
+    assert dummy_page.closed is True
+    assert dummy_browser.closed is False
+    pool.close()
+    assert dummy_browser.closed is True
 
 
 def _build_app() -> Flask:
@@ -176,3 +158,25 @@ def test_extract_accepts_html_payload(monkeypatch: pytest.MonkeyPatch) -> None:
     assert payload["text"] == "hello world"
     assert captured["url"] == "https://example.com/page"
     assert captured["title_hint"] == "Provided"
+
+
+def test_extract_times_out_when_pool_is_busy(monkeypatch: pytest.MonkeyPatch) -> None:
+    release = threading.Event()
+    page = _DummyPage(screenshot_bytes=b"", fallback_text="")
+    pool = BrowserPool(
+        size=1, launcher=lambda headless: (None, _DummyBrowser(context=_DummyContext(page=page)))
+    )
+    pool.submit(
+        lambda page: release.wait(5),
+        consumer="shadow",
+        context_options={"ignore_https_errors": True},
+    )
+    monkeypatch.setattr(extract_mod, "get_browser_pool", lambda: pool)
+    monkeypatch.setattr(extract_mod, "_EXTRACT_TIMEOUT_S", 0.05)
+
+    response = _build_app().test_client().get("/api/page/extract?url=https://example.com")
+    release.set()
+    pool.close()
+
+    assert response.status_code == 504
+    assert response.get_json()["error"] == "timeout"
@@ -201,9 +201,11 @@ class _RecordingRefreshWorker:
         depth: int | None,
         force: bool,
         seeds: list[str] | None,
+        priority: str = "user",
     ) -> tuple[str, dict[str, object], bool]:
         self.calls.append(
             {
+                "priority": priority,
                 "query": query,
                 "use_llm": use_llm,
                 "model": model,
@@ -254,3 +256,20 @@ def test_trigger_refresh_normalizes_manual_seed_urls() -> None:
     assert len(worker.calls) == 1
     seeds = worker.calls[0]["seeds"]
     assert seeds == ["https://Example.com/path?a=1", "https://example.com/path?a=1"]
+
+
+def test_trigger_refresh_validates_priority() -> None:
+    app = create_app()
+    worker = _RecordingRefreshWorker()
+    app.config["REFRESH_WORKER"] = worker
+    client = app.test_client()
+
+    for priority in (["user"], {"lane": "user"}, "urgent"):
+        response = client.post("/api/refresh", json={"query": "docs", "priority": priority})
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "invalid_priority"
+    assert worker.calls == []
+
+    response = client.post("/api/refresh", json={"query": "docs", "priority": "background"})
+    assert response.status_code == 202
+    assert worker.calls[0]["priority"] == "background"
@@ -190,6 +190,37 @@ def test_search_returns_keyword_results_without_llm():
     assert coldstart.calls == []
 
 
+def test_search_fuses_keyword_hits_when_hybrid_enabled():
+    chunks = [
+        RetrievedChunk(text="Vector chunk", title="Vector", url="https://vector.example", similarity=0.8, metadata={}),
+        RetrievedChunk(text="Shared chunk", title="Shared", url="https://shared.example", similarity=0.7, metadata={}),
+    ]
+
+    class StubSearchService:
+        def run_query(self, query: str, *, limit: int, use_llm: bool, model: str | None):
+            return (
+                [
+                    {"url": "https://shared.example", "title": "Shared", "snippet": "kw", "score": 9.0},
+                    {"url": "https://keyword.example", "title": "Keyword", "snippet": "Keyword only", "score": 4.0},
+                ],
+                None,
+                {},
+            )
+
+    app = _build_app(StubStore(chunks), ColdStartSpy(), StubRagAgent())
+    app.config.update(SEARCH_SERVICE=StubSearchService(), RAG_HYBRID_SEARCH=True)
+
+    response = app.test_client().get("/api/search", query_string={"q": "test", "llm": "off"})
+    payload = response.get_json()
+    assert [hit["url"] for hit in payload["results"]] == [
+        "https://shared.example",
+        "https://vector.example",
+        "https://keyword.example",
+    ]
+    assert payload["results"][0]["snippet"] == "Shared chunk"
+    assert set(payload["retrieval_timings"]) == {"vector", "bm25"}
+
+
 def test_search_triggers_coldstart_when_insufficient_hits():
     store = StubStore([])
     coldstart = ColdStartSpy()
@@ -3,6 +3,7 @@ from __future__ import annotations
 from flask import Flask
 
 from backend.app.api import agent_tools
+from backend.app.search.hybrid import HybridTimeoutError, RetrieverTiming
 
 
 class StubRuntime:
@@ -67,6 +68,18 @@ def test_search_validation_errors():
     assert bad_k.get_json()["error"] == "k must be an integer between 1 and 100"
 
 
+def test_search_times_out_when_no_retriever_returns():
+    runtime = StubRuntime()
+
+    def hybrid_search(query, *, k, use_embeddings):
+        raise HybridTimeoutError("no retriever returned", {"bm25": RetrieverTiming("timeout", 2000.0)})
+
+    runtime.hybrid_search = hybrid_search
+    response = _app(runtime).test_client().post("/api/tools/search_index", json={"query": "x"})
+    assert response.status_code == 504
+    assert response.get_json()["timings"]["bm25"]["status"] == "timeout"
+
+
 def test_enqueue_endpoint():
     runtime = StubRuntime()
     client = _app(runtime).test_client()
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.app.services.browser_pool import PRIORITY_INTERACTIVE, BrowserPool
+
+
+class _FakePage:
+    def __init__(self, context: "_FakeContext") -> None:
+        self.context = context
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeContext:
+    def __init__(self, options: dict) -> None:
+        self.options = options
+        self.routes: list[str] = []
+        self.cookie_clears = 0
+        self.closed = False
+
+    def route(self, pattern: str, handler) -> None:
+        self.routes.append(pattern)
+
+    def clear_cookies(self) -> None:
+        self.cookie_clears += 1
+
+    def new_page(self) -> _FakePage:
+        return _FakePage(self)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self) -> None:
+        self.contexts: list[_FakeContext] = []
+        self.connected = True
+        self.closed = False
+        self.thread = threading.get_ident()
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def new_context(self, **options) -> _FakeContext:
+        assert threading.get_ident() == self.thread
+        context = _FakeContext(options)
+        self.contexts.append(context)
+        return context
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _Launcher:
+    def __init__(self) -> None:
+        self.browsers: list[_FakeBrowser] = []
+
+    def __call__(self, headless: bool):
+        browser = _FakeBrowser()
+        self.browsers.append(browser)
+        return None, browser
+
+
+def test_browser_and_context_are_reused_until_recycled() -> None:
+    launcher = _Launcher()
+    pool = BrowserPool(size=1, browser_max_uses=5, context_max_uses=2, launcher=launcher)
+    pages = [
+        pool.run(
+            lambda page: page,
+            block=["*://ads.example/*"],
+            context_options={"ignore_https_errors": True},
+            origin=f"https://site.example/{n}",
+        )
+        for n in range(6)
+    ]
+    pool.close()
+
+    assert len(launcher.browsers) == 2
+    first = launcher.browsers[0]
+    assert [len(first.contexts), first.closed] == [3, True]
+    assert first.contexts[0].routes == ["*://ads.example/*"]
+    assert first.contexts[0].options == {"ignore_https_errors": True}
+    assert first.contexts[0].cookie_clears == 1
+    assert all(page.closed for page in pages)
+    assert pool.stats()["launches"] == 2 and pool.stats()["recycles"] == 1
+
+
+def test_contexts_are_not_shared_across_origins() -> None:
+    launcher = _Launcher()
+    pool = BrowserPool(size=1, launcher=launcher)
+    first = pool.run(lambda page: page.context, origin="https://a.example/login")
+    same = pool.run(lambda page: page.context, origin="https://A.example/account")
+    other = pool.run(lambda page: page.context, origin="https://b.example/")
+    anonymous = pool.run(lambda page: page.context)
+    pool.close()
+
+    assert first is same and first.closed
+    assert len({id(first), id(other), id(anonymous)}) == 3
+    assert first.options == {}
+
+
+def test_new_context_when_blocking_changes_and_relaunch_when_disconnected() -> None:
+    launcher = _Launcher()
+    pool = BrowserPool(size=1, launcher=launcher)
+    first = pool.run(lambda page: page.context)
+    second = pool.run(lambda page: page.context, block=["*.png"])
+    assert first is not second and first.closed
+    launcher.browsers[0].connected = False
+    pool.run(lambda page: None)
+    pool.close()
+    assert len(launcher.browsers) == 2
+
+
+def test_errors_reach_the_caller_and_discard_the_context() -> None:
+    launcher = _Launcher()
+    renders: list[tuple[str, bool]] = []
+    pool = BrowserPool(
+        size=1,
+        launcher=launcher,
+        on_render=lambda consumer, wait_ms, render_ms, ok: renders.append((consumer, ok)),
+    )
+
+    def boom(page):
+        raise TimeoutError("navigation timed out")
+
+    with pytest.raises(TimeoutError):
+        pool.run(boom, consumer="extract")
+    context = pool.run(lambda page: page.context, consumer="shadow")
+    pool.close()
+
+    assert launcher.browsers[0].contexts[0].closed
+    assert context is launcher.browsers[0].contexts[1]
+    assert renders == [("extract", False), ("shadow", True)]
+
+
+def test_pool_bounds_concurrency_and_serves_async_callers() -> None:
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def render(page):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return threading.current_thread().name
+
+    launcher = _Launcher()
+    pool = BrowserPool(size=2, launcher=launcher)
+
+    async def crawl() -> list[str]:
+        return await asyncio.gather(*(pool.arun(render, consumer="crawler") for _ in range(6)))
+
+    names = asyncio.run(crawl())
+    pool.close()
+
+    assert peak == 2
+    assert len(launcher.browsers) == 2
+    assert set(names) == {"browser-pool-0", "browser-pool-1"}
+
+
+def test_interactive_jobs_overtake_queued_background_work() -> None:
+    pool = BrowserPool(size=1, launcher=_Launcher())
+    started, release = threading.Event(), threading.Event()
+    order: list[str] = []
+    blocker = pool.submit(lambda page: started.set() or release.wait(5), consumer="shadow")
+    assert started.wait(5)
+    background = [pool.submit(lambda page, n=n: order.append(f"shadow {n}"), consumer="shadow") for n in range(2)]
+
+    with pytest.raises(TimeoutError):
+        pool.run(lambda page: order.append("abandoned"), timeout=0.05, priority=PRIORITY_INTERACTIVE)
+    interactive = pool.submit(lambda page: order.append("extract"), priority=PRIORITY_INTERACTIVE)
+    release.set()
+    for future in [blocker, interactive, *background]:
+        future.result(timeout=5)
+    pool.close()
+
+    assert order == ["extract", "shadow 0", "shadow 1"]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from backend.app.db import AppStateDB
+
+
+def _doc(n: int, **overrides):
+    doc = {
+        "job_id": None,
+        "document_id": f"doc-{n}",
+        "url": f"https://example.com/{n}",
+        "canonical_url": None,
+        "site": "example.com",
+        "title": f"Page {n}",
+        "description": None,
+        "language": "en",
+        "fetched_at": 1_700_000_000.0,
+        "normalized_path": None,
+        "text_len": 10,
+        "tokens": 2,
+        "content_hash": f"hash-{n}",
+        "categories": ["docs"],
+        "labels": [],
+        "source": "focused_crawl",
+        "verification": {"hash": f"hash-{n}"},
+        "outlinks": [f"https://example.com/{m}" for m in range(4)] + ["mailto:x@example.com"],
+    }
+    doc.update(overrides)
+    return doc
+
+
+def test_upsert_documents_writes_batches_in_single_transactions(tmp_path) -> None:
+    db = AppStateDB(tmp_path / "state.sqlite3")
+    baseline = db.write_batches
+
+    written = db.upsert_documents((_doc(n) for n in range(5)), batch_size=2)
+
+    assert written == 5
+    assert db.write_batches - baseline == 3
+    conn = db._conn
+    assert conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0] == 5
+    assert conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0] == 5
+    assert conn.execute("SELECT COUNT(*) FROM link_edges").fetchone()[0] == 20
+
+    # Re-ingesting updates in place and keeps existing labels.
+    db.update_document_labels("doc-0", ["kept"])
+    db.upsert_documents([_doc(1, title="Renamed")])
+    db.upsert_document(**_doc(0, labels=None, outlinks=None))
+    assert db.get_document("doc-1")["title"] == "Renamed"
+    assert db.get_document("doc-0")["labels"] == ["kept"]
+    assert conn.execute("SELECT COUNT(*) FROM link_edges").fetchone()[0] == 20
+    assert db.upsert_documents([]) == 0
+    db.close()
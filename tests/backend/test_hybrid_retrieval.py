@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from backend.agent.document_store import DocumentStore
+from backend.agent.frontier_store import FrontierStore
+from backend.agent.runtime import AgentRuntime, FetcherProtocol
+from backend.app.search import hybrid
+from backend.app.search.hybrid import HybridRetriever, HybridTimeoutError, fuse_rankings
+
+
+def _hits(*urls: str, scores=None):
+    return [
+        {"url": url, "title": url, "snippet": f"about {url}", "score": (scores or {}).get(url, 1.0 / (n + 1))}
+        for n, url in enumerate(urls)
+    ]
+
+
+def test_rrf_lets_agreement_outrank_a_single_top_hit() -> None:
+    fused = fuse_rankings(
+        {"vector": _hits("a", "b", "c"), "bm25": _hits("c", "d", "b")}, method="rrf"
+    )
+    assert [hit["url"] for hit in fused][:2] == ["c", "b"]
+    assert fused[0]["source"] == "hybrid"
+    assert fused[0]["sources"] == {"vector": {"rank": 3, "score": pytest.approx(1 / 3)}, "bm25": {"rank": 1, "score": 1.0}}
+    assert [hit["rank"] for hit in fused] == [1, 2, 3, 4]
+
+
+def test_weighted_fusion_normalizes_each_retriever() -> None:
+    fused = fuse_rankings(
+        {
+            "vector": _hits("a", "b", scores={"a": 0.9, "b": 0.1}),
+            "bm25": _hits("b", "a", scores={"b": 40.0, "a": 20.0}),
+        },
+        method="weighted",
+        weights={"vector": 1.0, "bm25": 3.0},
+    )
+    assert [hit["url"] for hit in fused] == ["b", "a"]
+    assert fused[0]["score"] == pytest.approx(3.0)
+
+
+def test_retrievers_run_concurrently_and_respect_deadlines() -> None:
+    release = threading.Event()
+
+    def slow(query, limit):
+        time.sleep(0.2)
+        return _hits("slow")
+
+    def stuck(query, limit):
+        release.wait(5)
+        return _hits("stuck")
+
+    retriever = HybridRetriever(
+        {"a": slow, "b": slow, "stuck": stuck},
+        deadlines_ms={"stuck": 300},
+    )
+    started = time.perf_counter()
+    result = retriever.search("q", k=5)
+    elapsed = time.perf_counter() - started
+    release.set()
+
+    assert elapsed < 0.39
+    assert [hit["url"] for hit in result.hits] == ["slow"]
+    assert result.timings["a"].status == "ok" and result.timings["a"].elapsed_ms >= 190
+    assert result.timings["stuck"].status == "timeout"
+
+
+def test_failures_are_reported_unless_every_retriever_fails() -> None:
+    def boom(query, limit):
+        raise RuntimeError("offline")
+
+    result = HybridRetriever({"bad": boom, "good": lambda q, n: _hits("x")}).search("q", k=3)
+    assert [hit["url"] for hit in result.hits] == ["x"]
+    assert result.timings_payload()["bad"]["error"] == "offline"
+    with pytest.raises(RuntimeError):
+        HybridRetriever({"bad": boom}).search("q", k=3)
+
+
+def test_hung_retriever_fills_only_its_own_lane() -> None:
+    release = threading.Event()
+
+    def hung(query, limit):
+        release.wait(5)
+        return _hits("late")
+
+    retriever = HybridRetriever(
+        {"hung-vector": hung, "keyword": lambda q, n: _hits("kw")},
+        deadlines_ms={"hung-vector": 20},
+    )
+    try:
+        for _ in range(hybrid.HYBRID_WORKERS + 2):
+            result = retriever.search("q", k=3)
+            assert [hit["url"] for hit in result.hits] == ["kw"]
+        assert result.timings["hung-vector"].status == "saturated"
+        assert result.timings["keyword"].status == "ok"
+
+        with pytest.raises(HybridTimeoutError) as excinfo:
+            HybridRetriever({"hung-vector": hung}).search("q", k=3)
+        assert excinfo.value.timings["hung-vector"].status == "saturated"
+    finally:
+        release.set()
+
+
+class _VectorIndex:
+    def search(self, query, *, k):
+        return [{"url": "https://v.example", "title": "V", "chunk": "vector chunk", "score": 0.9}]
+
+
+class _SearchService:
+    def run_query(self, query, *, limit, use_llm, model):
+        return [
+            {"url": "https://b.example", "title": "B", "snippet": "bm25", "score": 12.0},
+            {"url": "https://v.example", "title": "V", "snippet": "bm25 v", "score": 3.0},
+        ], None, {}
+
+
+class _Fetcher(FetcherProtocol):
+    def fetch(self, url: str):  # pragma: no cover - unused
+        raise AssertionError(url)
+
+
+def test_agent_runtime_search_index_fuses_both_retrievers(tmp_path: Path) -> None:
+    runtime = AgentRuntime(
+        search_service=_SearchService(),
+        frontier=FrontierStore(tmp_path / "frontier.sqlite3"),
+        document_store=DocumentStore(tmp_path / "docs"),
+        vector_index=_VectorIndex(),
+        fetcher=_Fetcher(),
+    )
+    result = runtime.hybrid_search("query", k=5)
+    assert [hit["url"] for hit in result.hits] == ["https://v.example", "https://b.example"]
+    assert result.hits[0]["snippet"] == "vector chunk"
+    assert set(result.timings) == {"vector", "bm25"}
+    assert [hit["url"] for hit in runtime.search_index("query", k=1, use_embeddings=False)] == [
+        "https://b.example"
+    ]
+
+
+class _HungSearchService:
+    def __init__(self, release: threading.Event) -> None:
+        self.release = release
+
+    def run_query(self, query, *, limit, use_llm, model):
+        self.release.wait(5)
+        return [], None, {}
+
+
+def test_agent_turn_treats_a_search_timeout_as_no_results(tmp_path: Path, monkeypatch) -> None:
+    release = threading.Event()
+    runtime = AgentRuntime(
+        search_service=_HungSearchService(release),
+        frontier=FrontierStore(tmp_path / "frontier.sqlite3"),
+        document_store=DocumentStore(tmp_path / "docs"),
+        vector_index=_VectorIndex(),
+        fetcher=_Fetcher(),
+        max_fetch_per_turn=0,
+    )
+    hybrid_search = runtime.hybrid_search
+    monkeypatch.setattr(
+        runtime,
+        "hybrid_search",
+        lambda query, **kwargs: hybrid_search(query, **{**kwargs, "use_embeddings": False, "deadline_ms": 20}),
+    )
+    try:
+        turn = runtime.handle_turn("query")
+    finally:
+        release.set()
+
+    assert turn["results"] == []
+    assert turn["coverage"] == 0.0
+    assert turn["actions"][0] == {"search": {"results": 0, "coverage": 0.0}}
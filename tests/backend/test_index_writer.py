@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from backend.app.indexer.incremental import IncrementalIndexer, index_generation
+from backend.app.indexer.writer import IndexWriterService
+
+
+def _doc(url: str, body: str) -> dict[str, str]:
+    return {"url": url, "title": url, "h1h2": "", "body": body, "lang": "en"}
+
+
+def _urls(service: IndexWriterService) -> set[str]:
+    with service.ix.searcher() as searcher:
+        return {doc["url"] for doc in searcher.documents()}
+
+
+def test_concurrent_producers_share_grouped_commits(tmp_path) -> None:
+    service = IndexWriterService(tmp_path / "index", commit_ms=300, batch_docs=1000)
+    barrier = threading.Barrier(8)
+    futures = []
+
+    def produce(n: int) -> None:
+        barrier.wait()
+        futures.append(service.update_documents([_doc(f"https://p{n}.example/{k}", "grouped") for k in range(5)]))
+
+    threads = [threading.Thread(target=produce, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    generations = {future.result(timeout=5) for future in futures}
+
+    assert service.commits == 1 and len(generations) == 1
+    assert len(_urls(service)) == 40
+    service.close()
+
+
+def test_flush_commits_immediately_and_writes_the_marker(tmp_path) -> None:
+    marker = tmp_path / "last_index_time"
+    service = IndexWriterService(tmp_path / "index", last_index_time_path=marker, commit_ms=60_000)
+    before = index_generation()
+    service.update_documents([_doc("https://a.example", "alpha"), _doc("https://b.example", "beta")])
+
+    started = time.perf_counter()
+    generation = service.flush(timeout=5)
+    assert time.perf_counter() - started < 5
+    assert generation > before and int(marker.read_text()) == generation
+    assert _urls(service) == {"https://a.example", "https://b.example"}
+
+    service.delete_documents(["https://a.example"])
+    service.flush(timeout=5)
+    assert _urls(service) == {"https://b.example"}
+    assert (service.commits, service.documents, service.deletes) == (2, 2, 1)
+    service.close()
+
+
+def test_failed_commit_reaches_producers_and_writer_recovers(tmp_path) -> None:
+    service = IndexWriterService(tmp_path / "index", commit_ms=0, optimize_every=2, merge=False)
+    bad = service.update_documents([{"url": "https://bad.example", "unknown_field": "x"}])
+    with pytest.raises(Exception):
+        bad.result(timeout=5)
+
+    for n in range(3):
+        service.update_documents([_doc(f"https://ok.example/{n}", "fine")]).result(timeout=5)
+    assert _urls(service) == {f"https://ok.example/{n}" for n in range(3)}
+    service.close()
+    with pytest.raises(RuntimeError):
+        service.update_documents([_doc("https://late.example", "closed")])
+
+
+def test_bad_document_fails_only_its_own_producer(tmp_path) -> None:
+    service = IndexWriterService(tmp_path / "index", commit_ms=60_000)
+    good = service.update_documents([_doc("https://good.example", "fine")])
+    bad = service.update_documents([{"url": "https://bad.example", "unknown_field": "x"}])
+    dropped = service.update_documents([_doc("https://dropped.example", "cancelled")])
+    later = service.update_documents([_doc("https://later.example", "fine")])
+    assert dropped.cancel()
+
+    service.flush(timeout=5)
+    with pytest.raises(Exception):
+        bad.result(timeout=5)
+    assert good.result(timeout=5) and later.result(timeout=5)
+    assert _urls(service) == {"https://good.example", "https://later.example"}
+    service.close()
+
+
+def test_concurrent_incremental_indexers_no_longer_contend_for_the_lock(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("rank.authority.DEFAULT_AUTHORITY_PATH", tmp_path / "authority.sqlite3")
+    errors: list[BaseException] = []
+
+    def job(n: int) -> None:
+        try:
+            with IncrementalIndexer(
+                tmp_path / "index",
+                tmp_path / f"ledger{n}.sqlite3",
+                tmp_path / f"simhash{n}.bin",
+                tmp_path / "last_index_time",
+            ) as indexer:
+                for batch in range(3):
+                    indexer.add([_doc(f"https://job{n}.example/{batch}", f"job {n} batch {batch} " * 20)])
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=job, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    indexer = IncrementalIndexer(
+        tmp_path / "index", tmp_path / "ledger0.sqlite3", tmp_path / "simhash0.bin", tmp_path / "last_index_time"
+    )
+    assert indexer.ix.doc_count() == 12
+    indexer.close()
+
+
+def test_failed_write_leaves_documents_pending_for_retry(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("rank.authority.DEFAULT_AUTHORITY_PATH", tmp_path / "authority.sqlite3")
+    indexer = IncrementalIndexer(
+        tmp_path / "index", tmp_path / "ledger.sqlite3", tmp_path / "simhash.bin", tmp_path / "last_index_time"
+    )
+    docs = [_doc("https://retry.example/1", "retry me " * 20)]
+    failed: Future = Future()
+    failed.set_exception(OSError("disk full"))
+    monkeypatch.setattr(indexer.writer, "update_documents", lambda pending: failed)
+    with pytest.raises(OSError):
+        indexer.add(docs)
+    assert indexer.ledger.content_hash("https://retry.example/1") is None
+    assert "https://retry.example/1" not in indexer.sim_index.entries
+
+    del indexer.writer.update_documents
+    assert indexer.add(docs) == (1, 0, 0)
+    assert "https://retry.example/1" in _urls(indexer.writer)
+    indexer.close()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.app.db import AppStateDB, schema
+
+pytestmark = pytest.mark.skipif(not schema.fts5_available(), reason="SQLite without FTS5 trigram")
+
+
+def _urls(rows) -> list[str]:
+    return [row["url"] for row in rows]
+
+
+def test_history_search_tracks_inserts_and_deletes(tmp_path) -> None:
+    db = AppStateDB(tmp_path / "state.sqlite3")
+    first = db.add_history_entry(tab_id=None, url="https://docs.python.org/3/library/sqlite3.html", title="sqlite3")
+    db.add_history_entry(tab_id=None, url="https://example.com/", title="Example Domain")
+    db.add_history_entry(tab_id=None, url="https://example.com/python", title="Python at example")
+
+    # Substring matches keep the semantics of the old LIKE filter.
+    assert sorted(_urls(db.query_history(query="XAMPLE.c"))) == [
+        "https://example.com/",
+        "https://example.com/python",
+    ]
+    assert _urls(db.search_history("python"))[0] == "https://example.com/python"
+    # Queries shorter than a trigram fall back to LIKE.
+    assert len(db.query_history(query="3/")) == 1
+
+    db.delete_history_entry(first)
+    assert db.search_history("docs.python") == []
+    db.close()
+
+
+def test_memory_and_message_search_is_ranked_and_in_sync(tmp_path) -> None:
+    db = AppStateDB(tmp_path / "state.sqlite3")
+    for memory_id, value in (("m1", "likes dark roast coffee"), ("m2", "coffee coffee every morning")):
+        db.upsert_memory(
+            memory_id=memory_id, scope="user", scope_ref="u1", key="pref", value=value,
+            metadata=None, strength=1.0,
+        )
+    assert [item["id"] for item in db.search_memories(query="coffee", scope="user")] == ["m2", "m1"]
+    db.upsert_memory(
+        memory_id="m1", scope="user", scope_ref="u1", key="pref", value="prefers tea",
+        metadata=None, strength=1.0,
+    )
+    assert [item["id"] for item in db.search_memories(query="coffee")] == ["m2"]
+
+    db.append_llm_message(thread_id="t1", role="user", content="How do I tune SQLite indexes?")
+    db.append_llm_message(thread_id="t2", role="assistant", content="Indexing strategies for sqlite")
+    db.import_llm_message_record(
+        {"id": "imported", "thread_id": "t1", "role": "user", "content": "unrelated", "created_at": "2024-01-01T00:00:00"}
+    )
+    assert {item["thread_id"] for item in db.search_llm_messages("sqlite index")} == {"t1", "t2"}
+    assert [item["thread_id"] for item in db.search_llm_messages("sqlite", thread_id="t2")] == ["t2"]
+    assert [item["id"] for item in db.search_llm_messages("unrelated")] == ["imported"]
+    db.close()
+
+
+def test_migration_backfills_existing_rows(tmp_path) -> None:
+    path = tmp_path / "state.sqlite3"
+    db = AppStateDB(path)
+    db.add_history_entry(tab_id=None, url="https://backfill.example/page", title="Backfill")
+    with db._lock, db._conn:
+        db._conn.execute("DROP TABLE history_fts")
+        db._conn.execute("DELETE FROM _migrations WHERE id = '015_fts_search'")
+    db.close()
+
+    reopened = AppStateDB(path)
+    assert _urls(reopened.search_history("backfill")) == ["https://backfill.example/page"]
+    reopened.close()
+
+
+def test_renumbered_rowids_are_reindexed_on_open(tmp_path) -> None:
+    path = tmp_path / "state.sqlite3"
+    db = AppStateDB(path)
+    for memory_id, value in (("m1", "espresso"), ("m2", "green tea")):
+        db.upsert_memory(
+            memory_id=memory_id, scope="user", scope_ref="u1", key="pref", value=value,
+            metadata=None, strength=1.0,
+        )
+    # What a VACUUM may do to a table without an INTEGER PRIMARY KEY.
+    with db._lock, db._conn:
+        db._conn.execute("UPDATE memories SET rowid = rowid + 100")
+    db.close()
+
+    reopened = AppStateDB(path)
+    assert [item["id"] for item in reopened.search_memories(query="espresso")] == ["m1"]
+    assert [item["id"] for item in reopened.search_memories(query="green tea")] == ["m2"]
+    reopened.close()
+
+
+def test_fts_migration_is_retried_when_fts5_was_missing(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "state.sqlite3"
+    monkeypatch.setattr(schema, "fts5_available", lambda: False)
+    db = AppStateDB(path)
+    applied = {row[0] for row in db._conn.execute("SELECT id FROM _migrations")}
+    db.close()
+    assert "015_fts_search" not in applied and "20251115_desktop_defaults" in applied
+
+    monkeypatch.undo()
+    reopened = AppStateDB(path)
+    reopened.add_history_entry(tab_id=None, url="https://later.example/", title="Later")
+    assert _urls(reopened.search_history("later")) == ["https://later.example/"]
+    reopened.close()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from backend.app.db import AppStateDB
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_queued_writes_share_one_commit_and_reads_do_not_wait(tmp_path) -> None:
+    calls: list[tuple[str, str]] = []
+    db = AppStateDB(
+        tmp_path / "state.sqlite3",
+        on_call=lambda method, kind, wait_ms, duration_ms: calls.append((method, kind)),
+    )
+    db.set_setting("seed", "0")
+    baseline = db.write_batches
+
+    # Hold the writer so every thread queues up behind an in-flight write.
+    db._lock.acquire()
+    writers = [
+        threading.Thread(target=db.set_setting, args=(f"key-{n}", str(n))) for n in range(8)
+    ]
+    for thread in writers:
+        thread.start()
+    _wait_for(lambda: db._writers_waiting == len(writers))
+
+    reads: list[str | None] = []
+    reader = threading.Thread(target=lambda: reads.append(db.get_setting("seed")))
+    reader.start()
+    reader.join(timeout=5)
+    assert reads == ["0"]
+
+    db._lock.release()
+    for thread in writers:
+        thread.join(timeout=5)
+
+    assert db.write_batches - baseline == 1
+    assert [db.get_setting(f"key-{n}") for n in range(8)] == [str(n) for n in range(8)]
+    assert ("set_setting", "write") in calls
+    assert ("get_setting", "read") in calls
+    db.close()
+
+
+def test_failed_write_rolls_back_only_itself(tmp_path) -> None:
+    db = AppStateDB(tmp_path / "state.sqlite3")
+
+    with pytest.raises(RuntimeError):
+        with db._write("test") as conn:
+            conn.execute("INSERT INTO app_settings(key, value) VALUES('doomed', 'x')")
+            # Reads inside a write see its own uncommitted rows.
+            assert db.get_setting("doomed") == "x"
+            raise RuntimeError("boom")
+
+    db.set_setting("kept", "y")
+    assert db.get_setting("doomed") is None
+    assert db.get_setting("kept") == "y"
+    db.close()
+
+
+def test_db_query_endpoint_reads_beside_an_open_write(tmp_path) -> None:
+    from flask import Flask
+
+    from backend.app.api import db as db_api
+
+    db = AppStateDB(tmp_path / "state.sqlite3")
+    db.set_setting("seed", "0")
+    app = Flask(__name__)
+    app.register_blueprint(db_api.bp)
+    app.config["APP_STATE_DB"] = db
+
+    inside = threading.Event()
+    release = threading.Event()
+
+    def hold_write() -> None:
+        with db._write("test") as conn:
+            conn.execute("INSERT INTO app_settings(key, value) VALUES('pending', 'x')")
+            inside.set()
+            release.wait(5)
+
+    writer = threading.Thread(target=hold_write)
+    writer.start()
+    assert inside.wait(5)
+    response = app.test_client().post(
+        "/api/db/query", json={"sql": "SELECT key FROM app_settings WHERE key IN ('seed', 'pending')"}
+    )
+    release.set()
+    writer.join(timeout=5)
+
+    assert response.status_code == 200
+    assert response.get_json()["rows"] == [["seed"]]
+    assert db.get_setting("pending") == "x"
+    db.close()
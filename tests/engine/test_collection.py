@@ -0,0 +1,184 @@
+"""Tests for the in-tree ``chromadb`` collection and its vector engine."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+
+from chromadb.api.models.Collection import Collection
+
+
+def _add(collection: Collection, vectors: dict[str, list[float]], **metadata) -> None:
+    ids = list(vectors)
+    collection.add(
+        ids=ids,
+        documents=[f"doc {identifier}" for identifier in ids],
+        metadatas=[{"id": identifier, **metadata} for identifier in ids],
+        embeddings=[vectors[identifier] for identifier in ids],
+    )
+
+
+def test_query_orders_by_cosine_distance(tmp_path) -> None:
+    collection = Collection(tmp_path, "docs", metadata={"hnsw:space": "cosine"})
+    _add(
+        collection,
+        {"a": [1.0, 0.0, 0.0], "b": [0.7, 0.7, 0.0], "c": [0.0, 0.0, 1.0]},
+    )
+
+    result = collection.query(
+        query_embeddings=[[1.0, 0.1, 0.0]],
+        n_results=2,
+        include=["documents", "distances", "embeddings"],
+    )
+
+    assert result["ids"] == [["a", "b"]]
+    assert result["documents"] == [["doc a", "doc b"]]
+    assert result["distances"][0][0] < result["distances"][0][1]
+    assert result["embeddings"][0][0] == [1.0, 0.0, 0.0]
+
+
+def test_query_respects_where_and_replaces_ids(tmp_path) -> None:
+    collection = Collection(tmp_path, "docs")
+    _add(collection, {"a": [1.0, 0.0], "b": [0.9, 0.1]}, url="one")
+    _add(collection, {"c": [1.0, 0.0]}, url="two")
+    _add(collection, {"a": [0.0, 1.0]}, url="one")
+
+    result = collection.query(
+        query_embeddings=[[1.0, 0.0]], n_results=5, where={"url": "one"}
+    )
+
+    assert result["ids"] == [["b", "a"]]
+    assert collection.count() == 3
+
+
+def test_mixed_dimensions_score_on_overlap(tmp_path) -> None:
+    collection = Collection(tmp_path, "docs")
+    _add(collection, {"short": [1.0, 0.0], "long": [0.0, 1.0, 0.0, 0.0]})
+
+    result = collection.query(
+        query_embeddings=[[1.0, 0.0, 0.0]], n_results=2, include=["embeddings"]
+    )
+
+    assert result["ids"] == [["short", "long"]]
+    assert result["embeddings"][0][0] == [1.0, 0.0]
+    assert result["embeddings"][0][1] == [0.0, 1.0, 0.0, 0.0]
+
+
+def test_delete_and_reload_round_trip(tmp_path) -> None:
+    collection = Collection(tmp_path, "docs")
+    _add(collection, {"a": [1.0, 0.0]}, url="keep")
+    _add(collection, {"b": [0.0, 1.0]}, url="drop")
+
+    collection.delete(where={"url": "drop"})
+    reloaded = Collection(tmp_path, "docs")
+
+    assert reloaded.get(include=["embeddings"]) == {
+        "ids": [["a"]],
+        "embeddings": [[[1.0, 0.0]]],
+    }
+
+
+def test_ivf_mode_finds_nearest_neighbours(tmp_path) -> None:
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(3000, 16)).astype(np.float32)
+    collection = Collection(
+        tmp_path,
+        "docs",
+        metadata={"hnsw:space": "cosine", "index:mode": "ivf", "index:nprobe": 4},
+    )
+    collection.add(
+        ids=[str(index) for index in range(len(vectors))],
+        documents=["" for _ in range(len(vectors))],
+        metadatas=[None for _ in range(len(vectors))],
+        embeddings=vectors.tolist(),
+    )
+
+    result = collection.query(query_embeddings=[vectors[42].tolist()], n_results=3)
+
+    assert result["ids"][0][0] == "42"
+    assert len(result["ids"][0]) == 3
+
+
+def test_reload_uses_segments_and_tombstones(tmp_path) -> None:
+    collection = Collection(tmp_path, "docs")
+    _add(collection, {"a": [1.0, 0.0], "b": [0.0, 1.0]}, url="one")
+    _add(collection, {"a": [0.5, 0.5]}, url="one")
+    _add(collection, {"c": [0.0, 1.0, 1.0]}, url="two")
+
+    reloaded = Collection(tmp_path, "docs")
+
+    assert not (tmp_path / "docs.json").exists()
+    assert reloaded.count() == 3
+    result = reloaded.get(ids=["a"], include=["documents", "embeddings"])
+    assert result == {
+        "ids": [["a"]],
+        "documents": [["doc a"]],
+        "embeddings": [[[0.5, 0.5]]],
+    }
+
+
+def test_legacy_json_collection_is_migrated(tmp_path) -> None:
+    payload = {
+        "entries": [
+            {
+                "id": "a",
+                "document": "alpha",
+                "metadata": {"url": "u"},
+                "embedding": [1.0, 0.0],
+            },
+            {"id": "broken", "document": "x", "metadata": {}},
+        ],
+        "metadata": {},
+    }
+    (tmp_path / "docs.json").write_text(json.dumps(payload), encoding="utf-8")
+
+    collection = Collection(tmp_path, "docs")
+
+    assert collection.get(include=["documents", "metadatas"]) == {
+        "ids": [["a"]],
+        "documents": [["alpha"]],
+        "metadatas": [[{"url": "u"}]],
+    }
+    assert not (tmp_path / "docs.json").exists()
+    assert Collection(tmp_path, "docs").count() == 1
+
+
+def test_compaction_purges_tombstones_and_keeps_results(tmp_path) -> None:
+    collection = Collection(tmp_path, "docs")
+    for index in range(20):
+        _add(collection, {f"d{index}": [1.0, float(index)]}, url=f"u{index % 4}")
+    collection.delete(where={"url": "u0"})
+    _add(collection, {"d1": [0.0, 1.0]}, url="u1")
+    before = collection.query(query_embeddings=[[1.0, 3.0]], n_results=20)
+
+    assert collection.compact() is True
+    _add(collection, {"late": [9.0, 9.0]}, url="u9")
+
+    after = collection.query(query_embeddings=[[1.0, 3.0]], n_results=20)
+    assert [i for i in after["ids"][0] if i != "late"] == before["ids"][0]
+    reloaded = Collection(tmp_path, "docs")
+    assert reloaded.count() == collection.count() == 16
+    assert reloaded.query(query_embeddings=[[1.0, 3.0]], n_results=20) == after
+    assert len(list((tmp_path / "docs" / "segments").iterdir())) == 2
+
+
+def test_where_filters_use_postings_for_and_and_lazy_keys(tmp_path) -> None:
+    collection = Collection(tmp_path, "docs")
+    _add(collection, {"a": [1.0, 0.0]}, url="one", lang="en")
+    _add(collection, {"b": [0.9, 0.1]}, url="one", lang="de")
+    _add(collection, {"c": [1.0, 0.0]}, url="two", lang="en")
+
+    result = collection.query(
+        query_embeddings=[[1.0, 0.0]],
+        n_results=5,
+        where={"$and": [{"url": "one"}, {"lang": "en"}]},
+    )
+
+    assert result["ids"] == [["a"]]
+    assert "lang" in collection._metadata_index.keys
+    collection.delete(where={"lang": "en"})
+    assert collection.get(where={"lang": "en"})["ids"] == [[]]
+    assert collection.get(where={"url": "one"})["ids"] == [["b"]]
+    _add(collection, {"d": [0.0, 1.0]}, url="three", lang="en")
+    assert collection.get(where={"lang": "en"})["ids"] == [["d"]]
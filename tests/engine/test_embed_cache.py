@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from engine.indexing.embed import OllamaEmbedder
+from engine.indexing.embed_cache import EmbeddingCache
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def embed(self, model: str, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+
+def test_unchanged_corpus_is_reembedded_without_model_calls(tmp_path) -> None:
+    path = tmp_path / "embeddings.sqlite3"
+    client = _Client()
+    probes: list[int] = []
+    embedder = OllamaEmbedder(client, "embed-model", cache=EmbeddingCache(path))
+    chunks = ["alpha", "beta", "alpha", "gamma"]
+
+    first = embedder.embed_documents(chunks, before_request=lambda: probes.append(1))
+    assert first == [[5.0, 0.5], [4.0, 0.5], [5.0, 0.5], [5.0, 0.5]]
+    assert client.calls == [["alpha", "beta", "gamma"]]
+    assert embedder.embed_query("beta") == [4.0, 0.5]
+    assert len(client.calls) == 1 and probes == [1]
+
+    # A fresh process (new memory tier) is served from the SQLite tier.
+    lookups: list[tuple[int, int]] = []
+    restarted = OllamaEmbedder(
+        client,
+        "embed-model",
+        cache=EmbeddingCache(path, on_lookup=lambda hits, misses: lookups.append((hits, misses))),
+    )
+    assert restarted.embed_documents(chunks, before_request=lambda: probes.append(1)) == first
+    assert len(client.calls) == 1 and probes == [1]
+    assert lookups == [(4, 0)]
+
+    # Vectors are keyed per model.
+    restarted.set_model("other-model")
+    restarted.embed_documents(["alpha"])
+    assert client.calls[-1] == ["alpha"]
+    assert restarted.cache.stats()["hit_rate"] == 0.8
+
+
+def test_disk_tier_evicts_least_recently_used_rows(tmp_path) -> None:
+    # Each 2-dim float32 vector is 8 bytes; the budget holds five of them and
+    # eviction trims back to 90% of it.
+    cache = EmbeddingCache(tmp_path / "embeddings.sqlite3", memory_entries=0, max_bytes=40)
+    texts = ["a", "b", "c", "d", "e"]
+    cache.put_many("m", texts, [[float(n), 0.0] for n in range(5)])
+    assert cache.get_many("m", ["a"]) == [[0.0, 0.0]]
+
+    cache.put_many("m", ["f"], [[5.0, 0.0]])
+
+    found = cache.get_many("m", texts + ["f"])
+    assert [vector is not None for vector in found] == [True, False, False, True, True, True]
+    stats = cache.stats()
+    assert stats["evictions"] == 2
+    assert stats["disk_bytes"] == 32
+
+
+def test_probe_always_reaches_the_model(tmp_path) -> None:
+    client = _Client()
+    embedder = OllamaEmbedder(client, "embed-model", cache=EmbeddingCache(tmp_path / "embeddings.sqlite3"))
+    embedder.embed_documents(["."])
+    assert embedder.probe() == [1.0, 0.5]
+    assert embedder.probe() == [1.0, 0.5]
+    assert client.calls == [["."], ["."], ["."]]
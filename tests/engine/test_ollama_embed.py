@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from engine.llm.ollama_client import OllamaClient, OllamaClientError
+
+
+class _FakeOllama(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *, batch: bool, delay: float = 0.0, missing_model: bool = False) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.batch = batch
+        self.missing_model = missing_model
+        self.delay = delay
+        self.requests: list[tuple[str, object]] = []
+        self.inflight = 0
+        self.max_inflight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _FakeOllama
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, payload.get("input", payload.get("prompt"))))
+            server.inflight += 1
+            server.max_inflight = max(server.max_inflight, server.inflight)
+        time.sleep(server.delay)
+        with server.lock:
+            server.inflight -= 1
+        if server.missing_model:
+            data = json.dumps({"error": f'model "{payload["model"]}" not found, try pulling it first'}).encode()
+            self.send_response(404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        if self.path == "/api/embed" and server.batch:
+            body = {"embeddings": [[float(len(text))] for text in payload["input"]]}
+        elif self.path == "/api/embeddings":
+            body = {"embedding": [float(len(payload["prompt"]))]}
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def fake_ollama(request):
+    server = _FakeOllama(**request.param)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+TEXTS = ["x" * length for length in range(1, 11)]
+
+
+@pytest.mark.parametrize("fake_ollama", [{"batch": True, "delay": 0.05}], indirect=True)
+def test_embed_batches_concurrently_and_preserves_order(fake_ollama) -> None:
+    client = OllamaClient(fake_ollama.url, embed_batch_size=3, embed_concurrency=2)
+
+    vectors = client.embed("embed-model", TEXTS)
+
+    assert vectors == [[float(len(text))] for text in TEXTS]
+    assert [path for path, _ in fake_ollama.requests] == ["/api/embed"] * 4
+    assert sorted(len(batch) for _, batch in fake_ollama.requests) == [1, 3, 3, 3]
+    assert fake_ollama.max_inflight == 2
+
+
+@pytest.mark.parametrize("fake_ollama", [{"batch": False}], indirect=True)
+def test_embed_falls_back_to_single_requests(fake_ollama) -> None:
+    client = OllamaClient(fake_ollama.url, embed_batch_size=4, embed_concurrency=1)
+
+    assert client.embed("embed-model", TEXTS[:5]) == [[float(n)] for n in range(1, 6)]
+    assert client.embed_one("embed-model", "abc") == [3.0]
+    paths = [path for path, _ in fake_ollama.requests]
+    assert paths.count("/api/embed") == 1
+    assert paths.count("/api/embeddings") == 6
+
+
+@pytest.mark.parametrize("fake_ollama", [{"batch": True, "missing_model": True}], indirect=True)
+def test_missing_model_does_not_disable_batch_embedding(fake_ollama) -> None:
+    client = OllamaClient(fake_ollama.url, embed_batch_size=4, embed_concurrency=1)
+
+    with pytest.raises(OllamaClientError):
+        client.embed("embed-model", TEXTS[:2])
+    fake_ollama.missing_model = False
+    assert client.embed("embed-model", TEXTS[:2]) == [[1.0], [2.0]]
+    assert [path for path, _ in fake_ollama.requests] == ["/api/embed", "/api/embed"]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from server import refresh_worker
+from server.refresh_worker import RefreshWorker
+
+
+class _Crawls:
+    """Stand-in for run_focused_crawl that records overlap and blocks on demand."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.running: set[str] = set()
+        self.peak = 0
+        self.order: list[str] = []
+        self.release = threading.Event()
+        self.started = threading.Semaphore(0)
+
+    def __call__(self, query, budget, use_llm, model, **kwargs):
+        with self.lock:
+            self.running.add(query)
+            self.peak = max(self.peak, len(self.running))
+            self.order.append(query)
+        self.started.release()
+        self.release.wait(timeout=5)
+        with self.lock:
+            self.running.discard(query)
+        return {"query": query, "pages_fetched": 0, "docs_indexed": 0}
+
+
+@pytest.fixture
+def crawls(monkeypatch):
+    fake = _Crawls()
+    monkeypatch.setattr(refresh_worker, "run_focused_crawl", fake)
+    yield fake
+    fake.release.set()
+
+
+def _worker(tmp_path, **kwargs) -> RefreshWorker:
+    config = SimpleNamespace(focused_budget=5, normalized_path=tmp_path / "normalized.jsonl")
+    return RefreshWorker(config, **kwargs)
+
+
+def _wait_done(worker: RefreshWorker, *job_ids: str) -> None:
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        if all(worker.status(job_id=job_id)["job"]["state"] == "done" for job_id in job_ids):
+            return
+        time.sleep(0.01)
+    pytest.fail("refresh jobs did not finish")
+
+
+def test_disjoint_hosts_run_concurrently_but_shared_hosts_wait(tmp_path, crawls) -> None:
+    worker = _worker(tmp_path, workers=3)
+    a, _, _ = worker.enqueue("docs a", seeds=["https://a.example/1"])
+    b, _, _ = worker.enqueue("docs b", seeds=["https://b.example/1"])
+    c, _, _ = worker.enqueue("docs c", seeds=["https://www.a.example/2"])
+    assert crawls.started.acquire(timeout=2) and crawls.started.acquire(timeout=2)
+    assert not crawls.started.acquire(timeout=0.2)
+    assert crawls.running == {"docs a", "docs b"}
+    queue = worker.status()["queue"]
+    assert (queue["running"], queue["depth"], queue["workers"]) == (2, 1, 3)
+
+    crawls.release.set()
+    _wait_done(worker, a, b, c)
+    assert crawls.order[-1] == "docs c"
+    assert crawls.peak == 2
+
+
+def test_user_lane_goes_first_with_bounded_background_wait(tmp_path, crawls) -> None:
+    worker = _worker(tmp_path, workers=1, user_burst=2)
+    first, _, _ = worker.enqueue("blocker")
+    assert crawls.started.acquire(timeout=2)
+    background, _, _ = worker.enqueue("nightly", priority="background")
+    users = [worker.enqueue(f"user {n}")[0] for n in range(3)]
+    with pytest.raises(ValueError):
+        worker.enqueue("bad", priority="urgent")
+
+    crawls.release.set()
+    _wait_done(worker, first, background, *users)
+    assert crawls.order == ["blocker", "user 0", "nightly", "user 1", "user 2"]
+
+    snapshot = worker.status()
+    lanes = snapshot["queue"]["lanes"]
+    assert lanes["background"]["started"] == 1 and lanes["user"]["started"] == 4
+    assert lanes["background"]["wait_ms"]["max"] > 0
+    assert worker.status(job_id=background)["job"]["priority"] == "background"
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import math
+
+from rank import blend_results
+from rank import authority as authority_module
+from rank.authority import AuthorityIndex
+
+
+def test_cached_authority_reuses_table_until_store_changes(tmp_path) -> None:
+    path = tmp_path / "authority.sqlite3"
+    AuthorityIndex(scores={"a.dev": 4}, path=path, _dirty={"a.dev"}).save()
+
+    first = AuthorityIndex.cached(path)
+    assert AuthorityIndex.cached(path) is first
+    assert first.score_for("https://www.a.dev/page") == round(math.log1p(4), 3)
+    assert first.score_for("https://unknown.dev") == 0.0
+
+    writer = AuthorityIndex.load(path)
+    writer.update_from_docs([{"url": "https://b.dev", "outlinks": ["https://a.dev"]}])
+    writer.save()
+
+    refreshed = AuthorityIndex.cached(path)
+    assert refreshed is not first
+    assert refreshed.score_for("a.dev") == round(math.log1p(5), 3)
+
+    assert AuthorityIndex.cached(path, generation=7) is not refreshed
+    assert AuthorityIndex.cached(path, generation=7) is AuthorityIndex.cached(path, generation=7)
+
+
+def test_blend_results_uses_cached_default_store(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "authority.sqlite3"
+    AuthorityIndex(scores={"a.dev": 9}, path=path, _dirty={"a.dev"}).save()
+    monkeypatch.setattr(authority_module, "DEFAULT_AUTHORITY_PATH", path)
+    loads: list[object] = []
+    original_load = AuthorityIndex.load.__func__
+    monkeypatch.setattr(
+        AuthorityIndex,
+        "load",
+        classmethod(lambda cls, p: loads.append(p) or original_load(cls, p)),
+    )
+
+    results = [
+        {"url": "https://b.dev", "score": 1.0},
+        {"url": "https://a.dev", "score": 1.0},
+    ]
+    for _ in range(3):
+        blended = blend_results(results, alpha=1.0)
+    assert [item["url"] for item in blended] == ["https://a.dev", "https://b.dev"]
+    assert blended[0]["host_authority"] == round(math.log1p(9), 3)
+    assert loads == [path]
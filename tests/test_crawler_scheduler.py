@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+
+from crawler.frontier import Candidate
+from crawler.scheduler import HostGate, HostScheduler
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _candidate(url: str, score: float) -> Candidate:
+    return Candidate(url=url, source="seed", weight=1.0, score=score)
+
+
+def test_scheduler_hands_out_best_candidate_across_hosts() -> None:
+    async def _run() -> list[str]:
+        scheduler = HostScheduler(per_host=1)
+        scheduler.put_nowait(_candidate("https://a.test/low", 0.1))
+        scheduler.put_nowait(_candidate("https://b.test/high", 0.9))
+        scheduler.put_nowait(_candidate("https://a.test/mid", 0.5))
+        order = []
+        for _ in range(3):
+            candidate = await scheduler.get()
+            order.append(candidate.url)
+            scheduler.task_done(candidate)
+        await scheduler.join()
+        return order
+
+    assert asyncio.run(_run()) == [
+        "https://b.test/high",
+        "https://a.test/mid",
+        "https://a.test/low",
+    ]
+
+
+def test_busy_or_delayed_host_does_not_block_other_hosts() -> None:
+    clock = _Clock()
+
+    async def _run() -> None:
+        scheduler = HostScheduler(crawl_delay=5.0, per_host=1, clock=clock)
+        scheduler.put_nowait(_candidate("https://hot.test/1", 0.9))
+        scheduler.put_nowait(_candidate("https://hot.test/2", 0.8))
+        scheduler.put_nowait(_candidate("https://cold.test/1", 0.1))
+
+        first = await scheduler.get()
+        second = await scheduler.get()
+        assert first.url == "https://hot.test/1"
+        assert second.url == "https://cold.test/1"
+
+        scheduler.task_done(first)
+        scheduler.task_done(second)
+        waiter = asyncio.ensure_future(scheduler.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        clock.now += 5.0
+        scheduler.put_nowait(_candidate("https://other.test/1", 0.0))
+        third = await waiter
+        assert third.url == "https://hot.test/2"
+        scheduler.task_done(third)
+        scheduler.task_done(await scheduler.get())
+        await scheduler.join()
+        scheduler.close()
+        assert await scheduler.get() is None
+
+    asyncio.run(_run())
+
+
+def test_schedulers_sharing_a_gate_share_each_hosts_delay() -> None:
+    clock = _Clock()
+    gate = HostGate()
+
+    async def _run() -> None:
+        first = HostScheduler(crawl_delay=5.0, per_host=1, clock=clock, gate=gate)
+        second = HostScheduler(crawl_delay=5.0, per_host=1, clock=clock, gate=gate)
+        first.put_nowait(_candidate("https://shared.test/a", 0.5))
+        second.put_nowait(_candidate("https://shared.test/b", 0.5))
+
+        taken = await first.get()
+        first.task_done(taken)
+        waiter = asyncio.ensure_future(second.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        clock.now += 5.0
+        second.put_nowait(_candidate("https://other.test/1", 0.0))
+        assert (await waiter).url == "https://shared.test/b"
+
+    asyncio.run(_run())
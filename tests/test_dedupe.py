@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import random
+
+from backend.app.indexer.dedupe import (
+    SimHashIndex,
+    hamming_distance,
+    simhash64,
+    simhash_many,
+)
+
+
+def _linear_nearest(index: SimHashIndex, target: int, threshold: int) -> str | None:
+    for url, value in index.entries.items():
+        if hamming_distance(target, value) <= threshold:
+            return url
+    return None
+
+
+def _flip(value: int, bits: list[int]) -> int:
+    for bit in bits:
+        value ^= 1 << bit
+    return value
+
+
+def test_nearest_matches_linear_scan() -> None:
+    rng = random.Random(1234)
+    index = SimHashIndex(entries={})
+    signatures = [rng.getrandbits(64) for _ in range(500)]
+    for position, value in enumerate(signatures):
+        index.update(f"https://example.com/{position}", value)
+
+    for threshold in (0, 3, 6):
+        for _ in range(200):
+            base = rng.choice(signatures)
+            target = _flip(base, rng.sample(range(64), rng.randint(0, threshold + 2)))
+            assert index.nearest(target, threshold) == _linear_nearest(
+                index, target, threshold
+            )
+
+
+def test_update_moves_signature_between_buckets() -> None:
+    index = SimHashIndex(entries={"a": 0})
+    assert index.nearest(0b111) == "a"
+
+    index.update("a", (1 << 64) - 1)
+    index.update("b", 0b1)
+
+    assert index.nearest(0b111) == "b"
+    assert index.nearest((1 << 64) - 2) == "a"
+    assert index.nearest(0b111, threshold=1) is None
+
+
+def test_readded_urls_keep_insertion_order_after_removals() -> None:
+    index = SimHashIndex(entries={"a": 0b1, "b": 0b10, "c": 0b11})
+    index.remove("a")
+    index.remove("b")
+    index.update("d", 0b11)
+
+    assert index.nearest(0b11, threshold=0) == "c"
+
+
+def _reference_simhash64(text: str) -> int:
+    import hashlib
+
+    from backend.app.indexer.dedupe import tokenize
+
+    vector = [0] * 64
+    tokens = list(tokenize(text))
+    if not tokens:
+        return 0
+    for token in tokens:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big", signed=False)
+        for bit in range(64):
+            vector[bit] += 1 if value & (1 << bit) else -1
+    return sum(1 << bit for bit, weight in enumerate(vector) if weight >= 0)
+
+
+def test_simhash_matches_reference_implementation() -> None:
+    texts = [
+        "",
+        "   ",
+        "Hello hello world",
+        "Résumé naïve café — ünïcode tokens 42",
+        " ".join(f"word{index % 37}" for index in range(2000)),
+    ]
+
+    assert [simhash64(text) for text in texts] == [
+        _reference_simhash64(text) for text in texts
+    ]
+    assert simhash_many(texts) == [_reference_simhash64(text) for text in texts]
+
+
+def test_binary_round_trip_and_legacy_json(tmp_path) -> None:
+    legacy = tmp_path / "simhash_index.json"
+    legacy.write_text(json.dumps({"https://a": 5, "https://b": 2**64 - 1}))
+    path = tmp_path / "simhash_index.bin"
+
+    index = SimHashIndex.load(path)
+    assert index.entries == {"https://a": 5, "https://b": 2**64 - 1}
+
+    index.update("https://ü.example/ä", 7)
+    index.save(path)
+
+    assert path.read_bytes().startswith(b"SIMHASH1")
+    assert SimHashIndex.load(path).entries == index.entries
+    assert SimHashIndex.load(path).nearest(4) == "https://a"
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from whoosh import index
+from whoosh.qparser import QueryParser
+
+from backend.app.config import AppConfig
+from backend.app.jobs.focused_crawl import _StreamingIndexer
+
+
+def _record(n: int, word: str) -> dict:
+    body = " ".join(f"{word} streaming pipeline paragraph number {n}" for _ in range(20))
+    return {
+        "url": f"https://site{n}.test/page",
+        "status": 200,
+        "title": f"Page {n}",
+        "html": f"<html><body><h1>Page {n}</h1><p>{body}</p></body></html>",
+        "fetched_at": 1700000000.0 + n,
+        "content_hash": f"hash-{n}",
+        "outlinks": [],
+    }
+
+
+def test_streaming_indexer_commits_batches_while_pages_arrive(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr("rank.authority.DEFAULT_AUTHORITY_PATH", tmp_path / "authority.sqlite3")
+    config = AppConfig.from_env()
+    config.ensure_dirs()
+
+    events: list[tuple[str, dict]] = []
+    committed = threading.Event()
+    batches: list[list[str]] = []
+
+    def _emit(stage: str, **payload: object) -> None:
+        events.append((stage, payload))
+        committed.set()
+
+    stream = _StreamingIndexer(
+        config,
+        state_db=None,
+        job_id=None,
+        learned_db=None,
+        emit=_emit,
+        documents_callback=lambda docs: batches.append([doc["url"] for doc in docs]),
+        batch_size=2,
+        commit_interval=60.0,
+        queue_size=1,
+    )
+    stream.submit(_record(1, "aardvark"))
+    stream.submit(_record(2, "aardvark"))
+    assert committed.wait(10)
+
+    # The first batch is searchable before the crawl has finished.
+    ix = index.open_dir(config.index_dir)
+    with ix.searcher() as searcher:
+        query = QueryParser("body", ix.schema).parse("aardvark")
+        assert len(searcher.search(query)) == 2
+    ix.close()
+
+    stream.submit(_record(3, "zebra"))
+    docs = stream.finish()
+
+    assert [doc["url"] for doc in docs] == [
+        "https://site1.test/page",
+        "https://site2.test/page",
+        "https://site3.test/page",
+    ]
+    assert docs[0]["site"] and "verification" in docs[0]
+    assert batches == [[doc["url"] for doc in docs[:2]], [docs[2]["url"]]]
+    assert [stage for stage, _ in events] == ["index_progress", "index_progress"]
+    assert events[-1][1]["docs_indexed"] == 3 and events[-1][1]["pages"] == 3
+    assert (stream.added, stream.skipped, stream.deduped) == (3, 0, 0)
+    assert len(config.normalized_path.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_crawl_failure_is_not_masked_by_indexing_failure(tmp_path, monkeypatch) -> None:
+    from backend.app.jobs import focused_crawl
+
+    monkeypatch.setenv("DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr("rank.authority.DEFAULT_AUTHORITY_PATH", tmp_path / "authority.sqlite3")
+    config = AppConfig.from_env()
+
+    def _crawl(*args, **kwargs):
+        raise RuntimeError("crawl failed")
+
+    def _finish(self):
+        raise ValueError("indexing failed")
+
+    monkeypatch.setattr(focused_crawl, "_crawl", _crawl)
+    monkeypatch.setattr(focused_crawl, "_get_seed_candidates", lambda *args, **kwargs: [])
+    monkeypatch.setattr(_StreamingIndexer, "finish", _finish)
+
+    with pytest.raises(RuntimeError, match="crawl failed"):
+        focused_crawl.run_focused_crawl("", 1, False, None, config=config)
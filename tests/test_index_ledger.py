@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+
+from backend.app.indexer.dedupe import SimHashIndex
+from backend.app.indexer.incremental import incremental_index
+from backend.app.indexer.ledger import IndexLedger
+from rank.authority import AuthorityIndex
+
+
+def _doc(url: str, body: str, **extra) -> dict:
+    return {"url": url, "title": url, "h1h2": "", "body": body, "lang": "en", **extra}
+
+
+def test_ledger_migrates_legacy_json(tmp_path) -> None:
+    (tmp_path / "index_ledger.json").write_text(json.dumps({"https://a": "h1"}))
+    simhash_path = tmp_path / "simhash_index.bin"
+    SimHashIndex(entries={"https://a": 2**64 - 1, "https://b": 3}).save(simhash_path)
+
+    with IndexLedger.open(
+        tmp_path / "index_ledger.json", simhash_path=simhash_path
+    ) as ledger:
+        assert ledger.path == tmp_path / "index_ledger.sqlite3"
+        assert ledger.content_hash("https://a") == "h1"
+        assert ledger.simhash_index().entries == {
+            "https://a": 2**64 - 1,
+            "https://b": 3,
+        }
+
+    # Migration runs once; later edits to the JSON file are ignored.
+    (tmp_path / "index_ledger.json").write_text(json.dumps({"https://a": "h2"}))
+    with IndexLedger.open(tmp_path / "index_ledger.sqlite3") as ledger:
+        assert ledger.content_hash("https://a") == "h1"
+
+
+def test_incremental_index_upserts_changed_rows(tmp_path, monkeypatch) -> None:
+    authority_path = tmp_path / "authority.sqlite3"
+    monkeypatch.setattr("rank.authority.DEFAULT_AUTHORITY_PATH", authority_path)
+    paths = (
+        tmp_path / "whoosh",
+        tmp_path / "index_ledger.sqlite3",
+        tmp_path / "simhash_index.bin",
+        tmp_path / "last_index_time",
+    )
+
+    first = [
+        _doc("https://a.dev/1", "alpha beta gamma " * 20, outlinks=["https://b.dev"]),
+        _doc("https://c.dev/1", "completely different words here " * 20),
+    ]
+    assert incremental_index(*paths, first) == (2, 0, 0)
+    assert incremental_index(*paths, first) == (0, 2, 0)
+
+    changed = [_doc("https://a.dev/1", "alpha beta delta epsilon " * 20)]
+    assert incremental_index(*paths, changed) == (1, 0, 0)
+
+    with sqlite3.connect(paths[1]) as conn:
+        rows = dict(conn.execute("SELECT url, simhash FROM documents"))
+    assert set(rows) == {"https://a.dev/1", "https://c.dev/1"}
+    assert AuthorityIndex.load(authority_path).scores == {
+        "a.dev": 0,
+        "b.dev": 1,
+        "c.dev": 0,
+    }
+
+
+def test_authority_sqlite_imports_legacy_json_and_saves_changes(tmp_path) -> None:
+    (tmp_path / "authority.json").write_text(json.dumps({"a.dev": 2}))
+    path = tmp_path / "authority.sqlite3"
+
+    authority = AuthorityIndex.load(path)
+    authority.update_from_docs(
+        [{"url": "https://c.dev", "outlinks": ["https://a.dev"]}]
+    )
+    authority.save()
+
+    assert AuthorityIndex.load(path).scores == {"a.dev": 3, "c.dev": 0}
+
+
+def test_authority_writers_from_one_snapshot_add_their_increments(tmp_path) -> None:
+    path = tmp_path / "authority.sqlite3"
+    seed = AuthorityIndex.load(path)
+    seed.update_from_docs([{"url": "https://b.dev", "outlinks": ["https://a.dev"]}])
+    seed.save()
+
+    first = AuthorityIndex.load(path)
+    second = AuthorityIndex.load(path)
+    first.update_from_docs([{"url": "https://c.dev", "outlinks": ["https://a.dev"]}])
+    second.update_from_docs([{"url": "https://d.dev", "outlinks": ["https://a.dev", "https://b.dev"]}])
+    first.save()
+    second.save()
+
+    assert AuthorityIndex.load(path).scores == {"a.dev": 3, "b.dev": 1, "c.dev": 0, "d.dev": 0}
@@ -81,3 +81,111 @@ def test_ensure_index_recovers_from_missing_segment(tmp_path):
             assert searcher.doc_count_all() == 0
     finally:
         recovered.close()
+
+
+def _offsetless_index(index_dir):
+    index_dir.mkdir()
+    schema = build_schema()
+    schema.remove("body")
+    schema.add("body", TEXT(stored=True, analyzer=build_schema()["body"].analyzer, phrase=True))
+    old_ix = index.create_in(index_dir, schema)
+    writer = old_ix.writer()
+    writer.add_document(
+        url="https://example.com/kept", lang="en", title="Kept", h1h2="", body="Crawled pages survive upgrades."
+    )
+    writer.commit()
+    old_ix.close()
+
+
+def _urls(ix):
+    with ix.searcher() as searcher:
+        return [doc["url"] for doc in searcher.documents()]
+
+
+def test_ensure_index_carries_stored_documents_into_new_schema(tmp_path):
+    index_dir = tmp_path / "positions_index"
+    _offsetless_index(index_dir)
+
+    upgraded = ensure_index(index_dir)
+    try:
+        assert upgraded.schema["body"].supports("characters")
+        assert _urls(upgraded) == ["https://example.com/kept"]
+    finally:
+        upgraded.close()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["positions_index", "positions_index.lock"]
+
+
+def test_failed_rebuild_keeps_the_existing_index(tmp_path, monkeypatch):
+    index_dir = tmp_path / "positions_index"
+    _offsetless_index(index_dir)
+    create_in = index.create_in
+
+    def failing_create_in(dirname, schema, *args, **kwargs):
+        if ".rebuild-" in str(dirname):
+            raise OSError("disk full")
+        return create_in(dirname, schema, *args, **kwargs)
+
+    monkeypatch.setattr(index, "create_in", failing_create_in)
+    kept = ensure_index(index_dir)
+    try:
+        assert not kept.schema["body"].supports("characters")
+        assert _urls(kept) == ["https://example.com/kept"]
+    finally:
+        kept.close()
+    assert not list(tmp_path.glob("positions_index.rebuild-*"))
+
+
+def test_interrupted_swap_restores_the_retired_index(tmp_path):
+    _offsetless_index(tmp_path / "positions_index.old-crash")
+    (tmp_path / "positions_index").mkdir()
+    (tmp_path / "positions_index.rebuild-crash").mkdir()
+
+    recovered = ensure_index(tmp_path / "positions_index")
+    try:
+        assert recovered.schema["body"].supports("characters")
+        assert _urls(recovered) == ["https://example.com/kept"]
+    finally:
+        recovered.close()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["positions_index", "positions_index.lock"]
+
+
+def test_snippets_use_stored_offsets_instead_of_reanalyzing(tmp_path, monkeypatch):
+    import whoosh.highlight
+
+    from search import query as query_module
+
+    ix = ensure_index(tmp_path / "index")
+    writer = ix.writer()
+    body = "filler words. " * 500 + "The crawler indexes Python pages. " + "trailing text. " * 500
+    writer.add_document(url="https://example.com/long", lang="en", title="Long", h1h2="", body=body)
+    writer.commit()
+
+    def retokenized(*args, **kwargs):  # pragma: no cover - must not be reached
+        raise AssertionError("snippet re-analyzed the stored body")
+
+    monkeypatch.setattr(whoosh.highlight, "set_matched_filter", retokenized)
+    try:
+        [hit] = query_module.search(ix, "crawlers python", limit=5)
+    finally:
+        ix.close()
+    assert '<mark class="match term0">crawler</mark>' in hit["snippet"]
+    assert "Python" in hit["snippet"] and len(hit["snippet"]) < 400
+
+
+def test_concurrent_opens_upgrade_once(tmp_path):
+    import threading
+
+    index_dir = tmp_path / "positions_index"
+    _offsetless_index(index_dir)
+    opened = []
+    threads = [threading.Thread(target=lambda: opened.append(ensure_index(index_dir))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(opened) == 4
+    for ix in opened:
+        assert ix.schema["body"].supports("characters")
+        assert _urls(ix) == ["https://example.com/kept"]
+        ix.close()
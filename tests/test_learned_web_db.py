@@ -124,3 +124,34 @@ def test_record_page_preserves_query_params(tmp_path) -> None:
 
     assert stored_url is not None
     assert stored_url[0] == "https://example.com/docs?lang=en&topic=ai"
+
+
+def test_similar_discovery_seeds_tracks_new_and_legacy_embeddings(tmp_path) -> None:
+    db_path = tmp_path / "learned.sqlite3"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE query_embeddings (query TEXT PRIMARY KEY, embedding TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.execute("INSERT INTO query_embeddings VALUES ('legacy', '[0.0, 1.0]', 1.0)")
+    db = LearnedWebDB(db_path)
+    db.upsert_query_embedding("near", [1.0, 0.1])
+    db.upsert_query_embedding("far", [-1.0, 0.0])
+    for n in range(3):
+        db.record_discovery("near", f"https://near.example/{n}", reason="frontier", score=1.0 - n / 10)
+    db.record_discovery("legacy", "https://legacy.example", reason="frontier", score=1.0)
+    db.record_discovery("far", "https://far.example", reason="frontier", score=1.0)
+
+    assert db.similar_discovery_seeds([1.0, 0.0], per_query=2) == [
+        "https://near.example/0",
+        "https://near.example/1",
+    ]
+    assert db.similar_discovery_seeds([0.0, 1.0], limit=1) == ["https://legacy.example"]
+
+    # Writes from another connection are picked up on the next lookup.
+    other = LearnedWebDB(db_path)
+    other.upsert_query_embedding("far", [1.0, 0.0])
+    assert "https://far.example" in db.similar_discovery_seeds([1.0, 0.0])
+    assert db.similar_discovery_seeds([1.0, 0.0, 0.0]) == []
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM query_embeddings WHERE vector IS NULL").fetchone()[0] == 0
@@ -1,6 +1,7 @@
 import json
+import threading
 
-from backend.app.pipeline.normalize import normalize
+from backend.app.pipeline.normalize import ExtractionPool, normalize, normalize_records, write_normalized
 
 
 def test_normalize_extracts_fields(tmp_path):
@@ -35,3 +36,72 @@ def test_normalize_extracts_fields(tmp_path):
     assert doc["lang"]
     assert "Packaging Basics" in doc["h1h2"]
     assert output.exists()
+
+
+def _slow_worker(record):
+    import time
+
+    from backend.app.pipeline.normalize import normalize_record
+
+    if record["url"].endswith("/slow"):
+        time.sleep(30)
+    return normalize_record(record)
+
+
+class _SlowPool(ExtractionPool):
+    _target = staticmethod(_slow_worker)
+
+
+def _page(url: str, heading: str) -> dict:
+    return {
+        "url": url,
+        "status": 200,
+        "html": f"<html><head><title>{heading}</title></head><body><h1>{heading}</h1>"
+        f"<p>{heading} explains how packaging works in practice.</p></body></html>",
+    }
+
+
+def test_parallel_extraction_matches_sequential_and_skips_stuck_pages():
+    records = [_page(f"https://example.com/{i}", f"Topic {i}") for i in range(6)]
+    sequential = list(normalize_records(records, workers=0))
+    assert [doc["title"] for doc in sequential] == [f"Topic {i}" for i in range(6)]
+    assert sequential[0]["h1h2"] == "Topic 0"
+
+    stuck = records[:2] + [_page("https://example.com/slow", "Slow")] + records[2:]
+    with _SlowPool(2, timeout=3.0) as pool:
+        parallel = list(normalize_records(stuck, pool=pool))
+        assert pool.timeouts == 1
+    assert parallel[2] is None
+    parallel.pop(2)
+    for left, right in zip(parallel, sequential):
+        left.pop("fetched_at")
+        right.pop("fetched_at")
+    assert parallel == sequential
+
+
+def test_inline_children_keep_word_boundaries():
+    record = _page("https://example.com/inline", "Inline")
+    record["html"] = (
+        "<html><body><h1>Hello<br>World</h1><h2><span>Foo</span><span>Bar</span></h2>"
+        "<p>Packaging guides describe wheels and source distributions in detail.</p></body></html>"
+    )
+    doc = next(normalize_records([record], workers=0))
+    assert doc["h1h2"] == "Hello World \nFoo Bar"
+
+
+def test_concurrent_appends_keep_every_line(tmp_path):
+    output = tmp_path / "normalized.jsonl"
+    batches = [[{"url": f"https://example.com/{n}/{i}"} for i in range(50)] for n in range(8)]
+    threads = [
+        threading.Thread(target=write_normalized, args=(output, batch), kwargs={"append": True})
+        for batch in batches
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert sorted(json.loads(line)["url"] for line in lines) == sorted(
+        doc["url"] for batch in batches for doc in batch
+    )
@@ -1,5 +1,9 @@
+import json
+import time
+
 import requests
 
+from rank import blend
 from rank.blend import maybe_rerank
 
 
@@ -11,3 +15,81 @@ def test_rerank_noop_without_llm(monkeypatch):
     docs = [{"url": "https://example.com", "title": "Example", "snippet": "Text"}]
     reranked = maybe_rerank("query", docs, enabled=True, model="fake", timeout=0.1)
     assert reranked is docs
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, order):
+        self._order = order
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return {"response": json.dumps(self._order)}
+
+
+class _FakeSession:
+    def __init__(self, order, delay=0.0):
+        self.order = order
+        self.delay = delay
+        self.calls = 0
+
+    def post(self, *args, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        return _FakeResponse(self.order)
+
+
+def _docs():
+    return [
+        {"url": "https://a.example", "title": "A", "snippet": ""},
+        {"url": "https://b.example", "title": "B", "snippet": ""},
+    ]
+
+
+def test_rerank_cache_reuses_order_for_same_candidates(monkeypatch):
+    blend.clear_rerank_cache()
+    session = _FakeSession(["https://b.example", "https://a.example"])
+    monkeypatch.setattr(blend, "_session", lambda: session)
+
+    first = maybe_rerank("Query", _docs(), enabled=True, model="fake", budget_ms=None)
+    second = maybe_rerank("query ", list(reversed(_docs())), enabled=True, model="fake", budget_ms=None)
+
+    assert [doc["url"] for doc in first] == ["https://b.example", "https://a.example"]
+    assert [doc["url"] for doc in second] == ["https://b.example", "https://a.example"]
+    assert session.calls == 1
+
+
+def test_rerank_budget_returns_blended_order_and_warms_cache(monkeypatch):
+    blend.clear_rerank_cache()
+    session = _FakeSession(["https://b.example", "https://a.example"], delay=0.2)
+    monkeypatch.setattr(blend, "_session", lambda: session)
+    docs = _docs()
+
+    assert maybe_rerank("slow", docs, enabled=True, model="fake", budget_ms=10) is docs
+
+    deadline = time.monotonic() + 5
+    while blend._INFLIGHT and time.monotonic() < deadline:
+        time.sleep(0.01)
+    warmed = maybe_rerank("slow", docs, enabled=True, model="fake", budget_ms=10)
+    assert [doc["url"] for doc in warmed] == ["https://b.example", "https://a.example"]
+    assert session.calls == 1
+
+
+def test_rerank_skips_new_queries_while_pending_calls_are_capped(monkeypatch):
+    blend.clear_rerank_cache()
+    session = _FakeSession(["https://b.example", "https://a.example"], delay=0.3)
+    monkeypatch.setattr(blend, "_session", lambda: session)
+    monkeypatch.setattr(blend, "RERANK_MAX_PENDING", 2)
+    docs = _docs()
+
+    for n in range(5):
+        assert maybe_rerank(f"slow {n}", docs, enabled=True, model="fake", budget_ms=0) is docs
+    assert len(blend._INFLIGHT) <= 2
+
+    deadline = time.monotonic() + 5
+    while blend._INFLIGHT and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert session.calls == 2
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import replace
+
+from frontier.robots import RobotsCache, RobotsStore
+
+
+class _Response:
+    def __init__(self, status_code: int, text: str = "", headers: dict | None = None) -> None:
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class _Client:
+    def __init__(self, responses: list[_Response], delay: float = 0.0) -> None:
+        self.responses = responses
+        self.delay = delay
+        self.requests: list[tuple[str, dict]] = []
+
+    async def get(self, url: str, timeout: float = 5.0, headers: dict | None = None) -> _Response:
+        self.requests.append((url, dict(headers or {})))
+        await asyncio.sleep(self.delay)
+        return self.responses.pop(0)
+
+
+ROBOTS = "User-agent: *\nDisallow: /private\n"
+
+
+def test_concurrent_misses_share_one_fetch_and_persist(tmp_path) -> None:
+    store = RobotsStore(tmp_path / "robots.sqlite3")
+    cache = RobotsCache(store=store)
+    client = _Client([_Response(200, ROBOTS, {"Cache-Control": "max-age=600"})], delay=0.05)
+
+    async def _run() -> list[bool]:
+        return await asyncio.gather(
+            cache.allowed_async(client, "https://example.com/private/a"),
+            cache.allowed_async(client, "https://example.com/public"),
+            cache.allowed_async(client, "https://example.com/private/b"),
+        )
+
+    assert asyncio.run(_run()) == [False, True, False]
+    assert len(client.requests) == 1
+    assert cache.stats["coalesced"] == 2
+
+    fresh = RobotsCache(store=RobotsStore(tmp_path / "robots.sqlite3"))
+    offline = _Client([])
+    assert asyncio.run(fresh.allowed_async(offline, "https://example.com/private/x")) is False
+    assert offline.requests == []
+
+
+def test_negative_results_are_recorded_and_expired_entries_revalidated(tmp_path) -> None:
+    fetches: list[tuple[str, float, bool]] = []
+    store = RobotsStore(tmp_path / "robots.sqlite3")
+    cache = RobotsCache(store=store, on_fetch=lambda origin, ms, neg: fetches.append((origin, ms, neg)))
+
+    failing = _Client([_Response(503)])
+    assert asyncio.run(cache.allowed_async(failing, "https://down.example/page")) is True
+    record = store.get("https://down.example")
+    assert record is not None and record.negative
+    assert record.expires_at - record.fetched_at == cache.negative_ttl
+    assert fetches and fetches[0][0] == "https://down.example" and fetches[0][2] is True
+
+    client = _Client(
+        [
+            _Response(200, ROBOTS, {"ETag": '"v1"', "Cache-Control": "max-age=60"}),
+            _Response(304, "", {"Cache-Control": "max-age=120"}),
+        ]
+    )
+    asyncio.run(cache.allowed_async(client, "https://site.example/"))
+    cache._cache.clear()
+    stale = store.get("https://site.example")
+    store.put("https://site.example", replace(stale, expires_at=0.0))
+
+    assert asyncio.run(cache.allowed_async(client, "https://site.example/private")) is False
+    assert client.requests[1][1] == {"If-None-Match": '"v1"'}
+    refreshed = store.get("https://site.example")
+    assert refreshed.body == ROBOTS
+    assert refreshed.expires_at - refreshed.fetched_at == 120
+
+
+class _ThreadRecordingStore(RobotsStore):
+    def __init__(self, path) -> None:
+        super().__init__(path)
+        self.threads: set[int] = set()
+
+    def get(self, origin):
+        self.threads.add(threading.get_ident())
+        return super().get(origin)
+
+    def put(self, origin, record) -> None:
+        self.threads.add(threading.get_ident())
+        super().put(origin, record)
+
+
+def test_store_io_runs_off_the_event_loop(tmp_path) -> None:
+    store = _ThreadRecordingStore(tmp_path / "robots.sqlite3")
+    cache = RobotsCache(store=store)
+    client = _Client([_Response(200, ROBOTS)])
+
+    async def _run() -> tuple[bool, int]:
+        allowed = await cache.allowed_async(client, "https://example.com/private")
+        return allowed, threading.get_ident()
+
+    allowed, loop_thread = asyncio.run(_run())
+    assert allowed is False
+    assert store.threads and loop_thread not in store.threads
+
+
+def test_shared_cache_calls_every_callers_fetch_hook(tmp_path) -> None:
+    first: list[str] = []
+    second: list[str] = []
+    path = tmp_path / "robots.sqlite3"
+    cache = RobotsCache.shared(path=path, on_fetch=lambda origin, ms, neg: first.append(origin))
+    assert RobotsCache.shared(path=path, on_fetch=lambda origin, ms, neg: second.append(origin)) is cache
+
+    asyncio.run(cache.allowed_async(_Client([_Response(200, ROBOTS)]), "https://hooks.example/"))
+    assert first == second == ["https://hooks.example"]
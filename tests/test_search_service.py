@@ -167,11 +167,14 @@ def test_run_query_triggers_for_low_confidence(monkeypatch, tmp_path):
 
 
 def test_get_index_reloads_when_generation_changes(tmp_path):
+    from backend.app.indexer.incremental import index_generation
+
+    base = index_generation()
     marker = tmp_path / "state" / ".last_index_time"
     marker.parent.mkdir(parents=True, exist_ok=True)
-    marker.write_text("1\n", encoding="utf-8")
+    marker.write_text(f"{base + 1}\n", encoding="utf-8")
 
-    config = _base_config(tmp_path, last_index_time_path=marker)
+    config = _base_config(tmp_path, last_index_time_path=marker, search_index_poll_seconds=0.0)
 
     class StubManager:
         def __init__(self) -> None:
@@ -185,8 +188,107 @@ def test_get_index_reloads_when_generation_changes(tmp_path):
 
     service = SearchService(config, StubManager())
 
-    first = service._get_index()
-    marker.write_text("2\n", encoding="utf-8")
-    second = service._get_index()
+    pool = service._get_index()
+    with pool.searcher():
+        pass
+    marker.write_text(f"{base + 2}\n", encoding="utf-8")
+    assert service._get_index() is pool
+    assert pool.generation == base + 2
+    with pool.searcher():
+        pass
+
+    assert pool.refreshed == 1
+
+
+def test_searchers_are_reused_and_refreshed_on_commit(monkeypatch, tmp_path):
+    from pathlib import Path
+
+    from backend.app.indexer.incremental import index_generation, publish_index_generation
+
+    config = _base_config(tmp_path, search_index_poll_seconds=3600.0)
+    service = SearchService(config, SimpleNamespace(db=None))
+
+    def add(url: str, body: str) -> None:
+        writer = service._get_index().ix.writer()
+        writer.update_document(url=url, title=url, h1h2="", body=body, lang="en")
+        writer.commit()
+        publish_index_generation(index_generation() + 1)
+
+    add("https://one.example", "pooled searcher alpha")
+    reads: list[Path] = []
+    original_read_text = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda self, *a, **k: reads.append(self) or original_read_text(self, *a, **k))
+
+    for _ in range(3):
+        assert [hit["url"] for hit in service._retrieve(service._get_index(), "alpha", 5)] == [
+            "https://one.example"
+        ]
+    add("https://two.example", "pooled searcher alpha beta")
+    hits = service._retrieve(service._get_index(), "beta", 5)
+
+    pool = service._get_index()
+    assert [hit["url"] for hit in hits] == ["https://two.example"]
+    assert (pool.opened, pool.refreshed) == (1, 1)
+    assert reads == []
+
 
-    assert first is not second
+def test_run_query_serves_repeats_from_cache_until_generation_changes(monkeypatch, tmp_path):
+    config = _base_config(tmp_path, use_llm_rerank=False)
+
+    class StubManager:
+        db = None
+
+        def schedule(self, *args, **kwargs):  # pragma: no cover - confident hits only
+            return None
+
+        def last_index_time(self) -> int:
+            return 0
+
+    service = SearchService(config, StubManager())
+    service._get_index = lambda: object()
+    _mute_metrics(monkeypatch)
+    calls: list[str] = []
+
+    def fake_search(ix, query, limit, max_limit, max_query_length):
+        calls.append(query)
+        return [{"url": "https://example.com", "title": "Example", "score": 3.0}]
+
+    monkeypatch.setattr("backend.app.search.service.query_module.search", fake_search)
+    monkeypatch.setattr("backend.app.search.service.blend_results", lambda results: list(results))
+
+    first, _, _ = service.run_query("python  docs", limit=5, use_llm=None, model=None)
+    first[0]["title"] = "mutated by caller"
+    second, _, _ = service.run_query(" python docs ", limit=5, use_llm=None, model=None)
+    assert calls == ["python  docs"]
+    assert second[0]["title"] == "Example"
+
+    service.run_query("python docs", limit=6, use_llm=None, model=None)
+    assert len(calls) == 2
+
+    service._index_generation += 1
+    service.run_query("python docs", limit=5, use_llm=None, model=None)
+    assert len(calls) == 3
+
+
+def test_result_cache_enforces_entry_byte_and_ttl_limits(monkeypatch):
+    from backend.app.search import result_cache
+    from backend.app.search.result_cache import QueryResultCache
+
+    cache = QueryResultCache(max_entries=2, max_bytes=10_000, ttl_seconds=30)
+    for key in ("a", "b", "c"):
+        cache.put(1, key, [{"url": key}])
+    assert cache.get(1, "a") is None
+    assert cache.get(1, "c") == [{"url": "c"}]
+    assert cache.stats().evictions == 1
+
+    small = QueryResultCache(max_entries=10, max_bytes=200, ttl_seconds=30)
+    small.put(1, "big", [{"snippet": "x" * 500}])
+    assert small.get(1, "big") is None
+
+    now = [100.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    expiring = QueryResultCache(max_entries=10, max_bytes=10_000, ttl_seconds=5)
+    expiring.put(1, "q", [{"url": "u"}])
+    now[0] += 6
+    assert expiring.get(1, "q") is None
+    assert expiring.stats().entries == 0